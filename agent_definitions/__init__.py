@@ -1,28 +1,71 @@
-"""エージェント定義のパッケージ."""
-from agent_definitions.persona_generator import (
-    create_persona_generator_agent,
-)
-from agent_definitions.question_designer import (
-    create_question_designer_agent,
-)
-from agent_definitions.interviewer import (
-    create_interviewer_agent,
-)
-from agent_definitions.hypothesis_builder import (
-    create_hypothesis_builder_agent,
-)
-from agent_definitions.validation_question_designer import (
-    create_validation_question_designer_agent,
-)
-from agent_definitions.question_evaluator import (
-    create_question_evaluator_agent,
-)
-
-__all__ = [
-    "create_persona_generator_agent",
-    "create_question_designer_agent",
-    "create_interviewer_agent",
-    "create_hypothesis_builder_agent",
-    "create_validation_question_designer_agent",
-    "create_question_evaluator_agent",
-]
+"""
+エージェント定義のパッケージ.
+
+公開している名前は最初に参照されたときに読み込む（エージェントSDKの読み込みを
+実際にエージェントを作成するまで遅らせる）。
+"""
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# 公開名 → 定義しているモジュール
+_EXPORTS = {
+    "create_theme_briefer_agent": "agent_definitions.theme_briefer",
+    "create_persona_generator_agent": "agent_definitions.persona_generator",
+    "create_question_designer_agent": "agent_definitions.question_designer",
+    "create_interviewer_agent": "agent_definitions.interviewer",
+    "create_question_answerer_agent": "agent_definitions.question_answerer",
+    "create_insight_extractor_agent": "agent_definitions.insight_extractor",
+    "create_hypothesis_builder_agent": "agent_definitions.hypothesis_builder",
+    "create_validation_question_designer_agent": "agent_definitions.validation_question_designer",
+    "create_question_evaluator_agent": "agent_definitions.question_evaluator",
+    "create_dimension_evaluator_agent": "agent_definitions.dimension_evaluator",
+    "create_question_mapper_agent": "agent_definitions.question_mapper",
+    "create_evaluation_synthesizer_agent": "agent_definitions.evaluation_synthesizer",
+    "create_validation_interviewer_agent": "agent_definitions.validation_interviewer",
+    "cached_agent": "agent_definitions.cache",
+    "OpenAIClientSettings": "agent_definitions.openai_client",
+    "PoolMetrics": "agent_definitions.openai_client",
+    "configure_openai_client": "agent_definitions.openai_client",
+    "pool_metrics": "agent_definitions.openai_client",
+    "shared_openai_client": "agent_definitions.openai_client",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from agent_definitions.theme_briefer import create_theme_briefer_agent
+    from agent_definitions.persona_generator import create_persona_generator_agent
+    from agent_definitions.question_designer import create_question_designer_agent
+    from agent_definitions.interviewer import create_interviewer_agent
+    from agent_definitions.question_answerer import create_question_answerer_agent
+    from agent_definitions.insight_extractor import create_insight_extractor_agent
+    from agent_definitions.hypothesis_builder import create_hypothesis_builder_agent
+    from agent_definitions.validation_question_designer import (
+        create_validation_question_designer_agent,
+    )
+    from agent_definitions.question_evaluator import create_question_evaluator_agent
+    from agent_definitions.dimension_evaluator import create_dimension_evaluator_agent
+    from agent_definitions.question_mapper import create_question_mapper_agent
+    from agent_definitions.evaluation_synthesizer import create_evaluation_synthesizer_agent
+    from agent_definitions.validation_interviewer import create_validation_interviewer_agent
+    from agent_definitions.cache import cached_agent
+    from agent_definitions.openai_client import (
+        OpenAIClientSettings,
+        PoolMetrics,
+        configure_openai_client,
+        pool_metrics,
+        shared_openai_client,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
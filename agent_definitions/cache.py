@@ -0,0 +1,16 @@
+"""エージェントの再利用."""
+from functools import lru_cache
+from typing import Callable, Hashable
+
+from agents import Agent
+
+
+@lru_cache(maxsize=None)
+def cached_agent(factory: Callable[..., Agent], *args: Hashable) -> Agent:
+    """
+    ファクトリ関数と引数の組ごとに1つだけエージェントを作成して再利用する.
+
+    エージェントは実行ごとの状態を持たないため、長時間動作するサーバーでは
+    ジョブごとに作り直さずに同じインスタンスを使い回せる。
+    """
+    return factory(*args)
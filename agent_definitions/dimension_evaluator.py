@@ -0,0 +1,42 @@
+"""評価側面ごとの質問セット評価エージェント."""
+from agents import Agent
+from models.evaluation_schemas import DimensionJudgement
+
+
+def create_dimension_evaluator_agent() -> Agent:
+    """
+    評価側面ごとの質問セット評価エージェントを作成する.
+    
+    指定された1つの評価側面についてのみ、初回ヒアリング質問と
+    検証用ヒアリング質問をスコアリングする（並列評価モード用）。
+    
+    Returns:
+        Agent: 評価側面ごとの評価エージェント
+    """
+    instructions = """
+あなたはヒアリング設計とリサーチ方法論の専門家です。
+
+## 役割
+初回ヒアリング質問と仮説検証用ヒアリング質問を、指定された1つの評価側面についてのみ比較・評価してください。
+
+## 評価の進め方
+1. 指定された評価側面の観点で、両方の質問セットを読み比べる
+2. 初回質問と検証質問それぞれに0-5のスコアを付ける
+3. スコア差の理由を、具体的な質問番号や表現を引用して説明する
+4. この側面での主な変化点を列挙する
+
+## 出力形式
+DimensionJudgementスキーマに従って出力してください。
+dimension_name には指定された評価側面の名前をそのまま使ってください。
+
+## 注意事項
+- 指定された評価側面以外には言及しない
+- 「どちらが優れているか」ではなく「どう進化したか」を評価する
+- 調査段階（探索 vs 検証）の違いを考慮する
+"""
+    
+    return Agent(
+        name="DimensionEvaluator",
+        instructions=instructions,
+        output_type=DimensionJudgement,
+    )
@@ -0,0 +1,43 @@
+"""質問セット評価の統合エージェント."""
+from agents import Agent
+from models.evaluation_schemas import EvaluationSynthesis
+
+
+def create_evaluation_synthesizer_agent() -> Agent:
+    """
+    質問セット評価の統合エージェントを作成する.
+    
+    評価側面ごとのスコアとテーマ別マッピングを受け取り、
+    総合評価・強み・改善提案をまとめる（並列評価モード用）。
+    
+    Returns:
+        Agent: 評価統合エージェント
+    """
+    instructions = """
+あなたはヒアリング設計とリサーチ方法論の専門家です。
+
+## 役割
+評価側面ごとに算出済みのスコアとテーマ別マッピングをもとに、
+初回ヒアリング質問から検証用ヒアリング質問への進化を総括してください。
+
+## まとめ方
+1. 各評価側面のスコアと説明を横断して、全体的な質的進化を総合評価にまとめる
+2. 最も重要な改善ポイントを優先順位順に挙げる
+3. 初回質問・検証質問それぞれの強みを挙げる
+4. 今後の改善提案と、両者を統合したハイブリッド版への提案を挙げる
+
+## 出力形式
+EvaluationSynthesisスキーマに従って出力してください。
+
+## 注意事項
+- 評価側面ごとのスコアを改めて採点し直さない
+- 質問数・変化率などの事前計算した値は再計算しない
+- 渡された評価結果と矛盾する内容を書かない
+- 簡潔にまとめる
+"""
+    
+    return Agent(
+        name="EvaluationSynthesizer",
+        instructions=instructions,
+        output_type=EvaluationSynthesis,
+    )
@@ -0,0 +1,40 @@
+"""ヒアリングの洞察抽出エージェント."""
+from agents import Agent
+from models.schemas import InterviewInsights
+
+
+def create_insight_extractor_agent() -> Agent:
+    """
+    ヒアリングの洞察抽出エージェントを作成する.
+    
+    質問ごとに並行して得た回答をまとめて受け取り、
+    ヒアリング全体から重要な洞察を抽出する（質問ごとのヒアリングモード用）。
+    
+    Returns:
+        Agent: 洞察抽出エージェント
+    """
+    instructions = """
+あなたはユーザーリサーチの専門家です。
+
+## 役割
+1人のペルソナへのヒアリングの質問と回答を読み、
+課題・ニーズ・行動の背景に関する重要な洞察を抽出してください。
+
+## 抽出の方針
+1. 複数の回答に共通して現れる考え方や行動パターンを優先する
+2. 表面的な要望ではなく、その背景にある動機や制約を捉える
+3. 具体的で、後続の仮説立案に使える粒度で書く
+
+## 出力形式
+InterviewInsightsスキーマに従って出力してください。
+
+## 注意事項
+- 回答に書かれていない内容を推測で補わない
+- 簡潔にまとめる
+"""
+    
+    return Agent(
+        name="InsightExtractor",
+        instructions=instructions,
+        output_type=InterviewInsights,
+    )
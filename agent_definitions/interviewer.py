@@ -3,12 +3,15 @@ from agents import Agent, WebSearchTool
 from models.schemas import InterviewResponse
 
 
-def create_interviewer_agent() -> Agent:
+def create_interviewer_agent(web_search: bool = True) -> Agent:
     """
     ヒアリング実行エージェントを作成する（Web Search統合）.
     
     ペルソナになりきって質問に回答し、Web検索で裏付けを取る。
     
+    Args:
+        web_search: Web検索ツールを使うか（False の場合は検索せずに回答する。予算を抑える場合に使う）
+    
     Returns:
         Agent: ヒアリング実行エージェント
     """
@@ -51,11 +54,17 @@ InterviewResponseスキーマに従って、構造化された回答を出力し
 - Web検索結果を自然に回答に統合する
 - 洞察は具体的で実用的なものにする
 - 回答はペルソナの背景と一貫性を保つ
+"""
+    if not web_search:
+        instructions += """
+## この実行での制約
+- Web検索は使えません。検索せずにペルソナの経験と知識だけで回答してください
+- supporting_evidence は空のリストにしてください
 """
     
     return Agent(
         name="Interviewer",
         instructions=instructions,
         output_type=InterviewResponse,
-        tools=[WebSearchTool()],  # OpenAI公式のWeb Searchツールを統合
+        tools=[WebSearchTool()] if web_search else [],  # OpenAI公式のWeb Searchツールを統合
     )
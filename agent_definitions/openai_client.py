@@ -0,0 +1,192 @@
+"""
+全エージェントで共有するOpenAIクライアント（接続プール）の設定.
+
+`configure_openai_client()` を一度呼び出すと、接続プールの大きさ・keep-alive・タイムアウトを
+設定した AsyncOpenAI クライアントがエージェントSDKのデフォルトとして登録され、
+agent_definitions/ のすべてのエージェントの呼び出しがこのクライアントの接続を使い回す。
+"""
+import importlib.util
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx2
+from agents import set_default_openai_client
+from openai import AsyncOpenAI
+
+
+@dataclass(frozen=True)
+class OpenAIClientSettings:
+    """
+    共有クライアントの接続設定.
+
+    Attributes:
+        max_connections: 同時に開く接続の上限（同時に実行するヒアリング数以上にする）
+        max_keepalive_connections: 再利用のために保持するアイドル接続の上限
+        keepalive_expiry: アイドル接続を保持する秒数（フェーズ間の待ち時間より長くする）
+        http2: HTTP/2 を使うか（h2 パッケージがない場合は HTTP/1.1 になる）
+        connect_timeout: 接続確立のタイムアウト（秒）
+        timeout: 応答全体のタイムアウト（秒）
+        max_retries: OpenAIクライアント自体の再試行回数
+    """
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 120.0
+    http2: bool = True
+    connect_timeout: float = 10.0
+    timeout: float = 600.0
+    max_retries: int = 2
+
+    def __post_init__(self):
+        if self.max_connections < 1:
+            raise ValueError("max_connections は1以上を指定してください")
+        if self.max_keepalive_connections < 0:
+            raise ValueError("max_keepalive_connections は0以上を指定してください")
+
+
+class PoolMetrics:
+    """共有クライアントのリクエスト数・新規接続数・同時リクエスト数の集計."""
+
+    def __init__(self, max_connections: int, http2: bool = False):
+        self.max_connections = max_connections
+        self.http2 = http2
+        self.requests = 0
+        self.connections_opened = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    @property
+    def reused_requests(self) -> int:
+        """既存の接続を再利用したリクエスト数."""
+        return max(0, self.requests - self.connections_opened)
+
+    @property
+    def peak_utilization(self) -> float:
+        """同時リクエスト数の最大値の、接続上限に対する割合."""
+        return self.peak_in_flight / self.max_connections
+
+    def to_dict(self) -> Dict[str, Any]:
+        """集計値を辞書で返す."""
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "reused_requests": self.reused_requests,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "max_connections": self.max_connections,
+            "peak_utilization": round(self.peak_utilization, 3),
+            "http2": self.http2,
+        }
+
+
+class MeteredTransport(httpx2.AsyncBaseTransport):
+    """リクエストと接続の確立を PoolMetrics に記録するトランスポート."""
+
+    def __init__(self, transport: httpx2.AsyncBaseTransport, metrics: PoolMetrics):
+        self._transport = transport
+        self.metrics = metrics
+
+    async def _trace(self, event: str, info: Dict[str, Any]) -> None:
+        if event.endswith("connect_tcp.complete"):
+            self.metrics.connections_opened += 1
+
+    async def handle_async_request(self, request: httpx2.Request) -> httpx2.Response:
+        request.extensions = {**request.extensions, "trace": self._trace}
+        metrics = self.metrics
+        metrics.requests += 1
+        metrics.in_flight += 1
+        metrics.peak_in_flight = max(metrics.peak_in_flight, metrics.in_flight)
+        try:
+            return await self._transport.handle_async_request(request)
+        finally:
+            metrics.in_flight -= 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def http2_available() -> bool:
+    """HTTP/2 に必要な h2 パッケージがインストールされているか."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_openai_client(
+    settings: OpenAIClientSettings,
+    metrics: Optional[PoolMetrics] = None,
+    base_url: Optional[str] = None,
+    api_key: Optional[str] = None,
+) -> AsyncOpenAI:
+    """
+    設定した接続プールを使う AsyncOpenAI クライアントを作成する.
+
+    base_url と api_key を省略した場合は OpenAI クライアントのデフォルト（環境変数）に従う。
+    """
+    use_http2 = settings.http2 and http2_available()
+    if metrics is None:
+        metrics = PoolMetrics(settings.max_connections, http2=use_http2)
+    transport = httpx2.AsyncHTTPTransport(
+        http2=use_http2,
+        limits=httpx2.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+    )
+    timeout = httpx2.Timeout(settings.timeout, connect=settings.connect_timeout)
+    http_client = httpx2.AsyncClient(
+        transport=MeteredTransport(transport, metrics),
+        timeout=timeout,
+        follow_redirects=True,
+    )
+    kwargs: Dict[str, Any] = {}
+    if base_url is not None:
+        kwargs["base_url"] = base_url
+    if api_key is not None:
+        kwargs["api_key"] = api_key
+    return AsyncOpenAI(
+        http_client=http_client,
+        timeout=timeout,
+        max_retries=settings.max_retries,
+        **kwargs,
+    )
+
+
+_installed_metrics: Optional[PoolMetrics] = None
+_installed_client: Optional[AsyncOpenAI] = None
+
+
+def configure_openai_client(
+    settings: Optional[OpenAIClientSettings] = None,
+    base_url: Optional[str] = None,
+    api_key: Optional[str] = None,
+    replace: bool = False,
+) -> PoolMetrics:
+    """
+    共有クライアントを作成し、エージェントSDKのデフォルトクライアントとして登録する.
+
+    プロセス内で一度だけ登録し、2回目以降は登録済みのクライアントの集計を返す
+    （replace=True の場合は作り直す）。
+
+    Returns:
+        PoolMetrics: 共有クライアントの接続プールの集計
+    """
+    global _installed_metrics, _installed_client
+    if _installed_metrics is not None and not replace:
+        return _installed_metrics
+    settings = settings or OpenAIClientSettings()
+    metrics = PoolMetrics(settings.max_connections, http2=settings.http2 and http2_available())
+    client = create_openai_client(settings, metrics, base_url=base_url, api_key=api_key)
+    set_default_openai_client(client)
+    _installed_metrics = metrics
+    _installed_client = client
+    return metrics
+
+
+def pool_metrics() -> Optional[PoolMetrics]:
+    """登録済みの共有クライアントの集計（未登録なら None）."""
+    return _installed_metrics
+
+
+def shared_openai_client() -> Optional[AsyncOpenAI]:
+    """configure_openai_client で登録した共有クライアント（未登録なら None）."""
+    return _installed_client
@@ -0,0 +1,59 @@
+"""質問ごとの回答エージェント（Web Search統合）."""
+from agents import Agent, WebSearchTool
+from models.schemas import QuestionGroupAnswers
+
+
+def create_question_answerer_agent(web_search: bool = True) -> Agent:
+    """
+    質問ごとの回答エージェントを作成する（Web Search統合）.
+    
+    ペルソナになりきって、割り当てられた一部の質問にだけ回答する
+    （質問ごとのヒアリングモード用。洞察の抽出は行わない）。
+    
+    Args:
+        web_search: Web検索ツールを使うか
+    
+    Returns:
+        Agent: 質問ごとの回答エージェント
+    """
+    instructions = """
+あなたは指定されたペルソナになりきり、割り当てられた質問に回答する役割を担います。
+同じペルソナへの他の質問は別の担当者が並行して回答します。
+
+## 役割
+1. **ペルソナへの没入**
+   - 与えられたペルソナの背景、属性、行動パターンを深く理解する
+   - そのペルソナとして自然な回答をする
+   - ペルソナの価値観や考え方を反映する
+
+2. **リアルな回答の提供**
+   - 具体的なエピソードや経験を語る
+   - 感情や思考プロセスを含める
+   - ペルソナ情報と矛盾しない人物像を維持する
+
+3. **Web検索による裏付け**
+   - 回答内容が現実的かどうかをWeb検索で確認する
+   - 検索結果を「supporting_evidence」として記録する
+
+## 出力形式
+QuestionGroupAnswersスキーマに従って出力してください。
+- answers には割り当てられた質問と同じ数・同じ順序で回答を入れる
+
+## 注意事項
+- 割り当てられた質問以外には回答しない
+- 洞察のまとめや要約は書かない（別の担当者が行う）
+- ペルソナから外れない
+"""
+    if not web_search:
+        instructions += """
+## この実行での制約
+- Web検索は使えません。検索せずにペルソナの経験と知識だけで回答してください
+- supporting_evidence は空のリストにしてください
+"""
+    
+    return Agent(
+        name="QuestionAnswerer",
+        instructions=instructions,
+        output_type=QuestionGroupAnswers,
+        tools=[WebSearchTool()] if web_search else [],
+    )
@@ -1,8 +1,19 @@
 """質問セット評価エージェント."""
 from agents import Agent
-from models.evaluation_schemas import EvaluationReport
+from models.evaluation_schemas import EvaluationJudgement
 
 
+# 評価する7つの側面（名前, 評価の観点）
+EVALUATION_DIMENSIONS = [
+    ("仮説との紐付けの明確さ", "検証質問は各質問が仮説と明確に対応しているか"),
+    ("反証可能性", "仮説の棄却を可能にする設計になっているか"),
+    ("中立性への配慮", "特定ソリューションへの誘導がないか"),
+    ("質問の具体性", "具体的なケースや実例を求める表現の度合い"),
+    ("深さ・掘り下げ", "単一質問での深掘り度合い"),
+    ("観点の幅", "複数のステークホルダー・課題領域をカバーしているか"),
+    ("実用性", "実施可能性と時間効率"),
+]
+
 def create_question_evaluator_agent() -> Agent:
     """
     質問セット評価エージェントを作成する.
@@ -67,7 +78,7 @@ def create_question_evaluator_agent() -> Agent:
 ## 比較分析の構造
 
 ### Step1: 基本情報の整理
-- 質問数の変化
+- 質問数の変化（事前計算した値を使う）
 - 設計哲学の明記の有無
 - 目的・戦略の記載
 
@@ -82,9 +93,9 @@ def create_question_evaluator_agent() -> Agent:
 - 改善ポイントの特定
 
 ### Step4: テーマ別マッピング
-- 共通テーマの抽出
-- 各テーマの深化度評価
-- 新規追加されたテーマの特定
+- 事前に対応付けたトピックごとに、トピック名を付ける
+- 各トピックの深化度評価
+- 新しいトピック（初回質問なし）の意義
 
 ### Step5: 総合評価
 - 全体的な質的進化
@@ -107,8 +118,14 @@ def create_question_evaluator_agent() -> Agent:
 - 複数回ヒアリングへの分割方法
 - 時間制約への対応
 
+## 事前計算した値
+質問数・変化率・トピックの対応付け（質問番号）・質問文の字句的な指標は、
+プロンプトの「事前計算した比較」に確定値として記載されています。
+これらを再計算したり出力したりせず、評価の根拠として使ってください。
+トピックの評価は、事前計算したトピックの番号（topic_number）で対応させてください。
+
 ## 出力形式
-EvaluationReportスキーマに従って、構造化された評価レポートを出力してください。
+EvaluationJudgementスキーマに従って、構造化された評価を出力してください。
 
 ## 特に注力すべき点
 1. **数値化**：各評価項目を0-5のスコアで定量化
@@ -127,5 +144,5 @@ EvaluationReportスキーマに従って、構造化された評価レポート
     return Agent(
         name="QuestionEvaluator",
         instructions=instructions,
-        output_type=EvaluationReport,
+        output_type=EvaluationJudgement,
     )
@@ -0,0 +1,41 @@
+"""質問セットのテーマ別マッピングエージェント."""
+from agents import Agent
+from models.evaluation_schemas import TopicAssessmentsOutput
+
+
+def create_question_mapper_agent() -> Agent:
+    """
+    質問セットのテーマ別マッピングエージェントを作成する.
+    
+    質問文の類似度で事前に対応付けた初回ヒアリング質問と検証用ヒアリング質問の
+    トピックごとに、名前と深化度を評価する（並列評価モード用）。
+    
+    Returns:
+        Agent: テーマ別マッピングエージェント
+    """
+    instructions = """
+あなたはヒアリング設計とリサーチ方法論の専門家です。
+
+## 役割
+初回ヒアリング質問と仮説検証用ヒアリング質問は、プロンプトの「事前計算した比較」で
+トピックごとに対応付け済みです。各トピックを評価してください。
+
+## 評価の進め方
+1. 各トピックに含まれる質問から、トピックを表す簡潔な名前を付ける
+2. 各トピックの深化度を「同等」「やや向上」「明確な向上」「大幅な向上」「劇的な向上」から選ぶ
+3. 初回質問のない新しいトピックは、検証で加わった意義を踏まえて評価する
+4. 各トピックについて簡潔な分析コメントを書く
+
+## 出力形式
+TopicAssessmentsOutputスキーマに従って出力してください。
+
+## 注意事項
+- topic_number には事前計算したトピックの番号（1始まり）を使う
+- 質問の対応付けは変更しない
+"""
+    
+    return Agent(
+        name="QuestionMapper",
+        instructions=instructions,
+        output_type=TopicAssessmentsOutput,
+    )
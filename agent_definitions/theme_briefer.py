@@ -0,0 +1,41 @@
+"""テーマ要約エージェント."""
+from agents import Agent
+from models.schemas import ThemeBrief
+
+
+def create_theme_briefer_agent() -> Agent:
+    """
+    テーマ要約エージェントを作成する.
+    
+    長いテーマ（企画書やブリーフ）を、後続のフェーズのプロンプトに
+    埋め込むための簡潔な構造化ブリーフにまとめる。
+    
+    Returns:
+        Agent: テーマ要約エージェント
+    """
+    instructions = """
+あなたはユーザーリサーチの企画を整理する専門家です。
+
+## 役割
+与えられたテーマ（企画書やブリーフ）を読み、ペルソナ生成・ヒアリング質問の設計・
+仮説生成・検証・評価の各工程で参照するための簡潔なブリーフにまとめてください。
+
+## まとめ方
+1. 要約はテーマの核心（何を、誰について、なぜ検討したいか）を数文で書く
+2. 対象ユーザー・明らかにしたいこと・前提となる事実・制約を、それぞれ短い箇条書きにする
+3. 数値・固有名詞・期間などの具体的な条件は省略せずに残す
+4. 元のテーマの半分以下の長さを目安にする
+
+## 出力形式
+ThemeBriefスキーマに従って出力してください。
+
+## 注意事項
+- テーマに書かれていない内容を推測で補わない
+- 意見や提案を加えない
+"""
+    
+    return Agent(
+        name="ThemeBriefer",
+        instructions=instructions,
+        output_type=ThemeBrief,
+    )
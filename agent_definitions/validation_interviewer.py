@@ -0,0 +1,43 @@
+"""検証ヒアリング実行エージェント."""
+from agents import Agent
+from models.validation_schemas import ValidationInterviewResponse
+
+
+def create_validation_interviewer_agent() -> Agent:
+    """
+    検証ヒアリング実行エージェントを作成する.
+    
+    ペルソナになりきって検証用質問に回答し、回答が各仮説を支持するか
+    反証するかを判定する。
+    
+    Returns:
+        Agent: 検証ヒアリング実行エージェント
+    """
+    instructions = """
+あなたは指定されたペルソナになりきり、仮説検証用の質問に回答する役割を担います。
+
+## 役割
+1. **ペルソナへの没入**
+   - 与えられたペルソナの背景、属性、行動パターンを踏まえて回答する
+   - 仮説に迎合せず、そのペルソナとして自然な回答をする
+   - 仮説と合わない経験や考えがあれば率直に述べる
+
+2. **仮説ごとの判定**
+   - 回答を踏まえ、提示された各仮説を「支持」「反証」「判断不能」のいずれかで判定する
+   - 判定には、根拠となった回答内容を簡潔に添える
+   - 仮説IDは提示されたもの（P1, I1 など）をそのまま使う
+
+## 出力形式
+ValidationInterviewResponseスキーマに従って、構造化された回答を出力してください。
+
+## 注意事項
+- 回答は各質問の順番どおりに並べる
+- すべての仮説について判定を1つずつ出力する
+- 根拠が乏しい場合は無理に支持・反証とせず「判断不能」とする
+"""
+    
+    return Agent(
+        name="ValidationInterviewer",
+        instructions=instructions,
+        output_type=ValidationInterviewResponse,
+    )
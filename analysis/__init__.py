@@ -0,0 +1,41 @@
+"""LLMを使わないローカル分析のパッケージ."""
+from analysis.text_similarity import (
+    normalize_text,
+    char_ngrams,
+    cosine_similarity,
+    NgramIndex,
+    NgramSearchIndex,
+)
+from analysis.saturation import SaturationTracker
+from analysis.insight_clustering import InsightCluster, cluster_insights
+from analysis.question_metrics import (
+    QuestionSetFacts,
+    QuestionTopic,
+    compare_question_sets,
+    map_question_topics,
+    question_set_metrics,
+)
+from analysis.persona_diversity import (
+    PersonaDiversity,
+    PersonaDiversityTooLow,
+    analyze_persona_diversity,
+)
+
+__all__ = [
+    "normalize_text",
+    "char_ngrams",
+    "cosine_similarity",
+    "NgramIndex",
+    "NgramSearchIndex",
+    "SaturationTracker",
+    "InsightCluster",
+    "cluster_insights",
+    "QuestionSetFacts",
+    "QuestionTopic",
+    "compare_question_sets",
+    "map_question_topics",
+    "question_set_metrics",
+    "PersonaDiversity",
+    "PersonaDiversityTooLow",
+    "analyze_persona_diversity",
+]
@@ -0,0 +1,274 @@
+"""
+ヒアリング結果の洞察のクラスタリング.
+
+すべてのヒアリングの key_insights を、文字n-gramをハッシュした TF-IDF ベクトルの
+コサイン類似度でまとめる。洞察は一定件数ずつまとめて、既存のクラスタの重心との
+類似度がしきい値以上なら最も近いクラスタに加え、そうでなければ新しいクラスタを作る
+（先に現れた洞察ほどクラスタの核になる）。n-gramの出現回数は疎な形式で持ち、
+密なベクトルはまとまりごとに作って捨てる。比較するクラスタの数にも上限を設け、
+超えた場合は洞察の少ない古いクラスタを比較の対象から外すため、10万件の洞察でも
+計算量とメモリ使用量は洞察の数に比例する程度に収まる。
+"""
+from dataclasses import dataclass
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from analysis.vectorize import hashed_ngram_counts, normalize_rows
+from models.schemas import InterviewResponse
+
+
+# n-gramをハッシュする次元数と、使うn-gramの文字数
+_DIM = 1024
+_NGRAM_SIZES = (2, 3)
+# 一度にベクトルにして割り当てる洞察の数
+_BATCH = 512
+# 新しい洞察と比較するクラスタの数の上限（超えたら 3/4 まで減らす）
+_MAX_ACTIVE_CLUSTERS = 1024
+
+
+@dataclass(frozen=True)
+class InsightCluster:
+    """
+    似た洞察のまとまり.
+
+    Attributes:
+        size: 洞察の数
+        representatives: 重心に近い順の代表的な洞察（重複を除く）
+        personas: 洞察を述べたペルソナ（ヒアリング順）
+    """
+
+    size: int
+    representatives: List[str]
+    personas: List[str]
+
+
+def _batches(count: int) -> Iterator[slice]:
+    for start in range(0, count, _BATCH):
+        yield slice(start, min(start + _BATCH, count))
+
+
+def _sparse_counts(texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    まとまりの文字n-gramの出現回数（疎な形式）.
+
+    Returns:
+        (行の番号 × 次元数 + 次元 の昇順の配列, その出現回数)
+    """
+    rows, buckets = hashed_ngram_counts(texts, _DIM, _NGRAM_SIZES)
+    counts = np.bincount(rows * _DIM + buckets, minlength=len(texts) * _DIM)
+    keys = np.flatnonzero(counts)
+    return keys, counts[keys]
+
+
+def _tfidf(keys: np.ndarray, counts: np.ndarray, rows: int, idf: np.ndarray) -> np.ndarray:
+    """対数をとった出現回数 × IDF を、行ごとに長さ1に正規化した値（keys に対応する疎な形式）."""
+    owners = keys // _DIM
+    values = np.log1p(counts).astype(np.float32) * idf[keys % _DIM]
+    norms = np.sqrt(np.bincount(owners, weights=np.square(values), minlength=rows)).astype(np.float32)
+    return values / norms[owners]
+
+
+def _dense(keys: np.ndarray, values: np.ndarray, rows: int) -> np.ndarray:
+    matrix = np.zeros(rows * _DIM, dtype=np.float32)
+    matrix[keys] = values
+    return matrix.reshape(rows, _DIM)
+
+
+class _Centroids:
+    """
+    クラスタの重心.
+
+    新しい洞察と比較するクラスタ（最大 _MAX_ACTIVE_CLUSTERS）の重心だけを固定の大きさの
+    行列で持ち、比較の対象から外したクラスタの重心は0でない要素だけを残して保管する。
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+        capacity = _MAX_ACTIVE_CLUSTERS + _BATCH
+        # 行列の各行のクラスタの番号（空いている行は -1）と、その重心（ベクトルの和と、和を正規化した重心）
+        self.labels = np.full(capacity, -1, dtype=np.int64)
+        self.sums = np.zeros((capacity, _DIM), dtype=np.float32)
+        self.unit = np.zeros((capacity, _DIM), dtype=np.float32)
+        # 使ったことのある行の数（空いている行は先頭から使う）
+        self._rows = 0
+        # クラスタの番号 → 行列の行（比較の対象外なら -1）
+        self._slots = np.zeros(0, dtype=np.int64)
+        self._archived_keys: List[np.ndarray] = []
+        self._archived_values: List[np.ndarray] = []
+
+    def nearest(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        比較の対象のクラスタのうち最も近いものと、その類似度.
+
+        空いている行の重心は0なので、類似度が0より大きければ比較の対象のクラスタになる。
+        """
+        if not self._rows:
+            return np.full(len(vectors), -1, dtype=np.int64), np.zeros(len(vectors), dtype=np.float32)
+        similarity = vectors @ self.unit[:self._rows].T
+        best = similarity.argmax(axis=1)
+        return self.labels[best], similarity[np.arange(len(vectors)), best]
+
+    def add(self, labels: np.ndarray, keys: np.ndarray, values: np.ndarray, size: int) -> None:
+        """
+        labels のクラスタにまとまりのベクトルを加え、重心を更新する.
+
+        Args:
+            labels: まとまりの洞察ごとのクラスタ（比較の対象のクラスタか新しいクラスタ）
+            keys, values: まとまりのベクトル（疎な形式）
+            size: 新しいクラスタを含むクラスタの数
+        """
+        added = np.arange(self.size, size)
+        free = np.flatnonzero(self.labels < 0)[:len(added)]
+        self.labels[free] = added
+        if len(free):
+            self._rows = max(self._rows, int(free[-1]) + 1)
+        self.counts = np.concatenate([self.counts, np.zeros(len(added), dtype=np.int64)])
+        self._slots = np.concatenate([self._slots, free])
+        self.size = size
+
+        touched, inverse = np.unique(labels, return_inverse=True)
+        self.counts[touched] += np.bincount(inverse)
+        # 疎なベクトルのまま、加えるクラスタごとに和を求める
+        sums = np.bincount(
+            inverse[keys // _DIM] * _DIM + keys % _DIM, weights=values, minlength=len(touched) * _DIM,
+        )
+        slots = self._slots[touched]
+        self.sums[slots] += sums.reshape(len(touched), _DIM).astype(np.float32)
+        self.unit[slots] = normalize_rows(self.sums[slots].copy())
+
+        occupied = np.flatnonzero(self.labels >= 0)
+        if len(occupied) > _MAX_ACTIVE_CLUSTERS:
+            # 洞察の少ないクラスタから、同じ数なら古いクラスタから比較の対象を外す
+            active = self.labels[occupied]
+            order = np.lexsort((-active, -self.counts[active]))
+            self._retire(occupied[order[_MAX_ACTIVE_CLUSTERS * 3 // 4:]])
+
+    def _retire(self, slots: np.ndarray) -> None:
+        """slots の行のクラスタを比較の対象から外し、重心を保管する."""
+        rows, columns = np.nonzero(self.unit[slots])
+        self._archived_keys.append(self.labels[slots][rows] * _DIM + columns)
+        self._archived_values.append(self.unit[slots][rows, columns])
+        self._slots[self.labels[slots]] = -1
+        self.labels[slots] = -1
+        self.sums[slots] = 0.0
+        self.unit[slots] = 0.0
+
+    def finish(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        すべてのクラスタの重心（疎な形式）.
+
+        Returns:
+            (クラスタの番号 × 次元数 + 次元 の昇順の配列, 重心のその要素の値)
+        """
+        self._retire(np.flatnonzero(self.labels >= 0))
+        keys = np.concatenate(self._archived_keys)
+        values = np.concatenate(self._archived_values)
+        order = np.argsort(keys)
+        return keys[order], values[order]
+
+
+def cluster_insights(
+    interviews: Sequence[InterviewResponse],
+    threshold: float = 0.45,
+    representatives: int = 3,
+) -> List[InsightCluster]:
+    """
+    ヒアリング結果の洞察をクラスタにまとめる.
+
+    クラスタは、洞察を述べたペルソナの数が多い順（同じなら洞察の数が多い順）に並べる。
+
+    Args:
+        interviews: ヒアリング結果
+        threshold: 既存のクラスタに加える、重心とのコサイン類似度の下限（0-1）
+        representatives: クラスタごとに返す代表的な洞察の数
+    """
+    if not 0 < threshold <= 1:
+        raise ValueError("threshold は0より大きく1以下を指定してください")
+    texts: List[str] = []
+    owners: List[int] = []
+    names: List[str] = []
+    for index, interview in enumerate(interviews):
+        names.append(interview.persona_name)
+        for insight in interview.key_insights:
+            if insight.strip():
+                texts.append(insight)
+                owners.append(index)
+    if not texts:
+        return []
+
+    # n-gramの数え上げは一度だけ行い、疎な形式で持っておく
+    batches = [(batch, *_sparse_counts(texts[batch])) for batch in _batches(len(texts))]
+    df = np.zeros(_DIM, dtype=np.int64)
+    for _, keys, _ in batches:
+        df += np.bincount(keys % _DIM, minlength=_DIM)
+    idf = (np.log((1 + len(texts)) / (1 + df)) + 1).astype(np.float32)
+
+    centroids = _Centroids()
+    size = 0
+    labels = np.empty(len(texts), dtype=np.int64)
+    for batch, keys, counts in batches:
+        values = _tfidf(keys, counts, batch.stop - batch.start, idf)
+        vectors = _dense(keys, values, batch.stop - batch.start)
+        batch_labels, similarity = centroids.nearest(vectors)
+        batch_labels[similarity < threshold] = -1
+        # どのクラスタにも近くない洞察は、まとまりの中で先に現れたものを核に新しいクラスタにする
+        pending = np.flatnonzero(batch_labels < 0)
+        if len(pending):
+            neighbors = vectors[pending] @ vectors[pending].T >= threshold
+            np.fill_diagonal(neighbors, False)
+            unassigned = np.ones(len(pending), dtype=bool)
+            for position in np.flatnonzero(neighbors.any(axis=1)):
+                if not unassigned[position]:
+                    continue
+                members = unassigned & neighbors[position]
+                members[position] = True
+                batch_labels[pending[members]] = size
+                unassigned &= ~members
+                size += 1
+            # 近い洞察のない洞察は1件だけのクラスタにする
+            singles = pending[unassigned]
+            batch_labels[singles] = np.arange(size, size + len(singles))
+            size += len(singles)
+        centroids.add(batch_labels, keys, values, size)
+        labels[batch] = batch_labels
+
+    # 重心に近い洞察ほど代表的とする
+    centroid_keys, centroid_values = centroids.finish()
+    closeness = np.zeros(len(texts), dtype=np.float32)
+    for batch, keys, counts in batches if len(centroid_keys) else ():
+        values = _tfidf(keys, counts, batch.stop - batch.start, idf)
+        owners_in_batch = keys // _DIM
+        lookup = labels[batch][owners_in_batch] * _DIM + keys % _DIM
+        positions = np.minimum(np.searchsorted(centroid_keys, lookup), len(centroid_keys) - 1)
+        weights = np.where(centroid_keys[positions] == lookup, centroid_values[positions], 0.0) * values
+        closeness[batch] = np.bincount(owners_in_batch, weights=weights, minlength=batch.stop - batch.start)
+
+    owners_array = np.asarray(owners, dtype=np.int64)
+    sizes = np.bincount(labels, minlength=size)
+    # クラスタとペルソナの組（重複を除く）から、クラスタごとのペルソナ数を数える
+    pairs = np.unique(labels * len(names) + owners_array)
+    pair_labels, pair_owners = np.divmod(pairs, len(names))
+    persona_counts = np.bincount(pair_labels, minlength=size)
+    cluster_order = np.lexsort((-sizes, -persona_counts))
+    member_order = np.lexsort((-closeness, labels))
+    member_starts = np.searchsorted(labels[member_order], np.arange(size))
+    persona_starts = np.searchsorted(pair_labels, np.arange(size))
+
+    clusters = []
+    for label in cluster_order:
+        chosen: List[str] = []
+        for position in member_order[member_starts[label]:member_starts[label] + sizes[label]]:
+            text = texts[position]
+            if text not in chosen:
+                chosen.append(text)
+                if len(chosen) >= representatives:
+                    break
+        owners_of_label = pair_owners[persona_starts[label]:persona_starts[label] + persona_counts[label]]
+        clusters.append(InsightCluster(
+            size=int(sizes[label]),
+            representatives=chosen,
+            personas=[names[owner] for owner in owners_of_label],
+        ))
+    return clusters
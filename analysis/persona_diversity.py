@@ -0,0 +1,312 @@
+"""
+ペルソナの多様性の分析.
+
+ペルソナ生成エージェントには年齢・職業・考え方を分散させるよう指示しているが、
+実際には似たペルソナに偏ることがある。ここでは生成されたペルソナについて、
+年齢層・職業の分類・不満のテーマの網羅率と、ペルソナ同士の類似度を NumPy で計算する。
+プロフィールの類似度は文字bigramを固定の次元にハッシュしたベクトルのコサイン類似度で、
+平均類似度は全ペアの行列を作らずに求めるため、数千名のペルソナでも短時間で終わる。
+"""
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from analysis.text_similarity import normalize_text
+from analysis.vectorize import hashed_ngram_matrix, normalize_rows
+from models.run_report import PersonaDiversityReport, SimilarPersonaPair
+from models.schemas import PersonaOutput
+
+
+# 年齢層（下限の年齢, 表示名）
+AGE_BANDS = (
+    (0, "〜19歳"),
+    (20, "20代"),
+    (30, "30代"),
+    (40, "40代"),
+    (50, "50代"),
+    (60, "60歳以上"),
+)
+
+# 職業の分類（職業に含まれる語で判定し、先に一致した分類を使う。ラテン文字の語は単語単位で判定する）
+OCCUPATION_FAMILIES = {
+    "学生": ("学生", "大学院生", "高校生", "専門学校"),
+    "主婦・主夫": ("主婦", "主夫", "専業"),
+    "退職・求職中": ("退職", "無職", "年金", "求職"),
+    "医療・福祉": ("医師", "看護", "薬剤", "介護", "保育", "福祉", "医療", "療法士"),
+    "教育": ("教師", "教員", "講師", "教授", "塾"),
+    "IT・技術": ("エンジニア", "プログラマ", "開発", "it", "データ"),
+    "クリエイティブ": ("デザイナー", "ライター", "編集", "クリエイター", "カメラマン", "マーケ"),
+    "経営・自営": ("経営", "社長", "自営", "起業", "フリーランス", "個人事業", "オーナー"),
+    "専門職・公務員": ("公務員", "弁護士", "会計士", "税理士", "コンサル", "研究"),
+    "営業・販売・接客": ("営業", "販売", "店員", "接客", "店長", "飲食"),
+    "製造・建設・物流": ("製造", "工場", "建設", "職人", "ドライバー", "運転", "物流", "配送", "農"),
+    "事務・管理": ("事務", "経理", "人事", "総務", "管理職", "マネージャー", "会社員", "秘書"),
+}
+
+# 不満のテーマ（pain_points に含まれる語で判定する。1名が複数のテーマに当てはまる）
+PAIN_POINT_THEMES = {
+    "時間・手間": ("時間", "忙し", "手間", "面倒", "待ち", "遅"),
+    "費用": ("費用", "コスト", "料金", "価格", "高い", "お金", "出費", "予算"),
+    "使いやすさ": ("使い", "操作", "わかりにく", "分かりにく", "複雑", "設定"),
+    "情報・比較": ("情報", "探", "比較", "見つから", "知らな"),
+    "人間関係・連携": ("家族", "夫", "妻", "同僚", "上司", "コミュニケーション", "相談", "共有", "連絡"),
+    "心身の負担": ("ストレス", "不安", "疲", "健康", "負担", "睡眠"),
+    "信頼・安全": ("セキュリティ", "個人情報", "プライバシー", "信頼", "安全", "詐欺"),
+    "継続・習慣": ("続か", "習慣", "忘れ", "モチベーション"),
+}
+
+# 分類できなかったペルソナの表示名（網羅率の計算には含めない）
+UNCLASSIFIED = "その他"
+
+# 網羅率を計算する側面（識別子 → 表示名）
+DIMENSIONS = {
+    "age": "年齢層",
+    "occupation": "職業",
+    "pain_points": "不満のテーマ",
+}
+
+# ペア間の類似度に占める各要素の重み（プロフィール・年齢・職業の分類）
+SIMILARITY_WEIGHTS = (0.6, 0.2, 0.2)
+
+# この類似度以上のペアをほぼ同じペルソナとみなす
+NEAR_DUPLICATE_SIMILARITY = 0.85
+
+# プロフィールの文字bigramをハッシュする次元数
+_PROFILE_DIM = 512
+# 年齢の類似度の計算で使う年齢の範囲（この範囲に丸め、差を範囲の幅で割る）
+_AGE_RANGE = (15, 75)
+# ペアの類似度を何行ずつまとめて計算するか（メモリ使用量の上限）
+_BLOCK_ROWS = 512
+
+
+class PersonaDiversityTooLow(Exception):
+    """ペルソナの多様性スコアが下限を下回ったため、ヒアリングを行わなかった."""
+
+    def __init__(self, report: PersonaDiversityReport):
+        super().__init__(
+            f"ペルソナの多様性スコア {report.score:.2f} が下限 {report.min_score:.2f} を下回りました"
+        )
+        self.report = report
+
+
+def _profile_text(persona: PersonaOutput) -> str:
+    return " ".join([
+        persona.occupation,
+        persona.background,
+        *persona.needs,
+        *persona.pain_points,
+        *persona.behaviors,
+    ])
+
+
+def _contains_keyword(text: str, keyword: str) -> bool:
+    if keyword.isascii():
+        # "it" が "editor" や "recruiter" の一部に一致しないよう、前後がラテン文字でない場合だけ一致させる
+        return re.search(rf"(?<![a-z]){re.escape(keyword)}(?![a-z])", text) is not None
+    return keyword in text
+
+
+def _classify(text: str, families: Dict[str, Tuple[str, ...]]) -> str:
+    for family, keywords in families.items():
+        if any(_contains_keyword(text, keyword) for keyword in keywords):
+            return family
+    return UNCLASSIFIED
+
+
+class PersonaDiversity:
+    """
+    ペルソナの集合の多様性.
+
+    Args:
+        personas: 分析するペルソナ
+    """
+
+    def __init__(self, personas: Sequence[PersonaOutput]):
+        self.names = [persona.name for persona in personas]
+        self.ages = np.array([persona.age for persona in personas], dtype=np.float32)
+        band_starts = np.array([start for start, _ in AGE_BANDS[1:]])
+        self.age_bands = np.digitize(self.ages, band_starts)
+        # 単語の区切りで判定できるよう、職業は空白を残したまま全角・半角と大文字・小文字だけをそろえる
+        occupations = [unicodedata.normalize("NFKC", persona.occupation).lower() for persona in personas]
+        family_names = list(OCCUPATION_FAMILIES)
+        family_index = {family: i for i, family in enumerate(family_names)}
+        # 分類できなかったペルソナは -1
+        self.occupation_families = np.array(
+            [family_index.get(_classify(occupation, OCCUPATION_FAMILIES), -1) for occupation in occupations],
+            dtype=np.int64,
+        )
+        pain_texts = [normalize_text(" ".join(persona.pain_points)) for persona in personas]
+        self.pain_themes = np.array(
+            [[any(keyword in text for keyword in keywords) for keywords in PAIN_POINT_THEMES.values()]
+             for text in pain_texts],
+            dtype=bool,
+        ).reshape(len(personas), len(PAIN_POINT_THEMES))
+        self.profiles = normalize_rows(
+            hashed_ngram_matrix([_profile_text(persona) for persona in personas], _PROFILE_DIM)
+        )
+        low, high = _AGE_RANGE
+        self._scaled_ages = ((np.clip(self.ages, low, high) - low) / (high - low)).astype(np.float32)
+        # 内積がプロフィールと職業の分類の類似度の重み付き和になる特徴量
+        profile_weight, _, occupation_weight = SIMILARITY_WEIGHTS
+        families = np.zeros((len(personas), len(OCCUPATION_FAMILIES)), dtype=np.float32)
+        classified = np.flatnonzero(self.occupation_families >= 0)
+        families[classified, self.occupation_families[classified]] = np.sqrt(occupation_weight)
+        self._features = np.hstack([np.sqrt(profile_weight, dtype=np.float32) * self.profiles, families])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def profile_similarity_matrix(self, rows: slice = slice(None)) -> np.ndarray:
+        """プロフィール（職業・背景・ニーズ・不満・行動）のコサイン類似度の行列."""
+        return self.profiles[rows] @ self.profiles.T
+
+    def age_similarity_matrix(self, rows: slice = slice(None)) -> np.ndarray:
+        """年齢の近さ（1 - 年齢差 / 年齢の範囲の幅）の行列."""
+        return 1.0 - np.abs(self._scaled_ages[rows, None] - self._scaled_ages[None, :])
+
+    def occupation_matrix(self, rows: slice = slice(None)) -> np.ndarray:
+        """職業の分類が同じか（分類できなかったペルソナ同士は同じとみなさない）の行列."""
+        families = self.occupation_families
+        return (families[rows, None] == families[None, :]) & (families[rows, None] >= 0)
+
+    def similarity_matrix(self, rows: slice = slice(None), columns: slice = slice(None)) -> np.ndarray:
+        """プロフィール・年齢・職業の分類の類似度の重み付き和の行列（0-1）."""
+        age_weight = SIMILARITY_WEIGHTS[1]
+        matrix = self._features[rows] @ self._features[columns].T
+        age_gap = np.subtract.outer(self._scaled_ages[rows], self._scaled_ages[columns])
+        np.abs(age_gap, out=age_gap)
+        age_gap *= age_weight
+        matrix -= age_gap
+        matrix += age_weight
+        return matrix
+
+    def mean_similarity(self) -> float:
+        """
+        異なるペルソナのペアの類似度の平均.
+
+        行列を作らずに、各要素のペアの和を O(n) で求める。
+        """
+        n = len(self)
+        if n < 2:
+            return 0.0
+        pairs = n * (n - 1)
+        total = self.profiles.sum(axis=0, dtype=np.float64)
+        profile = (total @ total - np.square(self.profiles, dtype=np.float64).sum()) / pairs
+        # 年齢差の全ペアの和（昇順に並べた k 番目の値は 2k - n + 1 回足される）
+        ages = np.sort(self._scaled_ages.astype(np.float64))
+        age = 1.0 - 2.0 * (ages @ (2 * np.arange(n) - n + 1)) / pairs
+        families = self.occupation_families[self.occupation_families >= 0]
+        counts = np.bincount(families, minlength=len(OCCUPATION_FAMILIES)).astype(np.float64)
+        occupation = (counts @ (counts - 1)) / pairs
+        profile_weight, age_weight, occupation_weight = SIMILARITY_WEIGHTS
+        return float(profile_weight * profile + age_weight * age + occupation_weight * occupation)
+
+    def similar_pairs(
+        self,
+        limit: int = 5,
+        min_similarity: float = NEAR_DUPLICATE_SIMILARITY,
+    ) -> Tuple[List[Tuple[int, int, float]], int]:
+        """
+        類似度の高いペアと、min_similarity 以上のペアの数.
+
+        行列は _BLOCK_ROWS 行ずつ計算するため、ペルソナが多くてもメモリは全体の行列の分を使わない。
+
+        Returns:
+            (類似度の高い順の最大 limit 件の (番号, 番号, 類似度), min_similarity 以上のペアの数)
+        """
+        n = len(self)
+        best: List[Tuple[int, int, float]] = []
+        above = 0
+        for start in range(0, n, _BLOCK_ROWS):
+            stop = min(start + _BLOCK_ROWS, n)
+            # 同じペアを二度数えないよう、この行より右の列だけを計算し、対角線とその左下を除く
+            block = self.similarity_matrix(slice(start, stop), slice(start, n))
+            block[np.tril_indices(stop - start, m=n - start)] = -np.inf
+            above += int(np.count_nonzero(block >= min_similarity))
+            if limit <= 0:
+                continue
+            # これまでの上位 limit 件より類似度が高いペアだけを候補にする
+            floor = best[-1][2] if len(best) >= limit else -np.inf
+            rows, columns = np.nonzero(block > floor)
+            values = block[rows, columns]
+            if len(values) > limit:
+                top = np.argpartition(values, -limit)[-limit:]
+                rows, columns, values = rows[top], columns[top], values[top]
+            best.extend(
+                (start + int(row), start + int(column), float(value))
+                for row, column, value in zip(rows, columns, values)
+            )
+            best = sorted(best, key=lambda pair: pair[2], reverse=True)[:limit]
+        return best, above
+
+    def distribution(self) -> Dict[str, Dict[str, int]]:
+        """側面ごとの分類別のペルソナ数（0名の分類も含む）."""
+        band_counts = np.bincount(self.age_bands, minlength=len(AGE_BANDS))
+        family_counts = np.bincount(self.occupation_families + 1, minlength=len(OCCUPATION_FAMILIES) + 1)
+        theme_counts = self.pain_themes.sum(axis=0)
+        occupation = dict(zip(OCCUPATION_FAMILIES, family_counts[1:].tolist()))
+        pain_points = dict(zip(PAIN_POINT_THEMES, theme_counts.tolist()))
+        if family_counts[0]:
+            occupation[UNCLASSIFIED] = int(family_counts[0])
+        unclassified_pain = int(np.count_nonzero(~self.pain_themes.any(axis=1)))
+        if unclassified_pain:
+            pain_points[UNCLASSIFIED] = unclassified_pain
+        return {
+            "age": dict(zip((label for _, label in AGE_BANDS), band_counts.tolist())),
+            "occupation": occupation,
+            "pain_points": pain_points,
+        }
+
+    def coverage(self) -> Dict[str, float]:
+        """
+        側面ごとの網羅率（0-1）.
+
+        ペルソナが1名以上いる分類の数を、分類の数とペルソナの数の小さい方で割る
+        （ペルソナが5名なら、5つの分類に分かれていれば網羅率は1）。
+        """
+        n = len(self)
+        result = {}
+        for dimension, counts in self.distribution().items():
+            categories = [count for name, count in counts.items() if name != UNCLASSIFIED]
+            covered = sum(1 for count in categories if count > 0)
+            result[dimension] = min(1.0, covered / min(len(categories), n)) if n else 0.0
+        return result
+
+    def report(self, min_score: Optional[float] = None, pairs: int = 3) -> PersonaDiversityReport:
+        """
+        多様性のレポート.
+
+        多様性スコアは、1 - 平均類似度 と、側面ごとの網羅率の平均を等しい重みで合わせた値（0-1）。
+
+        Args:
+            min_score: ヒアリングを行う多様性スコアの下限（記録用）
+            pairs: レポートに含める類似度の高いペアの数
+        """
+        coverage = self.coverage()
+        mean_similarity = self.mean_similarity()
+        mean_coverage = sum(coverage.values()) / len(coverage)
+        score = 0.5 * (1.0 - mean_similarity) + 0.5 * mean_coverage
+        most_similar, near_duplicates = self.similar_pairs(limit=pairs)
+        return PersonaDiversityReport(
+            personas=len(self),
+            score=round(score, 4),
+            mean_similarity=round(mean_similarity, 4),
+            coverage={dimension: round(value, 4) for dimension, value in coverage.items()},
+            distribution=self.distribution(),
+            near_duplicate_pairs=near_duplicates,
+            most_similar_pairs=[
+                SimilarPersonaPair(first=self.names[i], second=self.names[j], similarity=round(similarity, 4))
+                for i, j, similarity in most_similar
+            ],
+            min_score=min_score,
+        )
+
+
+def analyze_persona_diversity(
+    personas: Sequence[PersonaOutput],
+    min_score: Optional[float] = None,
+) -> PersonaDiversityReport:
+    """ペルソナの多様性のレポートを返す（min_score はヒアリングを行う多様性スコアの下限）."""
+    return PersonaDiversity(personas).report(min_score=min_score)
@@ -0,0 +1,179 @@
+"""
+質問セット評価の事前計算.
+
+質問数・変化率や、初回質問と検証質問のトピックの対応付け、質問文の字句的な指標は
+LLMに計算させると誤りやすく出力も長くなるため、評価の前にローカルで計算して
+評価エージェントには事実として渡す。トピックの対応付けは、質問文と意図の
+文字n-gramの類似度で近い質問同士をつないだまとまりとする。
+"""
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+from analysis.text_similarity import char_ngrams, cosine_similarity
+from models.evaluation_schemas import QuestionComparison, QuestionSetMetrics
+from models.schemas import InterviewQuestion
+
+
+# 具体的な事例・数値を求める表現
+SPECIFICITY_MARKERS = (
+    "具体的", "例えば", "実際", "最近", "直近", "前回", "最後に", "エピソード", "場面", "事例",
+    "何回", "何分", "何時間", "何日", "何円", "いくら", "どのくらい", "どれくらい", "頻度", "金額",
+)
+# 答えを広く求める疑問詞
+OPEN_ENDED_MARKERS = ("どのよう", "どんな", "なぜ", "何", "どう", "いつ", "どこ", "誰", "どれ", "教えて")
+_DIGITS = re.compile(r"[0-9０-９]")
+
+# 同じトピックとみなす質問同士の類似度の下限
+TOPIC_SIMILARITY = 0.2
+
+
+@dataclass
+class QuestionTopic:
+    """
+    初回質問と検証質問で共通する（または検証で新しく加わった）トピック.
+
+    Attributes:
+        initial_questions: 初回質問の番号（1始まり）
+        validation_questions: 検証質問の番号（1始まり）
+        similarity: 対応付けた質問同士の類似度の最大値（新しいトピックは 0）
+    """
+
+    initial_questions: List[int]
+    validation_questions: List[int]
+    similarity: float
+
+    @property
+    def is_new(self) -> bool:
+        return not self.initial_questions
+
+
+@dataclass
+class QuestionSetFacts:
+    """
+    評価エージェントに渡す、ローカルで計算した事実.
+
+    Attributes:
+        comparison: 質問数とその変化率
+        initial_metrics: 初回質問の字句的な指標
+        validation_metrics: 検証質問の字句的な指標
+        topics: 検証質問を含むトピック（検証質問の番号順）
+        unmatched_initial: どの検証質問とも対応しない初回質問の番号
+    """
+
+    comparison: QuestionComparison
+    initial_metrics: QuestionSetMetrics
+    validation_metrics: QuestionSetMetrics
+    topics: List[QuestionTopic]
+    unmatched_initial: List[int]
+
+
+def _ratio(count: int, total: int) -> float:
+    return round(count / total, 3) if total else 0.0
+
+
+def question_set_metrics(questions: Sequence[InterviewQuestion]) -> QuestionSetMetrics:
+    """質問セットの字句的な指標."""
+    texts = [q.question for q in questions]
+    specific = sum(
+        1 for text in texts
+        if _DIGITS.search(text) or any(marker in text for marker in SPECIFICITY_MARKERS)
+    )
+    open_ended = sum(1 for text in texts if any(marker in text for marker in OPEN_ENDED_MARKERS))
+    return QuestionSetMetrics(
+        question_count=len(texts),
+        average_length=round(sum(len(text) for text in texts) / len(texts), 1) if texts else 0.0,
+        specific_ratio=_ratio(specific, len(texts)),
+        open_ended_ratio=_ratio(open_ended, len(texts)),
+    )
+
+
+def _vectors(questions: Sequence[InterviewQuestion]) -> List[Counter]:
+    return [char_ngrams(f"{q.question} {q.intent}") for q in questions]
+
+
+def map_question_topics(
+    initial: Sequence[InterviewQuestion],
+    validation: Sequence[InterviewQuestion],
+    threshold: float = TOPIC_SIMILARITY,
+) -> List[QuestionTopic]:
+    """
+    初回質問と検証質問をトピックごとに対応付ける.
+
+    それぞれの質問を、もう一方の質問セットで最も近い質問（類似度がしきい値以上の場合）と
+    つなぎ、つながった質問のまとまりを1つのトピックとする。初回質問だけのまとまりは返さない。
+    """
+    initial_vectors = _vectors(initial)
+    validation_vectors = _vectors(validation)
+    similarity = [[cosine_similarity(v, i) for i in initial_vectors] for v in validation_vectors]
+
+    # 初回質問は 0..n-1、検証質問は n.. の番号でまとめる
+    parent = list(range(len(initial) + len(validation)))
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    edges = []
+    for v, row in enumerate(similarity):
+        if row:
+            best = max(range(len(row)), key=row.__getitem__)
+            edges.append((best, v))
+    for i in range(len(initial)):
+        if similarity:
+            edges.append((i, max(range(len(similarity)), key=lambda v: similarity[v][i])))
+    linked: Dict[int, float] = {}
+    for i, v in edges:
+        if similarity[v][i] >= threshold:
+            root_i, root_v = find(i), find(len(initial) + v)
+            parent[max(root_i, root_v)] = min(root_i, root_v)
+    for i, v in edges:
+        if similarity[v][i] >= threshold:
+            root = find(i)
+            linked[root] = max(linked.get(root, 0.0), similarity[v][i])
+
+    groups: Dict[int, QuestionTopic] = {}
+    for node in range(len(initial) + len(validation)):
+        root = find(node)
+        topic = groups.setdefault(root, QuestionTopic([], [], round(linked.get(root, 0.0), 3)))
+        if node < len(initial):
+            topic.initial_questions.append(node + 1)
+        else:
+            topic.validation_questions.append(node - len(initial) + 1)
+    topics = [topic for topic in groups.values() if topic.validation_questions]
+    topics.sort(key=lambda topic: topic.validation_questions[0])
+    return topics
+
+
+def compare_question_sets(
+    theme: str,
+    initial: Sequence[InterviewQuestion],
+    validation: Sequence[InterviewQuestion],
+) -> QuestionSetFacts:
+    """
+    初回質問と検証質問を比較した事実を計算する.
+
+    Args:
+        theme: 比較対象のテーマ
+        initial: 初回ヒアリング質問
+        validation: 検証用ヒアリング質問
+    """
+    topics = map_question_topics(initial, validation)
+    matched = {number for topic in topics for number in topic.initial_questions}
+    return QuestionSetFacts(
+        comparison=QuestionComparison(
+            theme=theme,
+            question_count_initial=len(initial),
+            question_count_validation=len(validation),
+            count_change_percent=(
+                round((len(validation) - len(initial)) / len(initial) * 100, 1) if initial else 0.0
+            ),
+        ),
+        initial_metrics=question_set_metrics(initial),
+        validation_metrics=question_set_metrics(validation),
+        topics=topics,
+        unmatched_initial=[number for number in range(1, len(initial) + 1) if number not in matched],
+    )
@@ -0,0 +1,58 @@
+"""ヒアリングの飽和（新しい洞察が出なくなった状態）の検出."""
+from typing import List, Optional
+
+from analysis.text_similarity import NgramIndex
+from models.schemas import InterviewResponse
+
+
+class SaturationTracker:
+    """
+    ヒアリング結果の新規性を測り、飽和に達したかを判定する.
+
+    各ヒアリングの新規性は、key_insights それぞれについて既出の洞察との
+    最大類似度を1から引いた値の平均とする。新規性が threshold を下回る
+    ヒアリングが patience 件連続したら飽和とみなす。
+    """
+
+    def __init__(self, threshold: float, patience: int = 3):
+        if not 0.0 <= threshold <= 1.0:
+            raise ValueError("threshold は0から1の範囲で指定してください")
+        if patience < 1:
+            raise ValueError("patience は1以上を指定してください")
+        self.threshold = threshold
+        self.patience = patience
+        self.curve: List[float] = []
+        self._index = NgramIndex()
+        self._low_streak = 0
+        self._saturated_at: Optional[int] = None
+
+    @property
+    def saturated(self) -> bool:
+        """飽和に達しているか."""
+        return self._saturated_at is not None
+
+    @property
+    def saturated_at(self) -> Optional[int]:
+        """飽和と判定されたヒアリングの件数（未到達なら None）."""
+        return self._saturated_at
+
+    def novelty(self, interview: InterviewResponse) -> float:
+        """既出の洞察に対するヒアリング結果の新規性（0-1）を返す."""
+        if not interview.key_insights:
+            return 0.0
+        scores = [1.0 - self._index.max_similarity(insight) for insight in interview.key_insights]
+        return sum(scores) / len(scores)
+
+    def observe(self, interview: InterviewResponse) -> float:
+        """ヒアリング結果を取り込み、その新規性を返す."""
+        score = self.novelty(interview)
+        self._index.extend(interview.key_insights)
+        self.curve.append(score)
+
+        if score < self.threshold:
+            self._low_streak += 1
+        else:
+            self._low_streak = 0
+        if self._saturated_at is None and self._low_streak >= self.patience:
+            self._saturated_at = len(self.curve)
+        return score
@@ -0,0 +1,152 @@
+"""文字n-gramによるローカルなテキスト類似度."""
+import heapq
+import math
+import re
+import unicodedata
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+# 類似度計算の前に取り除く空白・記号
+_IGNORED_CHARS = re.compile(r"[\s\W_]+", re.UNICODE)
+
+
+def normalize_text(text: str) -> str:
+    """全角・半角や大文字・小文字、空白・記号の揺れを吸収する."""
+    return _IGNORED_CHARS.sub("", unicodedata.normalize("NFKC", text).lower())
+
+
+def char_ngrams(text: str, n: int = 2) -> Counter:
+    """正規化したテキストの文字n-gramの出現回数を返す."""
+    normalized = normalize_text(text)
+    if len(normalized) < n:
+        return Counter([normalized]) if normalized else Counter()
+    return Counter(normalized[i:i + n] for i in range(len(normalized) - n + 1))
+
+
+def _norm(vector: Dict[str, int]) -> float:
+    return math.sqrt(sum(count * count for count in vector.values()))
+
+
+def cosine_similarity(a: Dict[str, int], b: Dict[str, int]) -> float:
+    """n-gram出現回数ベクトル同士のコサイン類似度（0-1）."""
+    if not a or not b:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(count * b.get(gram, 0) for gram, count in a.items())
+    if dot == 0:
+        return 0.0
+    return dot / (_norm(a) * _norm(b))
+
+
+class NgramIndex:
+    """既出テキストに対する最大類似度を求めるための索引."""
+
+    def __init__(self, n: int = 2):
+        self.n = n
+        self._vectors: List[Counter] = []
+        self._norms: List[float] = []
+        # n-gram -> そのn-gramを含むテキストの番号
+        self._postings: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def max_similarity(self, text: str) -> float:
+        """既出テキストの中で最も近いものとの類似度を返す."""
+        vector = char_ngrams(text, self.n)
+        if not vector or not self._vectors:
+            return 0.0
+        dots: Dict[int, int] = {}
+        for gram, count in vector.items():
+            for doc_id in self._postings.get(gram, ()):
+                dots[doc_id] = dots.get(doc_id, 0) + count * self._vectors[doc_id][gram]
+        if not dots:
+            return 0.0
+        norm = _norm(vector)
+        return max(dot / (norm * self._norms[doc_id]) for doc_id, dot in dots.items())
+
+    def add(self, text: str) -> None:
+        """テキストを索引に追加する."""
+        vector = char_ngrams(text, self.n)
+        if not vector:
+            return
+        doc_id = len(self._vectors)
+        self._vectors.append(vector)
+        self._norms.append(_norm(vector))
+        for gram in vector:
+            self._postings.setdefault(gram, []).append(doc_id)
+
+    def extend(self, texts: Iterable[str]) -> None:
+        """複数のテキストを索引に追加する."""
+        for text in texts:
+            self.add(text)
+
+
+class NgramSearchIndex:
+    """
+    多数のテキストから類似するものを探すための索引.
+
+    n-gramごとの転置リスト（テキスト番号と出現回数）を配列で持ち、数万件でもメモリを抑える。
+    検索時はクエリ側のn-gramに逆文書頻度（IDF）の重みを付け、索引が min_docs 件以上あるときは
+    max_df を超える割合のテキストに現れるn-gram（ほとんど差の付かないもの）を読み飛ばす。
+    類似度は 0-1 の範囲になる。
+    """
+
+    def __init__(self, n: int = 2, max_df: float = 0.5, min_docs: int = 20):
+        self.n = n
+        self.max_df = max_df
+        self.min_docs = min_docs
+        self._norms = array("d")
+        # n-gram -> (テキスト番号の配列, 出現回数の配列)
+        self._postings: Dict[str, Tuple[array, array]] = {}
+
+    def __len__(self) -> int:
+        return len(self._norms)
+
+    def add(self, text: str) -> int:
+        """テキストを索引に追加し、テキスト番号を返す（空のテキストは何にも一致しない）."""
+        vector = char_ngrams(text, self.n)
+        doc_id = len(self._norms)
+        self._norms.append(_norm(vector))
+        for gram, count in vector.items():
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = (array("i"), array("i"))
+            postings[0].append(doc_id)
+            postings[1].append(count)
+        return doc_id
+
+    def scores(self, text: str) -> Dict[int, float]:
+        """text と共通のn-gramを持つテキストの番号と類似度."""
+        vector = char_ngrams(text, self.n)
+        total = len(self._norms)
+        if not vector or not total:
+            return {}
+        weighted = []
+        for gram, count in vector.items():
+            postings = self._postings.get(gram)
+            if postings is None:
+                continue
+            df = len(postings[0])
+            weighted.append((count * math.log(1 + total / df), postings, df))
+        query_norm = math.sqrt(sum(weight * weight for weight, _, _ in weighted))
+        if query_norm == 0:
+            return {}
+        dots: Dict[int, float] = {}
+        skip = total >= self.min_docs
+        for weight, (doc_ids, counts), df in weighted:
+            if skip and df > self.max_df * total:
+                continue
+            for doc_id, count in zip(doc_ids, counts):
+                dots[doc_id] = dots.get(doc_id, 0.0) + weight * count
+        norms = self._norms
+        return {doc_id: dot / (query_norm * norms[doc_id]) for doc_id, dot in dots.items()}
+
+    def search(self, text: str, limit: int = 10, min_similarity: float = 0.0) -> List[Tuple[int, float]]:
+        """類似度の高い順に (テキスト番号, 類似度) を最大 limit 件返す."""
+        candidates = (
+            (doc_id, score) for doc_id, score in self.scores(text).items() if score >= min_similarity
+        )
+        return heapq.nlargest(limit, candidates, key=lambda item: item[1])
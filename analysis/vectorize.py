@@ -0,0 +1,69 @@
+"""
+文字n-gramを固定の次元にハッシュした NumPy のベクトル.
+
+語彙を持たずにテキストをベクトルにするため、件数が多くても辞書を作らずに
+まとめて計算できる（ハッシュの衝突は類似度をわずかに高くする程度に留まる）。
+"""
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from analysis.text_similarity import normalize_text
+
+
+def hashed_ngram_counts(
+    texts: Sequence[str],
+    dim: int,
+    sizes: Tuple[int, ...] = (2,),
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    正規化したテキストの文字n-gramのハッシュ.
+
+    Args:
+        texts: テキスト
+        dim: ハッシュの次元数
+        sizes: n-gramの文字数
+
+    Returns:
+        (n-gramごとのテキストの番号, n-gramごとの次元)
+    """
+    n = len(texts)
+    normalized = [normalize_text(text) for text in texts]
+    # 区切りの NUL は normalize_text で取り除かれる文字なので、テキストの中には現れない
+    codes = np.frombuffer("\0".join(normalized).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    lengths = np.fromiter((len(text) for text in normalized), dtype=np.int64, count=n)
+    owners = np.repeat(np.arange(n), lengths + 1)[:len(codes)]
+    rows, buckets = [], []
+    for size in sizes:
+        if len(codes) < size:
+            continue
+        count = len(codes) - size + 1
+        hashed = np.full(count, size, dtype=np.uint64)
+        valid = np.ones(count, dtype=bool)
+        for offset in range(size):
+            window = codes[offset:offset + count]
+            hashed = (hashed * np.uint64(1_000_003)) ^ window
+            valid &= window != 0
+        rows.append(owners[:count][valid])
+        buckets.append((hashed[valid] % np.uint64(dim)).astype(np.int64))
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(rows), np.concatenate(buckets)
+
+
+def hashed_ngram_matrix(
+    texts: Sequence[str],
+    dim: int,
+    sizes: Tuple[int, ...] = (2,),
+) -> np.ndarray:
+    """テキストごとの文字n-gramの出現回数の行列（テキスト数 × dim、float32）."""
+    rows, buckets = hashed_ngram_counts(texts, dim, sizes)
+    counts = np.bincount(rows * dim + buckets, minlength=len(texts) * dim)
+    return counts.reshape(len(texts), dim).astype(np.float32)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """各行を長さ1にする（ゼロの行はそのまま。matrix を書き換えて返す）."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
@@ -0,0 +1,37 @@
+"""エージェントのモデル呼び出し先（バックエンド）のパッケージ."""
+from backends.batch import (
+    BatchJobFailed,
+    BatchRequestFailed,
+    BatchResult,
+    BatchRun,
+    BatchStatus,
+    BatchSubmitter,
+    LocalBatchEndpoint,
+    OpenAIBatchEndpoint,
+    build_batch_request,
+    parse_batch_line,
+)
+from backends.fake_model import FakeModel, FakeModelProvider, example_from_schema
+from backends.rate_limited import RateLimitedModel, RateLimitedModelProvider
+from backends.scenario import Scenario, ScenarioModel, ScenarioModelProvider
+
+__all__ = [
+    "BatchJobFailed",
+    "BatchRequestFailed",
+    "BatchResult",
+    "BatchRun",
+    "BatchStatus",
+    "BatchSubmitter",
+    "LocalBatchEndpoint",
+    "OpenAIBatchEndpoint",
+    "build_batch_request",
+    "parse_batch_line",
+    "FakeModel",
+    "FakeModelProvider",
+    "example_from_schema",
+    "RateLimitedModel",
+    "RateLimitedModelProvider",
+    "Scenario",
+    "ScenarioModel",
+    "ScenarioModelProvider",
+]
@@ -0,0 +1,511 @@
+"""
+バッチAPIへのまとめての提出.
+
+急がない実行では、フェーズの中で互いに独立した呼び出し（フェーズ3のヒアリングなど）を
+1つのバッチジョブの入力ファイル（JSONL。1行が /v1/responses への1リクエスト）にまとめて提出し、
+完了するまで一定の間隔で状態を確かめてから、出力ファイルの各行を構造化出力に戻す。
+バッチAPIは通常の呼び出しより安価だが、結果が返るまで最大で completion_window かかる。
+
+OpenAIBatchEndpoint は OpenAI の Batch API に、LocalBatchEndpoint は API を呼び出さずに
+同じ形式の出力ファイルを返す代替のエンドポイントに提出する（オフラインでの動作確認用）。
+"""
+import asyncio
+import itertools
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type, Union
+
+from agents import Agent, AgentOutputSchema, Usage, WebSearchTool
+from agents.models import get_default_model
+
+from backends.fake_model import example_from_schema
+
+
+BATCH_URL = "/v1/responses"
+
+# ModelSettings の項目のうち、そのまま Responses API の同名（値は API での名前）の項目になるもの
+_BODY_SETTINGS = {
+    "temperature": "temperature",
+    "top_p": "top_p",
+    "truncation": "truncation",
+    "max_tokens": "max_output_tokens",
+    "metadata": "metadata",
+    "store": "store",
+    "prompt_cache_retention": "prompt_cache_retention",
+}
+
+# クライアント側の動作だけに関わり、モデルの出力には影響しない項目
+_CLIENT_SETTINGS = ("retry", "timeout", "include_usage", "preserve_raw_usage")
+
+# tool_choice のうち、そのまま送る値
+_TOOL_CHOICE_MODES = ("auto", "required", "none")
+
+# バッチの状態のうち、これ以上変わらないもの
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+class BatchJobFailed(RuntimeError):
+    """バッチジョブ全体が失敗した（入力ファイルの検証エラーなど）."""
+
+
+class BatchRequestFailed(RuntimeError):
+    """バッチに含めた1件のリクエストが失敗した、または結果が返らなかった."""
+
+
+@dataclass
+class BatchStatus:
+    """
+    バッチジョブの状態.
+
+    Attributes:
+        id: バッチの識別子
+        status: validating / in_progress / finalizing / completed / failed / expired / cancelling / cancelled
+        completed, failed, total: リクエストの件数
+        output_file_id, error_file_id: 成功・失敗した行のファイルの識別子（まだなければ None）
+        errors: 失敗の理由（入力ファイルの検証エラーなど）
+    """
+
+    id: str
+    status: str
+    completed: int = 0
+    failed: int = 0
+    total: int = 0
+    output_file_id: Optional[str] = None
+    error_file_id: Optional[str] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+@dataclass
+class BatchResult:
+    """
+    バッチの1リクエスト分の結果.
+
+    Attributes:
+        custom_id: リクエストの識別子
+        output: 構造化出力（失敗した場合は None）
+        error: 失敗の理由（成功した場合は None）
+        usage: 使用量（結果が返らなかった場合は None）
+        tool_calls: ホスト型ツールの呼び出し（種類・検索語・状態）
+    """
+
+    custom_id: str
+    output: Any = None
+    error: Optional[Exception] = None
+    usage: Optional[Usage] = None
+    tool_calls: List[Dict[str, Optional[str]]] = field(default_factory=list)
+
+
+@dataclass
+class BatchRun:
+    """
+    提出したバッチジョブ1件の記録.
+
+    Attributes:
+        batch_id: バッチの識別子
+        status: 最後に確かめた状態
+        polls: 状態を確かめた回数
+        input_path: 提出した入力ファイル
+        results: リクエストごとの結果（提出した順）
+    """
+
+    batch_id: str
+    status: str
+    polls: int
+    input_path: Path
+    results: List[BatchResult]
+
+
+def _apply_model_settings(agent: Agent, body: Dict[str, Any], include: List[str]) -> None:
+    """エージェントの model_settings を、SDKが通常の呼び出しで送るのと同じ形で body に入れる."""
+    settings = agent.model_settings
+    unsupported = []
+    for name, value in settings.to_json_dict().items():
+        if value is None or name in _CLIENT_SETTINGS:
+            continue
+        if name in _BODY_SETTINGS:
+            body[_BODY_SETTINGS[name]] = value
+        elif name == "reasoning":
+            body["reasoning"] = settings.reasoning.model_dump(exclude_none=True)
+        elif name == "verbosity":
+            body["text"]["verbosity"] = value
+        elif name == "tool_choice" and value in _TOOL_CHOICE_MODES:
+            body["tool_choice"] = value
+        elif name == "tool_choice" and value == "web_search" and "tools" in body:
+            body["tool_choice"] = {"type": "web_search"}
+        elif name == "parallel_tool_calls":
+            if "tools" in body:
+                body["parallel_tool_calls"] = value
+        elif name == "top_logprobs":
+            body["top_logprobs"] = value
+            include.append("message.output_text.logprobs")
+        elif name == "response_include":
+            include.extend(item for item in value if item not in include)
+        else:
+            unsupported.append(name)
+    if unsupported:
+        raise ValueError(
+            f"{agent.name} の model_settings（{', '.join(unsupported)}）はバッチの入力ファイルで表せないため、"
+            "バッチに含められません"
+        )
+
+
+def _tool_param(agent: Agent, tool) -> Dict[str, Any]:
+    """ツールを Responses API の tools の1要素にする（Web検索のみ対応）."""
+    if not isinstance(tool, WebSearchTool):
+        raise ValueError(f"{agent.name} のツール {tool.name} はバッチの入力ファイルで表せないため、バッチに含められません")
+    param: Dict[str, Any] = {"type": "web_search", "search_context_size": tool.search_context_size}
+    if tool.filters is not None:
+        param["filters"] = tool.filters.model_dump()
+    if tool.user_location is not None:
+        param["user_location"] = tool.user_location
+    if tool.external_web_access is not None:
+        param["external_web_access"] = tool.external_web_access
+    if tool.search_content_types is not None:
+        param["search_content_types"] = list(tool.search_content_types)
+    if tool.image_settings is not None:
+        param["image_settings"] = dict(tool.image_settings)
+    return param
+
+
+def build_batch_request(agent: Agent, prompt: str, output_type: Type, custom_id: str) -> Dict[str, Any]:
+    """
+    エージェントの1回の呼び出しを、バッチの入力ファイルの1行にする.
+
+    モデルはエージェントに指定がなければエージェントSDKのデフォルトを使い、ツール（Web検索）は
+    SDKが通常の呼び出しで送るのと同じ形にする。構造化出力はスキーマを text.format に指定する。
+    エージェントの model_settings（temperature・reasoning・max_tokens など）も通常の呼び出しと
+    同じ項目に入れ、入力ファイルの1行で表せない設定があればバッチに含めない。
+
+    Raises:
+        ValueError: 指示が文字列でない、またはバッチで表せないツール・model_settings がある場合
+    """
+    if not isinstance(agent.instructions, str):
+        raise ValueError(f"{agent.name} の指示が文字列ではないため、バッチに含められません")
+    schema = AgentOutputSchema(output_type)
+    model = agent.model if isinstance(agent.model, str) else get_default_model()
+    body: Dict[str, Any] = {
+        "model": model,
+        "instructions": agent.instructions,
+        "input": prompt,
+        "text": {
+            "format": {
+                "type": "json_schema",
+                "name": schema.name(),
+                "schema": schema.json_schema(),
+                "strict": schema.is_strict_json_schema(),
+            },
+        },
+    }
+    if agent.tools:
+        body["tools"] = [_tool_param(agent, tool) for tool in agent.tools]
+    include = []
+    if any(tool.search_content_types and "image" in tool.search_content_types for tool in agent.tools):
+        include.append("web_search_call.results")
+    _apply_model_settings(agent, body, include)
+    if include:
+        body["include"] = include
+    return {"custom_id": custom_id, "method": "POST", "url": BATCH_URL, "body": body}
+
+
+def _response_text(body: Dict[str, Any]) -> str:
+    """Responses API の応答からテキストの出力を取り出す."""
+    return "".join(
+        content.get("text", "")
+        for item in body.get("output", [])
+        if item.get("type") == "message"
+        for content in item.get("content", [])
+        if content.get("type") == "output_text"
+    )
+
+
+def _error_message(error: Any) -> str:
+    if isinstance(error, dict):
+        code = error.get("code")
+        message = error.get("message") or json.dumps(error, ensure_ascii=False)
+        return f"{code}: {message}" if code else message
+    return str(error)
+
+
+def parse_batch_line(line: Dict[str, Any], output_type: Type) -> BatchResult:
+    """
+    バッチの出力ファイル（またはエラーファイル）の1行を結果にする.
+
+    失敗した行や、出力がスキーマに適合しない行は error に理由を入れる。
+    """
+    result = BatchResult(custom_id=line.get("custom_id", ""))
+    response = line.get("response") or {}
+    body = response.get("body") or {}
+    usage = body.get("usage")
+    if usage:
+        result.usage = Usage(
+            requests=1,
+            input_tokens=usage.get("input_tokens", 0),
+            output_tokens=usage.get("output_tokens", 0),
+            total_tokens=usage.get("total_tokens", 0),
+        )
+    if line.get("error"):
+        result.error = BatchRequestFailed(_error_message(line["error"]))
+        return result
+    if response.get("status_code") != 200:
+        result.error = BatchRequestFailed(
+            f"ステータス {response.get('status_code')}: {_error_message(body.get('error') or body)}"
+        )
+        return result
+    for item in body.get("output", []):
+        if item.get("type", "").endswith("_call"):
+            result.tool_calls.append({
+                "type": item["type"].removesuffix("_call"),
+                "query": (item.get("action") or {}).get("query"),
+                "status": item.get("status"),
+            })
+    try:
+        result.output = AgentOutputSchema(output_type).validate_json(_response_text(body))
+    except Exception as e:
+        result.error = e
+    return result
+
+
+class OpenAIBatchEndpoint:
+    """
+    OpenAI の Batch API.
+
+    client には AsyncOpenAI クライアント（通常は configure_openai_client で登録した共有クライアント）を渡す。
+    """
+
+    def __init__(self, client, completion_window: str = "24h"):
+        self.client = client
+        self.completion_window = completion_window
+
+    async def submit(self, path: Path) -> str:
+        """入力ファイルをアップロードしてバッチを作成し、その識別子を返す."""
+        uploaded = await self.client.files.create(file=(path.name, path.read_bytes()), purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_URL,
+            completion_window=self.completion_window,
+            metadata={"source": path.name},
+        )
+        return batch.id
+
+    async def retrieve(self, batch_id: str) -> BatchStatus:
+        batch = await self.client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        return BatchStatus(
+            id=batch.id,
+            status=batch.status,
+            completed=counts.completed if counts else 0,
+            failed=counts.failed if counts else 0,
+            total=counts.total if counts else 0,
+            output_file_id=batch.output_file_id,
+            error_file_id=batch.error_file_id,
+            errors=[error.message or error.code or "" for error in (batch.errors.data or [])] if batch.errors else [],
+        )
+
+    async def download(self, file_id: str) -> str:
+        return (await self.client.files.content(file_id)).text
+
+    async def cancel(self, batch_id: str) -> None:
+        await self.client.batches.cancel(batch_id)
+
+
+# LocalBatchEndpoint の responder: (custom_id, リクエストの body) → 出力（JSONにできる値）
+BatchResponder = Callable[[str, Dict[str, Any]], Any]
+
+
+class LocalBatchEndpoint:
+    """
+    API を呼び出さずにバッチの流れを再現する代替のエンドポイント.
+
+    提出されたバッチは、状態を polls_to_complete 回確かめると完了し、OpenAI の Batch API と
+    同じ形式の出力ファイル・エラーファイルを返す。出力は responder を指定すればその戻り値、
+    省略すれば text.format のスキーマから生成した値（backends.fake_model.example_from_schema）。
+    responder が例外を送出したリクエストはエラーファイルの行になる。
+    使用量は文字数から概算する。
+
+    Attributes:
+        submitted: 提出された入力ファイルの各行（バッチの識別子ごと）
+    """
+
+    def __init__(self, polls_to_complete: int = 2, responder: Optional[BatchResponder] = None):
+        if polls_to_complete < 1:
+            raise ValueError("polls_to_complete は1以上を指定してください")
+        self.polls_to_complete = polls_to_complete
+        self.responder = responder
+        self.submitted: Dict[str, List[Dict[str, Any]]] = {}
+        self._statuses: Dict[str, BatchStatus] = {}
+        self._polls: Dict[str, int] = {}
+        self._files: Dict[str, str] = {}
+        self._serials = itertools.count(1)
+
+    async def submit(self, path: Path) -> str:
+        requests = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+        batch_id = f"batch_local_{uuid.uuid4().hex[:12]}"
+        errors = [
+            f"{number}行目: custom_id・url・body が必要です"
+            for number, request in enumerate(requests, 1)
+            if not {"custom_id", "url", "body"} <= request.keys() or request["url"] != BATCH_URL
+        ]
+        self.submitted[batch_id] = requests
+        self._polls[batch_id] = 0
+        self._statuses[batch_id] = BatchStatus(
+            id=batch_id, status="failed" if errors else "validating", total=len(requests), errors=errors,
+        )
+        return batch_id
+
+    async def retrieve(self, batch_id: str) -> BatchStatus:
+        status = self._statuses[batch_id]
+        if status.finished:
+            return status
+        self._polls[batch_id] += 1
+        if self._polls[batch_id] < self.polls_to_complete:
+            status.status = "in_progress"
+        else:
+            self._complete(status)
+        return status
+
+    def _complete(self, status: BatchStatus) -> None:
+        outputs, errors = [], []
+        for request in self.submitted[status.id]:
+            line = self._respond(request)
+            (errors if line["error"] else outputs).append(json.dumps(line, ensure_ascii=False))
+        if outputs:
+            status.output_file_id = self._store("\n".join(outputs) + "\n")
+        if errors:
+            status.error_file_id = self._store("\n".join(errors) + "\n")
+        status.completed, status.failed = len(outputs), len(errors)
+        status.status = "completed"
+
+    def _respond(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        body = request["body"]
+        line_id = f"batch_req_{uuid.uuid4().hex[:12]}"
+        try:
+            if self.responder is not None:
+                value = self.responder(request["custom_id"], body)
+            else:
+                value = example_from_schema(body["text"]["format"]["schema"], serial=next(self._serials))
+        except Exception as e:
+            return {
+                "id": line_id, "custom_id": request["custom_id"], "response": None,
+                "error": {"code": type(e).__name__, "message": str(e)},
+            }
+        text = json.dumps(value, ensure_ascii=False)
+        # 文字数からおおよそのトークン数を見積もる
+        input_tokens = max(1, len(body.get("instructions", "") + body.get("input", "")) // 4)
+        output_tokens = max(1, len(text) // 4)
+        return {
+            "id": line_id,
+            "custom_id": request["custom_id"],
+            "response": {
+                "status_code": 200,
+                "body": {
+                    "status": "completed",
+                    "model": body.get("model"),
+                    "output": [{
+                        "type": "message",
+                        "role": "assistant",
+                        "content": [{"type": "output_text", "text": text, "annotations": []}],
+                    }],
+                    "usage": {
+                        "input_tokens": input_tokens,
+                        "output_tokens": output_tokens,
+                        "total_tokens": input_tokens + output_tokens,
+                    },
+                },
+            },
+            "error": None,
+        }
+
+    def _store(self, text: str) -> str:
+        file_id = f"file_local_{uuid.uuid4().hex[:12]}"
+        self._files[file_id] = text
+        return file_id
+
+    async def download(self, file_id: str) -> str:
+        return self._files[file_id]
+
+    async def cancel(self, batch_id: str) -> None:
+        status = self._statuses[batch_id]
+        if not status.finished:
+            status.status = "cancelled"
+
+
+BatchEndpoint = Union[OpenAIBatchEndpoint, LocalBatchEndpoint]
+
+
+class BatchSubmitter:
+    """
+    呼び出しをまとめてバッチに提出し、完了を待って結果を受け取る.
+
+    入力ファイルは work_dir に「エージェント名-時刻.jsonl」として書き出し、受け取った
+    出力ファイル・エラーファイルは同じ名前の .output.jsonl / .errors.jsonl として残す。
+    待っている間にキャンセルされた場合（実行の期限など）は、提出したバッチもキャンセルする。
+    """
+
+    def __init__(self, endpoint: BatchEndpoint, work_dir: Union[str, Path], poll_interval: float = 60.0):
+        if poll_interval < 0:
+            raise ValueError("poll_interval は0以上の秒数を指定してください")
+        self.endpoint = endpoint
+        self.work_dir = Path(work_dir)
+        self.poll_interval = poll_interval
+
+    def write_requests(self, agent: Agent, prompts: Sequence[str], output_type: Type) -> Path:
+        """入力ファイルを書き出す（custom_id は「エージェント名-番号」）."""
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        path = self.work_dir / f"{agent.name}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}.jsonl"
+        with path.open("w", encoding="utf-8") as f:
+            for number, prompt in enumerate(prompts):
+                request = build_batch_request(agent, prompt, output_type, f"{agent.name}-{number}")
+                f.write(json.dumps(request, ensure_ascii=False) + "\n")
+        return path
+
+    async def run(self, agent: Agent, prompts: Sequence[str], output_type: Type) -> BatchRun:
+        """
+        prompts をまとめて提出し、完了後にプロンプトの順で結果を返す.
+
+        結果の返らなかったリクエスト（期限切れ・キャンセル）は BatchRequestFailed の結果になる。
+
+        Raises:
+            BatchJobFailed: バッチ全体が失敗した場合
+        """
+        path = self.write_requests(agent, prompts, output_type)
+        batch_id = await self.endpoint.submit(path)
+        polls = 0
+        try:
+            while True:
+                status = await self.endpoint.retrieve(batch_id)
+                polls += 1
+                if status.finished:
+                    break
+                await asyncio.sleep(self.poll_interval)
+        except asyncio.CancelledError:
+            await asyncio.shield(self.endpoint.cancel(batch_id))
+            raise
+        if status.status == "failed":
+            reason = "、".join(status.errors) or "理由は不明です"
+            raise BatchJobFailed(f"バッチ {batch_id} が失敗しました: {reason}")
+
+        lines: Dict[str, BatchResult] = {}
+        for file_id, suffix in ((status.output_file_id, ".output.jsonl"), (status.error_file_id, ".errors.jsonl")):
+            if file_id is None:
+                continue
+            text = await self.endpoint.download(file_id)
+            path.with_suffix(suffix).write_text(text, encoding="utf-8")
+            for raw in text.splitlines():
+                if raw.strip():
+                    result = parse_batch_line(json.loads(raw), output_type)
+                    lines[result.custom_id] = result
+        results = []
+        for number in range(len(prompts)):
+            custom_id = f"{agent.name}-{number}"
+            results.append(lines.get(custom_id) or BatchResult(
+                custom_id=custom_id,
+                error=BatchRequestFailed(f"バッチ {batch_id}（{status.status}）に結果がありません"),
+            ))
+        return BatchRun(batch_id=batch_id, status=status.status, polls=polls, input_path=path, results=results)
@@ -0,0 +1,147 @@
+"""
+ローカル検証用の偽モデルバックエンド.
+
+OpenAI APIを呼び出さず、エージェントの出力スキーマ（JSON Schema）から
+スキーマに適合する出力を生成して返す。サーバーモードやワークフロー全体を
+APIキーなしで動かす際に RunConfig(model_provider=FakeModelProvider()) として使う。
+"""
+import asyncio
+import itertools
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+from agents import Model, ModelProvider, Usage
+from agents.items import ModelResponse
+from openai.types.responses import ResponseOutputMessage, ResponseOutputText
+
+
+def example_from_schema(
+    schema: Dict[str, Any],
+    defs: Optional[Dict[str, Any]] = None,
+    label: str = "value",
+    serial: int = 1,
+    array_length: int = 3,
+) -> Any:
+    """
+    JSON Schema に適合する値を生成する.
+
+    文字列には「プロパティ名-通し番号」を入れるため、呼び出しごとに
+    serial を変えれば内容の異なる出力になる。数値は minimum/maximum の範囲に収める。
+    """
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return example_from_schema(
+            defs[schema["$ref"].split("/")[-1]], defs, label, serial, array_length
+        )
+    if "anyOf" in schema:
+        # null 以外の選択肢を優先する
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+        return example_from_schema(
+            (options or schema["anyOf"])[0], defs, label, serial, array_length
+        )
+    if "enum" in schema:
+        return schema["enum"][serial % len(schema["enum"])]
+    if "const" in schema:
+        return schema["const"]
+
+    schema_type = schema.get("type")
+    if isinstance(schema_type, list):
+        schema_type = next((t for t in schema_type if t != "null"), "null")
+
+    if schema_type == "object":
+        return {
+            name: example_from_schema(prop, defs, name, serial, array_length)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if schema_type == "array":
+        length = max(schema.get("minItems", 0), min(array_length, schema.get("maxItems", array_length)))
+        item_schema = schema.get("items", {"type": "string"})
+        return [
+            example_from_schema(item_schema, defs, label, serial * 100 + i, array_length)
+            for i in range(1, length + 1)
+        ]
+    if schema_type in ("integer", "number"):
+        low = schema.get("minimum", schema.get("exclusiveMinimum", 0))
+        high = schema.get("maximum", schema.get("exclusiveMaximum", low + 10))
+        value = low + serial % (max(high - low, 0) + 1)
+        return int(value) if schema_type == "integer" else float(value)
+    if schema_type == "boolean":
+        return serial % 2 == 0
+    if schema_type == "null":
+        return None
+    return f"{label}-{serial}"
+
+
+class FakeModel(Model):
+    """出力スキーマから生成した応答を返す偽モデル."""
+
+    def __init__(self, latency: float = 0.0, array_length: int = 3):
+        self.latency = latency
+        self.array_length = array_length
+        self.calls = 0
+        self._serials = itertools.count(1)
+
+    def _respond(self, system_instructions, input, output_schema) -> ModelResponse:
+        serial = next(self._serials)
+        self.calls += 1
+        if output_schema is None or output_schema.is_plain_text():
+            text = f"response-{serial}"
+        else:
+            value = example_from_schema(
+                output_schema.json_schema(), serial=serial, array_length=self.array_length
+            )
+            text = json.dumps(value, ensure_ascii=False)
+        prompt_text = (system_instructions or "") + (
+            input if isinstance(input, str) else json.dumps(input, ensure_ascii=False, default=str)
+        )
+        # 文字数からおおよそのトークン数を見積もる
+        input_tokens = max(1, len(prompt_text) // 4)
+        output_tokens = max(1, len(text) // 4)
+        message = ResponseOutputMessage(
+            id=f"msg_fake_{serial}",
+            type="message",
+            role="assistant",
+            status="completed",
+            content=[ResponseOutputText(type="output_text", text=text, annotations=[])],
+        )
+        return ModelResponse(
+            output=[message],
+            usage=Usage(
+                requests=1,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                total_tokens=input_tokens + output_tokens,
+            ),
+            response_id=None,
+        )
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        *,
+        previous_response_id=None,
+        conversation_id=None,
+        prompt=None,
+    ) -> ModelResponse:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(system_instructions, input, output_schema)
+
+    def stream_response(self, *args, **kwargs) -> AsyncIterator[Any]:
+        raise NotImplementedError("FakeModel はストリーミング応答に対応していません")
+
+
+class FakeModelProvider(ModelProvider):
+    """すべてのモデル名に対して同じ FakeModel を返すプロバイダー."""
+
+    def __init__(self, latency: float = 0.0, array_length: int = 3):
+        self.model = FakeModel(latency=latency, array_length=array_length)
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        return self.model
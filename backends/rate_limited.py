@@ -0,0 +1,37 @@
+"""モデル呼び出しの前にレート制限の枠を取得するバックエンド."""
+from typing import Any, AsyncIterator, Optional
+
+from agents import Model, ModelProvider
+from agents.items import ModelResponse
+
+
+class RateLimitedModel(Model):
+    """呼び出しごとに limiter.acquire() を待ってから元のモデルを呼び出す."""
+
+    def __init__(self, model: Model, limiter):
+        self.model = model
+        self.limiter = limiter
+
+    async def get_response(self, *args, **kwargs) -> ModelResponse:
+        await self.limiter.acquire()
+        return await self.model.get_response(*args, **kwargs)
+
+    async def stream_response(self, *args, **kwargs) -> AsyncIterator[Any]:
+        await self.limiter.acquire()
+        async for event in self.model.stream_response(*args, **kwargs):
+            yield event
+
+
+class RateLimitedModelProvider(ModelProvider):
+    """
+    元のプロバイダーが返すモデルをレート制限付きで包むプロバイダー.
+
+    limiter には `async acquire()` を持つオブジェクト（SharedRateLimiter など）を渡す。
+    """
+
+    def __init__(self, provider: ModelProvider, limiter):
+        self.provider = provider
+        self.limiter = limiter
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        return RateLimitedModel(self.provider.get_model(model_name), self.limiter)
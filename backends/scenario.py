@@ -0,0 +1,272 @@
+"""
+シナリオに従って遅延と障害を注入する偽モデルバックエンド（負荷試験用）.
+
+FakeModel と同じく出力スキーマから適合する出力を生成して返すが、シナリオファイル（JSON）で
+指定した分布の遅延を入れ、一定の確率でレート制限（429）・サーバーエラー・接続エラー・
+タイムアウト・応答の停止・不正なJSON・途中で切れた出力を返す。
+実際のAPIの割り当てを使わずに、再試行やタイムアウト、失敗したペルソナの扱いを確かめられる。
+
+シナリオファイルの例:
+
+    {
+      "seed": 42,
+      "latency": {"distribution": "lognormal", "seconds": 0.5, "sigma": 0.6},
+      "faults": {"rate_limit": 0.05, "server_error": 0.02, "truncated": 0.01},
+      "rate_limit_storms": [{"start": 2.0, "duration": 3.0}],
+      "outputs": {
+        "InterviewResponse": {"latency": {"distribution": "uniform", "low": 1.0, "high": 4.0}}
+      }
+    }
+
+outputs にはエージェントの出力の型名（InterviewResponse など）ごとに遅延と障害の確率を上書きする
+（モデルにはエージェント名が渡されないため、出力の型で区別する）。
+"""
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple, Union
+
+import httpx2
+import openai
+from agents import Model, ModelProvider
+from agents.items import ModelResponse
+
+from backends.fake_model import FakeModel
+
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+# 注入できる障害の種類
+FAULT_TYPES = (
+    "rate_limit",        # 429 Too Many Requests（openai.RateLimitError）
+    "server_error",      # 500 Internal Server Error（openai.InternalServerError）
+    "connection_error",  # 接続エラー（openai.APIConnectionError）
+    "timeout",           # リクエストのタイムアウト（openai.APITimeoutError）
+    "hang",              # 応答せずに hang_seconds 秒待つ（呼び出し側のタイムアウトの確認用）
+    "malformed_json",    # スキーマに従わない、JSONでない出力
+    "truncated",         # 途中で切れたJSONの出力
+)
+
+_REQUEST = httpx2.Request("POST", "https://fake.invalid/v1/responses")
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """
+    1回の呼び出しの遅延（秒）の分布.
+
+    Attributes:
+        distribution: "fixed"（seconds）、"uniform"（low〜high）、
+            "exponential"（平均 seconds）、"lognormal"（中央値 seconds、対数の標準偏差 sigma）
+    """
+
+    distribution: str = "fixed"
+    seconds: float = 0.0
+    low: float = 0.0
+    high: float = 0.0
+    sigma: float = 0.5
+
+    def __post_init__(self):
+        if self.distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"未対応の遅延の分布です: {self.distribution}")
+        if min(self.seconds, self.low, self.high, self.sigma) < 0 or self.high < self.low:
+            raise ValueError("遅延の分布には0以上の値（low <= high）を指定してください")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "uniform":
+            return rng.uniform(self.low, self.high)
+        if self.distribution == "exponential":
+            return rng.expovariate(1 / self.seconds) if self.seconds > 0 else 0.0
+        if self.distribution == "lognormal":
+            return rng.lognormvariate(math.log(self.seconds), self.sigma) if self.seconds > 0 else 0.0
+        return self.seconds
+
+
+def _parse_faults(data: Mapping[str, Any]) -> Dict[str, float]:
+    faults = {}
+    for name, rate in data.items():
+        if name not in FAULT_TYPES:
+            raise ValueError(f"未対応の障害の種類です: {name}（{', '.join(FAULT_TYPES)}）")
+        if not 0 <= rate <= 1:
+            raise ValueError(f"障害 {name} の確率は0以上1以下を指定してください")
+        faults[name] = float(rate)
+    if sum(faults.values()) > 1:
+        raise ValueError("障害の確率の合計は1以下にしてください")
+    return faults
+
+
+@dataclass(frozen=True)
+class OutputScenario:
+    """出力の型ごとの上書き（指定しなかった項目はシナリオ全体の設定を使う）."""
+
+    latency: Optional[LatencyDistribution] = None
+    faults: Optional[Dict[str, float]] = None
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    負荷試験のシナリオ.
+
+    Attributes:
+        latency: 呼び出しの遅延の分布
+        faults: 障害の種類ごとの発生確率
+        outputs: 出力の型名ごとの上書き
+        rate_limit_storms: すべての呼び出しが 429 になる時間帯（最初の呼び出しからの開始秒と長さ）
+        hang_seconds: "hang" の障害で応答を止める秒数
+        seed: 乱数のシード（同じシードなら同じ順序で障害が起きる）
+        array_length: 生成する出力のリストの長さ
+    """
+
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    faults: Dict[str, float] = field(default_factory=dict)
+    outputs: Dict[str, OutputScenario] = field(default_factory=dict)
+    rate_limit_storms: List[Tuple[float, float]] = field(default_factory=list)
+    hang_seconds: float = 60.0
+    seed: Optional[int] = None
+    array_length: int = 3
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Scenario":
+        """JSONから読み込んだ辞書からシナリオを作る（不正な値は ValueError）."""
+        outputs = {
+            name: OutputScenario(
+                latency=LatencyDistribution(**spec["latency"]) if "latency" in spec else None,
+                faults=_parse_faults(spec["faults"]) if "faults" in spec else None,
+            )
+            for name, spec in data.get("outputs", {}).items()
+        }
+        return cls(
+            latency=LatencyDistribution(**data.get("latency", {})),
+            faults=_parse_faults(data.get("faults", {})),
+            outputs=outputs,
+            rate_limit_storms=[
+                (float(storm["start"]), float(storm["duration"]))
+                for storm in data.get("rate_limit_storms", [])
+            ],
+            hang_seconds=float(data.get("hang_seconds", 60.0)),
+            seed=data.get("seed"),
+            array_length=int(data.get("array_length", 3)),
+        )
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "Scenario":
+        """シナリオファイル（JSON）を読み込む."""
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def for_output(self, output_name: Optional[str]) -> Tuple[LatencyDistribution, Dict[str, float]]:
+        """出力の型名に対する遅延の分布と障害の確率."""
+        override = self.outputs.get(output_name or "", OutputScenario())
+        return (
+            override.latency if override.latency is not None else self.latency,
+            override.faults if override.faults is not None else self.faults,
+        )
+
+
+class ScenarioModel(FakeModel):
+    """
+    シナリオに従って遅延と障害を注入する偽モデル.
+
+    呼び出し回数（障害を含む）は calls に、注入した障害の種類ごとの回数は faults に、
+    正しい応答を返した回数は succeeded に記録する。
+    """
+
+    def __init__(self, scenario: Scenario):
+        super().__init__(array_length=scenario.array_length)
+        self.scenario = scenario
+        self.faults: Counter = Counter()
+        self.succeeded = 0
+        self._rng = random.Random(scenario.seed)
+        self._started: Optional[float] = None
+
+    def _in_storm(self) -> bool:
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now
+        elapsed = now - self._started
+        return any(start <= elapsed < start + duration for start, duration in self.scenario.rate_limit_storms)
+
+    def _draw_fault(self, faults: Dict[str, float]) -> Optional[str]:
+        roll = self._rng.random()
+        for name, rate in faults.items():
+            if roll < rate:
+                return name
+            roll -= rate
+        return None
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        *,
+        previous_response_id=None,
+        conversation_id=None,
+        prompt=None,
+    ) -> ModelResponse:
+        output_name = output_schema.name() if output_schema is not None else None
+        latency, faults = self.scenario.for_output(output_name)
+        fault = "rate_limit" if self._in_storm() else self._draw_fault(faults)
+        delay = latency.sample(self._rng)
+        if fault == "rate_limit":
+            # レート制限はすぐに返る
+            delay = 0.0
+        elif fault == "hang":
+            delay = self.scenario.hang_seconds
+        if delay:
+            await asyncio.sleep(delay)
+
+        if fault is not None:
+            self.faults[fault] += 1
+        if fault not in (None, "malformed_json", "truncated"):
+            # 応答を返さない障害も呼び出し回数に含める
+            self.calls += 1
+        if fault == "rate_limit":
+            raise openai.RateLimitError(
+                "Rate limit reached (injected)",
+                response=httpx2.Response(429, request=_REQUEST),
+                body=None,
+            )
+        if fault == "server_error":
+            raise openai.InternalServerError(
+                "Internal server error (injected)",
+                response=httpx2.Response(500, request=_REQUEST),
+                body=None,
+            )
+        if fault == "connection_error":
+            raise openai.APIConnectionError(request=_REQUEST)
+        if fault in ("timeout", "hang"):
+            raise openai.APITimeoutError(request=_REQUEST)
+
+        response = self._respond(system_instructions, input, output_schema)
+        if fault in ("malformed_json", "truncated"):
+            text = response.output[0].content[0].text
+            response.output[0].content[0].text = (
+                "申し訳ありませんが、その形式では回答できません。" if fault == "malformed_json"
+                else text[:len(text) // 2]
+            )
+        else:
+            self.succeeded += 1
+        return response
+
+    def stream_response(self, *args, **kwargs) -> AsyncIterator[Any]:
+        raise NotImplementedError("ScenarioModel はストリーミング応答に対応していません")
+
+
+class ScenarioModelProvider(ModelProvider):
+    """すべてのモデル名に対して同じ ScenarioModel を返すプロバイダー."""
+
+    def __init__(self, scenario: Scenario):
+        self.model = ScenarioModel(scenario)
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        return self.model
@@ -8,22 +8,18 @@
 """
 import os
 import sys
-import asyncio
+import shlex
+import signal
 import argparse
 from pathlib import Path
-from typing import List
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Awaitable, List, Optional
 
-from workflows import (
-    run_multi_persona_hearing_workflow,
-    run_question_evaluation_workflow,
-)
-from models.schemas import (
-    PersonaOutput,
-    InterviewQuestion,
-    InterviewResponse,
-    HypothesisItem,
-)
+# --help や引数エラー、APIキー未設定の終了を速くするため、pydantic・エージェントSDK・asyncio などの
+# 重いモジュールは実際に使う関数の中で読み込む（tests/test_startup.py で読み込み時間を確認している）
+if TYPE_CHECKING:
+    from models.schemas import InterviewResponse
+    from models.run_report import BudgetReport, RunReport, ThemeBriefReport
+    from storage.run_index import PriorRun
 
 
 def format_personas_markdown(personas_output) -> str:
@@ -56,6 +52,48 @@ def format_personas_markdown(personas_output) -> str:
     return "\n".join(lines)
 
 
+def format_insight_clusters_markdown(interviews: List["InterviewResponse"]) -> str:
+    """ヒアリング結果の洞察のクラスタをMarkdown形式に整形."""
+    from analysis.insight_clustering import cluster_insights
+    
+    clusters = cluster_insights(interviews)
+    insights = sum(cluster.size for cluster in clusters)
+    lines = ["# 洞察のクラスタ\n"]
+    lines.append(
+        f"{len(interviews)}件のヒアリングの洞察 {insights}件を、文字n-gramの類似度で"
+        f"{len(clusters)}個のクラスタにまとめました（共通するペルソナが多い順）。\n"
+    )
+    for i, cluster in enumerate(clusters, 1):
+        if len(cluster.personas) < 2 and i > 1:
+            lines.append(f"ほかに1名だけが述べた洞察のクラスタが{len(clusters) - i + 1}個あります。\n")
+            break
+        lines.append(f"## {i}. {cluster.representatives[0]}\n")
+        lines.append(f"- **ペルソナ**: {len(cluster.personas)}名（{'、'.join(cluster.personas)}）")
+        lines.append(f"- **洞察の数**: {cluster.size}件")
+        for representative in cluster.representatives[1:]:
+            lines.append(f"- {representative}")
+        lines.append("")
+    
+    return "\n".join(lines)
+
+
+def format_persona_similarity_csv(personas_output) -> str:
+    """ペルソナ同士の類似度の行列をCSV形式に整形."""
+    import csv
+    import io
+    
+    from analysis.persona_diversity import PersonaDiversity
+    
+    personas = personas_output.personas
+    matrix = PersonaDiversity(personas).similarity_matrix()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["", *(persona.name for persona in personas)])
+    for persona, row in zip(personas, matrix):
+        writer.writerow([persona.name, *(f"{value:.3f}" for value in row)])
+    return buffer.getvalue()
+
+
 def format_questions_markdown(questions_output) -> str:
     """ヒアリング質問をMarkdown形式に整形."""
     lines = ["# 初回ヒアリング質問\n"]
@@ -71,10 +109,28 @@ def format_questions_markdown(questions_output) -> str:
     return "\n".join(lines)
 
 
-def format_interviews_markdown(interviews: List[InterviewResponse]) -> str:
+def _interview_coverage_lines(run_report: Optional["RunReport"], label: str) -> List[str]:
+    """ヒアリングの実施人数（期限による部分結果の注記を含む）の行を作る."""
+    if run_report is None:
+        return []
+    lines = [
+        f"**{label}**: {run_report.personas_total}名中 "
+        f"{run_report.interviews_completed}名にヒアリングを実施\n"
+    ]
+    if run_report.partial:
+        lines.append("> ⚠️ 実行期限によりヒアリングを途中で打ち切った部分的な結果です。\n")
+    return lines
+
+
+def format_interviews_markdown(
+    interviews: List["InterviewResponse"],
+    run_report: Optional["RunReport"] = None,
+) -> str:
     """ヒアリング結果をMarkdown形式に整形."""
     lines = ["# ヒアリング結果\n"]
     
+    lines.extend(_interview_coverage_lines(run_report, "実施状況"))
+    
     for i, interview in enumerate(interviews, 1):
         lines.append(f"## {i}. {interview.persona_name}\n")
         
@@ -96,13 +152,23 @@ def format_interviews_markdown(interviews: List[InterviewResponse]) -> str:
         
         lines.append("---\n")
     
+    if run_report is not None and run_report.not_interviewed:
+        lines.append("## ヒアリング未実施のペルソナ\n")
+        for skipped in run_report.not_interviewed:
+            lines.append(
+                f"- ペルソナ {skipped.persona_index}: {skipped.persona_name}（{skipped.reason}）"
+            )
+        lines.append("")
+    
     return "\n".join(lines)
 
 
-def format_hypotheses_markdown(hypotheses) -> str:
+def format_hypotheses_markdown(hypotheses, run_report: Optional["RunReport"] = None) -> str:
     """仮説をMarkdown形式に整形."""
     lines = ["# 課題仮説・インサイト仮説\n"]
     
+    lines.extend(_interview_coverage_lines(run_report, "仮説の根拠"))
+    
     lines.append(f"## 全体サマリー\n\n{hypotheses.synthesis_summary}\n")
     
     lines.append("## 課題仮説\n")
@@ -133,10 +199,15 @@ def format_hypotheses_markdown(hypotheses) -> str:
     return "\n".join(lines)
 
 
-def format_validation_questions_markdown(validation_questions) -> str:
+def format_validation_questions_markdown(
+    validation_questions,
+    run_report: Optional["RunReport"] = None,
+) -> str:
     """検証用質問をMarkdown形式に整形."""
     lines = ["# 仮説検証用ヒアリング項目\n"]
     
+    lines.extend(_interview_coverage_lines(run_report, "仮説の根拠"))
+    
     lines.append(f"## 検証戦略\n\n{validation_questions.validation_strategy}\n")
     
     lines.append("## 優先順位")
@@ -152,6 +223,49 @@ def format_validation_questions_markdown(validation_questions) -> str:
     return "\n".join(lines)
 
 
+def format_validation_interviews_markdown(validation_report) -> str:
+    """検証ヒアリング結果をMarkdown形式に整形."""
+    lines = ["# 検証ヒアリング結果\n"]
+    
+    lines.append(
+        f"**対象ペルソナ**: {validation_report.personas_sampled}名"
+        f"（完了 {len(validation_report.interviews)}名）\n"
+    )
+    if validation_report.partial:
+        lines.append("> ⚠️ 実行期限により検証ヒアリングを途中で打ち切った部分的な結果です。\n")
+    
+    lines.append("## 仮説ごとの集計\n")
+    lines.append("| 仮説 | 支持 | 反証 | 判断不能 | 支持率 |")
+    lines.append("|---|---:|---:|---:|---:|")
+    for tally in validation_report.tallies:
+        rate = "-" if tally.support_rate is None else f"{tally.support_rate * 100:.0f}%"
+        lines.append(
+            f"| {tally.hypothesis_id}: {tally.statement} | {tally.support} | "
+            f"{tally.refute} | {tally.inconclusive} | {rate} |"
+        )
+    lines.append("")
+    
+    lines.append("## ペルソナ別の回答\n")
+    for i, interview in enumerate(validation_report.interviews, 1):
+        lines.append(f"### {i}. {interview.persona_name}\n")
+        lines.append("**回答**:")
+        for j, answer in enumerate(interview.answers, 1):
+            lines.append(f"{j}. {answer}")
+        lines.append("")
+        lines.append("**判定**:")
+        for verdict in interview.verdicts:
+            lines.append(f"- {verdict.hypothesis_id}: {verdict.verdict} — {verdict.rationale}")
+        lines.append("\n---\n")
+    
+    if validation_report.failed:
+        lines.append("## 検証ヒアリングに失敗したペルソナ\n")
+        for failed in validation_report.failed:
+            lines.append(f"- ペルソナ {failed.persona_index}: {failed.persona_name}（{failed.reason}）")
+        lines.append("")
+    
+    return "\n".join(lines)
+
+
 def format_evaluation_report_markdown(evaluation_report) -> str:
     """評価レポートをMarkdown形式に整形."""
     lines = [f"# {evaluation_report.title}\n"]
@@ -164,6 +278,16 @@ def format_evaluation_report_markdown(evaluation_report) -> str:
     lines.append(f"- **検証質問数**: {evaluation_report.comparison.question_count_validation}問")
     lines.append(f"- **質問数の変化率**: {evaluation_report.comparison.count_change_percent:+.1f}%\n")
     
+    # 質問文の字句的な指標（ローカルで計算）
+    if evaluation_report.initial_metrics and evaluation_report.validation_metrics:
+        lines.append("| 指標 | 初回質問 | 検証質問 |")
+        lines.append("|------|----------|----------|")
+        initial, validation = evaluation_report.initial_metrics, evaluation_report.validation_metrics
+        lines.append(f"| 平均文字数 | {initial.average_length:.1f} | {validation.average_length:.1f} |")
+        lines.append(f"| 具体的な事例・数値を求める質問 | {initial.specific_ratio:.0%} | {validation.specific_ratio:.0%} |")
+        lines.append(f"| 疑問詞で広く尋ねる質問 | {initial.open_ended_ratio:.0%} | {validation.open_ended_ratio:.0%} |")
+        lines.append("")
+    
     # 総合評価
     lines.append("## 総合評価\n")
     lines.append(f"{evaluation_report.overall_assessment}\n")
@@ -222,6 +346,158 @@ def format_evaluation_report_markdown(evaluation_report) -> str:
     return "\n".join(lines)
 
 
+def format_budget_usage(budget: "BudgetReport") -> str:
+    """予算の使用状況の1行の要約（例: 「12,345 / 50,000トークン、$0.0312 / $0.50」）."""
+    tokens = f"{budget.spent_tokens:,}"
+    if budget.max_tokens is not None:
+        tokens += f" / {budget.max_tokens:,}"
+    cost = f"${budget.spent_cost:.4f}"
+    if budget.max_cost is not None:
+        cost += f" / ${budget.max_cost:.2f}"
+    return f"{tokens}トークン、{cost}"
+
+
+def format_theme_brief_usage(report: "ThemeBriefReport") -> str:
+    """テーマのブリーフによる入力トークンの削減を1行で表す."""
+    saved = report.input_tokens_without_brief - report.input_tokens
+    ratio = saved / report.input_tokens_without_brief if report.input_tokens_without_brief else 0.0
+    return (
+        f"入力トークン {report.input_tokens:,}（ブリーフなしの見積もり {report.input_tokens_without_brief:,}、"
+        f"{ratio:.0%}削減）"
+    )
+
+
+def format_run_report_markdown(run_report: "RunReport") -> str:
+    """実行のメタ情報をMarkdown形式に整形."""
+    lines = ["# 実行レポート\n"]
+    
+    lines.append("## ヒアリング実施状況\n")
+    lines.append(f"- **ペルソナ数**: {run_report.personas_total}名")
+    if run_report.personas_reused:
+        lines.append(f"- **ライブラリから再利用**: {run_report.personas_reused}名")
+    lines.append(f"- **ヒアリング実施**: {run_report.interviews_completed}名")
+    lines.append(f"- **未実施**: {len(run_report.not_interviewed)}名\n")
+    
+    diversity = run_report.persona_diversity
+    if diversity is not None:
+        from analysis.persona_diversity import DIMENSIONS
+        
+        lines.append("## ペルソナの多様性\n")
+        score = f"- **多様性スコア**: {diversity.score:.2f}"
+        if diversity.min_score is not None:
+            score += f"（下限 {diversity.min_score:.2f}）"
+        lines.append(score)
+        lines.append(f"- **ペルソナ間の平均類似度**: {diversity.mean_similarity:.2f}")
+        lines.append(f"- **ほぼ同じペルソナの組**: {diversity.near_duplicate_pairs}組\n")
+        lines.append("| 側面 | 網羅率 | 内訳 |")
+        lines.append("|---|---:|---|")
+        for dimension, label in DIMENSIONS.items():
+            counts = diversity.distribution.get(dimension, {})
+            breakdown = "、".join(f"{name} {count}" for name, count in counts.items() if count)
+            lines.append(f"| {label} | {diversity.coverage.get(dimension, 0.0):.0%} | {breakdown} |")
+        lines.append("")
+        if diversity.most_similar_pairs:
+            lines.append("**類似度の高いペルソナ**:")
+            for pair in diversity.most_similar_pairs:
+                lines.append(f"- {pair.first} と {pair.second}（{pair.similarity:.2f}）")
+            lines.append("")
+    
+    latency = run_report.latency_summary()
+    if latency is not None:
+        mode_label = {
+            "single": "1回の呼び出しで全質問に回答",
+            "per-question": "質問ごとに並行して回答",
+        }.get(run_report.interview_mode, run_report.interview_mode)
+        calls = [item.calls for item in run_report.interview_latencies]
+        lines.append("## ヒアリングの所要時間\n")
+        lines.append(f"- **実行方法**: {mode_label}（`{run_report.interview_mode}`）")
+        lines.append(f"- **1件あたりの呼び出し回数**: {max(calls)}回")
+        lines.append(f"- **計測したヒアリング**: {latency['count']}件\n")
+        lines.append("| 平均 | 中央値 | p95 | 最大 |")
+        lines.append("|---:|---:|---:|---:|")
+        lines.append(
+            f"| {latency['mean']:.1f}秒 | {latency['p50']:.1f}秒 "
+            f"| {latency['p95']:.1f}秒 | {latency['max']:.1f}秒 |"
+        )
+        lines.append("")
+    
+    hedging = run_report.hedging
+    if hedging is not None:
+        def seconds(value: Optional[float]) -> str:
+            return f"{value:.1f}秒" if value is not None else "-"
+        
+        fired_ratio = hedging.hedges_fired / hedging.calls if hedging.calls else 0.0
+        lines.append("## 重複リクエスト（ヘッジ）\n")
+        lines.append(
+            f"- **方針**: 所要時間が p{hedging.percentile * 100:g} を超えた呼び出しに重複リクエストを送信"
+            f"（上限: 呼び出しの{hedging.max_extra_fraction:.0%}）"
+        )
+        lines.append(f"- **対象の呼び出し**: {hedging.calls}回")
+        lines.append(f"- **重複リクエスト**: {hedging.hedges_fired}回（{fired_ratio:.1%}）、"
+                     f"うち{hedging.hedges_won}回は重複リクエストが先に完了\n")
+        lines.append("| 所要時間 | ヘッジあり | ヘッジなし（推定） |")
+        lines.append("|---|---:|---:|")
+        lines.append(f"| p50 | {seconds(hedging.p50_seconds)} | - |")
+        lines.append(f"| p95 | {seconds(hedging.p95_seconds)} | {seconds(hedging.unhedged_p95_seconds)} |")
+        lines.append(f"| p99 | {seconds(hedging.p99_seconds)} | {seconds(hedging.unhedged_p99_seconds)} |")
+        lines.append("")
+    
+    budget = run_report.budget
+    if budget is not None:
+        lines.append("## 予算\n")
+        lines.append(f"- **使用量 / 上限**: {format_budget_usage(budget)}")
+        lines.append(
+            f"- **単価**: 入力 ${budget.input_price_per_million:g} / "
+            f"出力 ${budget.output_price_per_million:g}（100万トークンあたり）"
+        )
+        if budget.interview_plan is not None:
+            status = "（予算に合わせて縮小）" if budget.interview_scaled_down else ""
+            lines.append(f"- **ヒアリングの計画**: {budget.interview_plan}{status}")
+        lines.append("")
+        lines.append("| フェーズ | リクエスト | 入力トークン | 出力トークン | 費用 | 確保 |")
+        lines.append("|---|---:|---:|---:|---:|---:|")
+        for entry in budget.entries:
+            label = entry.label if entry.started else f"{entry.label}（未実施）"
+            reserved = f"{entry.reserved_tokens:,}" if entry.reserved_tokens else "-"
+            lines.append(
+                f"| {label} | {entry.requests} | {entry.input_tokens:,} | {entry.output_tokens:,} "
+                f"| ${entry.cost:.4f} | {reserved} |"
+            )
+        lines.append("")
+    
+    theme_brief = run_report.theme_brief
+    if theme_brief is not None:
+        source = "キャッシュ" if theme_brief.cached else f"生成に入力 {theme_brief.brief_input_tokens:,}トークン"
+        lines.append("## テーマのブリーフ\n")
+        lines.append(
+            f"- **テーマ**: {theme_brief.theme_tokens:,}トークン → ブリーフ {theme_brief.brief_tokens:,}トークン"
+            f"（{source}）"
+        )
+        lines.append(f"- **ブリーフを使ったプロンプト**: {theme_brief.prompts_with_brief}件")
+        if theme_brief.full_text_phases:
+            lines.append(f"- **元のテーマを使ったフェーズ**: {', '.join(theme_brief.full_text_phases)}")
+        lines.append(f"- **実行全体**: {format_theme_brief_usage(theme_brief)}\n")
+    
+    if run_report.deadline_seconds is not None:
+        lines.append("## 実行期限\n")
+        lines.append(f"- **期限**: {run_report.deadline_seconds:g}秒")
+        status = "期限により打ち切り（部分的な結果）" if run_report.partial else "期限内に完了"
+        lines.append(f"- **結果**: {status}\n")
+    
+    if run_report.saturation_threshold is not None:
+        lines.append("## 飽和判定\n")
+        lines.append(f"- **新規性しきい値**: {run_report.saturation_threshold:.2f}")
+        status = "到達（以降のヒアリングを打ち切り）" if run_report.saturation_reached else "未到達"
+        lines.append(f"- **飽和**: {status}\n")
+        lines.append("| ヒアリング順 | 新規性 |")
+        lines.append("|---:|---:|")
+        for i, score in enumerate(run_report.saturation_curve, 1):
+            lines.append(f"| {i} | {score:.2f} |")
+        lines.append("")
+    
+    return "\n".join(lines)
+
+
 def save_results(
     output_dir: Path,
     personas_output,
@@ -230,44 +506,753 @@ def save_results(
     hypotheses,
     validation_questions,
     evaluation_report=None,
+    run_report=None,
+    validation_interviews=None,
+    skip_unchanged: bool = False,
 ):
-    """結果を複数のMarkdownファイルとして保存."""
+    """
+    結果を複数のMarkdownファイルとして保存.
+
+    skip_unchanged が True の場合、入力データとレンダラーの実装が前回の
+    保存時から変わっていないファイルは書き込みを省略する（ダイジェストはこの場合だけ求める）。
+    中断された実行でまだ完了していないフェーズ（None）のファイルは作らない。
+    """
+    from storage import load_render_manifest, render_digest, save_render_manifest
+    from workflows.tracing import trace_span
+    
     output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_render_manifest(output_dir)
+    
+    targets = [
+        # 1. ペルソナ情報
+        ("personas.md", "ペルソナ情報", format_personas_markdown, (personas_output,)),
+        # ペルソナ間の類似度の行列
+        (
+            "persona_similarity.csv",
+            "ペルソナ間の類似度",
+            format_persona_similarity_csv,
+            (personas_output,),
+        ),
+        # 2. 初回ヒアリング質問
+        ("initial_questions.md", "初回質問", format_questions_markdown, (questions_output,)),
+        # 3. ヒアリング結果
+        (
+            "interview_results.md",
+            "ヒアリング結果",
+            format_interviews_markdown,
+            (interviews, run_report),
+        ),
+        # 洞察のクラスタ
+        ("insight_clusters.md", "洞察のクラスタ", format_insight_clusters_markdown, (interviews,)),
+        # 4. 仮説
+        ("hypotheses.md", "仮説", format_hypotheses_markdown, (hypotheses, run_report)),
+        # 5. 検証用質問
+        (
+            "validation_questions.md",
+            "検証用質問",
+            format_validation_questions_markdown,
+            (validation_questions, run_report),
+        ),
+    ]
+    # 6. 検証ヒアリング結果（存在する場合）
+    if validation_interviews is not None:
+        targets.append(
+            (
+                "validation_interview_results.md",
+                "検証ヒアリング結果",
+                format_validation_interviews_markdown,
+                (validation_interviews,),
+            )
+        )
+    # 7. 評価レポート（存在する場合）
+    if evaluation_report:
+        targets.append(
+            ("evaluation.md", "評価レポート", format_evaluation_report_markdown, (evaluation_report,))
+        )
+    # 8. 実行レポート（存在する場合）
+    if run_report is not None:
+        targets.append(
+            ("run_report.md", "実行レポート", format_run_report_markdown, (run_report,))
+        )
+    
+    manifest_changed = False
+    for filename, label, formatter, inputs in targets:
+        if inputs[0] is None:
+            continue
+        path = output_dir / filename
+        digest = render_digest(formatter, inputs) if skip_unchanged else None
+        if digest is not None and manifest.get(filename) == digest and path.exists():
+            print(f"⏭️  {label}は変更なし: {path}")
+            continue
+        with trace_span("write", {"file.name": filename}):
+            path.write_text(formatter(*inputs), encoding="utf-8")
+        if digest is not None:
+            manifest[filename] = digest
+            manifest_changed = True
+        elif manifest.pop(filename, None) is not None:
+            # 書き直したファイルには、以前のダイジェストはもう対応しない
+            manifest_changed = True
+        print(f"✅ {label}を保存: {path}")
     
-    # 1. ペルソナ情報
-    personas_md = format_personas_markdown(personas_output)
-    (output_dir / "personas.md").write_text(personas_md, encoding="utf-8")
-    print(f"✅ ペルソナ情報を保存: {output_dir / 'personas.md'}")
+    if manifest_changed:
+        save_render_manifest(output_dir, manifest)
+
+
+def render_main(argv: List[str]) -> None:
+    """保存済みアーティファクトからMarkdownを再生成する（LLM呼び出しなし）."""
+    parser = argparse.ArgumentParser(
+        prog="main.py render",
+        description="保存済みの構造化アーティファクトからMarkdownを再生成します（APIキー不要）",
+    )
+    parser.add_argument(
+        "run_dir",
+        type=str,
+        help="過去の実行の出力ディレクトリ（artifacts/ を含む）",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="変更がないファイルも含めてすべて再生成する",
+    )
+    args = parser.parse_args(argv)
     
-    # 2. 初回ヒアリング質問
-    questions_md = format_questions_markdown(questions_output)
-    (output_dir / "initial_questions.md").write_text(questions_md, encoding="utf-8")
-    print(f"✅ 初回質問を保存: {output_dir / 'initial_questions.md'}")
+    from storage import load_artifacts
     
-    # 3. ヒアリング結果
-    interviews_md = format_interviews_markdown(interviews)
-    (output_dir / "interview_results.md").write_text(interviews_md, encoding="utf-8")
-    print(f"✅ ヒアリング結果を保存: {output_dir / 'interview_results.md'}")
+    run_dir = Path(args.run_dir).expanduser().resolve()
+    try:
+        artifacts = load_artifacts(run_dir, allow_partial=True)
+    except FileNotFoundError as e:
+        print(f"❌ エラー: {e}", file=sys.stderr)
+        sys.exit(1)
     
-    # 4. 仮説
-    hypotheses_md = format_hypotheses_markdown(hypotheses)
-    (output_dir / "hypotheses.md").write_text(hypotheses_md, encoding="utf-8")
-    print(f"✅ 仮説を保存: {output_dir / 'hypotheses.md'}")
+    save_results(
+        run_dir,
+        artifacts.personas_output,
+        artifacts.questions_output,
+        artifacts.interviews,
+        artifacts.hypotheses,
+        artifacts.validation_questions,
+        evaluation_report=artifacts.evaluation_report,
+        run_report=artifacts.run_report,
+        validation_interviews=artifacts.validation_interviews,
+        skip_unchanged=not args.force,
+    )
+
+
+async def run_pipeline(
+    args, theme: str, checkpoint, deadline, verbose: bool, hedging=None, budget=None, cassette=None,
+    persona_library=None, theme_briefing=None, batch=None,
+) -> None:
+    """
+    ヒアリング・検証ヒアリング・質問セット評価を順に実行する.
+
+    各フェーズの結果は checkpoint（CheckpointWriter）に蓄積される。
+    checkpoint の初期状態に完了済みのフェーズがあれば、その部分は再実行しない。
+    hedging（HedgingPolicy）は全ワークフローで共有し、送信状況を実行レポートに記録する。
+    budget（RunBudget）も全ワークフローで共有し、実行全体の使用量を上限内に収める。
+    cassette（Cassette）を指定すると、全ワークフローの呼び出しを記録または再生する。
+    persona_library（PersonaLibrary）を指定すると、類似するテーマのペルソナを再利用する。
+    theme_briefing（ThemeBriefing）を指定すると、長いテーマを最初に要約して各フェーズで使う。
+    batch（BatchSubmitter）を指定すると、フェーズ3のヒアリングをバッチAPIにまとめて提出する。
+    """
+    from workflows import (
+        ThemeBriefCache,
+        run_multi_persona_hearing_workflow,
+        run_validation_interview_workflow,
+        run_question_evaluation_workflow,
+        run_theme_brief_workflow,
+    )
     
-    # 5. 検証用質問
-    validation_md = format_validation_questions_markdown(validation_questions)
-    (output_dir / "validation_questions.md").write_text(validation_md, encoding="utf-8")
-    print(f"✅ 検証用質問を保存: {output_dir / 'validation_questions.md'}")
+    state = checkpoint.state
+    if theme_briefing is not None:
+        await run_theme_brief_workflow(
+            theme_briefing,
+            cache=ThemeBriefCache(Path(args.theme_brief_cache).expanduser()),
+            verbose=verbose,
+            on_event=checkpoint,
+            call_timeout=args.call_timeout,
+            budget=budget,
+            cassette=cassette,
+        )
+    result = await run_multi_persona_hearing_workflow(
+        theme=theme,
+        num_personas=args.num_personas,
+        verbose=verbose,
+        saturation_threshold=args.saturation_threshold,
+        saturation_patience=args.saturation_patience,
+        max_concurrency=args.max_concurrency,
+        on_event=checkpoint,
+        deadline=deadline,
+        call_timeout=args.call_timeout,
+        resume_from=state,
+        interview_mode=args.interview_mode,
+        question_group_size=args.question_group_size,
+        hedging=hedging,
+        budget=budget,
+        cassette=cassette,
+        persona_library=persona_library,
+        theme_briefing=theme_briefing,
+        min_persona_diversity=args.min_persona_diversity,
+        batch=batch,
+    )
+    # チェックポイントは完了順なので、ペルソナ順に並んだ最終結果で置き換える
+    state.interviews = result.interviews
     
-    # 6. 評価レポート（存在する場合）
-    if evaluation_report:
-        evaluation_md = format_evaluation_report_markdown(evaluation_report)
-        (output_dir / "evaluation.md").write_text(evaluation_md, encoding="utf-8")
-        print(f"✅ 評価レポートを保存: {output_dir / 'evaluation.md'}")
+    # 期限を過ぎた場合、任意のフェーズ（検証ヒアリング・評価）は実行しない
+    deadline_expired = deadline is not None and deadline.expired
+    if deadline_expired and verbose:
+        print("⏰ 実行期限を過ぎたため、検証ヒアリングと質問セット評価をスキップします")
+    
+    # 検証ヒアリング（フェーズ6）
+    if args.validation_interviews and not deadline_expired and state.validation_interviews is None:
+        await run_validation_interview_workflow(
+            theme=theme,
+            personas_output=result.personas_output,
+            hypotheses=result.hypotheses,
+            validation_questions=result.validation_questions,
+            sample_size=args.validation_sample,
+            max_concurrency=args.max_concurrency,
+            verbose=verbose,
+            on_event=checkpoint,
+            deadline=deadline,
+            call_timeout=args.call_timeout,
+            hedging=hedging,
+            budget=budget,
+            cassette=cassette,
+            theme_briefing=theme_briefing,
+        )
+    
+    # 質問セット評価ワークフロー実行
+    if deadline_expired or state.evaluation_report is not None:
+        return
+    if verbose:
+        print()
+        print("=" * 80)
+        print("📊 質問セット評価を実行します...")
+        print("=" * 80)
+        print()
+    
+    try:
+        await run_question_evaluation_workflow(
+            theme=theme,
+            initial_questions=result.questions_output,
+            validation_questions=result.validation_questions,
+            hypotheses=result.hypotheses,
+            verbose=verbose,
+            mode=args.evaluation_mode,
+            on_event=checkpoint,
+            call_timeout=args.call_timeout,
+            hedging=hedging,
+            budget=budget,
+            cassette=cassette,
+            theme_briefing=theme_briefing,
+        )
+    except Exception as e:
+        if verbose:
+            print(f"⚠️ 評価ワークフロー実行時にエラーが発生しました: {e}")
+            print("   メインのワークフロー結果は保存されています")
+
+
+async def run_interruptible(pipeline: Awaitable[None]) -> bool:
+    """
+    SIGINT/SIGTERM で中断できるように pipeline を実行する.
+
+    1回目のシグナルでは実行中のエージェント呼び出しをキャンセルして
+    正常に戻る（完了済みの結果を保存できるようにする）。
+    2回目のシグナルではその場で強制終了する。
+
+    Returns:
+        bool: シグナルにより中断された場合は True
+    """
+    import asyncio
+    
+    loop = asyncio.get_running_loop()
+    task = asyncio.ensure_future(pipeline)
+    interrupted = False
+    
+    def on_signal() -> None:
+        nonlocal interrupted
+        if interrupted:
+            print("\n❌ 強制終了します", file=sys.stderr)
+            os._exit(130)
+        interrupted = True
+        print(
+            "\n⏹️  中断しています...完了済みの結果を保存します（もう一度押すと強制終了）",
+            file=sys.stderr,
+        )
+        task.cancel()
+    
+    installed = []
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, on_signal)
+            installed.append(sig)
+        except (NotImplementedError, RuntimeError):
+            # Windows などシグナルハンドラを登録できない環境では従来どおり KeyboardInterrupt になる
+            pass
+    
+    try:
+        await task
+        return False
+    except asyncio.CancelledError:
+        if not interrupted:
+            raise
+        return True
+    finally:
+        for sig in installed:
+            loop.remove_signal_handler(sig)
+
+
+DUPLICATE_ACTIONS = ("ask", "reuse", "fork", "new")
+
+
+def choose_duplicate_action(prior: "PriorRun", on_duplicate: str) -> str:
+    """
+    ほぼ同じテーマの以前の実行があった場合の扱いを決める.
+
+    on_duplicate が "ask" の場合は対話的に確認する（端末から実行していなければ "new"）。
+
+    Returns:
+        "reuse"（以前の結果を使う）、"fork"（以前のペルソナと質問から実行する）、"new"（最初から実行する）
+    """
+    if on_duplicate != "ask":
+        return on_duplicate
+    if not sys.stdin.isatty():
+        print("   端末から実行していないため、新しく実行します（--on-duplicate で指定できます）")
+        return "new"
+    answers = {"r": "reuse", "f": "fork", "n": "new", "": "new"}
+    while True:
+        answer = input("   [r] 以前の結果を使う / [f] 以前のペルソナと質問から実行 / [n] 新しく実行 (n): ")
+        action = answers.get(answer.strip().lower())
+        if action is not None:
+            return action
+
+
+def reuse_prior_run(prior_dir: Path, output_dir: Path) -> None:
+    """以前の実行のアーティファクトを出力ディレクトリに写し、Markdownを生成する（LLM呼び出しなし）."""
+    import shutil
+    from storage import artifacts_dir, clear_artifacts, load_artifacts
+    
+    if prior_dir.resolve() != output_dir.resolve():
+        clear_artifacts(output_dir)
+        shutil.copytree(artifacts_dir(prior_dir), artifacts_dir(output_dir), dirs_exist_ok=True)
+    artifacts = load_artifacts(output_dir, allow_partial=True)
+    save_results(
+        output_dir,
+        artifacts.personas_output,
+        artifacts.questions_output,
+        artifacts.interviews,
+        artifacts.hypotheses,
+        artifacts.validation_questions,
+        evaluation_report=artifacts.evaluation_report,
+        run_report=artifacts.run_report,
+        validation_interviews=artifacts.validation_interviews,
+    )
+
+
+def resume_command(argv: List[str]) -> str:
+    """中断した実行を再開するためのコマンドラインを返す."""
+    args = [arg for arg in argv[1:] if arg != "--resume"]
+    return " ".join(shlex.quote(arg) for arg in ["python", argv[0], *args, "--resume"])
+
+
+def serve_main(argv: List[str]) -> None:
+    """ヒアリングジョブを受け付けるHTTPサーバーを起動する."""
+    parser = argparse.ArgumentParser(
+        prog="main.py serve",
+        description="ヒアリングジョブの投入・状態取得・結果取得・キャンセルを受け付けるHTTPサーバー",
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="待ち受けるアドレス（デフォルト: 127.0.0.1）")
+    parser.add_argument("--port", type=int, default=8080, help="待ち受けるポート（デフォルト: 8080）")
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=4,
+        help="同時に実行するジョブの最大数。超えたジョブは queued で待機する（デフォルト: 4）",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=None,
+        help="完了したジョブのアーティファクトを <output-dir>/<job_id>/ に保存する（デフォルト: 保存しない）",
+    )
+    parser.add_argument(
+        "--fake-backend",
+        action="store_true",
+        help="OpenAI APIを呼び出さず、スキーマから生成した偽の応答で動かす（ローカル検証用）",
+    )
+    args = parser.parse_args(argv)
+    if args.max_jobs < 1:
+        parser.error("--max-jobs は1以上を指定してください")
+    
+    from dotenv import load_dotenv
+    load_dotenv()
+    if not args.fake_backend and not os.getenv("OPENAI_API_KEY"):
+        print("❌ エラー: OPENAI_API_KEY が設定されていません", file=sys.stderr)
+        print("   ローカルで試す場合は --fake-backend を指定してください", file=sys.stderr)
+        sys.exit(1)
+    
+    import asyncio
+    from agents import RunConfig
+    from service import HearingHTTPServer, JobManager
+    
+    run_config = None
+    if args.fake_backend:
+        from backends import FakeModelProvider
+        run_config = RunConfig(model_provider=FakeModelProvider(), tracing_disabled=True)
+    else:
+        # すべてのジョブのエージェント呼び出しで接続プールを共有する
+        from agent_definitions import OpenAIClientSettings, configure_openai_client
+        configure_openai_client(OpenAIClientSettings(max_connections=max(20, args.max_jobs * 5)))
+    output_root = Path(args.output_dir).expanduser().resolve() if args.output_dir else None
+    
+    async def serve() -> None:
+        manager = JobManager(
+            max_running_jobs=args.max_jobs, run_config=run_config, output_root=output_root
+        )
+        server = HearingHTTPServer(manager, host=args.host, port=args.port)
+        await server.start()
+        print(f"🚀 http://{server.host}:{server.port} で待ち受けています（Ctrl-C で終了）")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+    
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("\n⏹️  サーバーを停止しました")
+
+
+def _add_job_option_arguments(parser: argparse.ArgumentParser) -> None:
+    """キューに投入するジョブのワークフローオプション（未指定ならワークフローのデフォルト）."""
+    parser.add_argument("--num-personas", type=int, default=None, help="生成するペルソナの数")
+    parser.add_argument("--saturation-threshold", type=float, default=None, help="飽和判定の新規性のしきい値")
+    parser.add_argument("--saturation-patience", type=int, default=None, help="飽和とみなす低新規性ヒアリングの連続件数")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="ジョブ内で同時に実行するヒアリングの最大数")
+    parser.add_argument("--call-timeout", type=float, default=None, help="エージェント呼び出し1回あたりのタイムアウト（秒）")
+    parser.add_argument("--deadline", type=float, default=None, help="ジョブ1件あたりの実行期限（秒）")
+
+
+def enqueue_main(argv: List[str]) -> None:
+    """テーマをSQLiteジョブキューに追加する."""
+    parser = argparse.ArgumentParser(
+        prog="main.py enqueue",
+        description="テーマをジョブキューに追加する（`main.py worker` が処理する）",
+    )
+    parser.add_argument("--queue", type=str, required=True, help="ジョブキューのSQLiteファイル")
+    parser.add_argument("--theme", type=str, action="append", default=[], help="テーマ（複数指定可）")
+    parser.add_argument("--input", type=str, nargs="+", default=[], help="テーマが記載されたファイル（複数指定可）")
+    parser.add_argument(
+        "--output-root",
+        type=str,
+        default="outputs/queue",
+        help="ジョブごとの出力ディレクトリを作成する場所（デフォルト: outputs/queue）",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="失敗・ワーカーの異常終了時を含め、1件のジョブを実行する最大回数（デフォルト: 3）",
+    )
+    _add_job_option_arguments(parser)
+    args = parser.parse_args(argv)
+    if not args.theme and not args.input:
+        parser.error("--theme または --input を指定してください")
+    
+    from hashlib import sha1
+    from service import parse_job_options
+    from storage.job_queue import JobQueue
+    
+    options = {
+        name: getattr(args, name)
+        for name in (
+            "num_personas", "saturation_threshold", "saturation_patience",
+            "max_concurrency", "call_timeout", "deadline",
+        )
+        if getattr(args, name) is not None
+    }
+    try:
+        options = parse_job_options(options)
+        queue = JobQueue(args.queue, max_attempts=args.max_attempts)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    output_root = Path(args.output_root).expanduser().resolve()
+    # (出力ディレクトリ名, テーマ)
+    entries = []
+    for theme in args.theme:
+        digest = sha1(theme.encode("utf-8")).hexdigest()[:10]
+        entries.append((f"theme-{digest}", theme))
+    for input_file in args.input:
+        input_path = Path(input_file).expanduser().resolve()
+        if not input_path.exists():
+            print(f"❌ エラー: 入力ファイルが見つかりません: {input_path}", file=sys.stderr)
+            sys.exit(1)
+        entries.append((input_path.stem, input_path.read_text(encoding="utf-8")))
+    
+    for dirname, theme in entries:
+        job_id = queue.enqueue(theme, output_root / dirname, options)
+        print(f"➕ ジョブ{job_id}: {output_root / dirname}")
+    counts = queue.counts()
+    queue.close()
+    print(f"📋 キュー: 待機 {counts['pending']}件 / 実行中 {counts['running']}件 / "
+          f"完了 {counts['succeeded']}件 / 失敗 {counts['failed']}件")
+
+
+def _run_queue_worker(options: dict) -> int:
+    """1プロセス分のワーカーを実行する（--processes で起動する子プロセスの入口）."""
+    import asyncio
+    from agents import RunConfig
+    from backends import RateLimitedModelProvider
+    from service.worker import QueueWorker
+    from storage.job_queue import JobQueue
+    from storage.rate_limiter import SharedRateLimiter
+    
+    if options["fake_backend"]:
+        from backends import FakeModelProvider
+        provider = FakeModelProvider()
+    else:
+        from agents import MultiProvider
+        from agent_definitions import configure_openai_client
+        configure_openai_client()
+        provider = MultiProvider()
+    if options["rpm"] is not None:
+        limiter = SharedRateLimiter(options["queue"], options["rpm"])
+        provider = RateLimitedModelProvider(provider, limiter)
+    run_config = RunConfig(model_provider=provider, tracing_disabled=options["fake_backend"])
+    
+    queue = JobQueue(options["queue"], visibility_timeout=options["visibility_timeout"])
+    worker = QueueWorker(queue, run_config=run_config, poll_interval=options["poll_interval"])
+    try:
+        return asyncio.run(worker.run(stop_when_empty=options["exit_when_empty"]))
+    except KeyboardInterrupt:
+        # リース中のジョブは返却済み（次のワーカーが続きから処理する）
+        return 0
+    finally:
+        queue.close()
+
+
+def worker_main(argv: List[str]) -> None:
+    """SQLiteジョブキューのジョブを処理するワーカーを起動する."""
+    parser = argparse.ArgumentParser(
+        prog="main.py worker",
+        description="ジョブキューからジョブをリースしてヒアリングを実行するワーカー",
+    )
+    parser.add_argument("--queue", type=str, required=True, help="ジョブキューのSQLiteファイル")
+    parser.add_argument("--processes", type=int, default=1, help="起動するワーカープロセスの数（デフォルト: 1）")
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        default=None,
+        help="全ワーカー合計のAPI呼び出し数の上限（1分あたり）。キューのファイルで共有する（デフォルト: 無制限）",
+    )
+    parser.add_argument(
+        "--visibility-timeout",
+        type=float,
+        default=300.0,
+        help="リースの有効期限（秒）。ハートビートが途絶えたジョブはこの時間後に回収される（デフォルト: 300）",
+    )
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="キューが空の場合の確認間隔（秒）")
+    parser.add_argument("--exit-when-empty", action="store_true", help="キューが空になったら終了する")
+    parser.add_argument(
+        "--fake-backend",
+        action="store_true",
+        help="OpenAI APIを呼び出さず、スキーマから生成した偽の応答で動かす（ローカル検証用）",
+    )
+    args = parser.parse_args(argv)
+    if args.processes < 1:
+        parser.error("--processes は1以上を指定してください")
+    if args.rpm is not None and args.rpm <= 0:
+        parser.error("--rpm は0より大きい値を指定してください")
+    if args.visibility_timeout <= 0:
+        parser.error("--visibility-timeout は0より大きい秒数を指定してください")
+    
+    from dotenv import load_dotenv
+    load_dotenv()
+    if not args.fake_backend and not os.getenv("OPENAI_API_KEY"):
+        print("❌ エラー: OPENAI_API_KEY が設定されていません", file=sys.stderr)
+        sys.exit(1)
+    
+    options = {
+        "queue": str(Path(args.queue).expanduser().resolve()),
+        "rpm": args.rpm,
+        "visibility_timeout": args.visibility_timeout,
+        "poll_interval": args.poll_interval,
+        "exit_when_empty": args.exit_when_empty,
+        "fake_backend": args.fake_backend,
+    }
+    if args.processes == 1:
+        processed = _run_queue_worker(options)
+        print(f"🏁 {processed}件のジョブを処理しました")
+        return
+    
+    import multiprocessing
+    
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_run_queue_worker, args=(options,), name=f"worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # 子プロセスにも SIGINT が届くので、リースを返却して終了するのを待つ
+        for process in processes:
+            process.join()
+    print(f"🏁 {args.processes}個のワーカープロセスが終了しました")
+
+
+def format_load_test_report(report) -> str:
+    """負荷試験の結果をコンソール表示用に整形."""
+    def seconds(value: Optional[float]) -> str:
+        return f"{value:.2f}秒" if value is not None else "-"
+    
+    lines = [
+        f"実行: {report.runs_succeeded}/{report.runs}件が完了（同時実行 {report.concurrency}）、"
+        f"所要時間 {report.elapsed:.1f}秒",
+        f"ヒアリング: 完了 {report.interviews_completed}件 / 失敗 {report.interviews_failed}件、"
+        f"スループット {report.interviews_per_minute:.1f}件/分",
+        f"ヒアリングの所要時間: p50 {seconds(report.latency_percentile(0.5))} / "
+        f"p95 {seconds(report.latency_percentile(0.95))} / p99 {seconds(report.latency_percentile(0.99))}",
+    ]
+    if report.model_calls is not None:
+        lines.append(f"モデルの呼び出し: {report.model_calls}回")
+    if report.faults:
+        lines.append("注入した障害: " + "、".join(f"{name} {count}回" for name, count in sorted(report.faults.items())))
+    lines.append(
+        "再試行: " + ("、".join(f"{name} {count}回" for name, count in sorted(report.retries.items())) or "なし")
+    )
+    for error in report.run_errors:
+        lines.append(f"失敗した実行: {error}")
+    return "\n".join(lines)
+
+
+def load_test_main(argv: List[str]) -> None:
+    """シナリオに従って遅延と障害を注入した偽のバックエンドで、ヒアリングワークフローの負荷試験を行う."""
+    parser = argparse.ArgumentParser(
+        prog="main.py load-test",
+        description="シナリオファイルに従って遅延と障害（429・タイムアウト・不正なJSONなど）を注入し、"
+                    "APIを呼び出さずにヒアリングワークフローの負荷試験を行う",
+    )
+    parser.add_argument(
+        "--scenario",
+        type=str,
+        default=None,
+        help="シナリオファイル（JSON）。省略すると遅延・障害なし",
+    )
+    parser.add_argument("--theme", type=str, default="負荷試験", help="ヒアリングのテーマ（デフォルト: 負荷試験）")
+    parser.add_argument("--runs", type=int, default=4, help="実行するワークフローの数（デフォルト: 4）")
+    parser.add_argument("--concurrency", type=int, default=2, help="同時に実行するワークフローの数（デフォルト: 2）")
+    parser.add_argument("--num-personas", type=int, default=5, help="1回の実行のペルソナ数（デフォルト: 5）")
+    parser.add_argument("--max-concurrency", type=int, default=5, help="1回の実行で同時に行うヒアリングの数（デフォルト: 5）")
+    parser.add_argument("--call-timeout", type=float, default=None, help="エージェント呼び出し1回あたりのタイムアウト（秒）")
+    parser.add_argument(
+        "--interview-mode",
+        choices=["single", "per-question"],
+        default="single",
+        help="ヒアリングの実行方法（デフォルト: single）",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="結果をJSONファイルにも書き出す（変更前後の比較用）",
+    )
+    args = parser.parse_args(argv)
+    if args.runs < 1 or args.concurrency < 1:
+        parser.error("--runs と --concurrency は1以上を指定してください")
+    
+    import asyncio
+    import json
+    from dataclasses import asdict
+    from agents import RunConfig
+    from backends import Scenario, ScenarioModelProvider
+    from service import run_load_test
+    
+    try:
+        scenario = Scenario.from_file(args.scenario) if args.scenario else Scenario()
+    except (OSError, ValueError, TypeError) as e:
+        print(f"❌ エラー: シナリオを読み込めません: {e}", file=sys.stderr)
+        sys.exit(1)
+    provider = ScenarioModelProvider(scenario)
+    run_config = RunConfig(model_provider=provider, tracing_disabled=True)
+    
+    print(f"🔥 負荷試験: {args.runs}回の実行（同時実行 {args.concurrency}、ペルソナ {args.num_personas}名）")
+    report = asyncio.run(run_load_test(
+        args.theme,
+        run_config,
+        runs=args.runs,
+        concurrency=args.concurrency,
+        model=provider.model,
+        num_personas=args.num_personas,
+        max_concurrency=args.max_concurrency,
+        call_timeout=args.call_timeout,
+        interview_mode=args.interview_mode,
+    ))
+    print(format_load_test_report(report))
+    if args.output:
+        output = Path(args.output).expanduser()
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(
+            json.dumps(
+                {**asdict(report), "interviews_per_minute": report.interviews_per_minute},
+                ensure_ascii=False,
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        print(f"結果: {output}")
+
+
+def trace_main(argv: List[str]) -> None:
+    """--trace で書き出したトレースをタイムラインとして表示する."""
+    parser = argparse.ArgumentParser(
+        prog="main.py trace",
+        description="--trace で書き出したトレース（OTLP/JSON）を、スパンのタイムラインとして表示します",
+    )
+    parser.add_argument("path", type=str, help="トレースファイル（--trace の出力）")
+    parser.add_argument("--width", type=int, default=40, help="タイムラインのバーの幅（デフォルト: 40）")
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=None,
+        help="表示するスパンの深さの上限（0 は最上位のスパンのみ。省略するとすべて）",
+    )
+    args = parser.parse_args(argv)
+    if args.width < 1:
+        parser.error("--width は1以上を指定してください")
+    
+    from workflows.tracing import format_trace_timeline, load_trace
+    
+    try:
+        spans = load_trace(Path(args.path).expanduser())
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ エラー: トレースを読み込めません: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(format_trace_timeline(spans, width=args.width, max_depth=args.max_depth))
+
+
+# 通常実行（--theme / --input）以外のサブコマンド
+SUBCOMMANDS = {
+    "render": render_main,
+    "trace": trace_main,
+    "serve": serve_main,
+    "enqueue": enqueue_main,
+    "worker": worker_main,
+    "load-test": load_test_main,
+}
 
 
 def main():
     """メインエントリーポイント."""
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        SUBCOMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(
         description="複数ペルソナヒアリングシステム",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -284,6 +1269,16 @@ def main():
   
   # 出力先を指定
   python main.py --theme "健康管理アプリ" --output-dir outputs/health_app
+  
+  # 保存済みの結果からMarkdownだけを再生成（LLM呼び出しなし）
+  python main.py render outputs/health_app
+  
+  # ジョブを受け付けるHTTPサーバーを起動
+  python main.py serve --port 8080 --max-jobs 4
+  
+  # テーマをジョブキューに追加し、4プロセスのワーカーで処理
+  python main.py enqueue --queue queue.db --input inputs/*.md
+  python main.py worker --queue queue.db --processes 4 --rpm 300
 """,
     )
     
@@ -313,6 +1308,257 @@ def main():
         help="出力ディレクトリのパス（デフォルト: outputs）",
     )
     
+    parser.add_argument(
+        "--saturation-threshold",
+        type=float,
+        default=None,
+        help="新規性（0-1）がこの値を下回るヒアリングが続いたら打ち切る（デフォルト: 無効）",
+    )
+    
+    parser.add_argument(
+        "--saturation-patience",
+        type=int,
+        default=3,
+        help="飽和とみなす低新規性ヒアリングの連続件数（デフォルト: 3）",
+    )
+    
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=5,
+        help="同時に実行するヒアリングの最大数（デフォルト: 5）",
+    )
+    
+    parser.add_argument(
+        "--interview-mode",
+        choices=["single", "per-question"],
+        default="single",
+        help="ヒアリングの実行方法。per-question は質問ごとに並行して回答させ、最後に洞察を抽出する（デフォルト: single）",
+    )
+    
+    parser.add_argument(
+        "--question-group-size",
+        type=int,
+        default=1,
+        help="per-question モードで1回の呼び出しに含める質問の数（デフォルト: 1）",
+    )
+    
+    parser.add_argument(
+        "--validation-interviews",
+        action="store_true",
+        help="検証用質問でペルソナに再ヒアリングし、仮説ごとの支持・反証を集計する（フェーズ6）",
+    )
+    
+    parser.add_argument(
+        "--validation-sample",
+        type=int,
+        default=None,
+        help="検証ヒアリングを行うペルソナの数（デフォルト: 全員）",
+    )
+    
+    parser.add_argument(
+        "--evaluation-mode",
+        choices=["single", "parallel"],
+        default="single",
+        help="質問セット評価の実行方法。parallel は評価側面ごとに並行評価して統合する（デフォルト: single）",
+    )
+    
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="実行全体の期限（秒）。期限が近づくと完了済みのヒアリングだけで後続のフェーズに進む（デフォルト: 無効）",
+    )
+    
+    parser.add_argument(
+        "--call-timeout",
+        type=float,
+        default=None,
+        help="エージェント呼び出し1回あたりのタイムアウト（秒）。超過した呼び出しは再試行する（デフォルト: 無効）",
+    )
+    
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        default=None,
+        help="呼び出しの所要時間がこのパーセンタイル（0-1。例: 0.95）を超えたら同じ呼び出しをもう1つ送り、先に完了した方を使う（デフォルト: 無効）",
+    )
+    
+    parser.add_argument(
+        "--hedge-max-extra",
+        type=float,
+        default=0.1,
+        help="重複リクエストの数の、呼び出し数に対する上限の割合（デフォルト: 0.1）",
+    )
+    
+    parser.add_argument(
+        "--max-cost",
+        type=float,
+        default=None,
+        help="実行全体の費用の上限（USD）。後続のフェーズの分を確保し、ヒアリングを予算に収まる規模に縮小する（デフォルト: 無効）",
+    )
+    
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=None,
+        help="実行全体のトークン数（入力・出力の合計）の上限（デフォルト: 無効）",
+    )
+    
+    parser.add_argument(
+        "--input-token-price",
+        type=float,
+        default=1.25,
+        help="費用の計算に使う入力トークンの単価（USD / 100万トークン。デフォルト: 1.25）",
+    )
+    
+    parser.add_argument(
+        "--output-token-price",
+        type=float,
+        default=10.0,
+        help="費用の計算に使う出力トークンの単価（USD / 100万トークン。デフォルト: 10.0）",
+    )
+    
+    parser.add_argument(
+        "--record-cassette",
+        default=None,
+        metavar="PATH",
+        help="すべてのエージェント呼び出しと構造化出力をカセットファイル（JSONL）に記録する",
+    )
+    
+    parser.add_argument(
+        "--replay-cassette",
+        default=None,
+        metavar="PATH",
+        help="記録したカセットから出力を再生し、APIを呼び出さずに実行する（APIキー不要）",
+    )
+    
+    parser.add_argument(
+        "--replay-latency",
+        action="store_true",
+        help="カセットの再生時に、記録時の所要時間だけ待ってから出力を返す",
+    )
+    
+    parser.add_argument(
+        "--cassette-strict",
+        action="store_true",
+        help="カセットの再生時に、入力（指示とプロンプト）が一致する記録だけを使う",
+    )
+    
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="フェーズ3のヒアリングをすべて1つのバッチジョブ（Batch API）にまとめて提出し、"
+             "完了を待ってから次のフェーズに進む（急がない実行向け。完了まで最大24時間。--interview-mode single のみ）",
+    )
+    
+    parser.add_argument(
+        "--batch-endpoint",
+        choices=("openai", "local"),
+        default="openai",
+        help="バッチの提出先（openai: OpenAI の Batch API / local: APIを呼び出さない代替のエンドポイント。デフォルト: openai）",
+    )
+    
+    parser.add_argument(
+        "--batch-poll-interval",
+        type=float,
+        default=60.0,
+        help="バッチの状態を確かめる間隔（秒。デフォルト: 60）",
+    )
+    
+    parser.add_argument(
+        "--batch-dir",
+        default=None,
+        metavar="DIR",
+        help="バッチの入力ファイルと受け取った出力ファイルを置くディレクトリ（デフォルト: 出力ディレクトリの batches/）",
+    )
+    
+    parser.add_argument(
+        "--trace",
+        default=None,
+        metavar="PATH",
+        help="フェーズ・ヒアリング・エージェント呼び出し・ツール呼び出し・ファイル書き込みのスパンを"
+             "OpenTelemetry互換のJSON（OTLP/JSON）に書き出す（`main.py trace PATH` でタイムラインを表示）",
+    )
+    
+    parser.add_argument(
+        "--theme-brief",
+        action="store_true",
+        help="長いテーマを最初に構造化ブリーフに要約し、各フェーズのプロンプトで元のテーマの代わりに使う",
+    )
+    
+    parser.add_argument(
+        "--theme-brief-full-text",
+        default="",
+        metavar="PHASES",
+        help="--theme-brief でもブリーフを使わずに元のテーマを渡すフェーズ（カンマ区切り。"
+             "personas, questions, hypotheses, validation_questions, validation_interviews, evaluation）",
+    )
+    
+    parser.add_argument(
+        "--theme-brief-cache",
+        default=".cache/theme_briefs",
+        metavar="DIR",
+        help="テーマのハッシュごとにブリーフを保存するディレクトリ（デフォルト: .cache/theme_briefs）",
+    )
+    
+    parser.add_argument(
+        "--persona-library",
+        default=None,
+        metavar="PATH",
+        help="生成したペルソナを蓄積するライブラリ（SQLite）。類似するテーマのペルソナを再利用し、足りない数だけ生成する",
+    )
+    
+    parser.add_argument(
+        "--library-min-similarity",
+        type=float,
+        default=0.3,
+        help="ペルソナライブラリから再利用するペルソナの類似度の下限（0-1。デフォルト: 0.3）",
+    )
+    
+    parser.add_argument(
+        "--min-persona-diversity",
+        type=float,
+        default=None,
+        metavar="SCORE",
+        help="ヒアリングを行うペルソナの多様性スコアの下限（0-1）。下回った場合はペルソナを保存して終了する",
+    )
+    
+    parser.add_argument(
+        "--http-pool-size",
+        type=int,
+        default=None,
+        help="全エージェントで共有するHTTP接続プールの接続数の上限（デフォルト: 20 と同時に実行する呼び出し数の大きい方）",
+    )
+    
+    parser.add_argument(
+        "--run-index",
+        default=None,
+        metavar="PATH",
+        help="完了した実行のテーマを記録する索引（SQLite）。ほぼ同じテーマの以前の実行があれば再利用を提案する",
+    )
+    
+    parser.add_argument(
+        "--duplicate-threshold",
+        type=float,
+        default=0.85,
+        help="ほぼ同じテーマとみなすテーマの類似度の下限（0-1。デフォルト: 0.85）",
+    )
+    
+    parser.add_argument(
+        "--on-duplicate",
+        choices=DUPLICATE_ACTIONS,
+        default="ask",
+        help="ほぼ同じテーマの以前の実行があった場合の扱い（ask: 確認する / reuse: 以前の結果を使う / "
+             "fork: 以前のペルソナと質問から実行 / new: 新しく実行。デフォルト: ask）",
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="--output-dir の中断した実行を再開する（完了済みのフェーズとヒアリングは再実行しない）",
+    )
+    
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -320,11 +1566,20 @@ def main():
     )
     
     args = parser.parse_args()
+    if args.record_cassette and args.replay_cassette:
+        parser.error("--record-cassette と --replay-cassette は同時に指定できません")
+    if args.batch and args.interview_mode != "single":
+        parser.error("--batch は --interview-mode single の場合のみ指定できます")
+    if args.batch and (args.record_cassette or args.replay_cassette):
+        parser.error("--batch はカセットの記録・再生と同時に指定できません")
+    if args.batch_poll_interval < 0:
+        parser.error("--batch-poll-interval は0以上の秒数を指定してください")
     
-    # 環境変数の読み込み
+    # 環境変数の読み込み（カセットの再生ではAPIを呼び出さない）
+    from dotenv import load_dotenv
     load_dotenv()
     api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
+    if not api_key and not args.replay_cassette:
         print("❌ エラー: OPENAI_API_KEY が設定されていません", file=sys.stderr)
         print("   .env ファイルまたは環境変数で設定してください", file=sys.stderr)
         sys.exit(1)
@@ -344,75 +1599,291 @@ def main():
     
     verbose = not args.quiet
     
+    # エージェントSDKの読み込みはワークフローを実行する場合のみ行う
+    import asyncio
+    import sqlite3
+    from agent_definitions import OpenAIClientSettings, configure_openai_client
+    from analysis import PersonaDiversityTooLow
+    from storage import RunArtifacts, clear_artifacts, load_artifacts, save_artifacts
+    from workflows import Cassette, CheckpointWriter, Deadline, HedgingPolicy, RunBudget, TokenPrices
+    
     try:
-        # ワークフロー実行
-        (
-            personas_output,
-            questions_output,
-            interviews,
-            hypotheses,
-            validation_questions,
-        ) = asyncio.run(
-            run_multi_persona_hearing_workflow(
-                theme=theme,
-                num_personas=args.num_personas,
-                verbose=verbose,
+        deadline = Deadline(args.deadline) if args.deadline is not None else None
+    except ValueError as e:
+        print(f"❌ エラー: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.call_timeout is not None and args.call_timeout <= 0:
+        print("❌ エラー: --call-timeout は0より大きい秒数を指定してください", file=sys.stderr)
+        sys.exit(1)
+    if args.question_group_size < 1:
+        print("❌ エラー: --question-group-size は1以上を指定してください", file=sys.stderr)
+        sys.exit(1)
+    if args.min_persona_diversity is not None and not 0 <= args.min_persona_diversity <= 1:
+        print("❌ エラー: --min-persona-diversity は0以上1以下を指定してください", file=sys.stderr)
+        sys.exit(1)
+    hedging = None
+    if args.hedge_percentile is not None:
+        try:
+            hedging = HedgingPolicy(args.hedge_percentile, max_extra_fraction=args.hedge_max_extra)
+        except ValueError as e:
+            print(f"❌ エラー: {e}", file=sys.stderr)
+            sys.exit(1)
+    budget = None
+    if args.max_cost is not None or args.max_tokens is not None:
+        from workflows.budget import evaluation_reserve, validation_interviews_reserve
+        from workflows.events import PHASE_EVALUATION, PHASE_VALIDATION_INTERVIEWS
+        
+        try:
+            budget = RunBudget(
+                max_tokens=args.max_tokens,
+                max_cost=args.max_cost,
+                prices=TokenPrices(args.input_token_price, args.output_token_price),
+            )
+        except ValueError as e:
+            print(f"❌ エラー: {e}", file=sys.stderr)
+            sys.exit(1)
+        # ヒアリングより後のフェーズの分は最初に確保しておく（仮説生成・検証項目の設計はワークフローが確保する）
+        budget.reserve(PHASE_EVALUATION, *evaluation_reserve(args.evaluation_mode))
+        if args.validation_interviews:
+            budget.reserve(
+                PHASE_VALIDATION_INTERVIEWS,
+                *validation_interviews_reserve(args.validation_sample or args.num_personas),
+            )
+    
+    cassette = None
+    try:
+        if args.replay_cassette:
+            cassette = Cassette(
+                Path(args.replay_cassette).expanduser(),
+                mode="replay",
+                simulate_latency=args.replay_latency,
+                strict=args.cassette_strict,
             )
+        elif args.record_cassette:
+            cassette = Cassette(Path(args.record_cassette).expanduser(), mode="record")
+    except (OSError, ValueError) as e:
+        print(f"❌ エラー: カセットを開けません: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    persona_library = None
+    if args.persona_library:
+        from storage import PersonaLibrary
+        try:
+            persona_library = PersonaLibrary(
+                Path(args.persona_library).expanduser(),
+                min_similarity=args.library_min_similarity,
+            )
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"❌ エラー: ペルソナライブラリを開けません: {e}", file=sys.stderr)
+            sys.exit(1)
+    
+    theme_briefing = None
+    if args.theme_brief:
+        from workflows import ThemeBriefing
+        try:
+            theme_briefing = ThemeBriefing(
+                theme,
+                full_text_phases=[phase.strip() for phase in args.theme_brief_full_text.split(",") if phase.strip()],
+            )
+        except ValueError as e:
+            print(f"❌ エラー: {e}", file=sys.stderr)
+            sys.exit(1)
+    
+    # 全フェーズ・全エージェントで共有する接続プール（カセットの再生ではAPIを呼び出さないため作らない）
+    http_pool = None
+    if not args.replay_cassette:
+        pool_size = args.http_pool_size
+        if pool_size is None:
+            concurrent_calls = args.max_concurrency
+            if args.interview_mode == "per-question":
+                # 質問ごとのヒアリングでは、1件あたり（最大15問の）まとまりの数だけ同時に呼び出す
+                concurrent_calls *= -(-15 // args.question_group_size)
+            pool_size = max(OpenAIClientSettings.max_connections, concurrent_calls)
+        try:
+            http_pool = configure_openai_client(OpenAIClientSettings(max_connections=pool_size))
+        except ValueError as e:
+            print(f"❌ エラー: {e}", file=sys.stderr)
+            sys.exit(1)
+    
+    batch = None
+    if args.batch:
+        from agent_definitions import shared_openai_client
+        from backends import BatchSubmitter, LocalBatchEndpoint, OpenAIBatchEndpoint
+        batch = BatchSubmitter(
+            LocalBatchEndpoint() if args.batch_endpoint == "local" else OpenAIBatchEndpoint(shared_openai_client()),
+            Path(args.batch_dir).expanduser() if args.batch_dir else output_dir / "batches",
+            poll_interval=args.batch_poll_interval,
         )
-        
-        # 質問セット評価ワークフロー実行
-        evaluation_report = None
-        if verbose:
-            print()
-            print("=" * 80)
-            print("📊 質問セット評価を実行します...")
-            print("=" * 80)
-            print()
-        
+    
+    # ほぼ同じテーマの以前の実行（再開する場合は確認しない）
+    run_index = None
+    prior_run = None
+    if args.run_index:
+        from storage import RunIndex
         try:
-            evaluation_report = asyncio.run(
-                run_question_evaluation_workflow(
-                    theme=theme,
-                    initial_questions=questions_output,
-                    validation_questions=validation_questions,
-                    hypotheses=hypotheses,
-                    verbose=verbose,
+            run_index = RunIndex(Path(args.run_index).expanduser(), threshold=args.duplicate_threshold)
+            similar_runs = [] if args.resume else run_index.find_similar(theme, limit=1)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"❌ エラー: 実行の索引を開けません: {e}", file=sys.stderr)
+            sys.exit(1)
+        if similar_runs:
+            prior_run = similar_runs[0]
+            print(
+                f"🔁 ほぼ同じテーマの以前の実行があります（類似度 {prior_run.similarity:.2f}）: "
+                f"{prior_run.output_dir}"
+            )
+            action = choose_duplicate_action(prior_run, args.on_duplicate)
+            if action == "reuse":
+                reuse_prior_run(prior_run.output_dir, output_dir)
+                run_index.record(theme, output_dir)
+                print(f"以前の実行の結果を使いました: {output_dir}")
+                return
+            if action == "new":
+                prior_run = None
+    
+    # 中断した実行の再開
+    resume_from = None
+    if args.resume:
+        try:
+            resume_from = load_artifacts(output_dir, allow_partial=True)
+        except FileNotFoundError as e:
+            print(f"❌ エラー: 再開できる実行結果がありません: {e}", file=sys.stderr)
+            sys.exit(1)
+    elif prior_run is not None:
+        # 以前の実行のペルソナと初回質問から分岐する（ヒアリング以降は新しいテーマで実行する）
+        forked = load_artifacts(prior_run.output_dir, allow_partial=True)
+        clear_artifacts(output_dir)
+        resume_from = RunArtifacts(
+            personas_output=forked.personas_output,
+            questions_output=forked.questions_output,
+        )
+    else:
+        # 前回の実行の結果が再開時に混ざらないようにする
+        clear_artifacts(output_dir)
+    
+    # 完了したフェーズとヒアリング結果はその都度 artifacts/ に保存される
+    checkpoint = CheckpointWriter(output_dir, initial=resume_from)
+    
+    tracer = None
+    if args.trace:
+        from workflows.tracing import Tracer
+        tracer = Tracer()
+        tracer.activate(root="run", attributes={"theme": theme[:200], "output_dir": str(output_dir)})
+    
+    try:
+        interrupted = asyncio.run(
+            run_interruptible(
+                run_pipeline(
+                    args, theme, checkpoint, deadline, verbose, hedging, budget, cassette, persona_library,
+                    theme_briefing, batch,
                 )
             )
-        except Exception as e:
-            if verbose:
-                print(f"⚠️ 評価ワークフロー実行時にエラーが発生しました: {e}")
-                print("   メインのワークフロー結果は保存されています")
+        )
+        
+        # 検証ヒアリング・評価の呼び出しを含めた重複リクエストの送信状況と予算の台帳
+        if hedging is not None and checkpoint.state.run_report is not None:
+            checkpoint.state.run_report.hedging = hedging.report()
+        if budget is not None and checkpoint.state.run_report is not None:
+            checkpoint.state.run_report.budget = budget.report()
+        if theme_briefing is not None and checkpoint.state.run_report is not None:
+            checkpoint.state.run_report.theme_brief = theme_briefing.report()
         
         # 結果を保存
+        state = checkpoint.state
         print()
         print("=" * 80)
         print("💾 結果を保存しています...")
         print("=" * 80)
+        save_artifacts(
+            output_dir,
+            state.personas_output,
+            state.questions_output,
+            state.interviews,
+            state.hypotheses,
+            state.validation_questions,
+            evaluation_report=state.evaluation_report,
+            run_report=state.run_report,
+            validation_interviews=state.validation_interviews,
+        )
         save_results(
             output_dir,
-            personas_output,
-            questions_output,
-            interviews,
-            hypotheses,
-            validation_questions,
-            evaluation_report=evaluation_report,
+            state.personas_output,
+            state.questions_output,
+            state.interviews,
+            state.hypotheses,
+            state.validation_questions,
+            evaluation_report=state.evaluation_report,
+            run_report=state.run_report,
+            validation_interviews=state.validation_interviews,
         )
         
+        if interrupted:
+            print()
+            print("=" * 80)
+            print("⏹️  中断しました（完了済みの結果は保存されています）")
+            print("=" * 80)
+            print(f"出力ディレクトリ: {output_dir}")
+            print(f"完了済みのヒアリング: {len(state.interviews)}件")
+            print("再開するには、同じ引数に --resume を付けて実行してください:")
+            print(f"  {resume_command(sys.argv)}")
+            sys.exit(130)
+        
         print()
         print("=" * 80)
         print("🎉 完了しました！")
         print("=" * 80)
         print(f"出力ディレクトリ: {output_dir}")
+        if verbose and http_pool is not None:
+            print(
+                f"HTTP接続: リクエスト {http_pool.requests}件 / 新規接続 {http_pool.connections_opened}件 / "
+                f"最大同時リクエスト {http_pool.peak_in_flight}（接続上限 {http_pool.max_connections}）"
+            )
+        if budget is not None:
+            print(f"予算: {format_budget_usage(budget.report())}")
+        if cassette is not None and cassette.replaying:
+            print(
+                f"カセット: {cassette.hits + cassette.fallbacks}件を再生"
+                f"（うち入力の不一致により記録順で対応付け {cassette.fallbacks}件）"
+            )
+        elif cassette is not None:
+            print(f"カセット: {len(cassette)}件の呼び出しを {cassette.path} に記録しました")
+        if theme_briefing is not None and state.run_report is not None and state.run_report.theme_brief:
+            print(f"テーマのブリーフ: {format_theme_brief_usage(state.run_report.theme_brief)}")
+        if run_index is not None:
+            run_index.record(theme, output_dir)
+        if persona_library is not None:
+            reused = state.run_report.personas_reused if state.run_report is not None else 0
+            print(f"ペルソナライブラリ: {reused}名を再利用（蓄積 {len(persona_library)}名）")
         
     except KeyboardInterrupt:
+        # シグナルハンドラを登録できない環境（Windowsなど）での中断
         print("\n❌ ユーザーによって中断されました", file=sys.stderr)
+        print(f"   完了済みのフェーズは {output_dir / 'artifacts'} に保存されています", file=sys.stderr)
+        print(f"   再開するには: {resume_command(sys.argv)}", file=sys.stderr)
+        sys.exit(1)
+    except PersonaDiversityTooLow as e:
+        from analysis.persona_diversity import DIMENSIONS
+        
+        print(f"\n❌ {e}。ヒアリングは行いません", file=sys.stderr)
+        coverage = "、".join(
+            f"{label} {e.report.coverage.get(dimension, 0.0):.0%}" for dimension, label in DIMENSIONS.items()
+        )
+        print(f"   網羅率: {coverage} / ペルソナ間の平均類似度: {e.report.mean_similarity:.2f}", file=sys.stderr)
+        save_results(output_dir, checkpoint.state.personas_output, None, None, None, None)
+        print("   ペルソナを確認し、--num-personas やテーマを見直して再実行してください", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ エラーが発生しました: {e}", file=sys.stderr)
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        if tracer is not None:
+            # 中断・エラーで終わった実行も、そこまでのスパンを書き出す
+            exit_code = getattr(sys.exc_info()[1], "code", None)
+            tracer.deactivate(error=f"終了コード {exit_code}" if exit_code else None)
+            trace_path = tracer.export(Path(args.trace).expanduser())
+            print(f"トレース: {len(tracer.spans)}件のスパンを {trace_path} に書き出しました")
 
 
 if __name__ == "__main__":
@@ -5,6 +5,8 @@ from models.schemas import (
     InterviewQuestion,
     InterviewQuestionsOutput,
     InterviewResponse,
+    QuestionGroupAnswers,
+    InterviewInsights,
     HypothesisList,
     HypothesisItem,
     ValidationQuestionsOutput,
@@ -12,8 +14,28 @@ from models.schemas import (
 from models.evaluation_schemas import (
     EvaluationReport,
     EvaluationDimension,
+    DimensionJudgement,
     QuestionComparison,
     QuestionMapping,
+    QuestionSetMetrics,
+    TopicAssessment,
+    TopicAssessmentsOutput,
+    EvaluationJudgement,
+    EvaluationSynthesis,
+)
+from models.run_report import (
+    BudgetLedgerEntry,
+    BudgetReport,
+    HedgingReport,
+    InterviewLatency,
+    NotInterviewedPersona,
+    RunReport,
+)
+from models.validation_schemas import (
+    HypothesisVerdict,
+    ValidationInterviewResponse,
+    HypothesisTally,
+    ValidationInterviewReport,
 )
 
 __all__ = [
@@ -22,12 +44,30 @@ __all__ = [
     "InterviewQuestion",
     "InterviewQuestionsOutput",
     "InterviewResponse",
+    "QuestionGroupAnswers",
+    "InterviewInsights",
     "HypothesisList",
     "HypothesisItem",
     "ValidationQuestionsOutput",
     "EvaluationReport",
     "EvaluationDimension",
+    "DimensionJudgement",
     "QuestionComparison",
     "QuestionMapping",
+    "QuestionSetMetrics",
+    "TopicAssessment",
+    "TopicAssessmentsOutput",
+    "EvaluationJudgement",
+    "EvaluationSynthesis",
     "ValidationQuestionsOutput",
+    "BudgetLedgerEntry",
+    "BudgetReport",
+    "HedgingReport",
+    "InterviewLatency",
+    "NotInterviewedPersona",
+    "RunReport",
+    "HypothesisVerdict",
+    "ValidationInterviewResponse",
+    "HypothesisTally",
+    "ValidationInterviewReport",
 ]
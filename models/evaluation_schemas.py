@@ -1,8 +1,11 @@
 """質問セット評価のスキーマ定義."""
-from typing import List, Dict, Literal
+from typing import List, Dict, Literal, Optional
 from pydantic import BaseModel, Field
 
 
+DepthLevel = Literal["同等", "やや向上", "明確な向上", "大幅な向上", "劇的な向上"]
+
+
 class QuestionComparison(BaseModel):
     """質問セット間の比較結果."""
     
@@ -12,13 +15,28 @@ class QuestionComparison(BaseModel):
     count_change_percent: float = Field(description="質問数の変化率（%）")
 
 
+class DimensionJudgement(BaseModel):
+    """
+    評価エージェントが出力する、評価の1つの側面.
+    
+    改善ポイント数はスコアの差なので、エージェントには出力させずにローカルで計算して
+    EvaluationDimension に組み込む。
+    """
+    
+    dimension_name: str = Field(description="評価項目の名前（例：質問の具体性）")
+    initial_score: float = Field(ge=0, le=5, description="初回質問のスコア（0-5）")
+    validation_score: float = Field(ge=0, le=5, description="検証質問のスコア（0-5）")
+    explanation: str = Field(description="スコア差の理由と詳細説明")
+    key_changes: List[str] = Field(description="この側面での主な変化点")
+
+
 class EvaluationDimension(BaseModel):
     """評価の1つの側面."""
     
     dimension_name: str = Field(description="評価項目の名前（例：質問の具体性）")
     initial_score: float = Field(ge=0, le=5, description="初回質問のスコア（0-5）")
     validation_score: float = Field(ge=0, le=5, description="検証質問のスコア（0-5）")
-    improvement_points: float = Field(description="改善ポイント数")
+    improvement_points: float = Field(description="改善ポイント数（検証質問のスコア - 初回質問のスコア）")
     explanation: str = Field(description="スコア差の理由と詳細説明")
     key_changes: List[str] = Field(description="この側面での主な変化点")
 
@@ -29,12 +47,19 @@ class QuestionMapping(BaseModel):
     topic: str = Field(description="トピック名")
     initial_questions: List[int] = Field(description="初回質問の番号リスト")
     validation_questions: List[int] = Field(description="検証質問の番号リスト")
-    depth_level: Literal["同等", "やや向上", "明確な向上", "大幅な向上", "劇的な向上"] = Field(
-        description="深化度レベル"
-    )
+    depth_level: DepthLevel = Field(description="深化度レベル")
     analysis: str = Field(description="マッピングの分析コメント")
 
 
+class QuestionSetMetrics(BaseModel):
+    """質問セットの字句的な指標（LLMを使わずに計算）."""
+    
+    question_count: int = Field(description="質問の数")
+    average_length: float = Field(description="質問文の平均文字数")
+    specific_ratio: float = Field(description="具体的な事例・数値を求める表現を含む質問の割合（0-1）")
+    open_ended_ratio: float = Field(description="疑問詞で答えを広く求める質問の割合（0-1）")
+
+
 class EvaluationReport(BaseModel):
     """質問セット評価レポート."""
     
@@ -66,3 +91,79 @@ class EvaluationReport(BaseModel):
     future_improvements: List[str] = Field(
         description="両者を統合した改善案"
     )
+    initial_metrics: Optional[QuestionSetMetrics] = Field(
+        default=None, description="初回質問の字句的な指標"
+    )
+    validation_metrics: Optional[QuestionSetMetrics] = Field(
+        default=None, description="検証質問の字句的な指標"
+    )
+
+
+class TopicAssessment(BaseModel):
+    """事前に対応付けたトピックの名前と深化度の評価."""
+    
+    topic_number: int = Field(description="評価するトピックの番号（事前計算したトピックの番号）")
+    topic: str = Field(description="トピック名")
+    depth_level: DepthLevel = Field(description="深化度レベル")
+    analysis: str = Field(description="マッピングの分析コメント")
+
+
+class TopicAssessmentsOutput(BaseModel):
+    """トピックごとの評価のみの評価結果（並列評価モード用）."""
+    
+    assessments: List[TopicAssessment] = Field(description="トピックごとの評価")
+
+
+class EvaluationJudgement(BaseModel):
+    """
+    質問セット評価エージェントの出力.
+    
+    質問数・変化率・質問の対応付け・評価日はローカルで計算して EvaluationReport に
+    組み込むため、エージェントには判断が必要な項目だけを出力させる。
+    """
+    
+    title: str = Field(description="レポートタイトル")
+    overall_assessment: str = Field(description="総合評価サマリー")
+    evaluation_dimensions: List[DimensionJudgement] = Field(
+        description="各評価側面の詳細"
+    )
+    topic_assessments: List[TopicAssessment] = Field(
+        description="事前に対応付けたトピックごとの評価"
+    )
+    key_improvements: List[str] = Field(
+        description="最も重要な改善ポイント（優先順位付け）"
+    )
+    recommendations: List[str] = Field(
+        description="今後の改善提案"
+    )
+    strengths_initial: List[str] = Field(
+        description="初回質問の強み"
+    )
+    strengths_validation: List[str] = Field(
+        description="検証質問の強み"
+    )
+    future_improvements: List[str] = Field(
+        description="両者を統合した改善案"
+    )
+
+
+class EvaluationSynthesis(BaseModel):
+    """各評価側面の結果を統合した総評（並列評価モード用）."""
+    
+    title: str = Field(description="レポートタイトル")
+    overall_assessment: str = Field(description="総合評価サマリー")
+    key_improvements: List[str] = Field(
+        description="最も重要な改善ポイント（優先順位付け）"
+    )
+    recommendations: List[str] = Field(
+        description="今後の改善提案"
+    )
+    strengths_initial: List[str] = Field(
+        description="初回質問の強み"
+    )
+    strengths_validation: List[str] = Field(
+        description="検証質問の強み"
+    )
+    future_improvements: List[str] = Field(
+        description="両者を統合した改善案"
+    )
@@ -0,0 +1,202 @@
+"""実行全体のメタ情報のスキーマ定義."""
+import math
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class NotInterviewedPersona(BaseModel):
+    """ヒアリングを実施しなかったペルソナ."""
+    
+    persona_index: int = Field(ge=1, description="ペルソナの番号（1始まり）")
+    persona_name: str = Field(description="ペルソナの名前")
+    reason: str = Field(description="ヒアリングを実施しなかった理由")
+
+
+class InterviewLatency(BaseModel):
+    """1人のペルソナへのヒアリングの所要時間."""
+    
+    persona_name: str = Field(description="ペルソナの名前")
+    seconds: float = Field(ge=0, description="ヒアリングの開始から完了までの秒数")
+    calls: int = Field(default=1, ge=1, description="ヒアリングに使ったエージェント呼び出しの回数")
+
+
+class HedgingReport(BaseModel):
+    """遅い呼び出しへの重複リクエスト（ヘッジ）の送信状況."""
+    
+    percentile: float = Field(description="重複リクエストを送る所要時間のパーセンタイル")
+    max_extra_fraction: float = Field(description="重複リクエストの割合の上限")
+    calls: int = Field(default=0, description="ヘッジの対象にしたエージェント呼び出しの数")
+    hedges_fired: int = Field(default=0, description="重複リクエストを送った回数")
+    hedges_won: int = Field(default=0, description="重複リクエストの方が先に完了した回数")
+    p50_seconds: Optional[float] = Field(default=None, description="呼び出しの所要時間の中央値（秒）")
+    p95_seconds: Optional[float] = Field(default=None, description="呼び出しの所要時間のp95（秒）")
+    p99_seconds: Optional[float] = Field(default=None, description="呼び出しの所要時間のp99（秒）")
+    unhedged_p95_seconds: Optional[float] = Field(
+        default=None,
+        description="重複リクエストを送らなかった場合の所要時間のp95（秒。キャンセルした呼び出しは推定値）",
+    )
+    unhedged_p99_seconds: Optional[float] = Field(
+        default=None,
+        description="重複リクエストを送らなかった場合の所要時間のp99（秒。キャンセルした呼び出しは推定値）",
+    )
+
+
+class BudgetLedgerEntry(BaseModel):
+    """予算の台帳の1フェーズ分."""
+    
+    phase: str = Field(description="フェーズの識別子")
+    label: str = Field(description="フェーズの表示名")
+    requests: int = Field(default=0, description="APIリクエスト数")
+    input_tokens: int = Field(default=0, description="入力トークン数")
+    output_tokens: int = Field(default=0, description="出力トークン数")
+    cost: float = Field(default=0.0, description="費用（USD）")
+    reserved_tokens: int = Field(default=0, description="実行の開始時にこのフェーズのために確保したトークン数")
+    started: bool = Field(default=True, description="フェーズが開始されたか")
+
+
+class BudgetReport(BaseModel):
+    """実行全体のトークン数・費用の予算と使用状況."""
+    
+    max_tokens: Optional[int] = Field(default=None, description="トークン数の上限")
+    max_cost: Optional[float] = Field(default=None, description="費用の上限（USD）")
+    input_price_per_million: float = Field(description="入力トークンの単価（USD / 100万トークン）")
+    output_price_per_million: float = Field(description="出力トークンの単価（USD / 100万トークン）")
+    spent_tokens: int = Field(default=0, description="使用したトークン数")
+    spent_cost: float = Field(default=0.0, description="使用した費用（USD）")
+    interview_plan: Optional[str] = Field(default=None, description="予算に合わせたヒアリングの計画")
+    interview_scaled_down: bool = Field(default=False, description="予算のためにヒアリングの規模を縮小したか")
+    entries: List[BudgetLedgerEntry] = Field(default_factory=list, description="フェーズごとの使用量")
+
+
+class ThemeBriefReport(BaseModel):
+    """テーマのブリーフによる入力トークンの削減状況."""
+    
+    theme_tokens: int = Field(description="元のテーマのトークン数（見積もり）")
+    brief_tokens: int = Field(description="ブリーフのトークン数（見積もり）")
+    cached: bool = Field(default=False, description="キャッシュしたブリーフを使ったか")
+    brief_input_tokens: int = Field(default=0, description="ブリーフの生成に使った入力トークン数")
+    prompts_with_brief: int = Field(default=0, description="テーマの代わりにブリーフを使ったプロンプトの数")
+    full_text_phases: List[str] = Field(
+        default_factory=list,
+        description="ブリーフを使わずに元のテーマを渡したフェーズ",
+    )
+    input_tokens: int = Field(default=0, description="実行全体の入力トークン数（ブリーフの生成を含む）")
+    input_tokens_without_brief: int = Field(
+        default=0,
+        description="ブリーフを使わなかった場合の実行全体の入力トークン数（見積もり）",
+    )
+
+
+class SimilarPersonaPair(BaseModel):
+    """類似度の高いペルソナのペア."""
+    
+    first: str = Field(description="ペルソナの名前")
+    second: str = Field(description="ペルソナの名前")
+    similarity: float = Field(description="プロフィール・年齢・職業の分類の類似度（0-1）")
+
+
+class PersonaDiversityReport(BaseModel):
+    """生成したペルソナの多様性."""
+    
+    personas: int = Field(description="分析したペルソナの数")
+    score: float = Field(description="多様性スコア（0-1。1 - 平均類似度 と網羅率の平均）")
+    mean_similarity: float = Field(description="異なるペルソナのペアの類似度の平均（0-1）")
+    coverage: Dict[str, float] = Field(
+        default_factory=dict,
+        description="側面（age / occupation / pain_points）ごとの網羅率（0-1）",
+    )
+    distribution: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict,
+        description="側面ごとの分類別のペルソナ数",
+    )
+    near_duplicate_pairs: int = Field(default=0, description="ほぼ同じとみなしたペルソナのペアの数")
+    most_similar_pairs: List[SimilarPersonaPair] = Field(
+        default_factory=list,
+        description="類似度の高いペア（類似度の高い順）",
+    )
+    min_score: Optional[float] = Field(
+        default=None,
+        description="ヒアリングを行う多様性スコアの下限（指定しなかった場合は None）",
+    )
+
+
+class RunReport(BaseModel):
+    """ワークフロー実行のメタ情報（ヒアリングの実施状況など）."""
+    
+    personas_total: int = Field(default=0, description="生成されたペルソナの数")
+    personas_reused: int = Field(
+        default=0,
+        description="ペルソナライブラリから再利用したペルソナの数（personas_total に含む）",
+    )
+    interviews_completed: int = Field(default=0, description="ヒアリングを完了したペルソナの数")
+    not_interviewed: List[NotInterviewedPersona] = Field(
+        default_factory=list,
+        description="ヒアリングを実施しなかったペルソナのリスト",
+    )
+    saturation_threshold: Optional[float] = Field(
+        default=None,
+        description="飽和判定に使った新規性のしきい値（無効な場合は None）",
+    )
+    saturation_curve: List[float] = Field(
+        default_factory=list,
+        description="ヒアリング完了順の新規性スコア（0-1）",
+    )
+    saturation_reached: bool = Field(default=False, description="飽和によりヒアリングを打ち切ったか")
+    deadline_seconds: Optional[float] = Field(
+        default=None,
+        description="実行全体の期限（秒）。指定しなかった場合は None",
+    )
+    partial: bool = Field(
+        default=False,
+        description="期限により一部のペルソナへのヒアリングを打ち切った部分的な結果か",
+    )
+    persona_diversity: Optional[PersonaDiversityReport] = Field(
+        default=None,
+        description="ペルソナの多様性（analysis.persona_diversity）",
+    )
+    interview_mode: str = Field(
+        default="single",
+        description="ヒアリングの実行方法（single: 1回の呼び出し / per-question: 質問ごとに並行実行）",
+    )
+    interview_latencies: List[InterviewLatency] = Field(
+        default_factory=list,
+        description="今回の実行で完了したヒアリングの所要時間（完了順。再開時に再利用した結果は含まない）",
+    )
+    
+    hedging: Optional[HedgingReport] = Field(
+        default=None,
+        description="重複リクエスト（ヘッジ）の送信状況（無効な場合は None）",
+    )
+    
+    budget: Optional[BudgetReport] = Field(
+        default=None,
+        description="トークン数・費用の予算と使用状況（無効な場合は None）",
+    )
+    
+    theme_brief: Optional[ThemeBriefReport] = Field(
+        default=None,
+        description="テーマのブリーフによる入力トークンの削減状況（無効な場合は None）",
+    )
+    
+    def latency_summary(self) -> Optional[Dict[str, float]]:
+        """
+        ヒアリングの所要時間の要約統計（ヒアリングがなければ None）.
+        
+        Returns:
+            Dict: count, mean, p50, p95, max（秒）
+        """
+        seconds = sorted(latency.seconds for latency in self.interview_latencies)
+        if not seconds:
+            return None
+        
+        def percentile(q: float) -> float:
+            # 最近傍順位法
+            return seconds[max(0, math.ceil(q * len(seconds)) - 1)]
+        
+        return {
+            "count": len(seconds),
+            "mean": sum(seconds) / len(seconds),
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "max": seconds[-1],
+        }
@@ -3,6 +3,19 @@ from typing import List
 from pydantic import BaseModel, Field
 
 
+class ThemeBrief(BaseModel):
+    """長いテーマを後続のフェーズ向けに要約した構造化ブリーフ."""
+    
+    summary: str = Field(description="テーマの要約（何を検討したいか）")
+    target_users: List[str] = Field(description="想定する対象ユーザーや顧客のリスト")
+    goals: List[str] = Field(description="明らかにしたいこと・目的のリスト")
+    key_facts: List[str] = Field(description="前提となる事実・背景・数値のリスト")
+    constraints: List[str] = Field(
+        default_factory=list,
+        description="制約条件や対象外とする範囲のリスト"
+    )
+
+
 class PersonaOutput(BaseModel):
     """生成された1つのペルソナ."""
     
@@ -48,6 +61,22 @@ class InterviewResponse(BaseModel):
     )
 
 
+class QuestionGroupAnswers(BaseModel):
+    """一部の質問に対するペルソナの回答（質問ごとのヒアリングモード用）."""
+    
+    answers: List[str] = Field(description="担当する各質問に対する回答のリスト（質問と同じ順序）")
+    supporting_evidence: List[str] = Field(
+        default_factory=list,
+        description="Web検索で得られた裏付け情報のリスト"
+    )
+
+
+class InterviewInsights(BaseModel):
+    """ヒアリングの回答全体から抽出した洞察（質問ごとのヒアリングモード用）."""
+    
+    key_insights: List[str] = Field(description="回答から得られた重要な洞察のリスト")
+
+
 class HypothesisItem(BaseModel):
     """1つの仮説."""
     
@@ -0,0 +1,62 @@
+"""検証ヒアリング（フェーズ6）のスキーマ定義."""
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+
+from models.run_report import NotInterviewedPersona
+
+
+class HypothesisVerdict(BaseModel):
+    """1つの仮説に対するペルソナの回答の判定."""
+    
+    hypothesis_id: str = Field(description="仮説ID（課題仮説はP1, P2...、インサイト仮説はI1, I2...）")
+    verdict: Literal["支持", "反証", "判断不能"] = Field(description="回答が仮説を支持するか反証するか")
+    rationale: str = Field(description="判定の根拠となる回答内容")
+
+
+class ValidationInterviewResponse(BaseModel):
+    """ペルソナへの検証ヒアリング結果."""
+    
+    persona_name: str = Field(description="回答したペルソナの名前")
+    answers: List[str] = Field(description="各検証質問に対する回答のリスト")
+    verdicts: List[HypothesisVerdict] = Field(description="各仮説に対する判定のリスト")
+
+
+class HypothesisTally(BaseModel):
+    """1つの仮説に対する判定の集計."""
+    
+    hypothesis_id: str = Field(description="仮説ID")
+    hypothesis_type: str = Field(description="仮説のタイプ（課題仮説/インサイト仮説）")
+    statement: str = Field(description="仮説文")
+    support: int = Field(default=0, ge=0, description="支持したペルソナの数")
+    refute: int = Field(default=0, ge=0, description="反証したペルソナの数")
+    inconclusive: int = Field(default=0, ge=0, description="判断不能だったペルソナの数")
+    
+    @property
+    def support_rate(self) -> Optional[float]:
+        """支持と反証のうち支持が占める割合（判定がなければ None）."""
+        decided = self.support + self.refute
+        if decided == 0:
+            return None
+        return self.support / decided
+
+
+class ValidationInterviewReport(BaseModel):
+    """検証ヒアリングの結果と仮説ごとの集計."""
+    
+    personas_sampled: int = Field(description="検証ヒアリングの対象としたペルソナの数")
+    interviews: List[ValidationInterviewResponse] = Field(
+        default_factory=list,
+        description="各ペルソナへの検証ヒアリング結果",
+    )
+    tallies: List[HypothesisTally] = Field(
+        default_factory=list,
+        description="仮説ごとの支持・反証の集計",
+    )
+    failed: List[NotInterviewedPersona] = Field(
+        default_factory=list,
+        description="検証ヒアリングに失敗したペルソナ",
+    )
+    partial: bool = Field(
+        default=False,
+        description="期限により一部のペルソナへの検証ヒアリングを打ち切った部分的な結果か",
+    )
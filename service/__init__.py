@@ -0,0 +1,31 @@
+"""ヒアリングジョブを受け付ける常駐サーバーのパッケージ."""
+from service.jobs import (
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    JOB_FAILED,
+    JOB_CANCELLED,
+    Job,
+    JobManager,
+    JobNotFound,
+    parse_job_options,
+)
+from service.http import HearingHTTPServer
+from service.worker import QueueWorker
+from service.load_test import LoadTestReport, run_load_test
+
+__all__ = [
+    "JOB_QUEUED",
+    "JOB_RUNNING",
+    "JOB_SUCCEEDED",
+    "JOB_FAILED",
+    "JOB_CANCELLED",
+    "Job",
+    "JobManager",
+    "JobNotFound",
+    "parse_job_options",
+    "HearingHTTPServer",
+    "QueueWorker",
+    "LoadTestReport",
+    "run_load_test",
+]
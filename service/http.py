@@ -0,0 +1,215 @@
+"""
+ヒアリングジョブのHTTP API（標準ライブラリの asyncio のみで実装）.
+
+エンドポイント:
+    POST /jobs                  ジョブを投入する（{"theme": "...", "num_personas": 10, ...}）
+    GET  /jobs                  ジョブの一覧
+    GET  /jobs/{id}             ジョブのステータス
+    GET  /jobs/{id}/result      ジョブの結果（完了前は 409）
+    POST /jobs/{id}/cancel      ジョブをキャンセルする
+    GET  /jobs/{id}/events      進捗イベントを Server-Sent Events で配信する
+    GET  /health                死活監視（共有HTTP接続プールの集計を含む）
+"""
+import asyncio
+import dataclasses
+import json
+import re
+from collections import abc
+from contextlib import suppress
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from agent_definitions import pool_metrics
+from service.jobs import JOB_SUCCEEDED, JobManager, JobNotFound, parse_job_options
+
+
+# リクエストボディの上限（テーマ本文を含めても十分な大きさ）
+MAX_BODY_BYTES = 1024 * 1024
+
+_JOB_PATH = re.compile(r"^/jobs/(?P<job_id>[0-9a-f]+)(?P<action>/result|/cancel|/events)?$")
+
+
+class HTTPError(Exception):
+    """エラーレスポンスとして返す例外."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def to_jsonable(value: Any) -> Any:
+    """イベントやワークフローの結果をJSONに変換できる形にする."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, tuple) and hasattr(value, "_asdict"):
+        return {key: to_jsonable(item) for key, item in value._asdict().items()}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            f.name: to_jsonable(getattr(value, f.name)) for f in dataclasses.fields(value)
+        }
+    if isinstance(value, abc.Sequence) and not isinstance(value, (str, bytes)):
+        return [to_jsonable(item) for item in value]
+    return value
+
+
+def event_payload(event) -> Dict[str, Any]:
+    """SSEで配信するイベントの内容（ワークフロー全体の結果は /result で取得する）."""
+    payload = to_jsonable(event)
+    if type(event).__name__ == "WorkflowFinished":
+        payload.pop("result", None)
+    return payload
+
+
+class HearingHTTPServer:
+    """JobManager をHTTPで公開するサーバー."""
+
+    def __init__(self, manager: JobManager, host: str = "127.0.0.1", port: int = 8080):
+        self.manager = manager
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """待ち受けを開始する（port=0 の場合は空いているポートを使う）."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """待ち受けを開始し、キャンセルされるまで処理を続ける."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """待ち受けを終了し、実行中のジョブをキャンセルする."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.manager.shutdown()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, path, body = await self._read_request(reader)
+                if method == "GET" and path.endswith("/events"):
+                    await self._stream_events(path, writer)
+                    return
+                status, payload = self._dispatch(method, path, body)
+            except HTTPError as e:
+                status, payload = e.status, {"error": e.message}
+            await self._write_json(writer, status, payload)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "不正なリクエストです") from None
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", "0") or 0)
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "リクエストボディが大きすぎます")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], body
+
+    def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[HTTPStatus, Any]:
+        if path == "/health" and method == "GET":
+            metrics = pool_metrics()
+            return HTTPStatus.OK, {
+                "status": "ok",
+                "http_pool": metrics.to_dict() if metrics is not None else None,
+            }
+        if path == "/jobs":
+            if method == "POST":
+                return self._submit(body)
+            if method == "GET":
+                return HTTPStatus.OK, {"jobs": [job.to_status() for job in self.manager.list()]}
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "許可されていないメソッドです")
+
+        match = _JOB_PATH.match(path)
+        if match is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "見つかりません")
+        job_id, action = match.group("job_id"), match.group("action")
+        try:
+            if action is None and method == "GET":
+                return HTTPStatus.OK, self.manager.get(job_id).to_status()
+            if action == "/cancel" and method == "POST":
+                return HTTPStatus.ACCEPTED, self.manager.cancel(job_id).to_status()
+            if action == "/result" and method == "GET":
+                job = self.manager.get(job_id)
+                if job.status != JOB_SUCCEEDED:
+                    raise HTTPError(
+                        HTTPStatus.CONFLICT, f"ジョブの結果はまだありません（status: {job.status}）"
+                    )
+                return HTTPStatus.OK, to_jsonable(job.result)
+        except JobNotFound:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"ジョブが見つかりません: {job_id}") from None
+        raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "許可されていないメソッドです")
+
+    def _submit(self, body: bytes) -> Tuple[HTTPStatus, Any]:
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "JSONを解析できません") from None
+        if not isinstance(payload, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "JSONオブジェクトを指定してください")
+        theme = payload.pop("theme", None)
+        if not isinstance(theme, str) or not theme.strip():
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "theme を指定してください")
+        try:
+            options = parse_job_options(payload)
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e)) from None
+        job = self.manager.submit(theme, **options)
+        return HTTPStatus.ACCEPTED, job.to_status()
+
+    async def _stream_events(self, path: str, writer: asyncio.StreamWriter) -> None:
+        match = _JOB_PATH.match(path)
+        if match is None or match.group("action") != "/events":
+            raise HTTPError(HTTPStatus.NOT_FOUND, "見つかりません")
+        job_id = match.group("job_id")
+        try:
+            job = self.manager.get(job_id)
+        except JobNotFound:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"ジョブが見つかりません: {job_id}") from None
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream; charset=utf-8\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        async for event in self.manager.follow(job_id):
+            data = json.dumps(event_payload(event), ensure_ascii=False)
+            writer.write(f"event: {type(event).__name__}\ndata: {data}\n\n".encode("utf-8"))
+            await writer.drain()
+        data = json.dumps(job.to_status(), ensure_ascii=False)
+        writer.write(f"event: end\ndata: {data}\n\n".encode("utf-8"))
+        await writer.drain()
+
+    async def _write_json(self, writer: asyncio.StreamWriter, status: HTTPStatus, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1")
+            + body
+        )
+        await writer.drain()
@@ -0,0 +1,223 @@
+"""サーバーモードで実行するヒアリングジョブの管理."""
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from agents import RunConfig
+
+from storage import save_artifacts
+from workflows import (
+    Deadline,
+    HearingWorkflowResult,
+    WorkflowEvent,
+    run_multi_persona_hearing_workflow,
+)
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+# ジョブの投入時に指定できるワークフローのオプションと、その型
+JOB_OPTIONS = {
+    "num_personas": int,
+    "saturation_threshold": float,
+    "saturation_patience": int,
+    "max_concurrency": int,
+    "call_timeout": float,
+    "deadline": float,
+}
+
+
+class JobNotFound(KeyError):
+    """指定したIDのジョブが存在しない."""
+
+
+@dataclass
+class Job:
+    """1件のヒアリングジョブ."""
+
+    job_id: str
+    theme: str
+    options: Dict[str, Any]
+    status: str = JOB_QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[HearingWorkflowResult] = None
+    events: List[WorkflowEvent] = field(default_factory=list)
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    _updated: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        """ジョブが終了（成功・失敗・キャンセル）しているか."""
+        return self.status in FINISHED_STATUSES
+
+    def record(self, event: WorkflowEvent) -> None:
+        """進捗イベントを記録し、購読中のクライアントに知らせる."""
+        self.events.append(event)
+        self._notify()
+
+    def _notify(self) -> None:
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    def to_status(self) -> Dict[str, Any]:
+        """ステータス取得APIで返す内容."""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "theme": self.theme,
+            "options": self.options,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "events": len(self.events),
+        }
+
+
+def parse_job_options(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    ジョブ投入リクエストのオプションを検証する.
+
+    Raises:
+        ValueError: 未知のオプションや型の合わない値が含まれる場合
+    """
+    options = {}
+    for name, value in payload.items():
+        if name not in JOB_OPTIONS:
+            raise ValueError(f"未対応のオプションです: {name}")
+        expected = JOB_OPTIONS[name]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{name} には数値を指定してください")
+        if expected is int and not float(value).is_integer():
+            raise ValueError(f"{name} には整数を指定してください")
+        options[name] = expected(value)
+    return options
+
+
+class JobManager:
+    """
+    ヒアリングジョブを受け付け、同時実行数の上限内で並行して実行する.
+
+    エージェントとOpenAIクライアントはプロセス内で使い回されるため、
+    ジョブごとにインタープリタの起動やSDKの読み込みは発生しない。
+    """
+
+    def __init__(
+        self,
+        max_running_jobs: int = 4,
+        run_config: Optional[RunConfig] = None,
+        output_root: Optional[Path] = None,
+    ):
+        if max_running_jobs < 1:
+            raise ValueError("max_running_jobs は1以上を指定してください")
+        self.max_running_jobs = max_running_jobs
+        self.run_config = run_config
+        self.output_root = output_root
+        self._slots = asyncio.Semaphore(max_running_jobs)
+        self._jobs: Dict[str, Job] = {}
+
+    def submit(self, theme: str, **options: Any) -> Job:
+        """ジョブを投入する（実行枠が空くまで queued のまま待つ）."""
+        job = Job(job_id=uuid.uuid4().hex, theme=theme, options=options)
+        self._jobs[job.job_id] = job
+        job.task = asyncio.ensure_future(self._run(job))
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """
+        ジョブを取得する.
+
+        Raises:
+            JobNotFound: ジョブが存在しない場合
+        """
+        try:
+            return self._jobs[job_id]
+        except KeyError:
+            raise JobNotFound(job_id) from None
+
+    def list(self) -> List[Job]:
+        """投入順のジョブ一覧."""
+        return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Job:
+        """ジョブをキャンセルする（終了済みのジョブは何もしない）."""
+        job = self.get(job_id)
+        if not job.finished and job.task is not None:
+            job.task.cancel()
+        return job
+
+    async def wait(self, job_id: str) -> Job:
+        """ジョブの終了を待つ."""
+        job = self.get(job_id)
+        while not job.finished:
+            await job._updated.wait()
+        return job
+
+    async def follow(self, job_id: str) -> AsyncIterator[WorkflowEvent]:
+        """記録済みのイベントから順に、ジョブが終了するまでイベントを返す."""
+        job = self.get(job_id)
+        position = 0
+        while True:
+            updated = job._updated
+            while position < len(job.events):
+                yield job.events[position]
+                position += 1
+            if job.finished:
+                return
+            await updated.wait()
+
+    async def shutdown(self) -> None:
+        """実行中・待機中のジョブをすべてキャンセルして終了を待つ."""
+        tasks = [job.task for job in self._jobs.values() if job.task is not None and not job.finished]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: Job) -> None:
+        try:
+            async with self._slots:
+                job.status = JOB_RUNNING
+                job.started_at = time.time()
+                job._notify()
+                options = dict(job.options)
+                if "deadline" in options:
+                    options["deadline"] = Deadline(options["deadline"])
+                job.result = await run_multi_persona_hearing_workflow(
+                    theme=job.theme,
+                    verbose=False,
+                    on_event=job.record,
+                    run_config=self.run_config,
+                    **options,
+                )
+                if self.output_root is not None:
+                    result = job.result
+                    save_artifacts(
+                        self.output_root / job.job_id,
+                        result.personas_output,
+                        result.questions_output,
+                        result.interviews,
+                        result.hypotheses,
+                        result.validation_questions,
+                        run_report=result.run_report,
+                    )
+                job.status = JOB_SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = JOB_CANCELLED
+        except Exception as e:
+            job.status = JOB_FAILED
+            job.error = f"{type(e).__name__}: {e}"
+        finally:
+            job.finished_at = time.time()
+            job._notify()
@@ -0,0 +1,125 @@
+"""
+ヒアリングワークフローの負荷試験.
+
+同じテーマのヒアリングワークフローを指定した回数・同時実行数で実行し、
+スループット、ヒアリングの所要時間、再試行、失敗したヒアリングと実行を集計する。
+モデルには backends.scenario の ScenarioModelProvider（遅延と障害の注入）を使う想定。
+"""
+import asyncio
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from agents import RunConfig
+
+from workflows import (
+    CallRetried,
+    InterviewCompleted,
+    InterviewFailed,
+    WorkflowEvent,
+    run_multi_persona_hearing_workflow,
+)
+
+
+def _nearest_rank(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+@dataclass
+class LoadTestReport:
+    """
+    負荷試験の結果.
+
+    Attributes:
+        runs: 実行したワークフローの数
+        concurrency: 同時に実行したワークフローの数
+        elapsed: 全体の所要時間（秒）
+        runs_succeeded: 最後まで完了したワークフローの数
+        run_errors: 失敗したワークフローのエラー
+        interviews_completed: 完了したヒアリングの数
+        interviews_failed: 失敗したヒアリングの数
+        interview_latencies: 完了したヒアリングの所要時間（秒）
+        retries: 再試行の回数（エラーの種類ごと）
+        model_calls: モデルの呼び出し回数（モデルが記録している場合）
+        faults: 注入した障害の回数（種類ごと。ScenarioModel の場合）
+    """
+
+    runs: int
+    concurrency: int
+    elapsed: float = 0.0
+    runs_succeeded: int = 0
+    run_errors: List[str] = field(default_factory=list)
+    interviews_completed: int = 0
+    interviews_failed: int = 0
+    interview_latencies: List[float] = field(default_factory=list)
+    retries: Dict[str, int] = field(default_factory=dict)
+    model_calls: Optional[int] = None
+    faults: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def interviews_per_minute(self) -> float:
+        """完了したヒアリングの1分あたりの件数."""
+        return self.interviews_completed / self.elapsed * 60 if self.elapsed > 0 else 0.0
+
+    def latency_percentile(self, q: float) -> Optional[float]:
+        """ヒアリングの所要時間のパーセンタイル（最近傍順位法）."""
+        return _nearest_rank(sorted(self.interview_latencies), q)
+
+
+async def run_load_test(
+    theme: str,
+    run_config: RunConfig,
+    runs: int = 1,
+    concurrency: int = 1,
+    model: Any = None,
+    **workflow_options,
+) -> LoadTestReport:
+    """
+    ヒアリングワークフローを runs 回（同時に concurrency 回まで）実行して集計する.
+
+    Args:
+        theme: ヒアリングのテーマ
+        run_config: エージェント実行時の設定（負荷試験用のモデルプロバイダーを指定する）
+        runs: 実行するワークフローの数
+        concurrency: 同時に実行するワークフローの最大数
+        model: 呼び出し回数（calls）と注入した障害（faults）を記録しているモデル（ScenarioModel など）
+        **workflow_options: run_multi_persona_hearing_workflow に渡す追加の引数
+    """
+    if runs < 1 or concurrency < 1:
+        raise ValueError("runs と concurrency は1以上を指定してください")
+    report = LoadTestReport(runs=runs, concurrency=concurrency)
+    retries: Counter = Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    def on_event(event: WorkflowEvent) -> None:
+        if isinstance(event, InterviewCompleted) and event.elapsed is not None:
+            report.interviews_completed += 1
+            report.interview_latencies.append(event.elapsed)
+        elif isinstance(event, InterviewFailed):
+            report.interviews_failed += 1
+        elif isinstance(event, CallRetried):
+            retries[event.error.split(":")[0]] += 1
+
+    async def run_once() -> None:
+        async with semaphore:
+            try:
+                await run_multi_persona_hearing_workflow(
+                    theme, verbose=False, on_event=on_event, run_config=run_config, **workflow_options,
+                )
+            except Exception as e:
+                report.run_errors.append(f"{type(e).__name__}: {e}")
+            else:
+                report.runs_succeeded += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_once() for _ in range(runs)))
+    report.elapsed = time.perf_counter() - started
+    report.retries = dict(retries)
+    if model is not None:
+        report.model_calls = getattr(model, "calls", None)
+        report.faults = dict(getattr(model, "faults", {}))
+    return report
@@ -0,0 +1,146 @@
+"""SQLiteジョブキューからジョブをリースして処理するワーカー."""
+import asyncio
+import os
+import socket
+from contextlib import suppress
+from typing import Callable, Optional
+
+from agents import RunConfig
+
+from storage import clear_artifacts, load_artifacts, save_artifacts
+from storage.job_queue import JobQueue, QueuedJob
+from workflows import CheckpointWriter, Deadline, run_multi_persona_hearing_workflow
+
+
+def default_worker_id() -> str:
+    """ホスト名とプロセスIDからワーカーIDを作る."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class QueueWorker:
+    """
+    ジョブキューのワーカー.
+
+    ジョブを1件ずつリースし、リース中はハートビートで期限を延長しながらワークフローを実行する。
+    完了したフェーズとヒアリング結果はジョブの出力ディレクトリに逐次保存されるため、
+    異常終了したワーカーのジョブを別のワーカーが回収した場合は、その続きから再開する。
+
+    Args:
+        queue: ジョブキュー
+        worker_id: リースの所有者として記録するID（デフォルト: ホスト名:PID）
+        run_config: ワークフローに渡す RunConfig（レート制限や偽モデルの指定）
+        heartbeat_interval: ハートビートの間隔（秒。デフォルト: リース期限の1/3）
+        poll_interval: キューが空の場合に次のリースを試すまでの間隔（秒）
+        print_fn: 進捗の出力先
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        worker_id: Optional[str] = None,
+        run_config: Optional[RunConfig] = None,
+        heartbeat_interval: Optional[float] = None,
+        poll_interval: float = 1.0,
+        print_fn: Callable[[str], None] = print,
+    ):
+        self.queue = queue
+        self.worker_id = worker_id or default_worker_id()
+        self.run_config = run_config
+        self.heartbeat_interval = (
+            heartbeat_interval if heartbeat_interval is not None else queue.visibility_timeout / 3
+        )
+        self.poll_interval = poll_interval
+        self._print = print_fn
+
+    async def run(self, stop_when_empty: bool = False) -> int:
+        """
+        ジョブを処理し続ける.
+
+        Args:
+            stop_when_empty: キューが空になったら終了する
+
+        Returns:
+            int: 処理したジョブ数（失敗を含む）
+        """
+        processed = 0
+        while True:
+            job = self.queue.lease(self.worker_id)
+            if job is None:
+                if stop_when_empty:
+                    return processed
+                await asyncio.sleep(self.poll_interval)
+                continue
+            await self.process(job)
+            processed += 1
+
+    async def process(self, job: QueuedJob) -> bool:
+        """
+        リースしたジョブを1件処理する.
+
+        Returns:
+            bool: ジョブが完了したか
+        """
+        self._print(f"▶️  [{self.worker_id}] ジョブ{job.job_id}（{job.attempts}回目）: {job.output_dir}")
+        resume_from = None
+        if job.is_retry:
+            with suppress(FileNotFoundError):
+                resume_from = load_artifacts(job.output_dir, allow_partial=True)
+        else:
+            clear_artifacts(job.output_dir)
+        checkpoint = CheckpointWriter(job.output_dir, initial=resume_from)
+
+        options = dict(job.options)
+        if "deadline" in options:
+            options["deadline"] = Deadline(options["deadline"])
+        workflow = asyncio.ensure_future(
+            run_multi_persona_hearing_workflow(
+                theme=job.theme,
+                verbose=False,
+                on_event=checkpoint,
+                resume_from=resume_from,
+                run_config=self.run_config,
+                **options,
+            )
+        )
+        lease_lost = asyncio.Event()
+        heartbeat = asyncio.ensure_future(self._heartbeat(job, workflow, lease_lost))
+        try:
+            result = await workflow
+        except asyncio.CancelledError:
+            if lease_lost.is_set():
+                self._print(f"⚠️  [{self.worker_id}] ジョブ{job.job_id}のリースを失ったため中断しました")
+                return False
+            # ワーカー自体の停止。完了済みの部分は保存済みなので、次のワーカーが続きから処理する
+            self.queue.release(job)
+            raise
+        except Exception as e:
+            self.queue.fail(job, f"{type(e).__name__}: {e}")
+            self._print(f"❌ [{self.worker_id}] ジョブ{job.job_id}が失敗しました: {e}")
+            return False
+        finally:
+            heartbeat.cancel()
+            with suppress(asyncio.CancelledError):
+                await heartbeat
+
+        save_artifacts(
+            job.output_dir,
+            result.personas_output,
+            result.questions_output,
+            result.interviews,
+            result.hypotheses,
+            result.validation_questions,
+            run_report=result.run_report,
+        )
+        if not self.queue.complete(job):
+            self._print(f"⚠️  [{self.worker_id}] ジョブ{job.job_id}は別のワーカーに回収されていました")
+            return False
+        self._print(f"✅ [{self.worker_id}] ジョブ{job.job_id}が完了しました")
+        return True
+
+    async def _heartbeat(self, job: QueuedJob, workflow: asyncio.Future, lease_lost: asyncio.Event) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            if not self.queue.heartbeat(job):
+                lease_lost.set()
+                workflow.cancel()
+                return
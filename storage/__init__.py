@@ -0,0 +1,77 @@
+"""
+実行結果の永続化のパッケージ.
+
+公開している名前は最初に参照されたときに読み込む（render はアーティファクトの読み書きだけを、
+ワーカーはジョブキューだけを読み込む）。
+"""
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# 公開名 → 定義しているモジュール
+_EXPORTS = {
+    "RunArtifacts": "storage.artifacts",
+    "artifacts_dir": "storage.artifacts",
+    "save_artifact": "storage.artifacts",
+    "save_artifacts": "storage.artifacts",
+    "clear_artifacts": "storage.artifacts",
+    "load_artifacts": "storage.artifacts",
+    "renderer_fingerprint": "storage.artifacts",
+    "render_digest": "storage.artifacts",
+    "load_render_manifest": "storage.artifacts",
+    "save_render_manifest": "storage.artifacts",
+    "InterviewStore": "storage.interview_store",
+    "InterviewView": "storage.interview_store",
+    "QUEUE_PENDING": "storage.job_queue",
+    "QUEUE_RUNNING": "storage.job_queue",
+    "QUEUE_SUCCEEDED": "storage.job_queue",
+    "QUEUE_FAILED": "storage.job_queue",
+    "JobQueue": "storage.job_queue",
+    "QueuedJob": "storage.job_queue",
+    "PersonaLibrary": "storage.persona_library",
+    "PersonaMatch": "storage.persona_library",
+    "PriorRun": "storage.run_index",
+    "RunIndex": "storage.run_index",
+    "theme_fingerprint": "storage.run_index",
+    "SharedRateLimiter": "storage.rate_limiter",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from storage.artifacts import (
+        RunArtifacts,
+        artifacts_dir,
+        save_artifact,
+        save_artifacts,
+        clear_artifacts,
+        load_artifacts,
+        renderer_fingerprint,
+        render_digest,
+        load_render_manifest,
+        save_render_manifest,
+    )
+    from storage.interview_store import InterviewStore, InterviewView
+    from storage.job_queue import (
+        QUEUE_PENDING,
+        QUEUE_RUNNING,
+        QUEUE_SUCCEEDED,
+        QUEUE_FAILED,
+        JobQueue,
+        QueuedJob,
+    )
+    from storage.persona_library import PersonaLibrary, PersonaMatch
+    from storage.run_index import PriorRun, RunIndex, theme_fingerprint
+    from storage.rate_limiter import SharedRateLimiter
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
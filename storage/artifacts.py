@@ -0,0 +1,303 @@
+"""実行結果の構造化アーティファクト（JSON）の保存と読み込み."""
+import hashlib
+import json
+import sys
+from collections import abc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from pydantic import BaseModel
+
+from models.schemas import (
+    PersonasOutput,
+    InterviewQuestionsOutput,
+    InterviewResponse,
+    HypothesisList,
+    ValidationQuestionsOutput,
+)
+from models.evaluation_schemas import EvaluationReport
+from models.run_report import RunReport
+from models.validation_schemas import ValidationInterviewReport
+from storage.interview_store import InterviewStore
+
+
+# 構造化アーティファクトを保存するサブディレクトリ名
+ARTIFACTS_DIRNAME = "artifacts"
+
+# Markdownの再生成判定に使うマニフェストのファイル名
+RENDER_MANIFEST_FILENAME = "render_manifest.json"
+
+PERSONAS_FILENAME = "personas.json"
+QUESTIONS_FILENAME = "initial_questions.json"
+INTERVIEWS_FILENAME = "interviews.jsonl"
+# 以前の形式（JSON配列）のヒアリング結果。読み込みのみ対応する
+LEGACY_INTERVIEWS_FILENAME = "interviews.json"
+HYPOTHESES_FILENAME = "hypotheses.json"
+VALIDATION_QUESTIONS_FILENAME = "validation_questions.json"
+EVALUATION_FILENAME = "evaluation.json"
+RUN_REPORT_FILENAME = "run_report.json"
+VALIDATION_INTERVIEWS_FILENAME = "validation_interviews.json"
+
+# ワークフローが保存するアーティファクトのファイル名（保存順）
+ARTIFACT_FILENAMES = (
+    PERSONAS_FILENAME,
+    QUESTIONS_FILENAME,
+    INTERVIEWS_FILENAME,
+    RUN_REPORT_FILENAME,
+    HYPOTHESES_FILENAME,
+    VALIDATION_QUESTIONS_FILENAME,
+    VALIDATION_INTERVIEWS_FILENAME,
+    EVALUATION_FILENAME,
+)
+
+
+@dataclass
+class RunArtifacts:
+    """
+    1回の実行で得られた構造化データ一式.
+
+    中断された実行では、まだ完了していないフェーズの値が None になる。
+    ヒアリング結果は、保存済みのアーティファクトから読み込んだ場合は
+    ファイルを直接参照する InterviewStore になる。
+    """
+
+    personas_output: Optional[PersonasOutput] = None
+    questions_output: Optional[InterviewQuestionsOutput] = None
+    interviews: Sequence[InterviewResponse] = field(default_factory=list)
+    hypotheses: Optional[HypothesisList] = None
+    validation_questions: Optional[ValidationQuestionsOutput] = None
+    evaluation_report: Optional[EvaluationReport] = None
+    run_report: Optional[RunReport] = None
+    validation_interviews: Optional[ValidationInterviewReport] = None
+
+
+def artifacts_dir(output_dir: Path) -> Path:
+    """出力ディレクトリ配下のアーティファクト保存先を返す."""
+    return output_dir / ARTIFACTS_DIRNAME
+
+
+def _write_json(path: Path, text: str) -> None:
+    """一時ファイル経由でJSONを書き込む（途中で中断されても壊れない）."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def _write_interviews(path: Path, interviews: Sequence[InterviewResponse]) -> None:
+    """ヒアリング結果を1行1件のJSONLとして書き込む（1件ずつ書き出し、全体をメモリに載せない）."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for interview in interviews:
+            f.write(interview.model_dump_json())
+            f.write("\n")
+    tmp_path.replace(path)
+
+
+def save_artifact(
+    output_dir: Path,
+    filename: str,
+    value: Union[BaseModel, Sequence[InterviewResponse]],
+) -> Path:
+    """
+    アーティファクトを1つだけ保存する（実行途中のチェックポイントに使う）.
+
+    Returns:
+        Path: 保存したファイルのパス
+    """
+    target_dir = artifacts_dir(output_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    path = target_dir / filename
+    if filename == INTERVIEWS_FILENAME:
+        # 保存先のファイルに追記済みのストアはそのままでよい
+        if not (isinstance(value, InterviewStore) and value.path.resolve() == path.resolve()):
+            _write_interviews(path, value)
+    else:
+        _write_json(path, value.model_dump_json(indent=2))
+    return path
+
+
+def clear_artifacts(output_dir: Path) -> None:
+    """前回の実行のアーティファクトを削除する（再開時に混ざらないように）."""
+    target_dir = artifacts_dir(output_dir)
+    for filename in (*ARTIFACT_FILENAMES, LEGACY_INTERVIEWS_FILENAME):
+        (target_dir / filename).unlink(missing_ok=True)
+
+
+def save_artifacts(
+    output_dir: Path,
+    personas_output: Optional[PersonasOutput],
+    questions_output: Optional[InterviewQuestionsOutput],
+    interviews: Sequence[InterviewResponse],
+    hypotheses: Optional[HypothesisList],
+    validation_questions: Optional[ValidationQuestionsOutput],
+    evaluation_report: Optional[EvaluationReport] = None,
+    run_report: Optional[RunReport] = None,
+    validation_interviews: Optional[ValidationInterviewReport] = None,
+) -> Path:
+    """
+    各フェーズの結果を構造化JSONとして保存する.
+
+    保存したアーティファクトは `main.py render` でMarkdownを再生成する際や、
+    中断した実行を `--resume` で再開する際の入力になる。
+    None のフェーズ（中断により未完了）は保存しない。
+
+    Returns:
+        Path: アーティファクトの保存先ディレクトリ
+    """
+    target_dir = artifacts_dir(output_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    values = {
+        PERSONAS_FILENAME: personas_output,
+        QUESTIONS_FILENAME: questions_output,
+        INTERVIEWS_FILENAME: interviews,
+        RUN_REPORT_FILENAME: run_report,
+        HYPOTHESES_FILENAME: hypotheses,
+        VALIDATION_QUESTIONS_FILENAME: validation_questions,
+        VALIDATION_INTERVIEWS_FILENAME: validation_interviews,
+        EVALUATION_FILENAME: evaluation_report,
+    }
+    for filename, value in values.items():
+        if value is not None:
+            save_artifact(output_dir, filename, value)
+
+    return target_dir
+
+
+def load_artifacts(output_dir: Path, allow_partial: bool = False) -> RunArtifacts:
+    """
+    保存済みの構造化JSONを読み込む.
+
+    allow_partial が True の場合、中断された実行のように一部のフェーズの
+    アーティファクトがなくてもエラーにせず、その値を None（ヒアリング結果は空）にする。
+
+    Raises:
+        FileNotFoundError: アーティファクトのディレクトリ、または
+            （allow_partial が False の場合に）必須のアーティファクトが存在しない場合
+    """
+    source_dir = artifacts_dir(output_dir)
+    if not source_dir.is_dir():
+        raise FileNotFoundError(f"アーティファクトが見つかりません: {source_dir}")
+
+    def read(filename: str) -> Optional[str]:
+        path = source_dir / filename
+        if allow_partial and not path.exists():
+            return None
+        return path.read_text(encoding="utf-8")
+
+    def read_required(filename: str, model):
+        text = read(filename)
+        return None if text is None else model.model_validate_json(text)
+
+    def read_optional(filename: str, model):
+        path = source_dir / filename
+        if not path.exists():
+            return None
+        return model.model_validate_json(path.read_text(encoding="utf-8"))
+
+    def read_interviews() -> Sequence[InterviewResponse]:
+        path = source_dir / INTERVIEWS_FILENAME
+        if path.exists():
+            return InterviewStore(path)
+        legacy_path = source_dir / LEGACY_INTERVIEWS_FILENAME
+        if legacy_path.exists():
+            data = json.loads(legacy_path.read_text(encoding="utf-8"))
+            return [InterviewResponse.model_validate(item) for item in data]
+        if allow_partial:
+            return []
+        raise FileNotFoundError(f"アーティファクトが見つかりません: {path}")
+
+    return RunArtifacts(
+        personas_output=read_required(PERSONAS_FILENAME, PersonasOutput),
+        questions_output=read_required(QUESTIONS_FILENAME, InterviewQuestionsOutput),
+        interviews=read_interviews(),
+        hypotheses=read_required(HYPOTHESES_FILENAME, HypothesisList),
+        validation_questions=read_required(
+            VALIDATION_QUESTIONS_FILENAME, ValidationQuestionsOutput
+        ),
+        evaluation_report=read_optional(EVALUATION_FILENAME, EvaluationReport),
+        run_report=read_optional(RUN_REPORT_FILENAME, RunReport),
+        validation_interviews=read_optional(
+            VALIDATION_INTERVIEWS_FILENAME, ValidationInterviewReport
+        ),
+    )
+
+
+# レンダラーが使う分析処理のモジュールのディレクトリ（ソースの内容をフィンガープリントに含める）
+RENDERER_SOURCE_DIRS = (Path(__file__).resolve().parent.parent / "analysis",)
+
+
+def _hash_code(code, digest) -> None:
+    """コードオブジェクト（ネストした関数・内包表記を含む）をハッシュに加える."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _hash_code(const, digest)
+        else:
+            digest.update(repr(const).encode("utf-8"))
+
+
+def _renderer_source_files(renderer: Callable) -> List[Path]:
+    """レンダラーを定義したモジュールと、分析処理のモジュールのソースファイル."""
+    files = []
+    module_file = getattr(sys.modules.get(renderer.__module__), "__file__", None)
+    if module_file is not None:
+        files.append(Path(module_file))
+    for directory in RENDERER_SOURCE_DIRS:
+        files.extend(sorted(directory.glob("*.py")))
+    return files
+
+
+def renderer_fingerprint(renderer: Callable) -> str:
+    """
+    レンダラー関数の実装から算出したバージョン識別子を返す.
+
+    レンダラー自身のバイトコードに加えて、レンダラーを定義したモジュール（main.py）と
+    分析処理のモジュール（analysis/）のソースファイルの内容から算出するため、
+    レンダラーが呼び出すヘルパー関数を変更しても手動でバージョンを上げずに再生成の対象になる。
+    """
+    digest = hashlib.sha256()
+    _hash_code(renderer.__code__, digest)
+    for path in _renderer_source_files(renderer):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def render_digest(renderer: Callable, inputs: Sequence[object]) -> str:
+    """レンダラーとその入力データの組み合わせに対するダイジェストを返す."""
+    digest = hashlib.sha256(renderer_fingerprint(renderer).encode("utf-8"))
+    for item in inputs:
+        if isinstance(item, BaseModel):
+            digest.update(item.model_dump_json().encode("utf-8"))
+        elif isinstance(item, abc.Sequence) and not isinstance(item, str):
+            for element in item:
+                digest.update(element.model_dump_json().encode("utf-8"))
+                digest.update(b"\x1e")
+        else:
+            digest.update(repr(item).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def load_render_manifest(output_dir: Path) -> Dict[str, str]:
+    """Markdownファイル名とレンダーダイジェストの対応表を読み込む."""
+    path = artifacts_dir(output_dir) / RENDER_MANIFEST_FILENAME
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+
+
+def save_render_manifest(output_dir: Path, manifest: Dict[str, str]) -> None:
+    """Markdownファイル名とレンダーダイジェストの対応表を保存する."""
+    target_dir = artifacts_dir(output_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    _write_json(
+        target_dir / RENDER_MANIFEST_FILENAME,
+        json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True),
+    )
@@ -0,0 +1,241 @@
+"""
+メモリ使用量を抑えたヒアリング結果の保存先.
+
+完了したヒアリング結果は追記専用のJSONLファイルに書き出し、メモリには
+各行の位置（オフセット）の索引と、直近に使った少数の結果だけを保持する。
+読み出しはメモリマップしたファイルから行単位で行うため、ペルソナ数や回答の長さが
+増えてもメモリ使用量はほぼ一定のまま、順次読み出しとペルソナ名による参照ができる。
+"""
+import json
+import mmap
+import os
+import tempfile
+import weakref
+from abc import abstractmethod
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Union
+
+from models.schemas import InterviewResponse
+
+
+# メモリに保持する直近のヒアリング結果の件数（デフォルト）
+DEFAULT_WINDOW = 64
+
+
+class _InterviewSequence(Sequence):
+    """
+    リストと同じように比較できるヒアリング結果のシーケンス.
+
+    Sequence と同じく抽象基底クラスなので、get を実装していないサブクラスは
+    インスタンスを作る時点で TypeError になる。
+    """
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (str, bytes)) or not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    @abstractmethod
+    def get(self, persona_name: str) -> Optional[InterviewResponse]:
+        """ペルソナ名でヒアリング結果を取得する（なければ None）."""
+
+
+class InterviewStore(_InterviewSequence):
+    """
+    追記専用ファイルに保存するヒアリング結果のシーケンス.
+
+    Args:
+        path: 保存先のJSONLファイル。既存のファイルは読み込んで続きに追記する。
+            省略すると一時ファイルを使い、close() またはガベージコレクション時に削除する
+        window: メモリに保持する直近のヒアリング結果の件数
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, window: int = DEFAULT_WINDOW):
+        if window < 0:
+            raise ValueError("window は0以上を指定してください")
+        self.window = window
+        self.temporary = path is None
+        if path is None:
+            fd, name = tempfile.mkstemp(prefix="interviews-", suffix=".jsonl")
+            os.close(fd)
+            path = name
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+
+        # 各行の開始位置と、ペルソナ名 → 位置の索引
+        self._offsets = array("q")
+        self._end = 0
+        self._by_persona: Dict[str, int] = {}
+        self._cache: "OrderedDict[int, InterviewResponse]" = OrderedDict()
+        self._map: Optional[mmap.mmap] = None
+        self._reader = open(self.path, "rb")
+        self._index_existing()
+        self._writer = open(self.path, "ab")
+        self._finalizer = weakref.finalize(
+            self, _close_files, self._reader, self._writer, self.path if self.temporary else None
+        )
+
+    def _index_existing(self) -> None:
+        """既存のファイルの索引を作る（途中で中断された最後の行は切り捨てる）."""
+        offset = 0
+        self._reader.seek(0)
+        for line in self._reader:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                persona_name = json.loads(line)["persona_name"]
+            except (ValueError, KeyError, TypeError):
+                break
+            self._by_persona[persona_name] = len(self._offsets)
+            self._offsets.append(offset)
+            offset += len(line)
+        if offset != self.path.stat().st_size:
+            os.truncate(self.path, offset)
+        self._end = offset
+
+    def append(self, interview: InterviewResponse) -> int:
+        """
+        ヒアリング結果を追記する.
+
+        Returns:
+            int: 追記した位置（インデックス）
+        """
+        line = interview.model_dump_json().encode("utf-8") + b"\n"
+        self._writer.write(line)
+        self._writer.flush()
+        position = len(self._offsets)
+        self._offsets.append(self._end)
+        self._end += len(line)
+        self._by_persona[interview.persona_name] = position
+        self._remember(position, interview)
+        return position
+
+    def extend(self, interviews: Iterable[InterviewResponse]) -> None:
+        """複数のヒアリング結果を追記する."""
+        for interview in interviews:
+            self.append(interview)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ヒアリング結果のインデックスが範囲外です")
+        cached = self._cache.get(index)
+        if cached is not None:
+            self._cache.move_to_end(index)
+            return cached
+        interview = InterviewResponse.model_validate_json(self._read(index))
+        self._remember(index, interview)
+        return interview
+
+    def __iter__(self) -> Iterator[InterviewResponse]:
+        # 順次読み出しでは直近の結果の保持を入れ替えない
+        for index in range(len(self)):
+            cached = self._cache.get(index)
+            yield cached if cached is not None else InterviewResponse.model_validate_json(self._read(index))
+
+    def index_of(self, persona_name: str) -> Optional[int]:
+        """ペルソナ名に対応する位置（なければ None。同名が複数ある場合は最後のもの）."""
+        return self._by_persona.get(persona_name)
+
+    def get(self, persona_name: str) -> Optional[InterviewResponse]:
+        position = self.index_of(persona_name)
+        return None if position is None else self[position]
+
+    def persona_names(self) -> List[str]:
+        """保存済みのヒアリング結果のペルソナ名（追記順）."""
+        names = [""] * len(self)
+        for name, position in self._by_persona.items():
+            names[position] = name
+        return names
+
+    def view(self, positions: Iterable[int]) -> "InterviewView":
+        """指定した位置のヒアリング結果を、その順に並べたシーケンスを返す（コピーしない）."""
+        return InterviewView(self, positions)
+
+    def close(self) -> None:
+        """ファイルを閉じる（一時ファイルの場合は削除する）."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._finalizer()
+
+    def __enter__(self) -> "InterviewStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"InterviewStore(path={str(self.path)!r}, count={len(self)})"
+
+    def _read(self, index: int) -> bytes:
+        start = self._offsets[index]
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else self._end
+        if self._map is None or len(self._map) < end:
+            # ファイルが伸びた分を読めるようにマップし直す
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._reader.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map[start:end]
+
+    def _remember(self, index: int, interview: InterviewResponse) -> None:
+        if self.window == 0:
+            return
+        self._cache[index] = interview
+        self._cache.move_to_end(index)
+        while len(self._cache) > self.window:
+            self._cache.popitem(last=False)
+
+
+def _close_files(reader, writer, temporary_path: Optional[Path]) -> None:
+    reader.close()
+    writer.close()
+    if temporary_path is not None:
+        temporary_path.unlink(missing_ok=True)
+
+
+class InterviewView(_InterviewSequence):
+    """InterviewStore の一部を任意の順序で参照するシーケンス（ペルソナ順の結果などに使う）."""
+
+    def __init__(self, store: InterviewStore, positions: Iterable[int]):
+        self.store = store
+        self._positions = array("q", positions)
+        # get で使う位置の集合（最初に使うときに作る）
+        self._members: Optional[FrozenSet[int]] = None
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.store[position] for position in self._positions[index]]
+        return self.store[self._positions[index]]
+
+    def __iter__(self) -> Iterator[InterviewResponse]:
+        for position in self._positions:
+            yield self.store[position]
+
+    def get(self, persona_name: str) -> Optional[InterviewResponse]:
+        position = self.store.index_of(persona_name)
+        if position is None:
+            return None
+        if self._members is None:
+            self._members = frozenset(self._positions)
+        if position not in self._members:
+            return None
+        return self.store[position]
+
+    def __repr__(self) -> str:
+        return f"InterviewView(store={self.store!r}, count={len(self)})"
@@ -0,0 +1,235 @@
+"""
+SQLiteを使った永続的なジョブキュー.
+
+複数のワーカープロセスが同じデータベースファイルを共有し、ジョブをリース（貸し出し）して処理する。
+リースには有効期限（visibility timeout）があり、ワーカーはハートビートで期限を延長する。
+ワーカーが異常終了して期限が切れたジョブは、次のリース時に自動的に回収され別のワーカーに渡る。
+"""
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+
+QUEUE_PENDING = "pending"
+QUEUE_RUNNING = "running"
+QUEUE_SUCCEEDED = "succeeded"
+QUEUE_FAILED = "failed"
+
+QUEUE_STATUSES = (QUEUE_PENDING, QUEUE_RUNNING, QUEUE_SUCCEEDED, QUEUE_FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    theme TEXT NOT NULL,
+    output_dir TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+
+@dataclass(frozen=True)
+class QueuedJob:
+    """リースしたジョブ."""
+
+    job_id: int
+    theme: str
+    output_dir: Path
+    options: Dict[str, Any]
+    attempts: int
+    lease_owner: str
+    lease_expires_at: float
+
+    @property
+    def is_retry(self) -> bool:
+        """以前のリースで途中まで処理された可能性があるか."""
+        return self.attempts > 1
+
+
+def connect(path: Union[str, Path], timeout: float = 30.0) -> sqlite3.Connection:
+    """
+    複数プロセスから共有するSQLiteデータベースに接続する.
+
+    WALモードにより読み込みと書き込みが互いを待たない。トランザクションは
+    `transaction()` で明示的に開始する（autocommit）。
+    """
+    conn = sqlite3.connect(str(path), timeout=timeout, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """書き込みロックを先に取得するトランザクション（他プロセスとの競合で読み直しが起きない）."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+class JobQueue:
+    """
+    SQLiteに保存するジョブキュー.
+
+    Args:
+        path: データベースファイルのパス（存在しなければ作成する）
+        visibility_timeout: リースの有効期限（秒）。ハートビートがないまま過ぎると回収される
+        max_attempts: 1件のジョブをリースする最大回数（失敗・回収を含む）
+        clock: 現在時刻（UNIX時間）を返す関数
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 3,
+        clock: Callable[[], float] = time.time,
+    ):
+        if visibility_timeout <= 0:
+            raise ValueError("visibility_timeout は0より大きい秒数を指定してください")
+        if max_attempts < 1:
+            raise ValueError("max_attempts は1以上を指定してください")
+        self.path = Path(path)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self._conn = connect(self.path)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """データベース接続を閉じる."""
+        self._conn.close()
+
+    def enqueue(
+        self, theme: str, output_dir: Union[str, Path], options: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """ジョブを追加し、ジョブIDを返す."""
+        cursor = self._conn.execute(
+            "INSERT INTO jobs (theme, output_dir, options, status, max_attempts, enqueued_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                theme,
+                str(output_dir),
+                json.dumps(options or {}, ensure_ascii=False),
+                QUEUE_PENDING,
+                self.max_attempts,
+                self._clock(),
+            ),
+        )
+        return cursor.lastrowid
+
+    def lease(self, worker_id: str) -> Optional[QueuedJob]:
+        """
+        次のジョブをリースする（なければ None）.
+
+        待機中のジョブに加え、リースの期限が切れた実行中のジョブ（ワーカーの異常終了）も対象にする。
+        回収されたジョブが試行回数の上限に達している場合は失敗として記録する。
+        """
+        now = self._clock()
+        with transaction(self._conn) as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, lease_owner = NULL,"
+                " error = 'リースの期限切れが上限回数に達しました'"
+                " WHERE status = ? AND lease_expires_at < ? AND attempts >= max_attempts",
+                (QUEUE_FAILED, now, QUEUE_RUNNING, now),
+            )
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? OR (status = ? AND lease_expires_at < ?)"
+                " ORDER BY id LIMIT 1",
+                (QUEUE_PENDING, QUEUE_RUNNING, now),
+            ).fetchone()
+            if row is None:
+                return None
+            expires_at = now + self.visibility_timeout
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?,"
+                " lease_expires_at = ?, started_at = COALESCE(started_at, ?) WHERE id = ?",
+                (QUEUE_RUNNING, worker_id, expires_at, now, row["id"]),
+            )
+        return QueuedJob(
+            job_id=row["id"],
+            theme=row["theme"],
+            output_dir=Path(row["output_dir"]),
+            options=json.loads(row["options"]),
+            attempts=row["attempts"] + 1,
+            lease_owner=worker_id,
+            lease_expires_at=expires_at,
+        )
+
+    def heartbeat(self, job: QueuedJob) -> bool:
+        """
+        リースの期限を延長する.
+
+        Returns:
+            延長できたか（期限切れで別のワーカーに回収された場合は False）
+        """
+        cursor = self._conn.execute(
+            "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+            (self._clock() + self.visibility_timeout, job.job_id, QUEUE_RUNNING, job.lease_owner),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job: QueuedJob) -> bool:
+        """ジョブを完了にする（リースを失っていた場合は何もせず False）."""
+        return self._finish(job, QUEUE_SUCCEEDED, None)
+
+    def fail(self, job: QueuedJob, error: str) -> bool:
+        """
+        失敗を記録する.
+
+        試行回数が上限に達していなければ待機中に戻し、別のリースで再試行する。
+        """
+        if job.attempts < self.max_attempts:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires_at = NULL, error = ?"
+                " WHERE id = ? AND status = ? AND lease_owner = ?",
+                (QUEUE_PENDING, error, job.job_id, QUEUE_RUNNING, job.lease_owner),
+            )
+            return cursor.rowcount == 1
+        return self._finish(job, QUEUE_FAILED, error)
+
+    def release(self, job: QueuedJob) -> bool:
+        """リースを返却して待機中に戻す（ワーカーの停止時。試行回数には数えない）."""
+        cursor = self._conn.execute(
+            "UPDATE jobs SET status = ?, attempts = attempts - 1, lease_owner = NULL,"
+            " lease_expires_at = NULL WHERE id = ? AND status = ? AND lease_owner = ?",
+            (QUEUE_PENDING, job.job_id, QUEUE_RUNNING, job.lease_owner),
+        )
+        return cursor.rowcount == 1
+
+    def _finish(self, job: QueuedJob, status: str, error: Optional[str]) -> bool:
+        cursor = self._conn.execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, lease_owner = NULL,"
+            " lease_expires_at = NULL, error = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+            (status, self._clock(), error, job.job_id, QUEUE_RUNNING, job.lease_owner),
+        )
+        return cursor.rowcount == 1
+
+    def counts(self) -> Dict[str, int]:
+        """ステータスごとのジョブ数."""
+        counts = {status: 0 for status in QUEUE_STATUSES}
+        for row in self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            counts[row["status"]] = row["n"]
+        return counts
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        """全ジョブの状態（追加順）."""
+        return [dict(row) for row in self._conn.execute("SELECT * FROM jobs ORDER BY id")]
@@ -0,0 +1,206 @@
+"""
+テーマをまたいでペルソナを再利用するためのペルソナライブラリ.
+
+生成したペルソナを、生成したときのテーマと一緒にSQLiteデータベースに蓄積する。
+検索用の索引（文字n-gramの転置索引）は最初の検索時にデータベースから作り、以降はメモリに保持する。
+新しいテーマでは、テーマの類似度とペルソナの内容（職業・背景・ニーズ・不満・行動）の
+類似度を合わせたスコアで、蓄積したペルソナから近いものを探す。
+"""
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from analysis.text_similarity import NgramSearchIndex
+from models.schemas import PersonaOutput
+from storage.job_queue import connect, transaction
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS themes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    theme TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS personas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    theme_id INTEGER NOT NULL REFERENCES themes (id),
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+# テーマの類似度で候補を絞るときに残すテーマ数
+_CANDIDATE_THEMES = 200
+
+
+def persona_text(persona: PersonaOutput) -> str:
+    """検索に使うペルソナの内容（名前と年齢は含めない）."""
+    return " ".join([
+        persona.occupation,
+        persona.background,
+        *persona.needs,
+        *persona.pain_points,
+        *persona.behaviors,
+    ])
+
+
+@dataclass(frozen=True)
+class PersonaMatch:
+    """
+    ライブラリから見つかったペルソナ.
+
+    Attributes:
+        persona: ペルソナ
+        theme: ペルソナを生成したときのテーマ
+        similarity: 検索したテーマとの類似度（0-1）
+    """
+
+    persona: PersonaOutput
+    theme: str
+    similarity: float
+
+
+class PersonaLibrary:
+    """
+    生成したペルソナを蓄積し、似たテーマで再利用するライブラリ.
+
+    Args:
+        path: データベースファイルのパス（存在しなければ作成する）
+        min_similarity: 再利用するペルソナの類似度の下限（0-1）
+        theme_weight: スコアに占めるテーマの類似度の割合（残りはペルソナの内容の類似度）
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        min_similarity: float = 0.3,
+        theme_weight: float = 0.5,
+    ):
+        if not 0 <= min_similarity <= 1:
+            raise ValueError("min_similarity は0以上1以下を指定してください")
+        if not 0 <= theme_weight <= 1:
+            raise ValueError("theme_weight は0以上1以下を指定してください")
+        self.path = Path(path)
+        self.min_similarity = min_similarity
+        self.theme_weight = theme_weight
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = connect(self.path)
+        self._conn.executescript(_SCHEMA)
+        # 索引は最初の検索時に作る（索引の番号 → データベースのID）
+        self._theme_index: Optional[NgramSearchIndex] = None
+        self._persona_index: Optional[NgramSearchIndex] = None
+        self._theme_ids: List[int] = []
+        self._persona_ids: List[int] = []
+        self._personas_by_theme: Dict[int, List[int]] = {}
+
+    def close(self) -> None:
+        """データベース接続を閉じる."""
+        self._conn.close()
+
+    def __enter__(self) -> "PersonaLibrary":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM personas").fetchone()[0]
+
+    def _build_index(self) -> None:
+        self._theme_index = NgramSearchIndex()
+        self._persona_index = NgramSearchIndex()
+        for row in self._conn.execute("SELECT id, theme FROM themes ORDER BY id"):
+            self._index_theme(row["id"], row["theme"])
+        for row in self._conn.execute("SELECT id, theme_id, data FROM personas ORDER BY id"):
+            self._index_persona(row["id"], row["theme_id"], PersonaOutput.model_validate_json(row["data"]))
+
+    def _index_theme(self, theme_id: int, theme: str) -> None:
+        self._theme_index.add(theme)
+        self._theme_ids.append(theme_id)
+        self._personas_by_theme[theme_id] = []
+
+    def _index_persona(self, persona_id: int, theme_id: int, persona: PersonaOutput) -> None:
+        self._persona_index.add(persona_text(persona))
+        self._personas_by_theme[theme_id].append(len(self._persona_ids))
+        self._persona_ids.append(persona_id)
+
+    def add(self, theme: str, personas: Iterable[PersonaOutput]) -> int:
+        """テーマと、そのテーマで生成したペルソナを追加し、追加したペルソナの数を返す."""
+        personas = list(personas)
+        if not personas:
+            return 0
+        now = time.time()
+        with transaction(self._conn) as conn:
+            theme_id = conn.execute(
+                "INSERT INTO themes (theme, created_at) VALUES (?, ?)", (theme, now)
+            ).lastrowid
+            persona_ids = [
+                conn.execute(
+                    "INSERT INTO personas (theme_id, name, data, created_at) VALUES (?, ?, ?, ?)",
+                    (theme_id, persona.name, persona.model_dump_json(), now),
+                ).lastrowid
+                for persona in personas
+            ]
+        if self._theme_index is not None:
+            self._index_theme(theme_id, theme)
+            for persona_id, persona in zip(persona_ids, personas):
+                self._index_persona(persona_id, theme_id, persona)
+        return len(personas)
+
+    def search(
+        self,
+        theme: str,
+        limit: int = 10,
+        exclude_names: Iterable[str] = (),
+    ) -> List[PersonaMatch]:
+        """
+        テーマに近いペルソナを類似度の高い順に最大 limit 件返す.
+
+        テーマの類似度で候補のテーマを絞り込み、その中のペルソナを
+        テーマの類似度とペルソナの内容の類似度の重み付き平均で並べる。
+        同じ名前のペルソナは最も類似度の高いものだけを返す。
+
+        Args:
+            theme: 新しいテーマ
+            limit: 返すペルソナの最大数
+            exclude_names: 返さないペルソナの名前
+        """
+        if limit <= 0:
+            return []
+        if self._theme_index is None:
+            self._build_index()
+        theme_scores = dict(self._theme_index.search(theme, limit=_CANDIDATE_THEMES))
+        if not theme_scores:
+            return []
+        persona_scores = self._persona_index.scores(theme)
+        weight = self.theme_weight
+        scored = []
+        for theme_position, theme_score in theme_scores.items():
+            for position in self._personas_by_theme[self._theme_ids[theme_position]]:
+                score = weight * theme_score + (1 - weight) * persona_scores.get(position, 0.0)
+                if score >= self.min_similarity:
+                    scored.append((score, position))
+        scored.sort(reverse=True)
+
+        matches: List[PersonaMatch] = []
+        seen = set(exclude_names)
+        for score, position in scored:
+            row = self._conn.execute(
+                "SELECT personas.name, personas.data, themes.theme FROM personas"
+                " JOIN themes ON themes.id = personas.theme_id WHERE personas.id = ?",
+                (self._persona_ids[position],),
+            ).fetchone()
+            if row["name"] in seen:
+                continue
+            seen.add(row["name"])
+            matches.append(PersonaMatch(
+                persona=PersonaOutput.model_validate(json.loads(row["data"])),
+                theme=row["theme"],
+                similarity=round(score, 4),
+            ))
+            if len(matches) >= limit:
+                break
+        return matches
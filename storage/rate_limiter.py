@@ -0,0 +1,90 @@
+"""複数プロセスで共有するAPI呼び出しのレート制限（SQLiteに状態を保存するトークンバケット）."""
+import asyncio
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from storage.job_queue import connect, transaction
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class SharedRateLimiter:
+    """
+    同じデータベースファイルを使うすべてのプロセスで共有するトークンバケット.
+
+    ワーカーを増やしても、API呼び出しの合計が requests_per_minute を超えないようにする。
+
+    Args:
+        path: データベースファイルのパス（ジョブキューと同じファイルでよい）
+        requests_per_minute: 1分あたりの呼び出し数の上限
+        burst: 一度に消費できる呼び出し数（デフォルト: 1秒分、最低1）
+        name: バケット名（上限の異なる複数のバケットを同じファイルに置く場合に使う）
+        clock: 現在時刻（UNIX時間）を返す関数
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        requests_per_minute: float,
+        burst: Optional[float] = None,
+        name: str = "openai",
+        clock: Callable[[], float] = time.time,
+    ):
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute は0より大きい値を指定してください")
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1.0, self.rate)
+        self.name = name
+        self._clock = clock
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """データベース接続を閉じる."""
+        self._conn.close()
+
+    def try_acquire(self) -> float:
+        """
+        呼び出し枠を1つ取得する.
+
+        Returns:
+            取得できた場合は0、できなかった場合は枠が空くまでの待ち秒数
+        """
+        now = self._clock()
+        with transaction(self._conn) as conn:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM rate_limits WHERE name = ?", (self.name,)
+            ).fetchone()
+            if row is None:
+                tokens = self.capacity
+            else:
+                elapsed = max(0.0, now - row["updated_at"])
+                tokens = min(self.capacity, row["tokens"] + elapsed * self.rate)
+            wait = 0.0
+            if tokens >= 1.0:
+                tokens -= 1.0
+            else:
+                wait = (1.0 - tokens) / self.rate
+            conn.execute(
+                "INSERT INTO rate_limits (name, tokens, updated_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(name) DO UPDATE SET tokens = excluded.tokens,"
+                " updated_at = excluded.updated_at",
+                (self.name, tokens, now),
+            )
+        return wait
+
+    async def acquire(self) -> None:
+        """呼び出し枠が空くまで待って1つ取得する."""
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
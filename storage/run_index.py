@@ -0,0 +1,163 @@
+"""
+過去の実行のテーマの索引（ほぼ同じテーマの再実行の検出）.
+
+完了した実行ごとに、テーマ・正規化したテーマのフィンガープリント・出力ディレクトリを
+SQLiteデータベースに記録する。新しいテーマと同じフィンガープリント（全角・半角や空白・記号の
+違いだけ）の実行、または文字n-gramのコサイン類似度がしきい値以上の実行を、ほぼ同じテーマの
+以前の実行として返す。候補は転置索引で絞り込むため、数千件の実行があっても検索は短時間で終わる。
+"""
+import hashlib
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Union
+
+from analysis.text_similarity import NgramSearchIndex, char_ngrams, cosine_similarity, normalize_text
+from storage.job_queue import connect, transaction
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    theme TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    output_dir TEXT NOT NULL UNIQUE,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_fingerprint ON runs (fingerprint);
+"""
+
+# 類似度を計算し直す候補の数
+_CANDIDATES = 50
+
+
+def theme_fingerprint(theme: str) -> str:
+    """正規化したテーマのハッシュ（表記の揺れだけが異なるテーマは同じ値になる）."""
+    return hashlib.sha256(normalize_text(theme).encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class PriorRun:
+    """
+    ほぼ同じテーマの以前の実行.
+
+    Attributes:
+        theme: 以前の実行のテーマ
+        output_dir: 以前の実行の出力ディレクトリ
+        created_at: 記録した時刻（UNIX時間）
+        similarity: 新しいテーマとの類似度（0-1。フィンガープリントが一致すれば 1.0）
+    """
+
+    theme: str
+    output_dir: Path
+    created_at: float
+    similarity: float
+
+    @property
+    def identical(self) -> bool:
+        """正規化したテーマが一致するか."""
+        return self.similarity >= 1.0
+
+
+class RunIndex:
+    """
+    過去の実行のテーマを記録し、ほぼ同じテーマの実行を探す索引.
+
+    Args:
+        path: データベースファイルのパス（存在しなければ作成する）
+        threshold: ほぼ同じテーマとみなす類似度の下限（0-1）
+        clock: 現在時刻（UNIX時間）を返す関数
+    """
+
+    def __init__(self, path: Union[str, Path], threshold: float = 0.85, clock=time.time):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold は0より大きく1以下を指定してください")
+        self.path = Path(path)
+        self.threshold = threshold
+        self._clock = clock
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = connect(self.path)
+        self._conn.executescript(_SCHEMA)
+        # 索引は最初の検索時に作る（索引の番号 → 実行のID）
+        self._index: Optional[NgramSearchIndex] = None
+        self._run_ids: List[int] = []
+
+    def close(self) -> None:
+        """データベース接続を閉じる."""
+        self._conn.close()
+
+    def __enter__(self) -> "RunIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def _build_index(self) -> None:
+        self._index = NgramSearchIndex()
+        for row in self._conn.execute("SELECT id, theme FROM runs ORDER BY id"):
+            self._index.add(row["theme"])
+            self._run_ids.append(row["id"])
+
+    def record(self, theme: str, output_dir: Union[str, Path]) -> None:
+        """
+        完了した実行を記録する.
+
+        同じ出力ディレクトリの以前の記録は置き換える（結果を上書きしたため）。
+        """
+        output_dir = str(Path(output_dir).resolve())
+        with transaction(self._conn) as conn:
+            conn.execute("DELETE FROM runs WHERE output_dir = ?", (output_dir,))
+            run_id = conn.execute(
+                "INSERT INTO runs (theme, fingerprint, output_dir, created_at) VALUES (?, ?, ?, ?)",
+                (theme, theme_fingerprint(theme), output_dir, self._clock()),
+            ).lastrowid
+        if self._index is not None:
+            # 置き換えた記録は検索時に読み飛ばされる
+            self._index.add(theme)
+            self._run_ids.append(run_id)
+
+    def find_similar(self, theme: str, limit: int = 5) -> List[PriorRun]:
+        """
+        ほぼ同じテーマの以前の実行を、類似度が高く新しい順に最大 limit 件返す.
+
+        出力ディレクトリの結果が削除された実行は返さない。
+        """
+        rows = {
+            row["id"]: row
+            for row in self._conn.execute(
+                "SELECT * FROM runs WHERE fingerprint = ?", (theme_fingerprint(theme),)
+            )
+        }
+        if self._index is None:
+            self._build_index()
+        candidate_ids = [
+            self._run_ids[position] for position, _ in self._index.search(theme, limit=_CANDIDATES)
+        ]
+        for run_id in candidate_ids:
+            if run_id not in rows:
+                row = self._conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+                if row is not None:
+                    rows[run_id] = row
+
+        vector = char_ngrams(theme)
+        fingerprint = theme_fingerprint(theme)
+        runs = []
+        for row in rows.values():
+            if row["fingerprint"] == fingerprint:
+                similarity = 1.0
+            else:
+                similarity = round(cosine_similarity(vector, char_ngrams(row["theme"])), 4)
+            # storage.artifacts の ARTIFACTS_DIRNAME（pydantic を読み込まないよう直接参照しない）
+            if similarity < self.threshold or not (Path(row["output_dir"]) / "artifacts").is_dir():
+                continue
+            runs.append(PriorRun(
+                theme=row["theme"],
+                output_dir=Path(row["output_dir"]),
+                created_at=row["created_at"],
+                similarity=similarity,
+            ))
+        runs.sort(key=lambda run: (run.similarity, run.created_at), reverse=True)
+        return runs[:limit]
@@ -1,8 +1,10 @@
 """共有フィクスチャと設定."""
+import inspect
 import sys
 from pathlib import Path
 import pytest
-from typing import List
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
 
 # プロジェクトルートをPythonパスに追加
 project_root = Path(__file__).parent.parent
@@ -123,3 +125,72 @@ def sample_validation_questions(
 def sample_theme() -> str:
     """サンプルテーマ."""
     return "開発者向けの新しいコラボレーションツール"
+
+
+class FakeRunResult:
+    """Runner.run の戻り値の代わりに使う結果オブジェクト."""
+
+    def __init__(self, output, usage=None):
+        self.final_output = output
+        if usage is not None:
+            input_tokens, output_tokens = usage
+            self.context_wrapper = SimpleNamespace(usage=SimpleNamespace(
+                requests=1, input_tokens=input_tokens, output_tokens=output_tokens,
+            ))
+
+    def final_output_as(self, cls, raise_if_incorrect_type=False):
+        return self.final_output
+
+
+class FakeRunner:
+    """
+    エージェント名ごとに用意した出力を返す Runner.run の代替.
+
+    outputs の値には出力オブジェクト、または (prompt) を受け取って
+    出力オブジェクトを返す関数（async関数も可）を指定できる。
+    関数が例外を送出した場合はそのまま呼び出し元に伝わる。
+    usage にエージェント名ごとの (入力トークン数, 出力トークン数) を指定すると、
+    結果にその使用量を含める。run_configs には呼び出しごとに渡された run_config を記録する。
+    """
+
+    def __init__(self, outputs):
+        self.outputs = dict(outputs)
+        self.usage: Dict[str, Tuple[int, int]] = {}
+        self.calls: List[tuple] = []
+        self.run_configs: List[object] = []
+
+    async def run(self, agent, prompt, **kwargs):
+        self.calls.append((agent.name, prompt))
+        self.run_configs.append(kwargs.get("run_config"))
+        output = self.outputs[agent.name]
+        if callable(output):
+            output = output(prompt)
+            if inspect.isawaitable(output):
+                output = await output
+        return FakeRunResult(output, self.usage.get(agent.name))
+
+    def calls_for(self, agent_name: str) -> List[str]:
+        """指定したエージェントに渡されたプロンプトのリスト."""
+        return [prompt for name, prompt in self.calls if name == agent_name]
+
+
+@pytest.fixture
+def fake_runner(
+    sample_personas_output,
+    sample_questions_output,
+    sample_interview_response,
+    sample_hypotheses_list,
+    sample_validation_questions,
+):
+    """エージェント呼び出し（AgentCaller）の Runner.run を差し替えた FakeRunner."""
+    from unittest.mock import patch
+
+    runner = FakeRunner({
+        "PersonaGenerator": sample_personas_output,
+        "QuestionDesigner": sample_questions_output,
+        "Interviewer": sample_interview_response,
+        "HypothesisBuilder": sample_hypotheses_list,
+        "ValidationQuestionDesigner": sample_validation_questions,
+    })
+    with patch("workflows.agent_calls.Runner.run", new=runner.run):
+        yield runner
@@ -0,0 +1,302 @@
+"""バッチAPIへのまとめての提出のテスト."""
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+from agents import ModelSettings, RunConfig, WebSearchTool, function_tool
+from agents.models import get_default_model
+from openai.types.shared import Reasoning
+
+from agent_definitions import create_interviewer_agent
+from backends import (
+    BatchJobFailed,
+    BatchRequestFailed,
+    BatchSubmitter,
+    LocalBatchEndpoint,
+    build_batch_request,
+    parse_batch_line,
+)
+from main import main
+from models.schemas import InterviewResponse, PersonasOutput
+from workflows import (
+    AgentCaller,
+    BudgetExceeded,
+    Deadline,
+    EventEmitter,
+    RunBudget,
+    run_multi_persona_hearing_workflow,
+)
+from workflows.budget import estimate_tokens
+from workflows.events import InterviewCompleted, InterviewFailed, UsageUpdated
+from workflows.tracing import Tracer
+
+
+def interview_output(name: str) -> dict:
+    return {
+        "persona_name": name,
+        "answers": [f"{name}の回答"],
+        "key_insights": [f"{name}の洞察"],
+        "supporting_evidence": [],
+    }
+
+
+@pytest.fixture
+def three_personas(fake_runner, sample_persona):
+    fake_runner.outputs["PersonaGenerator"] = PersonasOutput(
+        personas=[sample_persona.model_copy(update={"name": name}) for name in ("佐藤", "鈴木", "高橋")],
+        generation_rationale="多様なペルソナ",
+    )
+    return fake_runner
+
+
+class TestBatchRequests:
+    """入力ファイルの行と出力ファイルの行の変換のテスト."""
+
+    def test_build_request(self):
+        """指示・プロンプト・出力スキーマ・Web検索ツールを Responses API の形式にする."""
+        request = build_batch_request(
+            create_interviewer_agent(), "質問に答えてください", InterviewResponse, "Interviewer-0",
+        )
+
+        assert request["custom_id"] == "Interviewer-0"
+        assert (request["method"], request["url"]) == ("POST", "/v1/responses")
+        body = request["body"]
+        assert body["model"] == get_default_model()
+        assert body["input"] == "質問に答えてください"
+        assert body["text"]["format"]["name"] == "InterviewResponse"
+        assert "persona_name" in body["text"]["format"]["schema"]["properties"]
+        assert [tool["type"] for tool in body["tools"]] == ["web_search"]
+        assert "tools" not in build_batch_request(
+            create_interviewer_agent(web_search=False), "p", InterviewResponse, "x",
+        )["body"]
+
+    def test_model_settings_are_serialized(self):
+        """エージェントの model_settings を通常の呼び出しと同じ項目に入れる."""
+        agent = create_interviewer_agent().clone(model_settings=ModelSettings(
+            temperature=0.2, max_tokens=1500, reasoning=Reasoning(effort="low"),
+            verbosity="low", tool_choice="required", parallel_tool_calls=False, retry=None, timeout=30,
+        ))
+        body = build_batch_request(agent, "p", InterviewResponse, "x")["body"]
+
+        assert body["temperature"] == 0.2
+        assert body["max_output_tokens"] == 1500
+        assert body["reasoning"] == {"effort": "low"}
+        assert body["text"]["verbosity"] == "low"
+        assert body["tool_choice"] == "required"
+        assert body["parallel_tool_calls"] is False
+        assert "timeout" not in body
+        assert "temperature" not in build_batch_request(create_interviewer_agent(), "p", InterviewResponse, "x")["body"]
+
+    def test_rejects_unexpressible_model_settings(self):
+        """入力ファイルの1行で表せない設定（extra_args など）のエージェントはバッチに含めない."""
+        agent = create_interviewer_agent().clone(model_settings=ModelSettings(extra_args={"service_tier": "flex"}))
+        with pytest.raises(ValueError, match="extra_args"):
+            build_batch_request(agent, "p", InterviewResponse, "x")
+
+    def test_web_search_options_and_unsupported_tools(self):
+        """Web検索の設定は通常の呼び出しと同じ形にし、バッチで表せないツールのエージェントは含めない."""
+        agent = create_interviewer_agent().clone(
+            tools=[WebSearchTool(search_context_size="high", search_content_types=["text", "image"])],
+            model_settings=ModelSettings(tool_choice="web_search"),
+        )
+        body = build_batch_request(agent, "p", InterviewResponse, "x")["body"]
+
+        assert body["tools"] == [{
+            "type": "web_search", "search_context_size": "high", "search_content_types": ["text", "image"],
+        }]
+        assert body["include"] == ["web_search_call.results"]
+        assert body["tool_choice"] == {"type": "web_search"}
+
+        @function_tool
+        def lookup(query: str) -> str:
+            """検索する."""
+            return query
+
+        with pytest.raises(ValueError, match="lookup"):
+            build_batch_request(create_interviewer_agent().clone(tools=[lookup]), "p", InterviewResponse, "x")
+
+    def test_parse_failures(self):
+        """失敗した行・スキーマに適合しない出力は error に理由を入れる."""
+        failed = parse_batch_line(
+            {"custom_id": "a", "response": None, "error": {"code": "rate_limit", "message": "混雑"}},
+            InterviewResponse,
+        )
+        assert isinstance(failed.error, BatchRequestFailed)
+        assert "rate_limit: 混雑" in str(failed.error)
+
+        server_error = parse_batch_line(
+            {"custom_id": "b", "response": {"status_code": 500, "body": {"error": {"message": "内部エラー"}}}},
+            InterviewResponse,
+        )
+        assert "ステータス 500" in str(server_error.error)
+
+        malformed = parse_batch_line({"custom_id": "c", "response": {"status_code": 200, "body": {
+            "output": [{"type": "message", "content": [{"type": "output_text", "text": "{\"persona_name\": "}]}],
+            "usage": {"input_tokens": 10, "output_tokens": 3},
+        }}}, InterviewResponse)
+        assert malformed.output is None and malformed.error is not None
+        assert malformed.usage.output_tokens == 3
+
+
+class TestBatchSubmitter:
+    """BatchSubmitter と LocalBatchEndpoint のテスト."""
+
+    async def test_submit_poll_and_ingest(self, tmp_path):
+        """入力ファイルを提出し、完了するまで状態を確かめてから、プロンプトの順で結果を返す."""
+        endpoint = LocalBatchEndpoint(polls_to_complete=3)
+        submitter = BatchSubmitter(endpoint, tmp_path, poll_interval=0)
+
+        batch = await submitter.run(create_interviewer_agent(), ["一人目", "二人目"], InterviewResponse)
+
+        assert batch.status == "completed" and batch.polls == 3
+        lines = [json.loads(line) for line in batch.input_path.read_text(encoding="utf-8").splitlines()]
+        assert [line["body"]["input"] for line in lines] == ["一人目", "二人目"]
+        assert endpoint.submitted[batch.batch_id] == lines
+        assert batch.input_path.with_suffix(".output.jsonl").exists()
+        assert [result.custom_id for result in batch.results] == ["Interviewer-0", "Interviewer-1"]
+        assert all(isinstance(result.output, InterviewResponse) for result in batch.results)
+        assert all(result.usage.input_tokens > 0 for result in batch.results)
+
+    async def test_failed_batch(self, tmp_path):
+        """入力ファイルの検証で失敗したバッチは BatchJobFailed になる."""
+        endpoint = LocalBatchEndpoint()
+        submitter = BatchSubmitter(endpoint, tmp_path, poll_interval=0)
+        def without_body(agent, prompt, output_type, custom_id):
+            return {"custom_id": custom_id, "method": "POST", "url": "/v1/responses"}
+
+        with patch("backends.batch.build_batch_request", without_body):
+            with pytest.raises(BatchJobFailed, match="custom_id・url・body"):
+                await submitter.run(create_interviewer_agent(), ["p"], InterviewResponse)
+
+    async def test_run_batch_applies_run_config_settings(self, tmp_path):
+        """実行の設定の model_settings は、通常の呼び出しと同じくエージェントの設定より優先する."""
+        endpoint = LocalBatchEndpoint()
+        caller = AgentCaller(EventEmitter(), run_config=RunConfig(model_settings=ModelSettings(temperature=0.7)))
+        agent = create_interviewer_agent().clone(model_settings=ModelSettings(temperature=0.1, max_tokens=900))
+        submitter = BatchSubmitter(endpoint, tmp_path, poll_interval=0)
+
+        await caller.run_batch(submitter, agent, ["a"], InterviewResponse)
+
+        (body,) = [line["body"] for line in next(iter(endpoint.submitted.values()))]
+        assert (body["temperature"], body["max_output_tokens"]) == (0.7, 900)
+
+    async def test_run_batch_caps_output_to_budget(self, tmp_path):
+        """予算がある場合は残りの予算を等分した出力の上限を各リクエストに入れ、結果を取り込むまで確保する."""
+        agent = create_interviewer_agent()
+        prompts = ["a", "b"]
+        input_tokens = sum(estimate_tokens(f"{agent.instructions}{prompt}") for prompt in prompts)
+        budget = RunBudget(max_tokens=input_tokens + 2 * 600)
+        caller = AgentCaller(EventEmitter(), budget=budget)
+        endpoint = LocalBatchEndpoint()
+
+        async def submit(path):
+            # 提出した後は、確保した分だけ他の呼び出しに使える予算が減っている
+            with pytest.raises(BudgetExceeded):
+                budget.check("Interviewer", 0)
+            return await LocalBatchEndpoint.submit(endpoint, path)
+
+        endpoint.submit = submit
+        await caller.run_batch(BatchSubmitter(endpoint, tmp_path, poll_interval=0), agent, prompts, InterviewResponse)
+
+        bodies = [line["body"] for line in next(iter(endpoint.submitted.values()))]
+        assert [body["max_output_tokens"] for body in bodies] == [600, 600]
+
+    async def test_run_batch_records_usage(self, tmp_path):
+        """AgentCaller.run_batch は呼び出しごとに使用量を記録し、失敗した呼び出しは例外を返す."""
+        def responder(custom_id, body):
+            if custom_id.endswith("-1"):
+                raise RuntimeError("生成に失敗")
+            return interview_output("佐藤")
+
+        events = []
+        caller = AgentCaller(EventEmitter(events.append))
+        submitter = BatchSubmitter(LocalBatchEndpoint(responder=responder), tmp_path, poll_interval=0)
+        tracer = Tracer()
+        tracer.activate()
+        outputs = await caller.run_batch(submitter, create_interviewer_agent(), ["a", "b"], InterviewResponse)
+        tracer.deactivate()
+
+        assert outputs[0].persona_name == "佐藤"
+        assert isinstance(outputs[1], BatchRequestFailed) and "生成に失敗" in str(outputs[1])
+        assert [type(event) for event in events] == [UsageUpdated]
+        assert caller.total_requests == 1
+        span = next(span for span in tracer.spans if span.name == "batch Interviewer")
+        assert span.attributes["batch.requests"] == 2
+        assert span.attributes["batch.failed"] == 1
+        assert span.attributes["batch.status"] == "completed"
+
+
+class TestBatchWorkflow:
+    """フェーズ3のヒアリングをバッチで実行するテスト."""
+
+    async def test_interviews_via_batch(self, three_personas, tmp_path):
+        """すべてのヒアリングを1つのバッチで提出し、結果をペルソナ順のヒアリング結果に戻す."""
+        def responder(custom_id, body):
+            if "鈴木" in body["input"]:
+                raise RuntimeError("応答なし")
+            name = next(name for name in ("佐藤", "高橋") if name in body["input"])
+            return interview_output(name)
+
+        endpoint = LocalBatchEndpoint(responder=responder)
+        events = []
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", num_personas=3, verbose=False, on_event=events.append,
+            batch=BatchSubmitter(endpoint, tmp_path, poll_interval=0),
+        )
+
+        assert three_personas.calls_for("Interviewer") == []
+        assert len(endpoint.submitted) == 1
+        assert len(next(iter(endpoint.submitted.values()))) == 3
+        assert [interview.persona_name for interview in result.interviews] == ["佐藤", "高橋"]
+        assert [skipped.persona_name for skipped in result.run_report.not_interviewed] == ["鈴木"]
+        assert result.run_report.not_interviewed[0].reason == "エラー: RuntimeError: 応答なし"
+        assert len([event for event in events if isinstance(event, InterviewCompleted)]) == 2
+        assert len([event for event in events if isinstance(event, InterviewFailed)]) == 1
+        # 仮説生成はバッチの結果を受け取ってから行う
+        assert "佐藤の洞察" in three_personas.calls_for("HypothesisBuilder")[0]
+
+    async def test_deadline_cancels_batch(self, three_personas, tmp_path):
+        """期限に達するとバッチをキャンセルし、ヒアリングは期限により中断になる."""
+        endpoint = LocalBatchEndpoint(polls_to_complete=10**6)
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", num_personas=3, verbose=False, deadline=Deadline(0.2),
+            batch=BatchSubmitter(endpoint, tmp_path, poll_interval=0.01),
+        )
+
+        (status,) = endpoint._statuses.values()
+        assert status.status == "cancelled"
+        assert result.interviews == []
+        assert result.run_report.partial
+        assert {skipped.reason for skipped in result.run_report.not_interviewed} == {"期限により中断"}
+
+    async def test_rejects_per_question_mode(self, fake_runner, tmp_path):
+        with pytest.raises(ValueError, match="single"):
+            await run_multi_persona_hearing_workflow(
+                "テーマ", verbose=False, interview_mode="per-question",
+                batch=BatchSubmitter(LocalBatchEndpoint(), tmp_path),
+            )
+
+    def test_cli_local_endpoint(self, tmp_path, fake_runner, monkeypatch):
+        """--batch --batch-endpoint local で入力ファイルを出力ディレクトリの batches/ に書き出す."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        output_dir = tmp_path / "out"
+        argv = [
+            "main.py", "--theme", "テーマ", "--output-dir", str(output_dir), "--quiet",
+            "--batch", "--batch-endpoint", "local", "--batch-poll-interval", "0",
+        ]
+        with patch.object(sys, "argv", argv):
+            main()
+
+        assert fake_runner.calls_for("Interviewer") == []
+        assert len(list((output_dir / "batches").glob("Interviewer-*.output.jsonl"))) == 1
+        assert (output_dir / "interview_results.md").exists()
+
+    def test_cli_rejects_per_question_mode(self, tmp_path, capsys):
+        argv = [
+            "main.py", "--theme", "テーマ", "--output-dir", str(tmp_path),
+            "--batch", "--interview-mode", "per-question",
+        ]
+        with patch.object(sys, "argv", argv), pytest.raises(SystemExit):
+            main()
+        assert "--interview-mode single" in capsys.readouterr().err
@@ -0,0 +1,291 @@
+"""実行全体のトークン数・費用の予算のテスト."""
+import asyncio
+
+import pytest
+
+from agent_definitions import cached_agent, create_interviewer_agent, create_question_answerer_agent
+from main import format_run_report_markdown
+from models.run_report import RunReport
+from models.schemas import PersonaOutput, PersonasOutput
+from workflows import (
+    AgentCaller,
+    BudgetExceeded,
+    EventEmitter,
+    HedgingPolicy,
+    PhaseStarted,
+    RunBudget,
+    TokenPrices,
+    run_multi_persona_hearing_workflow,
+)
+from workflows.budget import estimate_tokens
+from workflows.events import PHASE_EVALUATION, PHASE_HYPOTHESES, PHASE_INTERVIEWS
+
+
+# 仮説生成（3000 + 400 × 15名, 4000）と検証項目の設計（4000, 4000）のために確保される分
+HEARING_RESERVE = 3000 + 400 * 15 + 4000 + 4000 + 4000
+
+
+def make_personas(count: int) -> PersonasOutput:
+    return PersonasOutput(
+        personas=[
+            PersonaOutput(
+                name=f"ペルソナ{i}", age=30, occupation="会社員", background="背景",
+                needs=[], behaviors=[], pain_points=[],
+            )
+            for i in range(count)
+        ],
+        generation_rationale="根拠",
+    )
+
+
+class TestRunBudget:
+    """RunBudget のテスト."""
+
+    def test_invalid_limits_are_rejected(self):
+        """上限を1つも指定しない場合や、0以下の上限はエラー."""
+        with pytest.raises(ValueError):
+            RunBudget()
+        with pytest.raises(ValueError):
+            RunBudget(max_tokens=0)
+        with pytest.raises(ValueError):
+            RunBudget(max_cost=-1.0)
+
+    def test_usage_is_recorded_per_phase(self):
+        """使用量はイベントで追跡している現在のフェーズに記録し、費用は単価から計算する."""
+        budget = RunBudget(max_cost=1.0, prices=TokenPrices(1.0, 10.0))
+        budget(PhaseStarted(phase=PHASE_INTERVIEWS))
+        budget.record("Interviewer", 1, 1000, 100)
+        budget.record("Interviewer", 2, 2000, 200)
+
+        assert budget.phase_usage(PHASE_INTERVIEWS) == (3, 3000, 300)
+        assert budget.spent_tokens == 3300
+        assert budget.spent_cost == pytest.approx(0.006)
+
+    def test_reserve_is_held_until_the_phase_starts(self):
+        """確保した分は、そのフェーズが始まるまで他のフェーズからは使えない."""
+        budget = RunBudget(max_tokens=10_000)
+        budget.reserve(PHASE_EVALUATION, 6000, 2000)
+
+        assert budget.fits(2000, 0)
+        assert not budget.fits(2001, 0)
+        assert budget.affordable_count(500, 500) == 2
+
+        budget(PhaseStarted(phase=PHASE_EVALUATION))
+        assert budget.fits(10_000, 0)
+        # 始まったフェーズへの予約は無視する
+        budget.reserve(PHASE_EVALUATION, 6000, 2000)
+        assert budget.fits(10_000, 0)
+
+    def test_cost_limit(self):
+        """費用の上限でも判定し、上限を超える呼び出しは BudgetExceeded で止める."""
+        budget = RunBudget(max_cost=0.01, prices=TokenPrices(1.0, 10.0))
+        budget.record("Agent", 1, 0, 900)
+
+        assert budget.affordable_count(1000, 0) == 1
+        budget.check("Agent", 1000, min_output_tokens=0)
+        with pytest.raises(BudgetExceeded):
+            budget.check("Agent", 1001, min_output_tokens=0)
+        # 残りの $0.001 は出力なら100トークン分で、既定の最低限の出力には足りない
+        assert budget.check("Agent", 0, min_output_tokens=100) == 100
+        with pytest.raises(BudgetExceeded):
+            budget.check("Agent", 0)
+        assert RunBudget(max_tokens=100).affordable_count(0, 0) == 100
+        assert RunBudget(max_cost=1.0, prices=TokenPrices(0, 0)).affordable_count(1, 1) > 10**9
+
+    def test_hold_reserves_output_of_calls_in_flight(self):
+        """実行中の呼び出しの出力の上限は、完了するまで他の呼び出しから使えない."""
+        budget = RunBudget(max_tokens=10_000)
+
+        with budget.hold("Interviewer", 1000) as first:
+            assert first == 8000
+            # 残りは 10,000 - 1,000 - 8,000 - 500 = 500 トークン
+            with budget.hold("Interviewer", 500) as second:
+                assert second == 500
+                with pytest.raises(BudgetExceeded):
+                    budget.check("Interviewer", 300)
+        assert budget.check("QuestionAnswerer", 1000) == 2000
+
+    def test_hold_for_several_requests(self):
+        """まとめて送るリクエストには、残りの予算を等分した上限をリクエストの数だけ確保する."""
+        budget = RunBudget(max_tokens=2000)
+
+        with budget.hold("Interviewer", 800, requests=3) as max_output_tokens:
+            assert max_output_tokens == 400
+            with pytest.raises(BudgetExceeded):
+                budget.check("Interviewer", 0)
+        with pytest.raises(BudgetExceeded):
+            budget.check("Interviewer", 1500, requests=3)
+
+    @pytest.mark.parametrize(
+        "max_tokens, expected",
+        [
+            # 1件あたり: 通常 5000 + 2150、Web検索なし 1000 + 2150、短い回答 1000 + 1000
+            (71_500, (10, True, False)),
+            (40_000, (10, False, False)),
+            (25_000, (10, False, True)),
+            (10_000, (5, False, True)),
+        ],
+    )
+    def test_interview_plan_scales_down_in_order(self, max_tokens, expected):
+        """Web検索なし、短い回答の順に縮小し、それでも足りなければペルソナ数を減らす."""
+        budget = RunBudget(max_tokens=max_tokens)
+
+        plan = budget.plan_interviews(10, base_input_tokens=1000, question_count=5)
+
+        assert (plan.personas, plan.web_search, plan.short_answers) == expected
+        assert plan.scaled_down == (expected != (10, True, False))
+
+    def test_plan_counts_every_call_of_an_interview(self):
+        """per-question モードでは呼び出し回数分の入力とWeb検索を見積もる."""
+        budget = RunBudget(max_tokens=10**9)
+
+        plan = budget.plan_interviews(3, base_input_tokens=1000, question_count=5, calls_per_interview=6)
+
+        assert plan.input_tokens == 6 * (1000 + 4000)
+        assert plan.describe(3) == "ペルソナ 3/3名・Web検索あり・通常の回答"
+
+
+class TestBudgetedCalls:
+    """AgentCaller での予算の確認のテスト."""
+
+    async def test_call_over_budget_is_not_sent(self, fake_runner):
+        """入力の見積もりが予算に収まらない呼び出しは送らずに BudgetExceeded を送出する."""
+        budget = RunBudget(max_tokens=100)
+        caller = AgentCaller(EventEmitter(), budget=budget)
+
+        with pytest.raises(BudgetExceeded):
+            await caller.run(cached_agent(create_interviewer_agent), "質問", object)
+        assert fake_runner.calls == []
+
+    async def test_response_is_capped_to_remaining_budget(self, fake_runner):
+        """1回の応答が残りの予算を超えないように、出力トークン数の上限を渡す."""
+        agent = cached_agent(create_interviewer_agent)
+        input_tokens = estimate_tokens(f"{agent.instructions}質問")
+        budget = RunBudget(max_tokens=input_tokens + 700)
+        caller = AgentCaller(EventEmitter(), budget=budget)
+
+        await caller.run(agent, "質問", object)
+
+        (run_config,) = fake_runner.run_configs
+        assert run_config.model_settings.max_tokens == 700
+
+    async def test_discarded_hedge_request_is_charged(self, fake_runner):
+        """ヘッジで結果を使わなかったリクエストの使用量も予算に記録する."""
+        agent = cached_agent(create_interviewer_agent)
+        started = []
+
+        async def slow_then_fast(prompt):
+            started.append(prompt)
+            if len(started) == 1:
+                await asyncio.sleep(10)
+            return "ok"
+
+        fake_runner.outputs["Interviewer"] = slow_then_fast
+        fake_runner.usage["Interviewer"] = (100, 50)
+        hedging = HedgingPolicy(min_samples=1, max_extra_fraction=1.0)
+        hedging.observe("Interviewer", 0.01)
+        hedging.calls = 1
+        budget = RunBudget(max_tokens=10**6)
+        caller = AgentCaller(EventEmitter(), budget=budget, hedging=hedging)
+
+        assert await caller.run(agent, "質問", str) == "ok"
+
+        # キャンセルした最初のリクエストは入力の見積もりを使用量とみなす
+        assert budget.phase_usage("other") == (2, 100 + estimate_tokens(f"{agent.instructions}質問"), 50)
+        assert caller.total_requests == 2
+
+    async def test_usage_is_recorded(self, fake_runner, sample_interview_response):
+        """完了した呼び出しの使用量を予算に記録する."""
+        fake_runner.usage["Interviewer"] = (1200, 300)
+        budget = RunBudget(max_tokens=10**6)
+        caller = AgentCaller(EventEmitter(), budget=budget)
+
+        await caller.run(cached_agent(create_interviewer_agent), "質問", object)
+
+        assert budget.phase_usage("other") == (1, 1200, 300)
+
+
+class TestBudgetInWorkflow:
+    """ヒアリングワークフローでの予算のテスト."""
+
+    @pytest.fixture
+    def ten_personas(self, fake_runner):
+        fake_runner.outputs["PersonaGenerator"] = make_personas(10)
+        return fake_runner
+
+    async def test_interviews_are_scaled_down_to_fit(self, ten_personas):
+        """残りの予算に合わせてWeb検索なし・短い回答にし、収まらないペルソナにはヒアリングしない."""
+        ten_personas.usage["Interviewer"] = (600, 300)
+        budget = RunBudget(max_tokens=HEARING_RESERVE + 12_000)
+
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, max_concurrency=1, budget=budget,
+        )
+
+        report = result.run_report
+        plan = budget.interview_plan
+        assert (plan.web_search, plan.short_answers) == (False, True)
+        assert 0 < report.interviews_completed == plan.personas < 10
+        assert {skipped.reason for skipped in report.not_interviewed} == {"予算により未実施"}
+        assert report.budget.interview_scaled_down
+        assert "Web検索なし・短い回答" in report.budget.interview_plan
+        prompt = ten_personas.calls_for("Interviewer")[0]
+        assert "Web検索は使わず" in prompt
+        assert "2〜3文で簡潔に" in prompt
+        # 確保していた仮説生成・検証項目の設計も予算内で実行できる
+        assert len(ten_personas.calls_for("HypothesisBuilder")) == 1
+        assert budget.spent_tokens <= budget.max_tokens
+
+    async def test_actual_usage_stops_further_interviews(self, ten_personas):
+        """実際の使用量が見積もりより多ければ、実績をもとに以降のヒアリングの開始を止める."""
+        ten_personas.usage["Interviewer"] = (15_000, 5_000)
+        budget = RunBudget(max_tokens=HEARING_RESERVE + 40_000)
+
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, max_concurrency=1, budget=budget,
+        )
+
+        assert budget.interview_plan.personas > 1
+        assert result.run_report.interviews_completed == 1
+        assert len(result.run_report.not_interviewed) == 9
+        ledger = {entry.phase: entry for entry in result.run_report.budget.entries}
+        assert ledger[PHASE_INTERVIEWS].input_tokens == 15_000
+        assert ledger[PHASE_HYPOTHESES].reserved_tokens == 3000 + 400 * 15 + 4000
+
+    async def test_per_question_mode_uses_answerer_without_web_search(self, ten_personas):
+        """per-question モードでもWeb検索なしの回答エージェントを使う."""
+        budget = RunBudget(max_tokens=HEARING_RESERVE + 30_000)
+
+        await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, max_concurrency=1, budget=budget,
+            interview_mode="per-question",
+        )
+
+        assert not budget.interview_plan.web_search
+        assert "Web検索は使わず" in ten_personas.calls_for("QuestionAnswerer")[0]
+
+    def test_agents_without_web_search(self):
+        """Web検索なしのエージェントは検索ツールを持たず、指示に制約が追加される."""
+        for factory in (create_interviewer_agent, create_question_answerer_agent):
+            agent = cached_agent(factory, False)
+            assert agent.tools == []
+            assert "Web検索は使えません" in agent.instructions
+            assert cached_agent(factory, True).tools
+            assert cached_agent(factory) is not agent
+
+
+def test_run_report_markdown():
+    """実行レポートに上限・使用量・ヒアリングの計画とフェーズごとの台帳を出力する."""
+    budget = RunBudget(max_tokens=100_000, max_cost=0.5)
+    budget.reserve(PHASE_EVALUATION, 8000, 6000)
+    budget(PhaseStarted(phase=PHASE_INTERVIEWS))
+    budget.plan_interviews(10, base_input_tokens=1000, question_count=5)
+    budget.record("Interviewer", 10, 40_000, 20_000)
+
+    markdown = format_run_report_markdown(RunReport(budget=budget.report()))
+
+    assert "## 予算" in markdown
+    assert "60,000 / 100,000トークン、$0.2500 / $0.50" in markdown
+    assert "ペルソナ 10/10名・Web検索あり・通常の回答" in markdown
+    assert "| 質問セット評価（未実施） | 0 | 0 | 0 | $0.0000 | 14,000 |" in markdown
+    assert "予算" not in format_run_report_markdown(RunReport())
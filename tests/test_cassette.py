@@ -0,0 +1,179 @@
+"""エージェント呼び出しの記録と再生（カセット）のテスト."""
+import asyncio
+import json
+import re
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+import agent_definitions.openai_client as openai_client
+from agent_definitions import cached_agent, create_interviewer_agent
+from main import main
+from models.schemas import InterviewResponse, PersonaOutput, PersonasOutput
+from workflows import (
+    AgentCaller,
+    Cassette,
+    CassetteMiss,
+    EventEmitter,
+    UsageUpdated,
+    run_multi_persona_hearing_workflow,
+)
+
+
+def make_personas(count: int) -> PersonasOutput:
+    return PersonasOutput(
+        personas=[
+            PersonaOutput(
+                name=f"ペルソナ{i}", age=30, occupation="会社員", background="背景",
+                needs=[], behaviors=[], pain_points=[],
+            )
+            for i in range(count)
+        ],
+        generation_rationale="根拠",
+    )
+
+
+def interview(prompt: str) -> InterviewResponse:
+    name = re.search(r"名前: (\S+)", prompt).group(1)
+    return InterviewResponse(persona_name=name, answers=[f"{name}の回答"], key_insights=[f"{name}の洞察"])
+
+
+@pytest.fixture
+def recording_runner(fake_runner):
+    fake_runner.outputs["PersonaGenerator"] = make_personas(4)
+    fake_runner.outputs["Interviewer"] = interview
+    fake_runner.usage["Interviewer"] = (1000, 200)
+    return fake_runner
+
+
+def fail_on_call(prompt):
+    raise AssertionError("再生中にエージェントが呼び出された")
+
+
+class TestCassette:
+    """Cassette のテスト."""
+
+    async def test_record_then_replay_without_calls(self, recording_runner, tmp_path):
+        """記録した実行を、エージェントを呼び出さずに同じ結果で再生する."""
+        path = tmp_path / "run.cassette.jsonl"
+        recorded = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, cassette=Cassette(path, mode="record"),
+        )
+        lines = path.read_text(encoding="utf-8").splitlines()
+        # ペルソナ生成・質問設計・ヒアリング4件・仮説生成・検証項目の設計
+        assert len(lines) == 8
+        assert json.loads(lines[0])["agent_name"] == "PersonaGenerator"
+
+        for name in list(recording_runner.outputs):
+            recording_runner.outputs[name] = fail_on_call
+        cassette = Cassette(path, strict=True)
+        events = []
+        replayed = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, max_concurrency=2, cassette=cassette, on_event=events.append,
+        )
+
+        assert list(replayed.interviews) == list(recorded.interviews)
+        assert replayed.hypotheses == recorded.hypotheses
+        assert replayed.validation_questions == recorded.validation_questions
+        assert (cassette.hits, cassette.fallbacks) == (8, 0)
+        # 記録した使用量も再生する
+        usage = [e for e in events if isinstance(e, UsageUpdated) and e.agent_name == "Interviewer"]
+        assert usage[-1].total_input_tokens == 4000
+
+    async def test_changed_prompt(self, recording_runner, tmp_path):
+        """入力が変わった呼び出しは strict では失敗し、そうでなければ記録順に対応付ける."""
+        path = tmp_path / "run.cassette.jsonl"
+        await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, cassette=Cassette(path, mode="record"),
+        )
+        recording_runner.outputs["PersonaGenerator"] = fail_on_call
+
+        with pytest.raises(CassetteMiss):
+            await run_multi_persona_hearing_workflow(
+                "別のテーマ", verbose=False, cassette=Cassette(path, strict=True),
+            )
+
+        cassette = Cassette(path)
+        result = await run_multi_persona_hearing_workflow(
+            "別のテーマ", verbose=False, cassette=cassette,
+        )
+        assert len(result.interviews) == 4
+        # プロンプトにテーマを含む4件は記録順で対応付け、ヒアリング4件は入力が一致する
+        assert (cassette.hits, cassette.fallbacks) == (4, 4)
+
+    async def test_identical_calls_are_kept_in_order(self, recording_runner, tmp_path):
+        """同じ入力の呼び出しは呼び出し順に記録・再生する."""
+        path = tmp_path / "run.cassette.jsonl"
+        agent = cached_agent(create_interviewer_agent)
+        prompt = "名前: 同じ人\n"
+        calls = iter(["1回目", "2回目"])
+        recording_runner.outputs["Interviewer"] = lambda p: InterviewResponse(
+            persona_name=next(calls), answers=[], key_insights=[],
+        )
+        recorder = AgentCaller(EventEmitter(), cassette=Cassette(path, mode="record"))
+        for _ in range(2):
+            await recorder.run(agent, prompt, InterviewResponse)
+
+        player = AgentCaller(EventEmitter(), cassette=Cassette(path, strict=True))
+        replayed = [await player.run(agent, prompt, InterviewResponse) for _ in range(2)]
+
+        assert [r.persona_name for r in replayed] == ["1回目", "2回目"]
+        with pytest.raises(CassetteMiss):
+            await player.run(agent, prompt, InterviewResponse)
+
+    async def test_simulated_latency(self, recording_runner, tmp_path):
+        """simulate_latency を指定すると記録時の所要時間を再現する."""
+        path = tmp_path / "run.cassette.jsonl"
+
+        async def slow(prompt):
+            await asyncio.sleep(0.1)
+            return interview(prompt)
+
+        recording_runner.outputs["Interviewer"] = slow
+        agent = cached_agent(create_interviewer_agent)
+        recorder = AgentCaller(EventEmitter(), cassette=Cassette(path, mode="record"))
+        await recorder.run(agent, "名前: A\n", InterviewResponse)
+
+        for simulate_latency, check in ((False, lambda s: s < 0.05), (True, lambda s: s >= 0.1)):
+            player = AgentCaller(EventEmitter(), cassette=Cassette(path, simulate_latency=simulate_latency))
+            started = time.perf_counter()
+            await player.run(agent, "名前: A\n", InterviewResponse)
+            assert check(time.perf_counter() - started)
+
+    def test_invalid_cassette(self, tmp_path):
+        """未対応のモードや存在しないカセットの再生はエラー."""
+        with pytest.raises(ValueError):
+            Cassette(tmp_path / "c.jsonl", mode="append")
+        with pytest.raises(FileNotFoundError):
+            Cassette(tmp_path / "missing.jsonl")
+
+
+class TestCassetteCLI:
+    """--record-cassette / --replay-cassette のテスト."""
+
+    def test_replay_without_api_key(self, recording_runner, tmp_path, monkeypatch, capsys):
+        """記録したカセットは OPENAI_API_KEY がなくても再生でき、クライアントも作らない."""
+        from agents.models import _openai_shared
+
+        cassette_path = tmp_path / "run.cassette.jsonl"
+        argv = ["main.py", "--theme", "テーマ", "--num-personas", "4", "--quiet"]
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        with patch.object(sys, "argv", argv + ["--output-dir", str(tmp_path / "recorded"),
+                                               "--record-cassette", str(cassette_path)]):
+            main()
+
+        monkeypatch.delenv("OPENAI_API_KEY")
+        monkeypatch.setattr(_openai_shared, "_default_openai_client", None)
+        monkeypatch.setattr(openai_client, "_installed_metrics", None)
+        monkeypatch.setattr(openai_client, "_installed_client", None)
+        recording_runner.outputs["Interviewer"] = fail_on_call
+        with patch.object(sys, "argv", argv + ["--output-dir", str(tmp_path / "replayed"),
+                                               "--replay-cassette", str(cassette_path)]):
+            main()
+
+        assert openai_client.shared_openai_client() is None
+        assert (tmp_path / "replayed" / "interview_results.md").read_text(encoding="utf-8") == (
+            tmp_path / "recorded" / "interview_results.md"
+        ).read_text(encoding="utf-8")
@@ -0,0 +1,171 @@
+"""実行期限と呼び出しタイムアウトのテスト."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from main import format_hypotheses_markdown, format_interviews_markdown, format_run_report_markdown
+from models.schemas import InterviewResponse, PersonaOutput, PersonasOutput
+from workflows import (
+    AgentCaller,
+    CallRetried,
+    Deadline,
+    DeadlineReached,
+    EventEmitter,
+    run_multi_persona_hearing_workflow,
+    run_validation_interview_workflow,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_personas(count: int) -> PersonasOutput:
+    return PersonasOutput(
+        personas=[
+            PersonaOutput(
+                name=f"ペルソナ{i}", age=30, occupation="会社員", background="背景",
+                needs=["ニーズ"], behaviors=["行動"], pain_points=["痛み"],
+            )
+            for i in range(count)
+        ],
+        generation_rationale="テスト用",
+    )
+
+
+class TestDeadline:
+    """Deadline のテスト."""
+
+    def test_remaining_and_expired(self):
+        """残り時間は時計に従って減り、0で期限切れになる."""
+        clock = FakeClock()
+        deadline = Deadline(10, clock=clock)
+        assert deadline.remaining() == pytest.approx(10)
+        assert not deadline.expired
+
+        clock.now += 12
+        assert deadline.remaining() == 0.0
+        assert deadline.expired
+
+    def test_non_positive_seconds_are_rejected(self):
+        """0以下の期限はエラー."""
+        with pytest.raises(ValueError):
+            Deadline(0)
+
+
+class TestCallTimeout:
+    """AgentCaller の呼び出しタイムアウトのテスト."""
+
+    async def test_hung_call_is_retried_then_fails(self, fake_runner):
+        """応答しない呼び出しはタイムアウトで再試行し、最後は TimeoutError になる."""
+        async def hang(prompt):
+            await asyncio.sleep(10)
+
+        fake_runner.outputs["Hung"] = hang
+        events = []
+        caller = AgentCaller(
+            EventEmitter(events.append), max_retries=1, backoff_base=0.001, call_timeout=0.02
+        )
+
+        with pytest.raises(TimeoutError, match="Hung"):
+            await caller.run(SimpleNamespace(name="Hung"), "prompt", str)
+        assert len(fake_runner.calls_for("Hung")) == 2
+        assert [type(e) for e in events] == [CallRetried]
+
+    def test_invalid_timeout_is_rejected(self):
+        """0以下のタイムアウトはエラー."""
+        with pytest.raises(ValueError):
+            AgentCaller(EventEmitter(), call_timeout=0)
+
+
+class TestHearingDeadline:
+    """期限付きのヒアリングワークフローのテスト."""
+
+    async def test_stragglers_are_cancelled_and_run_continues(
+        self, fake_runner, sample_theme
+    ):
+        """期限内に終わらないヒアリングは打ち切り、完了分で仮説生成に進む."""
+        fake_runner.outputs["PersonaGenerator"] = make_personas(4)
+
+        async def interview(prompt):
+            # ペルソナ0・1はすぐに終わり、ペルソナ2・3は応答しない
+            if "ペルソナ2" in prompt or "ペルソナ3" in prompt:
+                await asyncio.sleep(10)
+            name = "ペルソナ0" if "ペルソナ0" in prompt else "ペルソナ1"
+            return InterviewResponse(persona_name=name, answers=["回答"], key_insights=["洞察"])
+
+        fake_runner.outputs["Interviewer"] = interview
+        events = []
+
+        result = await asyncio.wait_for(
+            run_multi_persona_hearing_workflow(
+                sample_theme,
+                num_personas=4,
+                verbose=False,
+                max_concurrency=4,
+                deadline=Deadline(0.2),
+                on_event=events.append,
+            ),
+            timeout=5,
+        )
+
+        report = result.run_report
+        assert report.partial
+        assert report.interviews_completed == 2
+        assert report.deadline_seconds == 0.2
+        assert {s.reason for s in report.not_interviewed} == {"期限により中断"}
+        assert len(fake_runner.calls_for("HypothesisBuilder")) == 1
+        assert any(isinstance(e, DeadlineReached) for e in events)
+
+    async def test_unexpired_deadline_is_not_partial(self, fake_runner, sample_theme):
+        """期限内に終われば部分結果にはならない."""
+        result = await run_multi_persona_hearing_workflow(
+            sample_theme, num_personas=1, verbose=False, deadline=Deadline(60)
+        )
+        assert not result.run_report.partial
+        assert result.run_report.not_interviewed == []
+
+    async def test_validation_interviews_respect_deadline(
+        self, fake_runner, sample_theme, sample_hypotheses_list, sample_validation_questions
+    ):
+        """期限を過ぎた検証ヒアリングは部分結果として集計する."""
+        clock = FakeClock()
+        deadline = Deadline(1, clock=clock)
+        clock.now += 5
+
+        report = await run_validation_interview_workflow(
+            sample_theme,
+            make_personas(3),
+            sample_hypotheses_list,
+            sample_validation_questions,
+            verbose=False,
+            deadline=deadline,
+        )
+        assert report.partial
+        assert report.interviews == []
+        assert {f.reason for f in report.failed} == {"期限により未実施"}
+
+
+class TestPartialMarkdown:
+    """部分結果のMarkdown表示のテスト."""
+
+    def test_partial_run_is_stated(self, sample_interview_response, sample_hypotheses_list):
+        """実際にヒアリングした人数と部分結果である旨が表示される."""
+        from models.run_report import RunReport
+
+        report = RunReport(
+            personas_total=10, interviews_completed=4, deadline_seconds=600, partial=True
+        )
+        interviews_md = format_interviews_markdown([sample_interview_response], report)
+        hypotheses_md = format_hypotheses_markdown(sample_hypotheses_list, report)
+        run_report_md = format_run_report_markdown(report)
+
+        assert "10名中 4名にヒアリングを実施" in interviews_md
+        assert "部分的な結果" in interviews_md
+        assert "10名中 4名にヒアリングを実施" in hypotheses_md
+        assert "期限により打ち切り" in run_report_md
@@ -0,0 +1,264 @@
+"""質問セット評価ワークフロー（並列評価モード）のテスト."""
+import asyncio
+import datetime
+import time
+
+import pytest
+
+from agent_definitions import (
+    create_dimension_evaluator_agent,
+    create_question_mapper_agent,
+    create_evaluation_synthesizer_agent,
+)
+from agent_definitions.question_evaluator import EVALUATION_DIMENSIONS
+from models.evaluation_schemas import (
+    DimensionJudgement,
+    EvaluationJudgement,
+    EvaluationReport,
+    EvaluationSynthesis,
+    TopicAssessment,
+    TopicAssessmentsOutput,
+)
+from models.schemas import InterviewQuestion
+from workflows import run_question_evaluation_workflow
+
+
+SUB_CALL_DELAY = 0.05
+
+
+def make_dimension(prompt: str) -> DimensionJudgement:
+    return DimensionJudgement(
+        dimension_name="モデルが付けた名前",
+        initial_score=2.0,
+        validation_score=4.5,
+        explanation="説明",
+        key_changes=["変化"],
+    )
+
+
+@pytest.fixture
+def evaluation_runner(fake_runner):
+    """並列評価モードの各エージェントが遅延付きで応答する FakeRunner."""
+    async def dimension(prompt):
+        await asyncio.sleep(SUB_CALL_DELAY)
+        return make_dimension(prompt)
+
+    async def mappings(prompt):
+        await asyncio.sleep(SUB_CALL_DELAY)
+        return TopicAssessmentsOutput(assessments=[
+            TopicAssessment(
+                topic_number=1,
+                topic="ツール統合",
+                depth_level="明確な向上",
+                analysis="分析",
+            )
+        ])
+
+    fake_runner.outputs.update({
+        "DimensionEvaluator": dimension,
+        "QuestionMapper": mappings,
+        "EvaluationSynthesizer": EvaluationSynthesis(
+            title="評価レポート",
+            overall_assessment="総評",
+            key_improvements=["改善1"],
+            recommendations=["提案1"],
+            strengths_initial=["強み1"],
+            strengths_validation=["強み2"],
+            future_improvements=["統合案1"],
+        ),
+    })
+    return fake_runner
+
+
+class TestParallelEvaluation:
+    """並列評価モードのテスト."""
+
+    async def test_assembles_full_report(
+        self, evaluation_runner, sample_theme, sample_questions_output,
+        sample_validation_questions, sample_hypotheses_list,
+    ):
+        """側面ごとの評価・マッピング・統合結果から評価レポートを組み立てる."""
+        report = await run_question_evaluation_workflow(
+            theme=sample_theme,
+            initial_questions=sample_questions_output,
+            validation_questions=sample_validation_questions,
+            hypotheses=sample_hypotheses_list,
+            verbose=False,
+            mode="parallel",
+        )
+
+        assert isinstance(report, EvaluationReport)
+        names = [d.dimension_name for d in report.evaluation_dimensions]
+        assert names == [name for name, _ in EVALUATION_DIMENSIONS]
+        assert report.summary_scores == {name: 4.5 for name in names}
+        assert {d.improvement_points for d in report.evaluation_dimensions} == {2.5}
+        assert report.question_mappings[0].topic == "ツール統合"
+        assert report.overall_assessment == "総評"
+        assert len(evaluation_runner.calls_for("DimensionEvaluator")) == len(EVALUATION_DIMENSIONS)
+
+    async def test_sub_calls_run_concurrently(
+        self, evaluation_runner, sample_theme, sample_questions_output,
+        sample_validation_questions, sample_hypotheses_list,
+    ):
+        """側面ごとの評価は並行に実行され、所要時間は最も遅い呼び出し程度になる."""
+        started = time.perf_counter()
+        await run_question_evaluation_workflow(
+            theme=sample_theme,
+            initial_questions=sample_questions_output,
+            validation_questions=sample_validation_questions,
+            hypotheses=sample_hypotheses_list,
+            verbose=False,
+            mode="parallel",
+        )
+        elapsed = time.perf_counter() - started
+
+        sequential = SUB_CALL_DELAY * (len(EVALUATION_DIMENSIONS) + 1)
+        assert elapsed < sequential / 2
+
+    async def test_synthesis_receives_dimension_results(
+        self, evaluation_runner, sample_theme, sample_questions_output,
+        sample_validation_questions, sample_hypotheses_list,
+    ):
+        """統合呼び出しには各側面のスコアとマッピングが渡される."""
+        await run_question_evaluation_workflow(
+            theme=sample_theme,
+            initial_questions=sample_questions_output,
+            validation_questions=sample_validation_questions,
+            hypotheses=sample_hypotheses_list,
+            verbose=False,
+            mode="parallel",
+        )
+
+        prompt = evaluation_runner.calls_for("EvaluationSynthesizer")[0]
+        assert "反証可能性: 初回 2.0 → 検証 4.5" in prompt
+        assert "ツール統合" in prompt
+
+    async def test_each_dimension_prompt_targets_one_dimension(
+        self, evaluation_runner, sample_theme, sample_questions_output,
+        sample_validation_questions, sample_hypotheses_list,
+    ):
+        """側面ごとのプロンプトは1つの評価側面だけを指定する."""
+        await run_question_evaluation_workflow(
+            theme=sample_theme,
+            initial_questions=sample_questions_output,
+            validation_questions=sample_validation_questions,
+            hypotheses=sample_hypotheses_list,
+            verbose=False,
+            mode="parallel",
+        )
+
+        prompts = evaluation_runner.calls_for("DimensionEvaluator")
+        for (name, _), prompt in zip(EVALUATION_DIMENSIONS, prompts):
+            assert f"評価側面: **{name}**" in prompt
+            assert sample_questions_output.questions[0].question in prompt
+
+    async def test_invalid_mode(
+        self, sample_theme, sample_questions_output, sample_validation_questions, sample_hypotheses_list,
+    ):
+        """未対応のモードは ValueError."""
+        with pytest.raises(ValueError):
+            await run_question_evaluation_workflow(
+                theme=sample_theme,
+                initial_questions=sample_questions_output,
+                validation_questions=sample_validation_questions,
+                hypotheses=sample_hypotheses_list,
+                verbose=False,
+                mode="unknown",
+            )
+
+
+class TestPrecomputedFacts:
+    """ローカルで計算した比較を評価レポートに組み込むテスト."""
+
+    @pytest.fixture
+    def initial_questions(self, sample_questions_output):
+        extra = InterviewQuestion(question="休日の過ごし方を教えてください", intent="生活リズムを知る")
+        return sample_questions_output.model_copy(
+            update={"questions": [*sample_questions_output.questions, extra]},
+        )
+
+    @pytest.fixture
+    def judgement_runner(self, fake_runner):
+        fake_runner.outputs["QuestionEvaluator"] = EvaluationJudgement(
+            title="評価レポート",
+            overall_assessment="総評",
+            evaluation_dimensions=[make_dimension("")],
+            topic_assessments=[
+                TopicAssessment(topic_number=1, topic="ツール環境", depth_level="やや向上", analysis="分析"),
+                TopicAssessment(topic_number=9, topic="存在しない", depth_level="同等", analysis=""),
+            ],
+            key_improvements=[],
+            recommendations=[],
+            strengths_initial=[],
+            strengths_validation=[],
+            future_improvements=[],
+        )
+        return fake_runner
+
+    async def test_single_mode_merges_facts(
+        self, judgement_runner, sample_theme, initial_questions,
+        sample_validation_questions, sample_hypotheses_list,
+    ):
+        """質問数・変化率・トピックの質問番号・評価日・改善ポイント数はエージェントの出力ではなくローカルの計算を使う."""
+        report = await run_question_evaluation_workflow(
+            theme=sample_theme,
+            initial_questions=initial_questions,
+            validation_questions=sample_validation_questions,
+            hypotheses=sample_hypotheses_list,
+            verbose=False,
+        )
+
+        assert report.comparison.question_count_initial == 2
+        assert report.comparison.question_count_validation == 1
+        assert report.comparison.count_change_percent == -50.0
+        assert report.evaluation_date == datetime.date.today().isoformat()
+        assert [(m.topic, m.initial_questions, m.validation_questions) for m in report.question_mappings] == [
+            ("ツール環境", [1], [1]),
+        ]
+        assert report.summary_scores == {"モデルが付けた名前": 4.5}
+        assert report.evaluation_dimensions[0].improvement_points == 2.5
+        assert report.initial_metrics.question_count == 2
+        assert report.validation_metrics.open_ended_ratio == 1.0
+
+        prompt = judgement_runner.calls_for("QuestionEvaluator")[0]
+        assert "## 初回ヒアリング質問（2問）" in prompt
+        assert "初回 2問 → 検証 1問（-50.0%）" in prompt
+        assert "1. 初回[1] ↔ 検証[1]" in prompt
+        assert "改善ポイント数" not in prompt
+        assert "improvement_points" not in DimensionJudgement.model_json_schema()["properties"]
+        assert "検証質問と対応しない初回質問: [2]" in prompt
+
+    async def test_unassessed_topic_falls_back(
+        self, judgement_runner, sample_theme, sample_questions_output,
+        sample_validation_questions, sample_hypotheses_list,
+    ):
+        """評価されなかったトピックも、質問番号つきでレポートに残す."""
+        judgement_runner.outputs["QuestionEvaluator"] = judgement_runner.outputs["QuestionEvaluator"].model_copy(
+            update={"topic_assessments": []},
+        )
+
+        report = await run_question_evaluation_workflow(
+            theme=sample_theme,
+            initial_questions=sample_questions_output,
+            validation_questions=sample_validation_questions,
+            hypotheses=sample_hypotheses_list,
+            verbose=False,
+        )
+
+        assert report.question_mappings[0].topic == "検証質問1のトピック"
+        assert report.question_mappings[0].depth_level == "同等"
+
+
+class TestParallelEvaluationAgents:
+    """並列評価モード用エージェントのテスト."""
+
+    @pytest.mark.parametrize("factory,name,output_type", [
+        (create_dimension_evaluator_agent, "DimensionEvaluator", DimensionJudgement),
+        (create_question_mapper_agent, "QuestionMapper", TopicAssessmentsOutput),
+        (create_evaluation_synthesizer_agent, "EvaluationSynthesizer", EvaluationSynthesis),
+    ])
+    def test_agent_creation(self, factory, name, output_type):
+        agent = factory()
+        assert agent.name == name
+        assert agent.output_type == output_type
+        assert len(agent.instructions) > 0
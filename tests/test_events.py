@@ -0,0 +1,190 @@
+"""進捗イベントとエージェント呼び出しのテスト."""
+import time
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from workflows import (
+    AgentCaller,
+    CallRetried,
+    ConsoleReporter,
+    EventEmitter,
+    InterviewCompleted,
+    InterviewStarted,
+    PhaseFinished,
+    PhaseStarted,
+    UsageUpdated,
+    WorkflowFinished,
+    WorkflowStarted,
+    run_multi_persona_hearing_workflow,
+    stream_multi_persona_hearing_workflow,
+)
+from workflows.events import PHASE_INTERVIEWS
+
+
+class TestHearingWorkflowEvents:
+    """ヒアリングワークフローが発行するイベントのテスト."""
+
+    async def test_event_sequence(self, fake_runner, sample_theme):
+        """開始・各フェーズ・ヒアリング・完了の順にイベントが届く."""
+        events = []
+        result = await run_multi_persona_hearing_workflow(
+            sample_theme, num_personas=1, verbose=False, on_event=events.append
+        )
+
+        assert isinstance(events[0], WorkflowStarted)
+        assert isinstance(events[-1], WorkflowFinished)
+        assert events[-1].result == result
+
+        phases = [e.phase for e in events if isinstance(e, PhaseStarted)]
+        assert phases == [
+            "personas", "questions", "interviews", "hypotheses", "validation_questions",
+        ]
+        completed = [e for e in events if isinstance(e, InterviewCompleted)]
+        assert [e.response for e in completed] == result.interviews
+
+        interview_phase = next(
+            e for e in events if isinstance(e, PhaseFinished) and e.phase == PHASE_INTERVIEWS
+        )
+        assert interview_phase.result == result.run_report
+        assert interview_phase.elapsed >= 0
+
+    async def test_verbose_false_prints_nothing(self, fake_runner, sample_theme, capsys):
+        """verbose=False ならコンソールには何も出力しない."""
+        await run_multi_persona_hearing_workflow(sample_theme, num_personas=1, verbose=False)
+        assert capsys.readouterr().out == ""
+
+    async def test_verbose_output_is_rendered_from_events(self, fake_runner, sample_theme, capsys):
+        """verbose=True の表示はイベントから組み立てられる."""
+        await run_multi_persona_hearing_workflow(sample_theme, num_personas=1)
+        out = capsys.readouterr().out
+        assert "🎯 複数ペルソナヒアリングワークフローを開始します" in out
+        assert "1件のヒアリングを完了しました" in out
+        assert "🎉 ワークフロー完了" in out
+
+
+class TestStreamEvents:
+    """非同期イテレータとしての実行のテスト."""
+
+    async def test_stream_ends_with_result(self, fake_runner, sample_theme):
+        """最後のイベントにワークフローの結果が入る."""
+        events = [
+            event async for event in stream_multi_persona_hearing_workflow(
+                sample_theme, num_personas=1
+            )
+        ]
+        assert isinstance(events[-1], WorkflowFinished)
+        assert events[-1].result.interviews
+        assert any(isinstance(e, InterviewStarted) for e in events)
+
+    async def test_stream_reraises_workflow_error(self, fake_runner, sample_theme):
+        """ワークフローの例外はイベントを返し終えた後に送出される."""
+        def fail(prompt):
+            raise RuntimeError("ペルソナ生成に失敗")
+
+        fake_runner.outputs["PersonaGenerator"] = fail
+        events = []
+        with pytest.raises(RuntimeError, match="ペルソナ生成に失敗"):
+            async for event in stream_multi_persona_hearing_workflow(sample_theme):
+                events.append(event)
+        assert isinstance(events[0], WorkflowStarted)
+
+
+def _agent(name: str):
+    return SimpleNamespace(name=name)
+
+
+class TestAgentCaller:
+    """AgentCaller の再試行と使用量集計のテスト."""
+
+    async def test_retries_transient_errors(self, fake_runner):
+        """一時的なエラーは再試行し、CallRetried を発行する."""
+        attempts = []
+
+        def flaky(prompt):
+            attempts.append(prompt)
+            if len(attempts) == 1:
+                raise openai.APIConnectionError(request=None)
+            return "ok"
+
+        fake_runner.outputs["Flaky"] = flaky
+        events = []
+        caller = AgentCaller(EventEmitter(events.append), backoff_base=0.001)
+
+        assert await caller.run(_agent("Flaky"), "prompt", str) == "ok"
+        assert len(attempts) == 2
+        assert [type(e) for e in events] == [CallRetried]
+        assert events[0].agent_name == "Flaky"
+
+    async def test_gives_up_after_max_retries(self, fake_runner):
+        """再試行回数を超えたら最後のエラーを送出する."""
+        def always_fail(prompt):
+            raise openai.APIConnectionError(request=None)
+
+        fake_runner.outputs["Broken"] = always_fail
+        caller = AgentCaller(EventEmitter(), max_retries=2, backoff_base=0.001)
+
+        with pytest.raises(openai.APIConnectionError):
+            await caller.run(_agent("Broken"), "prompt", str)
+        assert len(fake_runner.calls_for("Broken")) == 3
+
+    async def test_non_retryable_errors_propagate(self, fake_runner):
+        """一時的でないエラーは再試行しない."""
+        def fail(prompt):
+            raise ValueError("schema error")
+
+        fake_runner.outputs["Invalid"] = fail
+        caller = AgentCaller(EventEmitter(), backoff_base=0.001)
+
+        with pytest.raises(ValueError):
+            await caller.run(_agent("Invalid"), "prompt", str)
+        assert len(fake_runner.calls_for("Invalid")) == 1
+
+    def test_usage_is_accumulated(self):
+        """呼び出しごとの使用量が累計され、UsageUpdated が発行される."""
+        events = []
+        caller = AgentCaller(EventEmitter(events.append))
+        usage = SimpleNamespace(requests=1, input_tokens=100, output_tokens=20)
+        result = SimpleNamespace(context_wrapper=SimpleNamespace(usage=usage))
+
+        caller._record_usage("A", result)
+        caller._record_usage("B", result)
+
+        assert caller.total_input_tokens == 200
+        assert isinstance(events[-1], UsageUpdated)
+        assert events[-1].agent_name == "B"
+        assert events[-1].total_output_tokens == 40
+
+
+class TestEventEmitter:
+    """EventEmitter と ConsoleReporter のテスト."""
+
+    def test_emitter_without_handlers_is_disabled(self):
+        """購読者がいなければ無効."""
+        emitter = EventEmitter(None)
+        assert not emitter.enabled
+        emitter.subscribe(lambda event: None)
+        assert emitter.enabled
+
+    def test_emit_is_cheap(self):
+        """イベントの発行はヒアリングの実行時間に比べて無視できる."""
+        received = []
+        emitter = EventEmitter(received.append)
+        event = PhaseStarted(phase="interviews")
+
+        started = time.perf_counter()
+        for _ in range(100_000):
+            emitter.emit(event)
+        assert time.perf_counter() - started < 1.0
+        assert len(received) == 100_000
+
+    def test_console_reporter_ignores_unknown_events(self):
+        """表示対象でないイベントは無視する."""
+        lines = []
+        reporter = ConsoleReporter(print_fn=lambda *args: lines.append(args))
+        reporter(UsageUpdated("A", 1, 1, 1, 1, 1, 1))
+        assert lines == []
+
+        reporter(PhaseStarted(phase="personas"))
+        assert any("フェーズ1" in str(line) for line in lines)
@@ -178,3 +178,20 @@ class TestFormatInterviewsMarkdown:
         assert "2. " in result
         assert sample_interview_response.persona_name in result
         assert response2.persona_name in result
+
+    def test_format_interviews_markdown_with_run_report(self, sample_interview_response):
+        """実行レポートがあれば実施人数と未実施のペルソナを表示する."""
+        from models.run_report import NotInterviewedPersona, RunReport
+        
+        report = RunReport(
+            personas_total=2,
+            interviews_completed=1,
+            not_interviewed=[
+                NotInterviewedPersona(persona_index=2, persona_name="佐藤花子", reason="飽和により打ち切り"),
+            ],
+        )
+        result = format_interviews_markdown([sample_interview_response], report)
+        
+        assert "2名中 1名" in result
+        assert "ヒアリング未実施のペルソナ" in result
+        assert "佐藤花子（飽和により打ち切り）" in result
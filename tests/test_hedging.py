@@ -0,0 +1,184 @@
+"""遅い呼び出しへの重複リクエスト（ヘッジ）のテスト."""
+import asyncio
+import time
+from collections import Counter
+
+import pytest
+
+from main import format_run_report_markdown
+from models.run_report import RunReport
+from models.schemas import PersonaOutput, PersonasOutput
+from workflows import CallHedged, HedgingPolicy, run_multi_persona_hearing_workflow
+
+
+def warmed_policy(seconds: float = 0.01, samples: int = 5, **kwargs) -> HedgingPolicy:
+    """所要時間の記録を samples 件分入れたポリシー."""
+    kwargs.setdefault("max_extra_fraction", 1.0)
+    policy = HedgingPolicy(min_samples=samples, **kwargs)
+    for _ in range(samples):
+        policy.observe("Agent", seconds)
+    # 記録した件数分を呼び出し済みとして数え、上限の割合の計算に含める
+    policy.calls = samples
+    return policy
+
+
+class Requests:
+    """呼び出しごとに所要時間と結果（または例外）を変えられるリクエストの代替."""
+
+    def __init__(self, *behaviors):
+        self.behaviors = list(behaviors)
+        self.started = 0
+        self.cancelled = 0
+
+    async def __call__(self):
+        delay, outcome = self.behaviors[self.started]
+        self.started += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class TestHedgingPolicy:
+    """HedgingPolicy のテスト."""
+
+    def test_invalid_settings_are_rejected(self):
+        """パーセンタイルと上限の割合の範囲外の値はエラー."""
+        with pytest.raises(ValueError):
+            HedgingPolicy(percentile=1.0)
+        with pytest.raises(ValueError):
+            HedgingPolicy(max_extra_fraction=1.5)
+
+    def test_delay_follows_observed_percentile(self):
+        """記録が min_samples 件集まるまでは送らず、以降はエージェントごとのパーセンタイルで待つ."""
+        policy = HedgingPolicy(percentile=0.9, min_samples=3)
+        policy.observe("A", 1.0)
+        policy.observe("A", 2.0)
+        assert policy.delay_for("A") is None
+
+        for seconds in range(3, 11):
+            policy.observe("A", float(seconds))
+
+        assert policy.delay_for("A") == 9.0
+        assert policy.delay_for("B") is None
+
+    def test_extra_fraction_is_capped(self):
+        """重複リクエストは呼び出し数に対する上限の割合までしか送らない."""
+        policy = HedgingPolicy(max_extra_fraction=0.25)
+        policy.calls = 8
+        assert [policy.try_hedge() for _ in range(3)] == [True, True, False]
+        assert policy.hedges_fired == 2
+
+
+class TestHedgedRequest:
+    """HedgingPolicy.run のテスト."""
+
+    async def test_fast_request_is_not_hedged(self):
+        """パーセンタイル以内に終わった呼び出しには重複リクエストを送らない."""
+        policy = warmed_policy(seconds=0.2)
+        requests = Requests((0.01, "primary"))
+
+        assert await policy.run("Agent", requests) == "primary"
+        assert requests.started == 1
+        assert policy.hedges_fired == 0
+
+    async def test_slow_request_is_hedged_and_loser_cancelled(self):
+        """遅い呼び出しには重複リクエストを送り、先に完了した方を使ってもう一方をキャンセルする."""
+        policy = warmed_policy(seconds=0.02)
+        requests = Requests((1.0, "primary"), (0.01, "hedge"))
+        hedged = []
+
+        started = time.perf_counter()
+        result = await policy.run("Agent", requests, on_hedge=hedged.append)
+
+        assert result == "hedge"
+        assert time.perf_counter() - started < 0.5
+        assert requests.cancelled == 1
+        assert hedged == [0.02]
+        assert (policy.hedges_fired, policy.hedges_won) == (1, 1)
+
+    async def test_failed_request_falls_back_to_the_other(self):
+        """一方が失敗した場合は、もう一方の結果を使う."""
+        policy = warmed_policy()
+        requests = Requests((0.05, ValueError("primary failed")), (0.1, "hedge"))
+
+        assert await policy.run("Agent", requests) == "hedge"
+
+    async def test_both_failed_raises_primary_error(self):
+        """両方失敗した場合は最初のリクエストのエラーを送出する."""
+        policy = warmed_policy()
+        requests = Requests((0.05, ValueError("primary")), (0.05, ValueError("hedge")))
+
+        with pytest.raises(ValueError, match="primary"):
+            await policy.run("Agent", requests)
+
+    async def test_cancelling_the_call_cancels_both_requests(self):
+        """呼び出し自体をキャンセルすると、両方のリクエストがキャンセルされる."""
+        policy = warmed_policy()
+        requests = Requests((1.0, "primary"), (1.0, "hedge"))
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(policy.run("Agent", requests), 0.1)
+        assert requests.cancelled == 2
+
+
+class TestHedgingInWorkflow:
+    """ワークフローでのヘッジのテスト."""
+
+    async def test_interview_tail_is_hedged(self, fake_runner, sample_interview_response):
+        """遅いヒアリングに重複リクエストが送られ、送信状況と所要時間の改善が実行レポートに記録される."""
+        fake_runner.outputs["PersonaGenerator"] = PersonasOutput(
+            personas=[
+                PersonaOutput(
+                    name=f"ペルソナ{i}", age=30, occupation="会社員", background="背景",
+                    needs=[], behaviors=[], pain_points=[],
+                )
+                for i in range(30)
+            ],
+            generation_rationale="根拠",
+        )
+        attempts = Counter()
+
+        async def interview(prompt):
+            attempts[prompt] += 1
+            # 記録が集まる前のペルソナ1と、ペルソナ20・21の最初のリクエストだけが遅い
+            slow = any(f"名前: ペルソナ{i}\n" in prompt for i in (1, 20, 21))
+            await asyncio.sleep(0.4 if slow and attempts[prompt] == 1 else 0.01)
+            return sample_interview_response
+
+        fake_runner.outputs["Interviewer"] = interview
+        events = []
+        policy = HedgingPolicy(percentile=0.9, max_extra_fraction=0.2, min_samples=5)
+
+        started = time.perf_counter()
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, max_concurrency=1, hedging=policy, on_event=events.append,
+        )
+
+        # ヘッジしなければ遅いリクエスト3件だけで 1.2秒かかる
+        assert time.perf_counter() - started < 1.0
+        report = result.run_report.hedging
+        assert report.hedges_fired == 2
+        assert report.hedges_won == 2
+        # キャンセルした遅いリクエストの所要時間は、完了したペルソナ1の記録から推定する
+        assert report.p95_seconds < 0.2
+        assert report.unhedged_p95_seconds >= 0.4
+        assert [e.agent_name for e in events if isinstance(e, CallHedged)] == ["Interviewer"] * 2
+        assert len(fake_runner.calls_for("Interviewer")) == 30 + 2
+
+    def test_run_report_markdown(self):
+        """実行レポートに重複リクエストの回数とヘッジあり・なしの所要時間を出力する."""
+        policy = warmed_policy(percentile=0.95, max_extra_fraction=0.1)
+        report = RunReport(hedging=policy.report())
+
+        markdown = format_run_report_markdown(report)
+
+        assert "## 重複リクエスト（ヘッジ）" in markdown
+        assert "p95 を超えた呼び出し" in markdown
+        assert "上限: 呼び出しの10%" in markdown
+        assert RunReport().hedging is None
+        assert "ヘッジ" not in format_run_report_markdown(RunReport())
@@ -0,0 +1,94 @@
+"""ヒアリング結果の洞察のクラスタリングのテスト."""
+import random
+import time
+
+import pytest
+
+from analysis import cluster_insights
+from main import format_insight_clusters_markdown
+from models.schemas import InterviewResponse
+from workflows import run_multi_persona_hearing_workflow
+
+
+def interview(name: str, *insights: str) -> InterviewResponse:
+    return InterviewResponse(persona_name=name, answers=["回答"], key_insights=list(insights))
+
+
+@pytest.fixture
+def interviews():
+    return [
+        interview("佐藤", "家事の分担が妻に偏っていて不満がある", "アプリに記録しても続かない"),
+        interview("鈴木", "家事の分担が偏っていて不満を感じている", "家計簿アプリを使っている"),
+        interview("高橋", "共働きなのに家事の分担が偏っていて不満がある", "アプリに記録しても長く続かない"),
+        interview("田中", "子どもの送迎の調整が大変"),
+    ]
+
+
+class TestClusterInsights:
+    """cluster_insights のテスト."""
+
+    def test_groups_similar_insights(self, interviews):
+        """似た洞察を1つのクラスタにまとめ、共通するペルソナが多い順に並べる."""
+        clusters = cluster_insights(interviews)
+
+        assert clusters[0].personas == ["佐藤", "鈴木", "高橋"]
+        assert clusters[0].size == 3
+        assert all("分担" in text for text in clusters[0].representatives)
+        assert clusters[1].personas == ["佐藤", "高橋"]
+        assert sum(cluster.size for cluster in clusters) == 7
+        assert [c.personas for c in clusters[2:]] in ([["鈴木"], ["田中"]], [["田中"], ["鈴木"]])
+
+    def test_representatives_are_distinct(self):
+        """同じ洞察は代表として重複させない."""
+        clusters = cluster_insights([interview(f"p{i}", "通知が多すぎる") for i in range(5)])
+
+        assert len(clusters) == 1
+        assert clusters[0].representatives == ["通知が多すぎる"]
+        assert len(clusters[0].personas) == 5
+
+    def test_empty_and_invalid(self):
+        assert cluster_insights([]) == []
+        assert cluster_insights([interview("a", "", "A")])[0].representatives == ["A"]
+        with pytest.raises(ValueError):
+            cluster_insights([], threshold=0)
+
+    def test_scales_to_many_insights(self):
+        """数万件の洞察でも短時間でまとめられる."""
+        rng = random.Random(0)
+        subjects = ["家事の分担", "家計の管理", "子どもの送迎", "献立", "掃除", "洗濯", "予定の共有", "通知"]
+        predicates = ["が偏っていて不満がある", "を話し合う時間がない", "を記録しても続かない", "を自動化したい"]
+        prefixes = ["", "特に平日は", "週末になると", "共働きなので", "在宅勤務の日は"]
+        many = [
+            interview(f"p{i}", *(rng.choice(prefixes) + rng.choice(subjects) + rng.choice(predicates)
+                                 for _ in range(5)))
+            for i in range(4000)
+        ]
+
+        started = time.perf_counter()
+        clusters = cluster_insights(many)
+        elapsed = time.perf_counter() - started
+
+        assert sum(cluster.size for cluster in clusters) == 20000
+        assert len(clusters) < 100
+        assert elapsed < 2.0
+
+
+class TestInsightClustersInOutputs:
+    """出力と仮説生成への洞察のクラスタの受け渡しのテスト."""
+
+    def test_markdown(self, interviews):
+        markdown = format_insight_clusters_markdown(interviews)
+
+        assert "4件のヒアリングの洞察 7件" in markdown
+        assert "- **ペルソナ**: 3名（佐藤、鈴木、高橋）" in markdown
+        assert "ほかに1名だけが述べた洞察のクラスタが2個あります。" in markdown
+
+    async def test_hypothesis_prompt_includes_clusters(self, fake_runner):
+        """仮説生成のプロンプトに、共通するペルソナの数つきの洞察のクラスタを含める."""
+        fake_runner.outputs["Interviewer"] = lambda prompt: interview("", "家事の分担が偏っていて不満がある")
+
+        await run_multi_persona_hearing_workflow("家事分担", num_personas=3, verbose=False)
+
+        prompt = fake_runner.calls_for("HypothesisBuilder")[0]
+        assert "洞察のクラスタ（全" in prompt
+        assert "- [" in prompt and "家事の分担が偏っていて不満がある" in prompt
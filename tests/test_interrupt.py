@@ -0,0 +1,189 @@
+"""中断時の結果保存と再開のテスト."""
+import asyncio
+import os
+import signal
+
+import pytest
+
+from main import resume_command, run_interruptible, save_results
+from models.schemas import InterviewResponse, PersonaOutput, PersonasOutput
+from storage import load_artifacts, save_artifacts
+from workflows import CheckpointWriter, run_multi_persona_hearing_workflow
+
+
+def make_personas(count: int) -> PersonasOutput:
+    return PersonasOutput(
+        personas=[
+            PersonaOutput(
+                name=f"ペルソナ{i}", age=30, occupation="会社員", background="背景",
+                needs=["ニーズ"], behaviors=["行動"], pain_points=["痛み"],
+            )
+            for i in range(count)
+        ],
+        generation_rationale="テスト用",
+    )
+
+
+def interview_for(prompt: str) -> InterviewResponse:
+    name = next(f"ペルソナ{i}" for i in range(10) if f"ペルソナ{i}" in prompt)
+    return InterviewResponse(persona_name=name, answers=["回答"], key_insights=[f"{name}の洞察"])
+
+
+class TestCheckpointWriter:
+    """CheckpointWriter のテスト."""
+
+    async def test_completed_work_is_on_disk_after_cancel(self, fake_runner, sample_theme, tmp_path):
+        """ヒアリング中にキャンセルされても、完了済みの結果は保存されている."""
+        fake_runner.outputs["PersonaGenerator"] = make_personas(3)
+
+        async def interview(prompt):
+            if "ペルソナ2" in prompt:
+                await asyncio.sleep(10)
+            return interview_for(prompt)
+
+        fake_runner.outputs["Interviewer"] = interview
+        checkpoint = CheckpointWriter(tmp_path)
+
+        task = asyncio.ensure_future(run_multi_persona_hearing_workflow(
+            sample_theme, num_personas=3, verbose=False, max_concurrency=3, on_event=checkpoint,
+        ))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        artifacts = load_artifacts(tmp_path, allow_partial=True)
+        assert artifacts.personas_output == make_personas(3)
+        assert {i.persona_name for i in artifacts.interviews} == {"ペルソナ0", "ペルソナ1"}
+        assert artifacts.hypotheses is None
+        assert checkpoint.state.interviews == artifacts.interviews
+
+    def test_partial_markdown_skips_unfinished_phases(self, tmp_path, sample_personas_output):
+        """未完了のフェーズのMarkdownは作らない."""
+        save_results(tmp_path, sample_personas_output, None, [], None, None)
+
+        assert (tmp_path / "personas.md").exists()
+        assert not (tmp_path / "initial_questions.md").exists()
+        assert not (tmp_path / "hypotheses.md").exists()
+
+    def test_strict_load_requires_all_phases(self, tmp_path, sample_personas_output):
+        """allow_partial を指定しなければ未完了のフェーズはエラー."""
+        save_artifacts(tmp_path, sample_personas_output, None, [], None, None)
+        with pytest.raises(FileNotFoundError):
+            load_artifacts(tmp_path)
+        assert load_artifacts(tmp_path, allow_partial=True).questions_output is None
+
+
+class TestResume:
+    """中断した実行の再開のテスト."""
+
+    async def test_resume_skips_completed_work(
+        self, fake_runner, sample_theme, sample_questions_output, tmp_path
+    ):
+        """完了済みのフェーズとヒアリングは再実行しない."""
+        personas = make_personas(3)
+        save_artifacts(
+            tmp_path, personas, sample_questions_output,
+            [interview_for("ペルソナ1")], None, None,
+        )
+        fake_runner.outputs["Interviewer"] = interview_for
+        resume_from = load_artifacts(tmp_path, allow_partial=True)
+
+        result = await run_multi_persona_hearing_workflow(
+            sample_theme, num_personas=3, verbose=False, resume_from=resume_from,
+        )
+
+        assert fake_runner.calls_for("PersonaGenerator") == []
+        assert fake_runner.calls_for("QuestionDesigner") == []
+        assert len(fake_runner.calls_for("Interviewer")) == 2
+        assert [i.persona_name for i in result.interviews] == ["ペルソナ0", "ペルソナ1", "ペルソナ2"]
+        assert result.run_report.interviews_completed == 3
+        assert len(fake_runner.calls_for("HypothesisBuilder")) == 1
+
+    async def test_resume_uses_persona_names_not_model_names(
+        self, fake_runner, sample_theme, sample_questions_output, tmp_path
+    ):
+        """モデルが別の名前を書いても、保存する結果はペルソナの名前にそろい、再開時に重複しない."""
+        personas = make_personas(3)
+        fake_runner.outputs["PersonaGenerator"] = personas
+        fake_runner.outputs["QuestionDesigner"] = sample_questions_output
+
+        async def respelled(prompt):
+            if "ペルソナ2" in prompt:
+                await asyncio.sleep(10)
+            # 名前を略したうえ、ペルソナ0の結果には別のペルソナの名前を書く
+            name = "ペルソナ2" if "ペルソナ0" in prompt else "ペルソナ一"
+            return InterviewResponse(persona_name=name, answers=["回答"], key_insights=["洞察"])
+
+        fake_runner.outputs["Interviewer"] = respelled
+        checkpoint = CheckpointWriter(tmp_path)
+        task = asyncio.ensure_future(run_multi_persona_hearing_workflow(
+            sample_theme, num_personas=3, verbose=False, max_concurrency=3, on_event=checkpoint,
+        ))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        resume_from = load_artifacts(tmp_path, allow_partial=True)
+        assert sorted(i.persona_name for i in resume_from.interviews) == ["ペルソナ0", "ペルソナ1"]
+
+        fake_runner.calls.clear()
+        fake_runner.outputs["Interviewer"] = interview_for
+        result = await run_multi_persona_hearing_workflow(
+            sample_theme, num_personas=3, verbose=False, resume_from=resume_from,
+        )
+
+        prompts = fake_runner.calls_for("Interviewer")
+        assert len(prompts) == 1 and "ペルソナ2" in prompts[0]
+        assert [i.persona_name for i in result.interviews] == ["ペルソナ0", "ペルソナ1", "ペルソナ2"]
+
+    async def test_resume_ignores_unknown_and_duplicate_results(
+        self, fake_runner, sample_theme, sample_questions_output, tmp_path
+    ):
+        """ペルソナと一致しない名前の結果と重複した結果は、再開時に使わない."""
+        save_artifacts(
+            tmp_path, make_personas(2), sample_questions_output,
+            [interview_for("ペルソナ0"), interview_for("ペルソナ0"), interview_for("ペルソナ9")], None, None,
+        )
+        fake_runner.outputs["Interviewer"] = interview_for
+
+        result = await run_multi_persona_hearing_workflow(
+            sample_theme, num_personas=2, verbose=False,
+            resume_from=load_artifacts(tmp_path, allow_partial=True),
+        )
+
+        assert len(fake_runner.calls_for("Interviewer")) == 1
+        assert [i.persona_name for i in result.interviews] == ["ペルソナ0", "ペルソナ1"]
+
+    def test_resume_command(self):
+        """再開コマンドは元の引数に --resume を付けたもの."""
+        command = resume_command(["main.py", "--theme", "新しい ツール", "--resume"])
+        assert command == "python main.py --theme '新しい ツール' --resume"
+
+
+class TestRunInterruptible:
+    """シグナルによる中断のテスト."""
+
+    async def test_first_signal_cancels_pipeline(self):
+        """1回目のシグナルで実行中の処理をキャンセルし、中断として戻る."""
+        cancelled = []
+
+        async def pipeline():
+            try:
+                os.kill(os.getpid(), signal.SIGINT)
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        assert await asyncio.wait_for(run_interruptible(pipeline()), timeout=5) is True
+        assert cancelled == [True]
+
+    async def test_completed_pipeline_is_not_interrupted(self):
+        """シグナルがなければ False を返し、ハンドラは元に戻る."""
+        async def pipeline():
+            return None
+
+        assert await run_interruptible(pipeline()) is False
+        assert signal.getsignal(signal.SIGINT) is signal.default_int_handler
@@ -0,0 +1,194 @@
+"""質問ごとのヒアリングモード（per-question）と所要時間の記録のテスト."""
+import asyncio
+import re
+import time
+
+import pytest
+
+from main import format_run_report_markdown
+from models.run_report import InterviewLatency, RunReport
+from models.schemas import (
+    InterviewInsights,
+    InterviewQuestion,
+    InterviewQuestionsOutput,
+    PersonaOutput,
+    PersonasOutput,
+    QuestionGroupAnswers,
+)
+from workflows import InterviewCompleted, run_multi_persona_hearing_workflow
+
+
+QUESTION_COUNT = 5
+
+
+def make_personas(count: int) -> PersonasOutput:
+    return PersonasOutput(
+        personas=[
+            PersonaOutput(
+                name=f"ペルソナ{i}", age=30, occupation="会社員", background="背景",
+                needs=["ニーズ"], behaviors=["行動"], pain_points=["不満"],
+            )
+            for i in range(count)
+        ],
+        generation_rationale="根拠",
+    )
+
+
+def answer_numbered_questions(prompt: str) -> QuestionGroupAnswers:
+    """プロンプトに含まれる質問番号ごとに「ペルソナ名:番号」の回答を返す."""
+    persona_name = re.search(r"名前: (\S+)", prompt).group(1)
+    numbers = re.findall(r"^(\d+)\. ", prompt, flags=re.MULTILINE)
+    return QuestionGroupAnswers(
+        answers=[f"{persona_name}:{number}" for number in numbers],
+        supporting_evidence=["共通の裏付け", f"裏付け{numbers[0]}"],
+    )
+
+
+@pytest.fixture
+def per_question_runner(fake_runner):
+    fake_runner.outputs.update({
+        "PersonaGenerator": make_personas(3),
+        "QuestionDesigner": InterviewQuestionsOutput(
+            questions=[
+                InterviewQuestion(question=f"質問{i}", intent=f"意図{i}")
+                for i in range(1, QUESTION_COUNT + 1)
+            ],
+            design_rationale="設計",
+        ),
+        "QuestionAnswerer": answer_numbered_questions,
+        "InsightExtractor": InterviewInsights(key_insights=["洞察"]),
+    })
+    return fake_runner
+
+
+class TestPerQuestionMode:
+    """per-question モードのテスト."""
+
+    async def test_answers_are_merged_in_question_order(self, per_question_runner):
+        """質問ごとの回答が質問順に1件のヒアリング結果にまとまり、最後に洞察が抽出される."""
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, interview_mode="per-question",
+        )
+
+        assert len(per_question_runner.calls_for("QuestionAnswerer")) == 3 * QUESTION_COUNT
+        assert len(per_question_runner.calls_for("InsightExtractor")) == 3
+        assert per_question_runner.calls_for("Interviewer") == []
+        for interview in result.interviews:
+            assert interview.answers == [
+                f"{interview.persona_name}:{n}" for n in range(1, QUESTION_COUNT + 1)
+            ]
+            assert interview.key_insights == ["洞察"]
+            assert interview.supporting_evidence[0] == "共通の裏付け"
+            assert len(interview.supporting_evidence) == QUESTION_COUNT + 1
+        # 洞察の抽出には全質問の回答を渡す
+        insight_prompt = per_question_runner.calls_for("InsightExtractor")[0]
+        assert "Q5. 質問5" in insight_prompt
+
+    async def test_question_groups(self, per_question_runner):
+        """question_group_size 問ずつまとめて1回の呼び出しで回答させる."""
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, interview_mode="per-question", question_group_size=2,
+        )
+
+        # 5問 → 2問・2問・1問の3回
+        assert len(per_question_runner.calls_for("QuestionAnswerer")) == 3 * 3
+        assert result.interviews[0].answers == [f"ペルソナ0:{n}" for n in range(1, 6)]
+        assert {latency.calls for latency in result.run_report.interview_latencies} == {4}
+
+    async def test_mismatched_answer_count_keeps_alignment(self, per_question_runner):
+        """回答数が質問数と合わなくても、以降の質問と回答の対応はずれない."""
+        def answer(prompt):
+            first = int(re.findall(r"^(\d+)\. ", prompt, flags=re.MULTILINE)[0])
+            # 最初のまとまりは1件だけ、それ以外は余分に返す
+            count = 1 if first == 1 else 3
+            return QuestionGroupAnswers(answers=[f"回答{first}"] * count)
+
+        per_question_runner.outputs["QuestionAnswerer"] = answer
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, interview_mode="per-question", question_group_size=2,
+        )
+
+        assert result.interviews[0].answers == ["回答1", "（回答なし）", "回答3", "回答3", "回答5"]
+
+    async def test_failed_question_fails_the_interview(self, per_question_runner):
+        """1つの質問の回答に失敗したペルソナは未実施として記録される."""
+        def answer(prompt):
+            if "名前: ペルソナ1" in prompt and "3. 質問3" in prompt:
+                raise ValueError("回答に失敗")
+            return answer_numbered_questions(prompt)
+
+        per_question_runner.outputs["QuestionAnswerer"] = answer
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, interview_mode="per-question",
+        )
+
+        assert [i.persona_name for i in result.interviews] == ["ペルソナ0", "ペルソナ2"]
+        assert result.run_report.not_interviewed[0].persona_name == "ペルソナ1"
+
+    async def test_questions_run_concurrently(self, per_question_runner):
+        """1件のヒアリングの所要時間は、質問ごとの回答時間の合計より短い."""
+        async def slow_answer(prompt):
+            await asyncio.sleep(0.05)
+            return answer_numbered_questions(prompt)
+
+        per_question_runner.outputs["PersonaGenerator"] = make_personas(1)
+        per_question_runner.outputs["QuestionAnswerer"] = slow_answer
+        started = time.perf_counter()
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, interview_mode="per-question",
+        )
+
+        latency = result.run_report.interview_latencies[0]
+        assert latency.seconds < 0.05 * QUESTION_COUNT
+        assert latency.seconds <= time.perf_counter() - started
+
+    async def test_invalid_options_are_rejected(self):
+        """未対応のモードや1未満のまとまりの大きさはエラー."""
+        with pytest.raises(ValueError):
+            await run_multi_persona_hearing_workflow("テーマ", verbose=False, interview_mode="batch")
+        with pytest.raises(ValueError):
+            await run_multi_persona_hearing_workflow(
+                "テーマ", verbose=False, interview_mode="per-question", question_group_size=0,
+            )
+
+
+class TestInterviewLatency:
+    """ヒアリングの所要時間の記録のテスト."""
+
+    async def test_single_mode_records_latency(self, fake_runner):
+        """single モードでもヒアリングごとの所要時間を記録し、イベントにも含める."""
+        events = []
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, on_event=events.append,
+        )
+
+        report = result.run_report
+        assert report.interview_mode == "single"
+        assert [latency.calls for latency in report.interview_latencies] == [1]
+        completed = [e for e in events if isinstance(e, InterviewCompleted)]
+        assert completed[0].elapsed is not None
+
+    def test_latency_summary(self):
+        """平均・中央値・p95・最大を求める."""
+        report = RunReport(interview_latencies=[
+            InterviewLatency(persona_name=f"P{i}", seconds=float(i)) for i in range(1, 21)
+        ])
+
+        summary = report.latency_summary()
+
+        assert summary == {"count": 20, "mean": 10.5, "p50": 10.0, "p95": 19.0, "max": 20.0}
+        assert RunReport().latency_summary() is None
+
+    def test_run_report_markdown(self):
+        """実行レポートに実行方法と所要時間の統計を出力する."""
+        report = RunReport(
+            interview_mode="per-question",
+            interview_latencies=[InterviewLatency(persona_name="P", seconds=12.5, calls=16)],
+        )
+
+        markdown = format_run_report_markdown(report)
+
+        assert "## ヒアリングの所要時間" in markdown
+        assert "質問ごとに並行して回答（`per-question`）" in markdown
+        assert "16回" in markdown
+        assert "| 12.5秒 | 12.5秒 | 12.5秒 | 12.5秒 |" in markdown
@@ -0,0 +1,194 @@
+"""ヒアリング結果のストア（ディスクへの書き出しと索引による参照）のテスト."""
+import json
+import tracemalloc
+
+import pytest
+
+from models.schemas import InterviewResponse
+from storage import load_artifacts, save_artifacts
+from storage.artifacts import INTERVIEWS_FILENAME, LEGACY_INTERVIEWS_FILENAME, artifacts_dir
+from storage.interview_store import InterviewStore, InterviewView
+from workflows import CheckpointWriter, InterviewCompleted, run_multi_persona_hearing_workflow
+from workflows.events import PHASE_INTERVIEWS
+
+
+def make_interview(i: int, answer_length: int = 10) -> InterviewResponse:
+    return InterviewResponse(
+        persona_name=f"ペルソナ{i}",
+        answers=[f"回答{i}-" + "あ" * answer_length, f"回答{i}-2"],
+        key_insights=[f"洞察{i}"],
+        supporting_evidence=[],
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = InterviewStore(tmp_path / "interviews.jsonl", window=2)
+    yield store
+    store.close()
+
+
+class TestInterviewStore:
+    """InterviewStore のテスト."""
+
+    def test_sequence_access(self, store):
+        """リストと同じようにインデックス・スライス・反復で読み出せる."""
+        interviews = [make_interview(i) for i in range(5)]
+        positions = [store.append(interview) for interview in interviews]
+
+        assert positions == [0, 1, 2, 3, 4]
+        assert len(store) == 5
+        assert store[0] == interviews[0]
+        assert store[-1] == interviews[4]
+        assert store[1:3] == interviews[1:3]
+        assert list(store) == interviews
+        assert store == interviews
+        with pytest.raises(IndexError):
+            store[5]
+
+    def test_random_access_by_persona(self, store):
+        """ペルソナ名で参照できる."""
+        store.extend(make_interview(i) for i in range(5))
+
+        assert store.get("ペルソナ3") == make_interview(3)
+        assert store.index_of("ペルソナ3") == 3
+        assert store.get("いない") is None
+        assert store.persona_names() == [f"ペルソナ{i}" for i in range(5)]
+
+    def test_memory_window_is_bounded(self, store):
+        """メモリに保持するのは直近の window 件だけ."""
+        store.extend(make_interview(i) for i in range(10))
+        for i in range(10):
+            store[i]
+        assert len(store._cache) == 2
+        assert list(store._cache) == [8, 9]
+
+    def test_reopen_existing_file(self, store, tmp_path):
+        """既存のファイルを開くと索引を作り直し、続きに追記できる."""
+        store.extend(make_interview(i) for i in range(3))
+        store.close()
+
+        reopened = InterviewStore(tmp_path / "interviews.jsonl")
+        assert reopened == [make_interview(i) for i in range(3)]
+        assert reopened.get("ペルソナ1") == make_interview(1)
+        reopened.append(make_interview(3))
+        assert len(reopened) == 4
+        reopened.close()
+
+    def test_truncated_last_line_is_discarded(self, store, tmp_path):
+        """書き込み途中で中断された最後の行は切り捨てる."""
+        store.extend(make_interview(i) for i in range(2))
+        store.close()
+        path = tmp_path / "interviews.jsonl"
+        with open(path, "ab") as f:
+            f.write(make_interview(2).model_dump_json().encode("utf-8")[:20])
+
+        reopened = InterviewStore(path)
+        assert len(reopened) == 2
+        reopened.append(make_interview(2))
+        reopened.close()
+        assert InterviewStore(path) == [make_interview(i) for i in range(3)]
+
+    def test_temporary_file_is_removed_on_close(self):
+        """パスを省略した場合は一時ファイルを使い、close() で削除する."""
+        store = InterviewStore()
+        store.append(make_interview(0))
+        path = store.path
+        assert path.exists()
+        store.close()
+        assert not path.exists()
+
+    def test_view_orders_without_copying(self, store):
+        """view は指定した順序で元のストアを参照する."""
+        store.extend(make_interview(i) for i in range(4))
+        view = store.view([3, 1])
+
+        assert isinstance(view, InterviewView)
+        assert view == [make_interview(3), make_interview(1)]
+        assert view.get("ペルソナ1") == make_interview(1)
+        assert view.get("ペルソナ0") is None
+
+    def test_incomplete_subclass_fails_on_instantiation(self):
+        """get を実装していないシーケンスはインスタンスを作る時点でエラーになる."""
+        from storage.interview_store import _InterviewSequence
+
+        class Incomplete(_InterviewSequence):
+            def __len__(self):
+                return 0
+
+            def __getitem__(self, index):
+                raise IndexError(index)
+
+        with pytest.raises(TypeError, match="get"):
+            Incomplete()
+
+    def test_memory_stays_bounded_for_many_interviews(self, tmp_path):
+        """10,000件の長いヒアリング結果を保存・走査しても、メモリ使用量は件数に比例して増えない."""
+        store = InterviewStore(tmp_path / "interviews.jsonl", window=16)
+        tracemalloc.start()
+        try:
+            for i in range(10_000):
+                store.append(make_interview(i, answer_length=1000))
+            persona_count = sum(1 for _ in store)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert persona_count == 10_000
+        data_size = store.path.stat().st_size
+        assert data_size > 20_000_000
+        # 索引（位置とペルソナ名）以外はほとんど保持しない
+        assert peak < data_size / 5
+        store.close()
+
+
+class TestInterviewArtifacts:
+    """ヒアリング結果のアーティファクトのテスト."""
+
+    def test_checkpoint_appends_each_interview(self, tmp_path):
+        """CheckpointWriter は完了したヒアリングを1件ずつファイルに追記する."""
+        checkpoint = CheckpointWriter(tmp_path)
+        path = artifacts_dir(tmp_path) / INTERVIEWS_FILENAME
+        for i in range(3):
+            checkpoint(InterviewCompleted(
+                phase=PHASE_INTERVIEWS, index=i, total=3, persona_name=f"ペルソナ{i}",
+                response=make_interview(i),
+            ))
+            assert len(path.read_text(encoding="utf-8").splitlines()) == i + 1
+        assert isinstance(checkpoint.state.interviews, InterviewStore)
+
+    def test_legacy_json_array_is_loaded(
+        self, tmp_path, sample_personas_output, sample_questions_output,
+        sample_hypotheses_list, sample_validation_questions,
+    ):
+        """以前の形式（interviews.json）で保存した実行も読み込める."""
+        save_artifacts(
+            tmp_path, sample_personas_output, sample_questions_output, [],
+            sample_hypotheses_list, sample_validation_questions,
+        )
+        (artifacts_dir(tmp_path) / INTERVIEWS_FILENAME).unlink()
+        legacy = [json.loads(make_interview(i).model_dump_json()) for i in range(2)]
+        (artifacts_dir(tmp_path) / LEGACY_INTERVIEWS_FILENAME).write_text(
+            json.dumps(legacy, ensure_ascii=False), encoding="utf-8"
+        )
+
+        assert load_artifacts(tmp_path).interviews == [make_interview(0), make_interview(1)]
+
+
+class TestWorkflowStore:
+    """ワークフローでのストアの利用のテスト."""
+
+    async def test_interviews_are_written_to_the_given_store(self, fake_runner, sample_theme, tmp_path):
+        """ヒアリング結果は指定したストアに書き出され、結果はペルソナ順に参照できる."""
+        store = InterviewStore(tmp_path / "interviews.jsonl")
+        result = await run_multi_persona_hearing_workflow(
+            sample_theme, num_personas=3, verbose=False, interview_store=store
+        )
+
+        assert isinstance(result.interviews, InterviewView)
+        assert result.interviews.store is store
+        assert len(store) == len(result.interviews)
+        assert [i.persona_name for i in result.interviews] == [
+            p.name for p in result.personas_output.personas
+        ][:len(result.interviews)]
+        store.close()
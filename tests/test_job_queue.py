@@ -0,0 +1,234 @@
+"""SQLiteジョブキュー・共有レート制限・キューワーカーのテスト."""
+import asyncio
+import multiprocessing
+
+import pytest
+from agents import RunConfig
+
+from backends import FakeModelProvider, RateLimitedModelProvider
+from service import QueueWorker
+from storage import (
+    QUEUE_FAILED,
+    QUEUE_PENDING,
+    QUEUE_RUNNING,
+    QUEUE_SUCCEEDED,
+    JobQueue,
+    SharedRateLimiter,
+    load_artifacts,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def lease_all(path, worker_id, results):
+    """別プロセスでキューが空になるまでリースし、リースしたジョブIDを返す."""
+    queue = JobQueue(path)
+    leased = []
+    while (job := queue.lease(worker_id)) is not None:
+        leased.append(job.job_id)
+        queue.complete(job)
+    queue.close()
+    results.put(leased)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = JobQueue(tmp_path / "queue.db", visibility_timeout=60, max_attempts=2, clock=clock)
+    yield queue
+    queue.close()
+
+
+class TestJobQueue:
+    """JobQueue のテスト."""
+
+    def test_lease_and_complete(self, queue, tmp_path):
+        """追加順にリースし、完了を記録できる."""
+        first = queue.enqueue("テーマA", tmp_path / "a", {"num_personas": 3})
+        queue.enqueue("テーマB", tmp_path / "b")
+
+        job = queue.lease("w1")
+        assert job.job_id == first
+        assert job.options == {"num_personas": 3}
+        assert job.attempts == 1 and not job.is_retry
+        assert queue.counts()[QUEUE_RUNNING] == 1
+
+        assert queue.complete(job)
+        assert queue.lease("w2").theme == "テーマB"
+        assert queue.lease("w3") is None
+        assert queue.counts() == {
+            QUEUE_PENDING: 0, QUEUE_RUNNING: 1, QUEUE_SUCCEEDED: 1, QUEUE_FAILED: 0,
+        }
+
+    def test_expired_lease_is_reclaimed(self, queue, clock, tmp_path):
+        """ハートビートが途絶えたジョブは期限後に別のワーカーが回収する."""
+        queue.enqueue("テーマ", tmp_path / "a")
+        crashed = queue.lease("w1")
+        assert queue.lease("w2") is None
+
+        clock.now += 61
+        reclaimed = queue.lease("w2")
+        assert reclaimed.job_id == crashed.job_id
+        assert reclaimed.is_retry
+
+        # 回収された元のワーカーは完了もハートビートもできない
+        assert not queue.heartbeat(crashed)
+        assert not queue.complete(crashed)
+        assert queue.complete(reclaimed)
+
+    def test_heartbeat_extends_lease(self, queue, clock, tmp_path):
+        """ハートビートを続けている間は回収されない."""
+        queue.enqueue("テーマ", tmp_path / "a")
+        job = queue.lease("w1")
+        for _ in range(3):
+            clock.now += 40
+            assert queue.heartbeat(job)
+        assert queue.lease("w2") is None
+
+    def test_attempts_are_limited(self, queue, clock, tmp_path):
+        """失敗は上限回数まで再試行し、その後は失敗として残る."""
+        queue.enqueue("テーマ", tmp_path / "a")
+        assert queue.fail(queue.lease("w1"), "エラー1")
+        job = queue.lease("w1")
+        assert job.attempts == 2
+        assert queue.fail(job, "エラー2")
+        assert queue.lease("w1") is None
+        assert queue.jobs()[0]["status"] == QUEUE_FAILED
+        assert queue.jobs()[0]["error"] == "エラー2"
+
+        # リースの期限切れでも上限に達したら失敗になる
+        queue.enqueue("テーマ", tmp_path / "b")
+        queue.lease("w1")
+        clock.now += 61
+        queue.lease("w2")
+        clock.now += 61
+        assert queue.lease("w3") is None
+        assert queue.counts()[QUEUE_FAILED] == 2
+
+    def test_release_does_not_count_attempt(self, queue, tmp_path):
+        """停止時に返却したジョブは試行回数に数えない."""
+        queue.enqueue("テーマ", tmp_path / "a")
+        assert queue.release(queue.lease("w1"))
+        assert queue.lease("w2").attempts == 1
+
+    @pytest.mark.slow
+    def test_workers_in_separate_processes_never_share_a_job(self, tmp_path):
+        """複数プロセスから同時にリースしても、1件のジョブは1つのワーカーにしか渡らない."""
+        path = tmp_path / "queue.db"
+        queue = JobQueue(path)
+        for i in range(60):
+            queue.enqueue(f"テーマ{i}", tmp_path / str(i))
+
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        processes = [
+            context.Process(target=lease_all, args=(path, f"w{i}", results)) for i in range(3)
+        ]
+        for process in processes:
+            process.start()
+        leased = [results.get(timeout=30) for _ in processes]
+        for process in processes:
+            process.join(timeout=30)
+
+        all_ids = [job_id for ids in leased for job_id in ids]
+        assert sorted(all_ids) == list(range(1, 61))
+        assert queue.counts()[QUEUE_SUCCEEDED] == 60
+        queue.close()
+
+
+class TestSharedRateLimiter:
+    """SharedRateLimiter のテスト."""
+
+    def test_bucket_is_shared_between_instances(self, tmp_path, clock):
+        """同じファイルを使うリミッター同士で枠を共有する."""
+        path = tmp_path / "queue.db"
+        first = SharedRateLimiter(path, requests_per_minute=60, clock=clock)
+        second = SharedRateLimiter(path, requests_per_minute=60, clock=clock)
+
+        assert first.try_acquire() == 0
+        assert second.try_acquire() == pytest.approx(1.0)
+
+        clock.now += 1
+        assert second.try_acquire() == 0
+
+    async def test_model_calls_wait_for_the_limiter(self, tmp_path):
+        """レート制限付きのプロバイダーは呼び出しごとに枠を取得する."""
+        acquired = []
+
+        class Limiter:
+            async def acquire(self):
+                acquired.append(1)
+
+        fake = FakeModelProvider()
+        provider = RateLimitedModelProvider(fake, Limiter())
+        model = provider.get_model(None)
+        await model.get_response(None, "prompt", None, [], None, [], None)
+        assert len(acquired) == 1
+        assert fake.model.calls == 1
+
+
+class TestQueueWorker:
+    """QueueWorker のテスト."""
+
+    def make_worker(self, queue, **kwargs):
+        run_config = RunConfig(model_provider=FakeModelProvider(), tracing_disabled=True)
+        return QueueWorker(queue, worker_id="w1", run_config=run_config, print_fn=lambda *_: None, **kwargs)
+
+    async def test_jobs_are_processed_and_artifacts_saved(self, tmp_path):
+        """キューが空になるまで処理し、ジョブごとにアーティファクトを保存する."""
+        queue = JobQueue(tmp_path / "queue.db")
+        queue.enqueue("テーマA", tmp_path / "a")
+        queue.enqueue("テーマB", tmp_path / "b")
+
+        processed = await self.make_worker(queue).run(stop_when_empty=True)
+
+        assert processed == 2
+        assert queue.counts()[QUEUE_SUCCEEDED] == 2
+        for output_dir in (tmp_path / "a", tmp_path / "b"):
+            artifacts = load_artifacts(output_dir)
+            assert len(artifacts.interviews) == len(artifacts.personas_output.personas)
+            assert artifacts.run_report is not None
+        queue.close()
+
+    async def test_failed_job_is_requeued(self, tmp_path, monkeypatch):
+        """ワークフローが失敗したジョブは待機中に戻る."""
+        async def broken(**kwargs):
+            raise RuntimeError("壊れた")
+
+        monkeypatch.setattr("service.worker.run_multi_persona_hearing_workflow", broken)
+        queue = JobQueue(tmp_path / "queue.db", max_attempts=2)
+        queue.enqueue("テーマ", tmp_path / "a")
+
+        worker = self.make_worker(queue)
+        assert not await worker.process(queue.lease("w1"))
+        job = queue.jobs()[0]
+        assert job["status"] == QUEUE_PENDING
+        assert "壊れた" in job["error"]
+        queue.close()
+
+    async def test_lost_lease_cancels_the_job(self, tmp_path):
+        """ハートビートでリースを失ったと分かったら実行を中断する."""
+        queue = JobQueue(tmp_path / "queue.db")
+        queue.enqueue("テーマ", tmp_path / "a")
+        job = queue.lease("w1")
+        # 別のワーカーが回収した状態にする
+        queue._conn.execute("UPDATE jobs SET lease_owner = 'w2'")
+
+        worker = self.make_worker(queue, heartbeat_interval=0.01)
+        worker.run_config = RunConfig(
+            model_provider=FakeModelProvider(latency=0.5), tracing_disabled=True
+        )
+        assert not await asyncio.wait_for(worker.process(job), timeout=0.4)
+        assert queue.jobs()[0]["lease_owner"] == "w2"
+        assert not (tmp_path / "a" / "artifacts" / "personas.json").exists()
+        queue.close()
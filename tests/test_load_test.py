@@ -0,0 +1,181 @@
+"""遅延と障害を注入するバックエンドと負荷試験のテスト."""
+import json
+import random
+import time
+
+import pytest
+from agents import RunConfig
+
+from backends import Scenario, ScenarioModelProvider
+from backends.scenario import LatencyDistribution
+from main import format_load_test_report, load_test_main
+from service import run_load_test
+from workflows import AgentCaller, run_multi_persona_hearing_workflow
+
+
+def run_config_for(scenario: dict):
+    provider = ScenarioModelProvider(Scenario.from_dict(scenario))
+    return provider.model, RunConfig(model_provider=provider, tracing_disabled=True)
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """再試行の待ち時間をなくす."""
+    monkeypatch.setattr(AgentCaller, "_backoff_delay", lambda self, attempt: 0.0)
+
+
+class TestScenario:
+    """Scenario の読み込みのテスト."""
+
+    def test_invalid_scenarios_are_rejected(self):
+        """未対応の障害・分布や、確率の合計が1を超えるシナリオはエラー."""
+        with pytest.raises(ValueError):
+            Scenario.from_dict({"faults": {"disk_full": 0.1}})
+        with pytest.raises(ValueError):
+            Scenario.from_dict({"faults": {"rate_limit": 0.7, "timeout": 0.7}})
+        with pytest.raises(ValueError):
+            Scenario.from_dict({"latency": {"distribution": "pareto"}})
+        with pytest.raises(ValueError):
+            Scenario.from_dict({"latency": {"distribution": "uniform", "low": 2, "high": 1}})
+
+    def test_latency_distributions(self):
+        """分布ごとの遅延はシードが同じなら同じ値になる."""
+        rng = random.Random(1)
+        uniform = LatencyDistribution("uniform", low=1.0, high=2.0)
+        assert all(1.0 <= uniform.sample(rng) <= 2.0 for _ in range(100))
+        lognormal = LatencyDistribution("lognormal", seconds=1.0, sigma=0.5)
+        assert lognormal.sample(random.Random(7)) == lognormal.sample(random.Random(7))
+        assert LatencyDistribution(seconds=0.3).sample(rng) == 0.3
+
+    def test_output_overrides(self):
+        """出力の型名ごとの上書きがなければ全体の設定を使う."""
+        scenario = Scenario.from_dict({
+            "faults": {"server_error": 0.1},
+            "outputs": {"InterviewResponse": {"faults": {}}},
+        })
+        assert scenario.for_output("InterviewResponse")[1] == {}
+        assert scenario.for_output("PersonasOutput")[1] == {"server_error": 0.1}
+
+    def test_example_scenario_file(self):
+        """リポジトリのシナリオ例を読み込める."""
+        scenario = Scenario.from_file("inputs/load_test_scenario.json")
+        assert scenario.rate_limit_storms == [(5.0, 3.0)]
+
+
+class TestScenarioBackend:
+    """ScenarioModel を使ったワークフローのテスト."""
+
+    async def test_schema_valid_outputs(self):
+        """障害がなければ全エージェントでスキーマに適合する出力を返す."""
+        model, run_config = run_config_for({"seed": 1})
+
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", num_personas=3, verbose=False, run_config=run_config,
+        )
+
+        assert len(result.interviews) == 3
+        assert result.hypotheses.problem_hypotheses
+        assert model.calls == model.succeeded == 2 + 3 + 2
+
+    async def test_rate_limited_interviews_fail_after_retries(self, no_backoff):
+        """レート制限が続くヒアリングは再試行した後に失敗として記録される."""
+        model, run_config = run_config_for({
+            "outputs": {"InterviewResponse": {"faults": {"rate_limit": 1.0}}},
+        })
+
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, run_config=run_config,
+        )
+
+        # 1回 + 再試行3回
+        assert model.faults["rate_limit"] == 3 * 4
+        assert result.interviews == []
+        assert all("Rate limit" in skipped.reason for skipped in result.run_report.not_interviewed)
+
+    async def test_malformed_output_is_not_retried(self, no_backoff):
+        """不正なJSONや途中で切れた出力は再試行せずにヒアリングの失敗になる."""
+        model, run_config = run_config_for({
+            "seed": 3,
+            "outputs": {"InterviewResponse": {"faults": {"malformed_json": 0.5, "truncated": 0.5}}},
+        })
+
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, run_config=run_config,
+        )
+
+        assert model.faults["malformed_json"] + model.faults["truncated"] == 3
+        assert len(result.run_report.not_interviewed) == 3
+
+    async def test_hang_is_cut_by_call_timeout(self, no_backoff):
+        """応答が止まった呼び出しは call_timeout で打ち切って再試行する."""
+        model, run_config = run_config_for({
+            "hang_seconds": 30,
+            "outputs": {"InterviewResponse": {"faults": {"hang": 1.0}}},
+        })
+
+        started = time.perf_counter()
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, run_config=run_config, call_timeout=0.05,
+        )
+
+        assert time.perf_counter() - started < 5
+        assert all("応答しませんでした" in s.reason for s in result.run_report.not_interviewed)
+
+    async def test_rate_limit_storm(self, monkeypatch):
+        """嵐の時間帯の呼び出しはすべて 429 になり、過ぎた後の再試行は成功する."""
+        monkeypatch.setattr(AgentCaller, "_backoff_delay", lambda self, attempt: 0.1)
+        model, run_config = run_config_for({"rate_limit_storms": [{"start": 0, "duration": 0.15}]})
+
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ", verbose=False, run_config=run_config,
+        )
+
+        assert model.faults["rate_limit"] == 2
+        assert len(result.interviews) == 3
+
+
+class TestLoadTest:
+    """負荷試験のテスト."""
+
+    async def test_report(self, no_backoff):
+        """実行・ヒアリング・再試行・注入した障害を集計する."""
+        model, run_config = run_config_for({
+            "seed": 5,
+            "outputs": {"InterviewResponse": {"faults": {"server_error": 0.3}}},
+        })
+
+        report = await run_load_test(
+            "テーマ", run_config, runs=3, concurrency=2, model=model, num_personas=3,
+        )
+
+        assert report.runs_succeeded == 3
+        assert report.interviews_completed + report.interviews_failed == 9
+        assert report.faults["server_error"] == report.retries["InternalServerError"]
+        assert report.model_calls == model.calls
+        assert report.interviews_per_minute > 0
+        text = format_load_test_report(report)
+        assert "実行: 3/3件が完了（同時実行 2）" in text
+        assert "server_error" in text
+
+    async def test_failed_runs_are_counted(self):
+        """ワークフローが失敗した実行はエラーとして記録する."""
+        model, run_config = run_config_for({"outputs": {"PersonasOutput": {"faults": {"truncated": 1.0}}}})
+
+        report = await run_load_test("テーマ", run_config, runs=2, model=model)
+
+        assert report.runs_succeeded == 0
+        assert len(report.run_errors) == 2
+        assert "失敗した実行: ModelBehaviorError" in format_load_test_report(report)
+
+    def test_cli(self, tmp_path, capsys):
+        """load-test コマンドはシナリオを読み込んで結果を表示し、JSONにも書き出す."""
+        scenario = tmp_path / "scenario.json"
+        scenario.write_text(json.dumps({"seed": 1}), encoding="utf-8")
+        output = tmp_path / "result.json"
+
+        load_test_main([
+            "--scenario", str(scenario), "--runs", "2", "--num-personas", "2", "--output", str(output),
+        ])
+
+        assert "実行: 2/2件が完了" in capsys.readouterr().out
+        assert json.loads(output.read_text(encoding="utf-8"))["runs_succeeded"] == 2
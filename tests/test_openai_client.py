@@ -0,0 +1,171 @@
+"""共有OpenAIクライアント（接続プール）のテスト."""
+import asyncio
+import itertools
+import json
+
+import pytest
+from agents import RunConfig
+
+import agent_definitions.openai_client as openai_client
+from agent_definitions import OpenAIClientSettings, configure_openai_client, pool_metrics, shared_openai_client
+from backends import example_from_schema
+from workflows import run_multi_persona_hearing_workflow
+
+
+class StubResponsesServer:
+    """
+    Responses API を模したローカルのHTTPサーバー.
+
+    keep-alive の接続で複数のリクエストを受け付け、リクエストの出力スキーマに適合する応答を返す。
+    受け付けた接続数とリクエスト数を記録する。
+    """
+
+    def __init__(self, array_length: int = 3, latency: float = 0.01):
+        self.array_length = array_length
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self.port = None
+        self._serials = itertools.count(1)
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+                await asyncio.sleep(self.latency)
+                payload = json.dumps(self._respond(json.loads(body))).encode("utf-8")
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode("latin-1")
+                    + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, request):
+        serial = next(self._serials)
+        text_format = (request.get("text") or {}).get("format") or {}
+        if text_format.get("type") == "json_schema":
+            value = example_from_schema(
+                text_format["schema"], serial=serial, array_length=self.array_length
+            )
+            text = json.dumps(value, ensure_ascii=False)
+        else:
+            text = f"response-{serial}"
+        return {
+            "id": f"resp_{serial}",
+            "object": "response",
+            "created_at": 0,
+            "model": request.get("model", "stub"),
+            "status": "completed",
+            "output": [
+                {
+                    "id": f"msg_{serial}",
+                    "type": "message",
+                    "role": "assistant",
+                    "status": "completed",
+                    "content": [{"type": "output_text", "text": text, "annotations": []}],
+                }
+            ],
+            "parallel_tool_calls": False,
+            "tool_choice": "auto",
+            "tools": [],
+            "usage": {
+                "input_tokens": 10,
+                "output_tokens": 10,
+                "total_tokens": 20,
+                "input_tokens_details": {"cached_tokens": 0, "cache_write_tokens": 0},
+                "output_tokens_details": {"reasoning_tokens": 0},
+            },
+        }
+
+
+@pytest.fixture
+async def stub_server():
+    server = StubResponsesServer(array_length=8)
+    await server.start()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+def isolated_default_client(monkeypatch):
+    """テストで登録した共有クライアントを、テスト後に元に戻す."""
+    from agents.models import _openai_shared
+
+    monkeypatch.setattr(_openai_shared, "_default_openai_client", None)
+    monkeypatch.setattr(openai_client, "_installed_metrics", None)
+    monkeypatch.setattr(openai_client, "_installed_client", None)
+
+
+class TestSettings:
+    """OpenAIClientSettings のテスト."""
+
+    def test_invalid_pool_size_is_rejected(self):
+        """接続数の上限は1以上."""
+        with pytest.raises(ValueError):
+            OpenAIClientSettings(max_connections=0)
+
+
+class TestSharedClient:
+    """共有クライアントを使ったワークフロー実行のテスト."""
+
+    def test_configured_once(self, isolated_default_client):
+        """2回目以降の登録は既存のクライアントをそのまま使う."""
+        first = configure_openai_client(api_key="test")
+        assert configure_openai_client(api_key="test") is first
+        assert pool_metrics() is first
+        client = shared_openai_client()
+        assert client is not None
+        assert configure_openai_client(api_key="test", replace=True) is not first
+        assert shared_openai_client() is not client
+
+    async def test_connections_are_reused_across_interviews(
+        self, stub_server, isolated_default_client
+    ):
+        """並行するヒアリングとフェーズをまたいで、上限内の接続が使い回される."""
+        metrics = configure_openai_client(
+            OpenAIClientSettings(max_connections=4, max_retries=0),
+            base_url=stub_server.base_url,
+            api_key="test",
+        )
+
+        result = await run_multi_persona_hearing_workflow(
+            "テーマ",
+            verbose=False,
+            max_concurrency=4,
+            run_config=RunConfig(tracing_disabled=True),
+        )
+
+        assert len(result.interviews) == 8
+        assert metrics.requests == stub_server.requests
+        assert metrics.connections_opened == stub_server.connections
+        assert stub_server.connections <= 4
+        assert metrics.reused_requests >= stub_server.requests - 4
+        assert metrics.peak_in_flight >= 2
+        assert metrics.in_flight == 0
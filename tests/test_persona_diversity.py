@@ -0,0 +1,176 @@
+"""ペルソナの多様性の分析のテスト."""
+import random
+import sys
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from analysis import PersonaDiversity, PersonaDiversityTooLow, analyze_persona_diversity
+from analysis.persona_diversity import OCCUPATION_FAMILIES
+from main import format_persona_similarity_csv, format_run_report_markdown, main
+from models.schemas import InterviewResponse, PersonaOutput, PersonasOutput
+from workflows import run_multi_persona_hearing_workflow
+
+
+def make_persona(name, age, occupation, pain_points, background="都内で働いている") -> PersonaOutput:
+    return PersonaOutput(
+        name=name, age=age, occupation=occupation, background=background,
+        needs=["手軽に使いたい"], behaviors=["毎日スマホを使う"], pain_points=list(pain_points),
+    )
+
+
+@pytest.fixture
+def clustered():
+    """年齢・職業・不満が似通ったペルソナ."""
+    return [
+        make_persona(f"エンジニア{i}", 30 + i, "ソフトウェアエンジニア", ["時間がない"]) for i in range(5)
+    ]
+
+
+@pytest.fixture
+def diverse():
+    return [
+        make_persona("学生", 19, "大学生", ["費用が高い"], "地方から上京した"),
+        make_persona("看護師", 28, "看護師", ["夜勤で疲れている"], "病院で交代勤務をしている"),
+        make_persona("店長", 41, "飲食店の店長", ["スタッフとの連絡が面倒"], "郊外で店舗を運営している"),
+        make_persona("主婦", 53, "専業主婦", ["操作が複雑"], "子どもが独立した"),
+        make_persona("退職者", 68, "定年退職", ["個人情報が不安"], "地域の活動に参加している"),
+    ]
+
+
+class TestPersonaDiversity:
+    """PersonaDiversity のテスト."""
+
+    def test_diverse_personas_score_higher(self, clustered, diverse):
+        """年齢・職業・不満が分散したペルソナほど網羅率と多様性スコアが高い."""
+        low = analyze_persona_diversity(clustered)
+        high = analyze_persona_diversity(diverse)
+
+        assert high.score > low.score
+        assert high.mean_similarity < low.mean_similarity
+        assert high.coverage == {"age": 1.0, "occupation": 1.0, "pain_points": 1.0}
+        assert low.coverage["occupation"] == pytest.approx(0.2)
+        assert low.distribution["age"]["30代"] == 5
+        assert low.distribution["occupation"]["IT・技術"] == 5
+
+    def test_occupation_keywords_match_whole_words(self):
+        """「IT」は単語の一部（Editor・Recruiter）には一致せず、研究職はIT・技術に分類しない."""
+        personas = [
+            make_persona(name, 30, occupation, ["時間がない"])
+            for name, occupation in (
+                ("a", "Recruiter"),
+                ("b", "Web Editor"),
+                ("c", "ＩＴ企業の社員"),
+                ("d", "IT consultant"),
+                ("e", "研究員"),
+            )
+        ]
+        diversity = PersonaDiversity(personas)
+        families = list(OCCUPATION_FAMILIES)
+
+        assert [families[i] if i >= 0 else None for i in diversity.occupation_families] == [
+            None, None, "IT・技術", "IT・技術", "専門職・公務員",
+        ]
+
+    def test_mean_similarity_matches_matrix(self, clustered, diverse):
+        """行列を作らずに求めた平均類似度は、行列の対角線より右上の平均と一致する."""
+        diversity = PersonaDiversity(clustered + diverse)
+        matrix = diversity.similarity_matrix()
+
+        assert matrix.shape == (10, 10)
+        assert np.allclose(matrix, matrix.T, atol=1e-5)
+        assert np.allclose(np.diag(matrix), 1.0, atol=1e-5)
+        upper = matrix[np.triu_indices(10, k=1)]
+        assert diversity.mean_similarity() == pytest.approx(float(upper.mean()), abs=1e-5)
+
+    def test_most_similar_pairs(self, clustered, diverse):
+        """同じプロフィールのペルソナの組を類似度の高い順に返す."""
+        twins = [
+            make_persona(f"双子{i}", 35, "グラフィックデザイナー", ["締め切りが重なる"], "制作会社に勤めている")
+            for i in range(2)
+        ]
+
+        report = analyze_persona_diversity(diverse + twins)
+
+        assert {report.most_similar_pairs[0].first, report.most_similar_pairs[0].second} == {"双子0", "双子1"}
+        assert report.most_similar_pairs[0].similarity == pytest.approx(1.0, abs=1e-4)
+        assert report.near_duplicate_pairs == 1
+
+    def test_fast_for_thousands_of_personas(self):
+        """数千名のペルソナでも分析は1秒未満で終わる."""
+        rng = random.Random(0)
+        occupations = ["看護師", "エンジニア", "大学生", "営業", "会社員", "デザイナー", "農家", "教師"]
+        pains = ["時間がない", "費用が高い", "操作が複雑", "家族と共有できない", "不安", "続かない"]
+        personas = [
+            make_persona(
+                f"ペルソナ{i}", rng.randint(18, 80), rng.choice(occupations), rng.sample(pains, 2),
+                "背景" * rng.randint(5, 30) + str(i),
+            )
+            for i in range(3000)
+        ]
+
+        started = time.perf_counter()
+        report = analyze_persona_diversity(personas)
+        elapsed = time.perf_counter() - started
+
+        assert report.personas == 3000
+        assert elapsed < 1.0
+
+    def test_similarity_csv(self, diverse):
+        csv = format_persona_similarity_csv(PersonasOutput(personas=diverse, generation_rationale="根拠"))
+        lines = csv.splitlines()
+        assert lines[0] == ",学生,看護師,店長,主婦,退職者"
+        assert lines[1].startswith("学生,1.000,")
+
+
+class TestDiversityGate:
+    """ヒアリング前の多様性の確認のテスト."""
+
+    @pytest.fixture
+    def interview_runner(self, fake_runner):
+        fake_runner.outputs["Interviewer"] = lambda prompt: InterviewResponse(
+            persona_name="", answers=["回答"], key_insights=["洞察"],
+        )
+        return fake_runner
+
+    async def test_report_recorded(self, interview_runner, diverse):
+        """下限を指定しなくても多様性を実行レポートに記録する."""
+        interview_runner.outputs["PersonaGenerator"] = PersonasOutput(personas=diverse, generation_rationale="根拠")
+
+        result = await run_multi_persona_hearing_workflow("テーマ", num_personas=5, verbose=False)
+
+        assert result.run_report.persona_diversity.personas == 5
+        markdown = format_run_report_markdown(result.run_report)
+        assert "## ペルソナの多様性" in markdown
+        assert "| 年齢層 | 100% |" in markdown
+
+    async def test_gate_stops_before_questions(self, interview_runner, clustered):
+        """多様性スコアが下限を下回れば質問設計・ヒアリングを行わない."""
+        interview_runner.outputs["PersonaGenerator"] = PersonasOutput(personas=clustered, generation_rationale="根拠")
+
+        with pytest.raises(PersonaDiversityTooLow) as excinfo:
+            await run_multi_persona_hearing_workflow(
+                "テーマ", num_personas=5, verbose=False, min_persona_diversity=0.6,
+            )
+
+        assert excinfo.value.report.min_score == 0.6
+        assert interview_runner.calls_for("QuestionDesigner") == []
+        assert interview_runner.calls_for("Interviewer") == []
+
+    def test_cli_saves_personas_and_exits(self, interview_runner, clustered, tmp_path, monkeypatch, capsys):
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        interview_runner.outputs["PersonaGenerator"] = PersonasOutput(personas=clustered, generation_rationale="根拠")
+        argv = [
+            "main.py", "--theme", "テーマ", "--output-dir", str(tmp_path), "--quiet",
+            "--num-personas", "5", "--min-persona-diversity", "0.6",
+        ]
+
+        with patch.object(sys, "argv", argv), pytest.raises(SystemExit) as excinfo:
+            main()
+
+        assert excinfo.value.code == 1
+        assert "ペルソナの多様性スコア" in capsys.readouterr().err
+        assert (tmp_path / "personas.md").exists()
+        assert (tmp_path / "persona_similarity.csv").exists()
@@ -0,0 +1,161 @@
+"""ペルソナライブラリのテスト."""
+import random
+import time
+
+import pytest
+
+from analysis import NgramSearchIndex
+from main import format_run_report_markdown
+from models.schemas import InterviewResponse, PersonaOutput, PersonasOutput
+from storage import PersonaLibrary
+from workflows import PhaseStarted, run_multi_persona_hearing_workflow
+
+
+def make_persona(name: str, occupation: str = "会社員", needs=()) -> PersonaOutput:
+    return PersonaOutput(
+        name=name, age=35, occupation=occupation, background=f"{occupation}として働いている",
+        needs=list(needs), behaviors=[], pain_points=[],
+    )
+
+
+def generated(count: int, prefix: str = "新規") -> PersonasOutput:
+    return PersonasOutput(
+        personas=[make_persona(f"{prefix}{i}") for i in range(count)],
+        generation_rationale="生成の根拠",
+    )
+
+
+@pytest.fixture
+def library(tmp_path):
+    with PersonaLibrary(tmp_path / "personas.db") as library:
+        library.add("共働き世帯の家事分担アプリ", [
+            make_persona("佐藤", "看護師", ["家事の負担を減らしたい"]),
+            make_persona("鈴木", "エンジニア", ["家族の予定を共有したい"]),
+        ])
+        library.add("中小企業の経理業務の効率化", [
+            make_persona("高橋", "経理担当", ["請求書処理を減らしたい"]),
+        ])
+        yield library
+
+
+class TestNgramSearchIndex:
+    """NgramSearchIndex のテスト."""
+
+    def test_search_ranks_similar_texts_first(self):
+        """共通するn-gramが多いテキストほど上位になり、共通しないテキストは返さない."""
+        index = NgramSearchIndex()
+        for text in ("家事分担アプリ", "経理業務の効率化", "家事代行サービス"):
+            index.add(text)
+
+        results = index.search("共働き世帯の家事分担", limit=5)
+
+        assert [doc_id for doc_id, _ in results] == [0, 2]
+        assert 0 < results[0][1] <= 1
+        assert index.search("", limit=5) == []
+
+
+class TestPersonaLibrary:
+    """PersonaLibrary のテスト."""
+
+    def test_search_prefers_similar_theme(self, library):
+        """類似するテーマのペルソナを類似度の高い順に返し、似ていないテーマのペルソナは返さない."""
+        matches = library.search("子育て世帯の家事分担", limit=5)
+
+        assert {match.persona.name for match in matches} == {"佐藤", "鈴木"}
+        assert all(match.theme == "共働き世帯の家事分担アプリ" for match in matches)
+        assert matches[0].similarity >= matches[-1].similarity >= library.min_similarity
+        assert library.search("子育て世帯の家事分担", limit=1, exclude_names=["佐藤", "鈴木"]) == []
+
+    def test_persona_content_breaks_ties(self, library):
+        """同じテーマのペルソナは、テーマとペルソナの内容の類似度で並べる."""
+        matches = library.search("家事分担アプリと家族の予定の共有", limit=2)
+        assert matches[0].persona.name == "鈴木"
+
+    def test_persistent_across_reopen(self, library):
+        """追加したペルソナは開き直しても検索できる."""
+        library.close()
+        with PersonaLibrary(library.path) as reopened:
+            assert len(reopened) == 3
+            reopened.add("家事分担アプリの改善", [make_persona("田中")])
+            names = [match.persona.name for match in reopened.search("家事分担アプリ", limit=10)]
+        assert "田中" in names and "高橋" not in names
+
+    def test_invalid_options(self, tmp_path):
+        with pytest.raises(ValueError):
+            PersonaLibrary(tmp_path / "p.db", min_similarity=1.5)
+
+    def test_search_scales_to_large_library(self, tmp_path):
+        """数万名のペルソナを蓄積していても検索は短時間で終わる."""
+        rng = random.Random(0)
+        words = ["家事", "育児", "経理", "物流", "教育", "医療", "小売", "旅行", "金融", "農業",
+                 "アプリ", "サービス", "効率化", "改善", "支援", "管理", "共有", "予約", "通販", "相談"]
+        with PersonaLibrary(tmp_path / "large.db") as library:
+            for i in range(2000):
+                theme = "の".join(rng.sample(words, 3))
+                library.add(theme, [
+                    make_persona(f"ペルソナ{i}-{j}", rng.choice(words), rng.sample(words, 2))
+                    for j in range(10)
+                ])
+            library.search("家事の共有", limit=1)  # 索引の作成
+
+            started = time.perf_counter()
+            matches = library.search("家事の支援アプリ", limit=15)
+            elapsed = time.perf_counter() - started
+
+        assert len(matches) == 15
+        assert elapsed < 1.0
+
+
+class TestWorkflowReuse:
+    """ワークフローでのペルソナの再利用のテスト."""
+
+    @pytest.fixture
+    def interview_runner(self, fake_runner):
+        fake_runner.outputs["Interviewer"] = lambda prompt: InterviewResponse(
+            persona_name="", answers=["回答"], key_insights=["洞察"],
+        )
+        return fake_runner
+
+    async def test_generates_only_the_shortfall(self, interview_runner, library):
+        """再利用したペルソナの分を除いた数だけ生成し、生成したペルソナをライブラリに追加する."""
+        interview_runner.outputs["PersonaGenerator"] = generated(2)
+        events = []
+
+        result = await run_multi_persona_hearing_workflow(
+            "子育て世帯の家事分担", num_personas=4, verbose=False,
+            persona_library=library, on_event=events.append,
+        )
+
+        names = [persona.name for persona in result.personas_output.personas]
+        assert names[2:] == ["新規0", "新規1"]
+        assert set(names[:2]) == {"佐藤", "鈴木"}
+        prompt = interview_runner.calls_for("PersonaGenerator")[0]
+        assert "2体の多様なペルソナ" in prompt
+        assert "佐藤（35歳、看護師）" in prompt
+        assert result.run_report.personas_reused == 2
+        assert "ライブラリから再利用**: 2名" in format_run_report_markdown(result.run_report)
+        started = next(e for e in events if isinstance(e, PhaseStarted))
+        assert started.detail == "ライブラリから2名を再利用、2名を生成"
+        assert len(library) == 5
+
+    async def test_no_generation_when_library_is_enough(self, interview_runner, library):
+        """必要な数のペルソナが見つかればペルソナ生成を呼び出さない."""
+        result = await run_multi_persona_hearing_workflow(
+            "共働き世帯の家事分担アプリ", num_personas=2, verbose=False, persona_library=library,
+        )
+
+        assert interview_runner.calls_for("PersonaGenerator") == []
+        assert len(result.personas_output.personas) == 2
+        assert len(result.interviews) == 2
+        assert len(library) == 3
+
+    async def test_duplicate_generated_names_are_renamed(self, interview_runner, library):
+        """生成したペルソナの名前が再利用したペルソナと重なる場合は区別できる名前にする."""
+        interview_runner.outputs["PersonaGenerator"] = generated(1, prefix="佐藤")
+        interview_runner.outputs["PersonaGenerator"].personas[0].name = "佐藤"
+
+        result = await run_multi_persona_hearing_workflow(
+            "子育て世帯の家事分担", num_personas=3, verbose=False, persona_library=library,
+        )
+
+        assert result.personas_output.personas[-1].name == "佐藤（2）"
@@ -0,0 +1,68 @@
+"""質問セット評価の事前計算のテスト."""
+import pytest
+
+from analysis import compare_question_sets, map_question_topics, question_set_metrics
+from models.schemas import InterviewQuestion
+
+
+def q(question: str, intent: str = "") -> InterviewQuestion:
+    return InterviewQuestion(question=question, intent=intent)
+
+
+INITIAL = [
+    q("普段どのように家事を分担していますか？", "家事分担の現状を知る"),
+    q("家計簿をつけていますか？", "家計管理の習慣を知る"),
+    q("子どもの送迎はどなたが担当していますか？", "送迎の分担を知る"),
+    q("休日の過ごし方を教えてください", "生活リズムを知る"),
+]
+VALIDATION = [
+    q("直近1週間で家事の分担について話し合った場面を具体的に教えてください", "家事分担の話し合いの頻度を検証する"),
+    q("送迎の担当を決めるとき、何回くらい調整が必要でしたか？", "送迎の分担の調整コストを検証する"),
+    q("家事の記録アプリを使ったことがありますか？", "記録アプリの利用経験を検証する"),
+]
+
+
+class TestQuestionSetMetrics:
+    """question_set_metrics のテスト."""
+
+    def test_lexical_metrics(self):
+        metrics = question_set_metrics(VALIDATION)
+
+        assert metrics.question_count == 3
+        assert metrics.average_length == round(sum(len(x.question) for x in VALIDATION) / 3, 1)
+        assert metrics.specific_ratio == pytest.approx(0.667)
+        assert metrics.open_ended_ratio == pytest.approx(0.667)
+
+    def test_empty(self):
+        metrics = question_set_metrics([])
+        assert (metrics.question_count, metrics.average_length, metrics.specific_ratio) == (0, 0.0, 0.0)
+
+
+class TestCompareQuestionSets:
+    """compare_question_sets のテスト."""
+
+    def test_counts_and_change_percent(self):
+        facts = compare_question_sets("家事分担", INITIAL, VALIDATION)
+
+        assert facts.comparison.theme == "家事分担"
+        assert facts.comparison.question_count_initial == 4
+        assert facts.comparison.question_count_validation == 3
+        assert facts.comparison.count_change_percent == -25.0
+        assert compare_question_sets("t", [], VALIDATION).comparison.count_change_percent == 0.0
+
+    def test_topic_mapping(self):
+        """似た質問同士をトピックにまとめ、対応のない検証質問は新しいトピックにする."""
+        facts = compare_question_sets("家事分担", INITIAL, VALIDATION)
+
+        assert [(t.initial_questions, t.validation_questions) for t in facts.topics] == [
+            ([1], [1]), ([3], [2]), ([], [3]),
+        ]
+        assert facts.topics[2].is_new
+        assert facts.topics[0].similarity >= 0.2
+        assert facts.unmatched_initial == [2, 4]
+
+    def test_every_validation_question_is_mapped_once(self):
+        topics = map_question_topics(INITIAL, VALIDATION + VALIDATION)
+        numbers = sorted(n for topic in topics for n in topic.validation_questions)
+        assert numbers == list(range(1, 7))
+        assert map_question_topics(INITIAL, []) == []
@@ -0,0 +1,241 @@
+"""アーティファクト保存と render サブコマンドのテスト."""
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from main import main, save_results, format_personas_markdown
+from storage import (
+    save_artifacts,
+    load_artifacts,
+    renderer_fingerprint,
+    render_digest,
+    load_render_manifest,
+)
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def saved_run_dir(
+    tmp_path,
+    sample_personas_output,
+    sample_questions_output,
+    sample_interview_response,
+    sample_hypotheses_list,
+    sample_validation_questions,
+) -> Path:
+    """構造化アーティファクトを保存済みの実行ディレクトリ."""
+    run_dir = tmp_path / "run"
+    save_artifacts(
+        run_dir,
+        sample_personas_output,
+        sample_questions_output,
+        [sample_interview_response],
+        sample_hypotheses_list,
+        sample_validation_questions,
+    )
+    return run_dir
+
+
+class TestArtifacts:
+    """構造化アーティファクトの保存・読み込みのテスト."""
+
+    def test_round_trip(self, saved_run_dir, sample_personas_output, sample_interview_response):
+        """保存したアーティファクトを同じ内容で読み込める."""
+        artifacts = load_artifacts(saved_run_dir)
+
+        assert artifacts.personas_output == sample_personas_output
+        assert artifacts.interviews == [sample_interview_response]
+        assert artifacts.evaluation_report is None
+
+    def test_load_missing_directory_raises(self, tmp_path):
+        """アーティファクトがない場合は FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_artifacts(tmp_path / "missing")
+
+
+class TestRenderDigest:
+    """再生成判定用ダイジェストのテスト."""
+
+    def test_fingerprint_is_stable(self):
+        """同じレンダラーからは同じフィンガープリントが得られる."""
+        assert renderer_fingerprint(format_personas_markdown) == renderer_fingerprint(
+            format_personas_markdown
+        )
+
+    def test_fingerprint_changes_with_implementation(self):
+        """実装が異なればフィンガープリントも異なる."""
+        def renderer_a(data):
+            return f"# A {data}"
+
+        def renderer_b(data):
+            return f"# B {data}"
+
+        assert renderer_fingerprint(renderer_a) != renderer_fingerprint(renderer_b)
+
+    def test_fingerprint_covers_renderer_sources(self):
+        """レンダラーのモジュール（main.py）と分析処理のモジュールがフィンガープリントの対象になる."""
+        from main import format_insight_clusters_markdown
+        from storage.artifacts import _renderer_source_files
+
+        names = {path.name for path in _renderer_source_files(format_insight_clusters_markdown)}
+
+        assert {"main.py", "insight_clustering.py", "vectorize.py"} <= names
+
+    def test_fingerprint_changes_with_helper_source(self, tmp_path, monkeypatch):
+        """分析処理のモジュールのソースを変更するとフィンガープリントも変わる."""
+        helper = tmp_path / "helper.py"
+        helper.write_text("def lines():\n    return ['a']\n", encoding="utf-8")
+        monkeypatch.setattr("storage.artifacts.RENDERER_SOURCE_DIRS", (tmp_path,))
+        before = renderer_fingerprint(format_personas_markdown)
+
+        helper.write_text("def lines():\n    return ['b']\n", encoding="utf-8")
+
+        assert renderer_fingerprint(format_personas_markdown) != before
+
+    def test_digest_changes_with_inputs(self, sample_personas_output):
+        """入力データが変わるとダイジェストも変わる."""
+        changed = sample_personas_output.model_copy(update={"generation_rationale": "変更"})
+
+        assert render_digest(format_personas_markdown, (sample_personas_output,)) != render_digest(
+            format_personas_markdown, (changed,)
+        )
+
+
+class TestSaveResultsSkipUnchanged:
+    """save_results の差分書き込みのテスト."""
+
+    def test_unchanged_files_are_skipped(self, saved_run_dir, capsys):
+        """入力とレンダラーが同じなら2回目は書き込まない."""
+        artifacts = load_artifacts(saved_run_dir)
+        args = (
+            artifacts.personas_output,
+            artifacts.questions_output,
+            artifacts.interviews,
+            artifacts.hypotheses,
+            artifacts.validation_questions,
+        )
+        save_results(saved_run_dir, *args, skip_unchanged=True)
+        personas_path = saved_run_dir / "personas.md"
+        first_mtime = personas_path.stat().st_mtime_ns
+        capsys.readouterr()
+
+        save_results(saved_run_dir, *args, skip_unchanged=True)
+
+        assert personas_path.stat().st_mtime_ns == first_mtime
+        assert "変更なし" in capsys.readouterr().out
+        assert "personas.md" in load_render_manifest(saved_run_dir)
+
+    def test_helper_change_is_regenerated(self, saved_run_dir, tmp_path, monkeypatch, capsys):
+        """レンダラーが使う分析処理のモジュールを変更すると、ファイルを再生成する."""
+        helper = tmp_path / "helpers" / "clustering.py"
+        helper.parent.mkdir()
+        helper.write_text("THRESHOLD = 0.5\n", encoding="utf-8")
+        monkeypatch.setattr("storage.artifacts.RENDERER_SOURCE_DIRS", (helper.parent,))
+        artifacts = load_artifacts(saved_run_dir)
+        args = (
+            artifacts.personas_output,
+            artifacts.questions_output,
+            artifacts.interviews,
+            artifacts.hypotheses,
+            artifacts.validation_questions,
+        )
+        save_results(saved_run_dir, *args, skip_unchanged=True)
+        capsys.readouterr()
+
+        helper.write_text("THRESHOLD = 0.7\n", encoding="utf-8")
+        save_results(saved_run_dir, *args, skip_unchanged=True)
+
+        out = capsys.readouterr().out
+        assert "変更なし" not in out
+        assert "insight_clusters.md" in out
+
+    def test_plain_save_skips_digests(self, saved_run_dir, monkeypatch):
+        """差分書き込みでない保存はダイジェストを求めず、書き直したファイルの以前の記録を消す."""
+        artifacts = load_artifacts(saved_run_dir)
+        args = (
+            artifacts.personas_output,
+            artifacts.questions_output,
+            artifacts.interviews,
+            artifacts.hypotheses,
+            artifacts.validation_questions,
+        )
+        save_results(saved_run_dir, *args, skip_unchanged=True)
+        assert "personas.md" in load_render_manifest(saved_run_dir)
+
+        def fail(renderer, inputs):
+            raise AssertionError("ダイジェストを求めた")
+
+        monkeypatch.setattr("storage.render_digest", fail)
+        save_results(saved_run_dir, *args)
+
+        assert load_render_manifest(saved_run_dir) == {}
+
+    def test_deleted_file_is_regenerated(self, saved_run_dir):
+        """マニフェストが一致してもファイルがなければ再生成する."""
+        artifacts = load_artifacts(saved_run_dir)
+        args = (
+            artifacts.personas_output,
+            artifacts.questions_output,
+            artifacts.interviews,
+            artifacts.hypotheses,
+            artifacts.validation_questions,
+        )
+        save_results(saved_run_dir, *args, skip_unchanged=True)
+        (saved_run_dir / "hypotheses.md").unlink()
+
+        save_results(saved_run_dir, *args, skip_unchanged=True)
+
+        assert (saved_run_dir / "hypotheses.md").exists()
+
+
+class TestRenderSubcommand:
+    """render サブコマンドのテスト."""
+
+    def test_render_creates_markdown(self, saved_run_dir, monkeypatch):
+        """render で全Markdownファイルが生成される."""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        with patch.object(sys, "argv", ["main.py", "render", str(saved_run_dir)]):
+            main()
+
+        for filename in [
+            "personas.md",
+            "initial_questions.md",
+            "interview_results.md",
+            "hypotheses.md",
+            "validation_questions.md",
+        ]:
+            assert (saved_run_dir / filename).exists()
+
+    def test_render_missing_run_dir_exits(self, tmp_path):
+        """アーティファクトがないディレクトリではエラー終了."""
+        with patch.object(sys, "argv", ["main.py", "render", str(tmp_path)]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+        assert exc_info.value.code == 1
+
+    def test_render_does_not_import_agents_sdk(self, saved_run_dir):
+        """render はエージェントSDKを読み込まずに完了する."""
+        script = (
+            "import sys; sys.argv = ['main.py', 'render', sys.argv[1]]; "
+            "import main; main.main(); "
+            "assert 'agents' not in sys.modules, 'agents SDK was imported'"
+        )
+        env = {"PATH": "", "PYTHONPATH": str(PROJECT_ROOT)}
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-c", script, str(saved_run_dir)],
+            cwd=PROJECT_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        elapsed = time.perf_counter() - started
+
+        assert completed.returncode == 0, completed.stderr
+        assert elapsed < 5.0
@@ -0,0 +1,143 @@
+"""過去の実行の索引（ほぼ同じテーマの再実行の検出）のテスト."""
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from main import main
+from storage import RunIndex, load_artifacts, save_artifacts, theme_fingerprint
+
+
+THEME = "共働き世帯向けの家事分担アプリの新しいアイデアを検討したい"
+
+
+def make_run_dir(path: Path) -> Path:
+    """アーティファクトがあるだけの実行ディレクトリ."""
+    (path / "artifacts").mkdir(parents=True)
+    return path
+
+
+@pytest.fixture
+def run_index(tmp_path):
+    with RunIndex(tmp_path / "runs.db") as index:
+        yield index
+
+
+class TestRunIndex:
+    """RunIndex のテスト."""
+
+    def test_fingerprint_ignores_trivial_differences(self):
+        """全角・半角や空白・記号の違いだけのテーマは同じフィンガープリントになる."""
+        assert theme_fingerprint("AIで 家計簿を自動化！") == theme_fingerprint("ａｉで家計簿を自動化")
+        assert theme_fingerprint("AIで家計簿を自動化") != theme_fingerprint("AIで日記を自動化")
+
+    def test_find_near_duplicates(self, run_index, tmp_path):
+        """類似度がしきい値以上の実行だけを類似度の高い順に返す."""
+        run_index.record(THEME, make_run_dir(tmp_path / "a"))
+        run_index.record("中小企業の経理業務を効率化するSaaS", make_run_dir(tmp_path / "b"))
+
+        identical = run_index.find_similar("共働き世帯向けの 家事分担アプリの新しいアイデアを検討したい。")
+        assert [run.output_dir for run in identical] == [(tmp_path / "a").resolve()]
+        assert identical[0].identical
+
+        edited = run_index.find_similar("共働き世帯向けの家事分担アプリの新しいアイデアを検討したいです")
+        assert len(edited) == 1
+        assert run_index.threshold <= edited[0].similarity < 1.0
+        assert run_index.find_similar("高齢者向けの見守りサービス") == []
+
+    def test_removed_and_replaced_runs(self, run_index, tmp_path):
+        """結果が削除された実行は返さず、同じ出力ディレクトリの記録は置き換える."""
+        run_dir = make_run_dir(tmp_path / "a")
+        run_index.record(THEME, run_dir)
+        run_index.find_similar(THEME)  # 索引の作成
+        run_index.record("高齢者向けの見守りサービス", run_dir)
+
+        assert len(run_index) == 1
+        assert run_index.find_similar(THEME) == []
+        assert len(run_index.find_similar("高齢者向けの見守りサービス")) == 1
+
+        (run_dir / "artifacts").rmdir()
+        assert run_index.find_similar("高齢者向けの見守りサービス") == []
+
+    def test_fast_lookup_over_thousands_of_runs(self, tmp_path):
+        """数千件の実行を記録していても検索は短時間で終わる."""
+        run_dir = make_run_dir(tmp_path / "run")
+        with RunIndex(tmp_path / "many.db") as index:
+            for i in range(3000):
+                index.record(f"テーマ{i}: 業界{i % 37}向けの業務{i % 11}の効率化", tmp_path / f"r{i}")
+            index.record(THEME, run_dir)
+            index.find_similar("索引の作成")
+
+            started = time.perf_counter()
+            runs = index.find_similar(THEME + "。")
+            elapsed = time.perf_counter() - started
+
+        assert [run.output_dir for run in runs] == [run_dir.resolve()]
+        assert elapsed < 0.5
+
+    def test_invalid_threshold(self, tmp_path):
+        with pytest.raises(ValueError):
+            RunIndex(tmp_path / "runs.db", threshold=0)
+
+
+class TestDuplicateRunCLI:
+    """--run-index を指定した実行のテスト."""
+
+    @pytest.fixture
+    def prior_run(self, tmp_path, sample_personas_output, sample_questions_output,
+                  sample_interview_response, sample_hypotheses_list, sample_validation_questions):
+        run_dir = tmp_path / "prior"
+        save_artifacts(
+            run_dir,
+            sample_personas_output,
+            sample_questions_output,
+            [sample_interview_response],
+            sample_hypotheses_list,
+            sample_validation_questions,
+        )
+        with RunIndex(tmp_path / "runs.db") as index:
+            index.record(THEME, run_dir)
+        return run_dir
+
+    def run_main(self, tmp_path, theme, *options):
+        argv = [
+            "main.py", "--theme", theme, "--output-dir", str(tmp_path / "new"),
+            "--run-index", str(tmp_path / "runs.db"), "--quiet", *options,
+        ]
+        with patch.object(sys, "argv", argv):
+            main()
+
+    def test_reuse_copies_prior_results(self, tmp_path, prior_run, fake_runner, monkeypatch, capsys):
+        """reuse ではエージェントを呼び出さずに以前の結果を出力ディレクトリに写す."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+        self.run_main(tmp_path, THEME + "。", "--on-duplicate", "reuse")
+
+        assert fake_runner.calls == []
+        assert "ほぼ同じテーマの以前の実行があります" in capsys.readouterr().out
+        assert (tmp_path / "new" / "hypotheses.md").exists()
+        assert load_artifacts(tmp_path / "new").hypotheses == load_artifacts(prior_run).hypotheses
+        with RunIndex(tmp_path / "runs.db") as index:
+            assert len(index) == 2
+
+    def test_fork_reuses_personas_and_questions(self, tmp_path, prior_run, fake_runner, monkeypatch):
+        """fork では以前のペルソナと初回質問を使い、ヒアリング以降を新しく実行する."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+        self.run_main(tmp_path, THEME + "です", "--on-duplicate", "fork")
+
+        assert fake_runner.calls_for("PersonaGenerator") == []
+        assert fake_runner.calls_for("QuestionDesigner") == []
+        assert len(fake_runner.calls_for("Interviewer")) == 1
+        forked = load_artifacts(tmp_path / "new")
+        assert forked.personas_output == load_artifacts(prior_run).personas_output
+
+    def test_non_interactive_ask_runs_new(self, monkeypatch):
+        """端末から実行していない場合の ask は新しく実行する."""
+        from main import choose_duplicate_action
+
+        monkeypatch.setattr(sys.stdin, "isatty", lambda: False)
+        assert choose_duplicate_action(None, "ask") == "new"
+        assert choose_duplicate_action(None, "fork") == "fork"
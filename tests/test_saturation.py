@@ -0,0 +1,130 @@
+"""飽和判定によるヒアリング打ち切りのテスト."""
+import pytest
+
+from analysis import NgramIndex, SaturationTracker, char_ngrams, cosine_similarity
+from models.schemas import InterviewResponse, PersonasOutput
+from workflows import run_multi_persona_hearing_workflow
+
+
+def make_interview(name: str, insights) -> InterviewResponse:
+    return InterviewResponse(persona_name=name, answers=["回答"], key_insights=list(insights))
+
+
+class TestTextSimilarity:
+    """文字n-gram類似度のテスト."""
+
+    def test_identical_texts_have_similarity_one(self):
+        """同一テキストの類似度は1."""
+        vector = char_ngrams("ツール切り替えの手間が大きい")
+        assert cosine_similarity(vector, vector) == pytest.approx(1.0)
+
+    def test_normalization_ignores_width_and_punctuation(self):
+        """全角・半角や記号の違いは無視される."""
+        a = char_ngrams("ＡＰＩ連携が重要！")
+        b = char_ngrams("API連携が重要")
+        assert cosine_similarity(a, b) == pytest.approx(1.0)
+
+    def test_unrelated_texts_have_low_similarity(self):
+        """無関係なテキストの類似度は低い."""
+        a = char_ngrams("価格が高すぎて導入できない")
+        b = char_ngrams("チームの雰囲気を大切にしている")
+        assert cosine_similarity(a, b) < 0.2
+
+    def test_index_max_similarity(self):
+        """索引から最も近い既出テキストとの類似度を求められる."""
+        index = NgramIndex()
+        assert index.max_similarity("なんでも") == 0.0
+
+        index.extend(["価格が高すぎて導入できない", "サポート体制に不安がある"])
+
+        assert index.max_similarity("価格が高すぎて導入できない") == pytest.approx(1.0)
+        assert index.max_similarity("全く別の話題について") < 0.2
+
+
+class TestSaturationTracker:
+    """SaturationTracker のテスト."""
+
+    def test_first_interview_is_fully_novel(self):
+        """最初のヒアリングの新規性は1."""
+        tracker = SaturationTracker(threshold=0.3, patience=2)
+        assert tracker.observe(make_interview("A", ["価格が高い"])) == pytest.approx(1.0)
+
+    def test_repeated_insights_reach_saturation(self):
+        """同じ洞察が続くと patience 件目で飽和する."""
+        tracker = SaturationTracker(threshold=0.3, patience=2)
+        tracker.observe(make_interview("A", ["価格が高い", "サポートが弱い"]))
+        tracker.observe(make_interview("B", ["価格が高い"]))
+        assert not tracker.saturated
+
+        tracker.observe(make_interview("C", ["サポートが弱い"]))
+
+        assert tracker.saturated
+        assert tracker.saturated_at == 3
+        assert len(tracker.curve) == 3
+
+    def test_novel_interview_resets_streak(self):
+        """新規性の高いヒアリングで連続カウントがリセットされる."""
+        tracker = SaturationTracker(threshold=0.3, patience=2)
+        tracker.observe(make_interview("A", ["価格が高い"]))
+        tracker.observe(make_interview("B", ["価格が高い"]))
+        tracker.observe(make_interview("C", ["オンボーディング資料が英語しかない"]))
+        tracker.observe(make_interview("D", ["価格が高い"]))
+
+        assert not tracker.saturated
+
+    def test_interview_without_insights_has_zero_novelty(self):
+        """洞察のないヒアリングの新規性は0."""
+        tracker = SaturationTracker(threshold=0.3)
+        assert tracker.observe(make_interview("A", [])) == 0.0
+
+    @pytest.mark.parametrize("threshold,patience", [(-0.1, 3), (1.5, 3), (0.5, 0)])
+    def test_invalid_parameters(self, threshold, patience):
+        """不正なパラメータは ValueError."""
+        with pytest.raises(ValueError):
+            SaturationTracker(threshold=threshold, patience=patience)
+
+
+class TestWorkflowSaturation:
+    """ワークフローでの飽和による打ち切りのテスト."""
+
+    @pytest.fixture
+    def five_personas(self, sample_persona) -> PersonasOutput:
+        return PersonasOutput(
+            personas=[
+                sample_persona.model_copy(update={"name": f"ペルソナ{i}"})
+                for i in range(1, 6)
+            ],
+            generation_rationale="テスト",
+        )
+
+    async def test_stops_interviewing_after_saturation(self, fake_runner, five_personas):
+        """飽和後のペルソナはヒアリングせず未実施として記録する."""
+        fake_runner.outputs["PersonaGenerator"] = five_personas
+        fake_runner.outputs["Interviewer"] = make_interview("同じ人", ["価格が高い"])
+
+        result = await run_multi_persona_hearing_workflow(
+            theme="テーマ",
+            num_personas=5,
+            verbose=False,
+            saturation_threshold=0.3,
+            saturation_patience=2,
+            max_concurrency=1,
+        )
+
+        assert len(fake_runner.calls_for("Interviewer")) == 3
+        assert len(result.interviews) == 3
+        report = result.run_report
+        assert report.saturation_reached
+        assert report.interviews_completed == 3
+        assert [p.persona_name for p in report.not_interviewed] == ["ペルソナ4", "ペルソナ5"]
+        assert report.saturation_curve[0] == pytest.approx(1.0)
+
+    async def test_all_personas_interviewed_when_disabled(self, fake_runner, five_personas):
+        """しきい値を指定しなければ全員にヒアリングする."""
+        fake_runner.outputs["PersonaGenerator"] = five_personas
+
+        result = await run_multi_persona_hearing_workflow(theme="テーマ", verbose=False)
+
+        assert len(result.interviews) == 5
+        assert result.run_report.not_interviewed == []
+        assert result.run_report.saturation_curve == []
@@ -0,0 +1,152 @@
+"""サーバーモード（ジョブAPI）と偽モデルバックエンドのテスト."""
+import asyncio
+import json
+
+import pytest
+from agents import AgentOutputSchema, RunConfig
+
+from backends import FakeModelProvider, example_from_schema
+from models.schemas import HypothesisList, PersonasOutput
+from models.validation_schemas import ValidationInterviewResponse
+from service import (
+    JOB_CANCELLED,
+    JOB_QUEUED,
+    JOB_SUCCEEDED,
+    HearingHTTPServer,
+    JobManager,
+    parse_job_options,
+)
+
+
+async def http_request(port, method, path, payload=None):
+    """1回のHTTPリクエストを送り、(ステータス, 本文) を返す."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    return status, content.decode("utf-8")
+
+
+@pytest.fixture
+async def server():
+    """偽モデルで動くサーバー（空いているポートで待ち受け）."""
+    run_config = RunConfig(model_provider=FakeModelProvider(latency=0.01), tracing_disabled=True)
+    manager = JobManager(max_running_jobs=2, run_config=run_config)
+    server = HearingHTTPServer(manager, port=0)
+    await server.start()
+    yield server
+    await server.close()
+
+
+class TestFakeModel:
+    """偽モデルバックエンドのテスト."""
+
+    @pytest.mark.parametrize(
+        "output_type", [PersonasOutput, HypothesisList, ValidationInterviewResponse]
+    )
+    def test_examples_match_output_schema(self, output_type):
+        """スキーマから生成した値はそのまま出力型として検証を通る."""
+        schema = AgentOutputSchema(output_type).json_schema()
+        value = example_from_schema(schema, serial=7)
+        output_type.model_validate(value)
+
+    def test_serial_changes_content(self):
+        """通し番号ごとに異なる内容になる."""
+        schema = AgentOutputSchema(PersonasOutput).json_schema()
+        assert example_from_schema(schema, serial=1) != example_from_schema(schema, serial=2)
+
+
+class TestJobManager:
+    """JobManager のテスト."""
+
+    def test_options_are_validated(self):
+        """未知のオプションや型の合わない値は拒否する."""
+        assert parse_job_options({"num_personas": 3, "deadline": 60}) == {
+            "num_personas": 3, "deadline": 60.0,
+        }
+        with pytest.raises(ValueError):
+            parse_job_options({"unknown": 1})
+        with pytest.raises(ValueError):
+            parse_job_options({"num_personas": 2.5})
+
+    async def test_running_jobs_are_capped(self):
+        """同時実行数の上限を超えたジョブは queued のまま待つ."""
+        run_config = RunConfig(model_provider=FakeModelProvider(latency=0.05), tracing_disabled=True)
+        manager = JobManager(max_running_jobs=1, run_config=run_config)
+        first = manager.submit("テーマA", num_personas=2)
+        second = manager.submit("テーマB", num_personas=2)
+        await asyncio.sleep(0.02)
+
+        assert second.status == JOB_QUEUED
+        await manager.wait(first.job_id)
+        await manager.wait(second.job_id)
+        assert first.status == second.status == JOB_SUCCEEDED
+        assert first.finished_at <= second.started_at
+
+
+class TestHTTPServer:
+    """HTTP API のテスト."""
+
+    async def test_submit_status_and_result(self, server):
+        """ジョブを投入し、完了後に結果を取得できる."""
+        status, body = await http_request(
+            server.port, "POST", "/jobs", {"theme": "リモートワーク", "num_personas": 3}
+        )
+        assert status == 202
+        job_id = json.loads(body)["job_id"]
+
+        await server.manager.wait(job_id)
+        status, body = await http_request(server.port, "GET", f"/jobs/{job_id}")
+        assert status == 200
+        assert json.loads(body)["status"] == JOB_SUCCEEDED
+
+        status, body = await http_request(server.port, "GET", f"/jobs/{job_id}/result")
+        assert status == 200
+        result = json.loads(body)
+        assert len(result["interviews"]) == len(result["personas_output"]["personas"])
+        assert result["run_report"]["interviews_completed"] == len(result["interviews"])
+
+    async def test_events_are_streamed(self, server):
+        """進捗イベントが Server-Sent Events で届き、終了イベントで閉じる."""
+        _, body = await http_request(server.port, "POST", "/jobs", {"theme": "テーマ"})
+        job_id = json.loads(body)["job_id"]
+
+        status, stream = await asyncio.wait_for(
+            http_request(server.port, "GET", f"/jobs/{job_id}/events"), timeout=10
+        )
+        assert status == 200
+        names = [line[len("event: "):] for line in stream.splitlines() if line.startswith("event: ")]
+        assert names[0] == "WorkflowStarted"
+        assert "InterviewCompleted" in names
+        assert names[-2:] == ["WorkflowFinished", "end"]
+
+    async def test_cancel(self, server):
+        """実行中のジョブをキャンセルできる."""
+        _, body = await http_request(
+            server.port, "POST", "/jobs", {"theme": "テーマ", "num_personas": 50, "max_concurrency": 1}
+        )
+        job_id = json.loads(body)["job_id"]
+        await asyncio.sleep(0.05)
+
+        status, _ = await http_request(server.port, "POST", f"/jobs/{job_id}/cancel")
+        assert status == 202
+        job = await server.manager.wait(job_id)
+        assert job.status == JOB_CANCELLED
+
+        status, _ = await http_request(server.port, "GET", f"/jobs/{job_id}/result")
+        assert status == 409
+
+    async def test_errors(self, server):
+        """不正なリクエストや存在しないジョブはエラーになる."""
+        assert (await http_request(server.port, "POST", "/jobs", {"num_personas": 3}))[0] == 400
+        assert (await http_request(server.port, "POST", "/jobs", {"theme": "x", "foo": 1}))[0] == 400
+        assert (await http_request(server.port, "GET", "/jobs/abc123"))[0] == 404
+        assert (await http_request(server.port, "GET", "/nothing"))[0] == 404
+        assert (await http_request(server.port, "GET", "/health"))[0] == 200
@@ -0,0 +1,102 @@
+"""CLIの起動時間（モジュールの読み込み）のテスト."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from storage import save_artifacts
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# 起動直後の終了（--help・引数エラー・APIキー未設定）では読み込まないモジュール
+HEAVY_MODULES = (
+    "agents", "openai", "httpx2", "pydantic", "asyncio", "models", "storage.artifacts",
+    "workflows.multi_hearing",
+)
+
+# `import main` の読み込み時間の上限（-X importtime の累積、マイクロ秒）
+MAIN_IMPORT_BUDGET_US = 100_000
+
+# main を「main」モジュールとして読み込んで実行し（スクリプト実行では __main__ になるため）、
+# 終了時に読み込まれていたモジュールを出力する
+_RUN_MAIN = (
+    "import atexit, sys; "
+    "atexit.register(lambda: print('MODULES', *sorted(sys.modules), file=sys.stderr)); "
+    "import main; sys.argv = ['main.py', *sys.argv[1:]]; main.main()"
+)
+
+
+def import_profile(*args, env=None):
+    """
+    `python -X importtime` で main.main() を実行する.
+
+    Returns:
+        (終了コード, 終了時に読み込まれていたモジュール名, {モジュール名: 累積読み込み時間(μs)})
+    """
+    run_env = {"PATH": os.environ.get("PATH", ""), "PYTHONPATH": str(PROJECT_ROOT)}
+    run_env.update(env or {})
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _RUN_MAIN, *args],
+        cwd=PROJECT_ROOT,
+        env=run_env,
+        capture_output=True,
+        text=True,
+    )
+    loaded, import_times = set(), {}
+    for line in completed.stderr.splitlines():
+        if line.startswith("MODULES "):
+            loaded = set(line.split()[1:])
+        elif line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            import_times[name.strip()] = int(cumulative)
+    return completed.returncode, loaded, import_times
+
+
+class TestStartup:
+    """重いモジュールを必要になるまで読み込まないことのテスト."""
+
+    @pytest.mark.parametrize(
+        "args, env, expected_code",
+        [
+            (["--help"], {}, 0),
+            (["--theme", "テーマ", "--num-personas", "abc"], {}, 2),
+            (["--theme", "テーマ"], {"OPENAI_API_KEY": ""}, 1),
+            (["serve", "--help"], {}, 0),
+        ],
+        ids=["help", "argument-error", "missing-api-key", "subcommand-help"],
+    )
+    def test_trivial_invocations_skip_heavy_imports(self, args, env, expected_code):
+        """ヘルプ表示やエラー終了ではエージェントSDKやpydanticを読み込まない."""
+        code, loaded, _ = import_profile(*args, env=env)
+
+        assert code == expected_code
+        assert "main" in loaded
+        assert [name for name in HEAVY_MODULES if name in loaded] == []
+
+    def test_main_import_time_budget(self):
+        """main モジュール自体の読み込み時間が予算内に収まる."""
+        _, _, import_times = import_profile("--help")
+        assert import_times["main"] < MAIN_IMPORT_BUDGET_US, f"main: {import_times['main']}μs"
+
+    def test_render_skips_agents_sdk(self, tmp_path, sample_personas_output, sample_questions_output,
+                                     sample_interview_response, sample_hypotheses_list,
+                                     sample_validation_questions):
+        """render はアーティファクトの読み込みに必要なモジュールだけを読み込む."""
+        save_artifacts(
+            tmp_path,
+            sample_personas_output,
+            sample_questions_output,
+            [sample_interview_response],
+            sample_hypotheses_list,
+            sample_validation_questions,
+        )
+        code, loaded, _ = import_profile("render", str(tmp_path))
+
+        assert code == 0
+        assert "storage.artifacts" in loaded
+        assert [
+            name for name in ("agents", "openai", "httpx2", "asyncio", "sqlite3") if name in loaded
+        ] == []
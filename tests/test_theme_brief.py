@@ -0,0 +1,112 @@
+"""テーマの構造化ブリーフのテスト."""
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from main import format_run_report_markdown, main
+from models.schemas import ThemeBrief
+from workflows import (
+    PhaseStarted,
+    ThemeBriefCache,
+    ThemeBriefing,
+    run_multi_persona_hearing_workflow,
+    run_theme_brief_workflow,
+)
+
+
+LONG_THEME = "共働き世帯向けの家事分担アプリの企画書です。" + "利用者調査の詳細な記録。" * 200
+BRIEF = ThemeBrief(
+    summary="共働き世帯の家事分担アプリ",
+    target_users=["共働きの夫婦"],
+    goals=["家事の偏りの原因"],
+    key_facts=["家事の記録が続かない"],
+)
+
+
+@pytest.fixture
+def briefer_runner(fake_runner):
+    fake_runner.outputs["ThemeBriefer"] = BRIEF
+    return fake_runner
+
+
+class TestThemeBriefWorkflow:
+    """run_theme_brief_workflow のテスト."""
+
+    async def test_short_theme_is_not_summarized(self, briefer_runner):
+        """短いテーマは要約せずにそのまま使う."""
+        briefing = ThemeBriefing("家事分担アプリ")
+
+        assert await run_theme_brief_workflow(briefing, verbose=False) is None
+        assert briefer_runner.calls_for("ThemeBriefer") == []
+        assert briefing.text_for("questions") == "家事分担アプリ"
+        assert briefing.report() is None
+
+    async def test_brief_is_cached_by_theme(self, briefer_runner, tmp_path):
+        """長いテーマは一度だけ要約し、同じテーマではキャッシュしたブリーフを使う."""
+        cache = ThemeBriefCache(tmp_path / "briefs")
+        events = []
+
+        first = ThemeBriefing(LONG_THEME)
+        assert await run_theme_brief_workflow(first, cache=cache, verbose=False) == BRIEF
+        second = ThemeBriefing(LONG_THEME)
+        await run_theme_brief_workflow(second, cache=cache, verbose=False, on_event=events.append)
+
+        assert len(briefer_runner.calls_for("ThemeBriefer")) == 1
+        assert not first.cached and second.cached
+        assert second.brief == BRIEF
+        assert next(e for e in events if isinstance(e, PhaseStarted)).detail == "キャッシュしたブリーフを使います"
+        assert cache.get(LONG_THEME + "。") is None
+
+    def test_invalid_full_text_phase(self):
+        with pytest.raises(ValueError):
+            ThemeBriefing(LONG_THEME, full_text_phases=["interviews"])
+
+
+class TestBriefInPrompts:
+    """ワークフローのプロンプトへのブリーフの埋め込みのテスト."""
+
+    async def test_prompts_use_brief_except_full_text_phases(self, briefer_runner):
+        """ブリーフを使うフェーズのプロンプトには元のテーマを含めない."""
+        briefer_runner.usage["ThemeBriefer"] = (3000, 100)
+        briefer_runner.usage["QuestionDesigner"] = (500, 200)
+        briefing = ThemeBriefing(LONG_THEME, full_text_phases=["personas"])
+        await run_theme_brief_workflow(briefing, verbose=False)
+
+        result = await run_multi_persona_hearing_workflow(
+            LONG_THEME, num_personas=1, verbose=False, theme_briefing=briefing,
+        )
+
+        assert LONG_THEME in briefer_runner.calls_for("PersonaGenerator")[0]
+        question_prompt = briefer_runner.calls_for("QuestionDesigner")[0]
+        assert LONG_THEME not in question_prompt
+        assert "明らかにしたいこと:\n- 家事の偏りの原因" in question_prompt
+
+        report = result.run_report.theme_brief
+        assert report.prompts_with_brief == 1
+        assert report.full_text_phases == ["personas"]
+        assert report.brief_input_tokens == 3000
+        assert report.input_tokens == 3500
+        assert report.input_tokens_without_brief == 500 + report.theme_tokens - report.brief_tokens
+
+        markdown = format_run_report_markdown(result.run_report)
+        assert "## テーマのブリーフ" in markdown
+        assert "元のテーマを使ったフェーズ**: personas" in markdown
+
+
+class TestThemeBriefCLI:
+    """--theme-brief を指定した実行のテスト."""
+
+    def test_run_reports_token_reduction(self, briefer_runner, tmp_path, monkeypatch, capsys):
+        """実行全体の入力トークンとブリーフなしの見積もりを出力する."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        argv = [
+            "main.py", "--theme", LONG_THEME, "--output-dir", str(tmp_path / "out"), "--quiet",
+            "--theme-brief", "--theme-brief-cache", str(tmp_path / "briefs"),
+        ]
+        with patch.object(sys, "argv", argv):
+            main()
+
+        assert len(briefer_runner.calls_for("ThemeBriefer")) == 1
+        assert "テーマのブリーフ: 入力トークン" in capsys.readouterr().out
+        assert "## テーマのブリーフ" in (tmp_path / "out" / "run_report.md").read_text(encoding="utf-8")
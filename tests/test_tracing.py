@@ -0,0 +1,184 @@
+"""スパンのトレースのテスト."""
+import contextvars
+import json
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import openai
+import pytest
+
+from main import main
+from workflows import AgentCaller, EventEmitter, run_multi_persona_hearing_workflow
+from workflows.tracing import (
+    NULL_SPAN,
+    STATUS_ERROR,
+    STATUS_OK,
+    Tracer,
+    current_tracer,
+    format_trace_timeline,
+    load_trace,
+    trace_span,
+)
+from workflows.agent_calls import _trace_tool_calls
+
+
+def by_name(tracer: Tracer, name: str):
+    return [span for span in tracer.spans if span.name == name]
+
+
+class TestTracer:
+    """Tracer のテスト."""
+
+    def test_disabled_is_noop(self):
+        """無効なときは共通の何もしないスパンを返し、ほとんど時間を使わない."""
+        assert current_tracer() is None
+        assert trace_span("write") is NULL_SPAN
+
+        started = time.perf_counter()
+        for _ in range(100_000):
+            with trace_span("write", {"file.name": "x"}) as span:
+                span.set("key", 1)
+        assert time.perf_counter() - started < 0.5
+
+    def test_nested_spans_and_deactivate(self):
+        """trace_span は現在のスパンの子になり、deactivate で元の状態に戻る."""
+        tracer = Tracer()
+
+        def run():
+            tracer.activate(root="run")
+            with trace_span("outer") as outer:
+                with pytest.raises(ValueError), trace_span("inner"):
+                    raise ValueError("失敗")
+            tracer.deactivate()
+            return outer
+
+        outer = contextvars.copy_context().run(run)
+
+        root, inner = by_name(tracer, "run")[0], by_name(tracer, "inner")[0]
+        assert outer.parent_id == root.span_id and inner.parent_id == outer.span_id
+        assert inner.status == STATUS_ERROR and inner.message == "ValueError: 失敗"
+        assert root.status == STATUS_OK and root.end_ns >= outer.end_ns
+        assert current_tracer() is None
+
+    def test_otlp_round_trip(self, tmp_path):
+        """OTLP/JSON に書き出し、親子関係と属性を保ったまま読み込める."""
+        tracer = Tracer()
+
+        def run():
+            tracer.activate(root="run")
+            with trace_span("agent Interviewer", {"agent.input_tokens": 120, "agent.replayed": False}):
+                pass
+            unfinished = tracer.start_span("interview")
+            tracer.deactivate()
+            return unfinished
+
+        contextvars.copy_context().run(run)
+        path = tracer.export(tmp_path / "trace.json")
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        raw = data["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert {span["traceId"] for span in raw} == {tracer.trace_id}
+        assert len(raw[0]["traceId"]) == 32 and len(raw[0]["spanId"]) == 16
+        assert {"key": "agent.input_tokens", "value": {"intValue": "120"}} in raw[1]["attributes"]
+
+        spans = load_trace(path)
+        assert spans[1].parent is spans[0]
+        assert spans[1].attributes == {"agent.input_tokens": 120, "agent.replayed": False}
+        assert spans[2].attributes["unfinished"] is True
+
+
+class TestWorkflowSpans:
+    """ワークフローの実行中のスパンのテスト."""
+
+    async def test_phases_interviews_and_calls(self, fake_runner):
+        """フェーズ・ヒアリング・エージェント呼び出しのスパンが親子関係つきで記録される."""
+        fake_runner.usage["Interviewer"] = (300, 80)
+        tracer = Tracer()
+        tracer.activate(root="run")
+
+        await run_multi_persona_hearing_workflow("テーマ", num_personas=3, verbose=False, max_concurrency=2)
+        tracer.deactivate()
+
+        workflow = by_name(tracer, "workflow hearing")[0]
+        phases = {span.attributes["phase"]: span for span in tracer.spans if span.name.startswith("phase ")}
+        assert {"personas", "questions", "interviews", "hypotheses", "validation_questions"} <= set(phases)
+        assert all(span.parent_id == workflow.span_id for span in phases.values())
+
+        interviews = by_name(tracer, "interview")
+        assert sorted(span.attributes["persona.index"] for span in interviews) == [0]
+        assert all(span.parent_id == phases["interviews"].span_id for span in interviews)
+        calls = by_name(tracer, "agent Interviewer")
+        assert [call.parent_id for call in calls] == [interviews[0].span_id]
+        assert calls[0].attributes["agent.input_tokens"] == 300
+        assert by_name(tracer, "agent PersonaGenerator")[0].parent_id == phases["personas"].span_id
+        assert all(span.end_ns is not None for span in tracer.spans)
+
+    async def test_retries_and_tool_calls(self, fake_runner):
+        """再試行の回数とツールの呼び出しを呼び出しのスパンに記録する."""
+        attempts = []
+
+        def flaky(prompt):
+            attempts.append(prompt)
+            if len(attempts) == 1:
+                raise openai.APIConnectionError(request=None)
+            return "ok"
+
+        fake_runner.outputs["Flaky"] = flaky
+        tracer = Tracer()
+        tracer.activate()
+        await AgentCaller(EventEmitter(), backoff_base=0.001).run(SimpleNamespace(name="Flaky"), "p", str)
+        with trace_span("agent Interviewer"):
+            _trace_tool_calls(SimpleNamespace(new_items=[
+                SimpleNamespace(type="message_output_item"),
+                SimpleNamespace(type="tool_call_item", raw_item=SimpleNamespace(
+                    type="web_search_call", status="completed", action=SimpleNamespace(query="家事 分担 調査"),
+                )),
+            ]))
+        tracer.deactivate()
+
+        assert by_name(tracer, "agent Flaky")[0].attributes["agent.retries"] == 1
+        tool = by_name(tracer, "tool web_search_call")[0]
+        assert tool.parent_id == by_name(tracer, "agent Interviewer")[0].span_id
+        assert tool.attributes == {
+            "tool.name": "web_search_call", "tool.query": "家事 分担 調査", "tool.status": "completed",
+        }
+
+
+class TestTraceCLI:
+    """--trace と trace サブコマンドのテスト."""
+
+    def test_trace_file_and_timeline(self, tmp_path, fake_runner, monkeypatch, capsys):
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        trace_path = tmp_path / "trace.json"
+        argv = [
+            "main.py", "--theme", "テーマ", "--output-dir", str(tmp_path / "out"),
+            "--quiet", "--trace", str(trace_path),
+        ]
+        with patch.object(sys, "argv", argv):
+            main()
+
+        assert current_tracer() is None
+        spans = load_trace(trace_path)
+        names = {span.name for span in spans}
+        assert {"run", "workflow hearing", "phase interviews", "interview", "agent Interviewer"} <= names
+        writes = {span.attributes["file.name"] for span in spans if span.name == "write"}
+        assert {"personas.json", "personas.md", "hypotheses.md"} <= writes
+
+        capsys.readouterr()
+        with patch.object(sys, "argv", ["main.py", "trace", str(trace_path), "--max-depth", "1"]):
+            main()
+        timeline = capsys.readouterr().out
+        assert timeline.startswith("トレース ")
+        assert "  workflow hearing" in timeline
+        assert "phase interviews" not in timeline
+
+    def test_timeline_marks_failures(self):
+        tracer = Tracer()
+        span = tracer.start_span("agent QuestionEvaluator", {"agent.retries": 2})
+        span.fail("TimeoutError")
+        span.end()
+        timeline = format_trace_timeline(tracer.spans, width=10)
+        assert "agent QuestionEvaluator  (再試行2回, ❌ TimeoutError)" in timeline
+        assert format_trace_timeline([]) == "スパンがありません"
@@ -0,0 +1,210 @@
+"""検証ヒアリング（フェーズ6）のテスト."""
+import asyncio
+
+import pytest
+
+from agent_definitions import create_validation_interviewer_agent
+from main import format_validation_interviews_markdown
+from models.schemas import PersonasOutput
+from models.validation_schemas import (
+    HypothesisTally,
+    HypothesisVerdict,
+    ValidationInterviewResponse,
+)
+from workflows import run_validation_interview_workflow
+from workflows.multi_hearing import _run_bounded, _sample_indices
+
+
+def make_response(name: str, verdicts) -> ValidationInterviewResponse:
+    return ValidationInterviewResponse(
+        persona_name=name,
+        answers=["回答"],
+        verdicts=[
+            HypothesisVerdict(hypothesis_id=hid, verdict=verdict, rationale="根拠")
+            for hid, verdict in verdicts
+        ],
+    )
+
+
+@pytest.fixture
+def many_personas(sample_persona) -> PersonasOutput:
+    return PersonasOutput(
+        personas=[
+            sample_persona.model_copy(update={"name": f"ペルソナ{i}"})
+            for i in range(1, 21)
+        ],
+        generation_rationale="テスト",
+    )
+
+
+class TestRunBounded:
+    """_run_bounded のテスト."""
+
+    async def test_respects_max_concurrency(self):
+        """同時実行数が max_concurrency を超えない."""
+        running = 0
+        peak = 0
+
+        async def worker(index: int) -> int:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            return index * 2
+
+        results = await _run_bounded(50, worker, max_concurrency=4)
+
+        assert results == [i * 2 for i in range(50)]
+        assert peak == 4
+
+    async def test_failures_are_isolated(self):
+        """1件の失敗が他の処理に影響しない."""
+        async def worker(index: int) -> int:
+            if index == 2:
+                raise RuntimeError("boom")
+            return index
+
+        results = await _run_bounded(5, worker, max_concurrency=2)
+
+        assert results[:2] == [0, 1]
+        assert isinstance(results[2], RuntimeError)
+        assert results[3:] == [3, 4]
+
+    async def test_should_start_stops_new_work(self):
+        """should_start が False になると未着手の処理は None のまま."""
+        done = []
+
+        async def worker(index: int) -> int:
+            done.append(index)
+            return index
+
+        results = await _run_bounded(
+            10, worker, max_concurrency=1, should_start=lambda: len(done) < 3
+        )
+
+        assert results[:3] == [0, 1, 2]
+        assert results[3:] == [None] * 7
+
+
+class TestSampleIndices:
+    """_sample_indices のテスト."""
+
+    def test_all_when_sample_size_is_none(self):
+        assert _sample_indices(5, None) == [0, 1, 2, 3, 4]
+
+    def test_evenly_spaced_sample(self):
+        assert _sample_indices(10, 5) == [0, 2, 4, 6, 8]
+
+    def test_invalid_sample_size(self):
+        with pytest.raises(ValueError):
+            _sample_indices(10, 0)
+
+
+class TestValidationInterviewWorkflow:
+    """run_validation_interview_workflow のテスト."""
+
+    async def test_tallies_verdicts_per_hypothesis(
+        self, fake_runner, many_personas, sample_hypotheses_list, sample_validation_questions
+    ):
+        """仮説ごとに支持・反証・判断不能を集計する."""
+        responses = iter([
+            make_response("A", [("P1", "支持"), ("I1", "反証")]),
+            make_response("B", [("p1", "支持"), ("I1", "判断不能")]),
+            make_response("C", [("P1", "反証"), ("P1", "支持"), ("X9", "支持")]),
+        ])
+        fake_runner.outputs["ValidationInterviewer"] = lambda prompt: next(responses)
+
+        report = await run_validation_interview_workflow(
+            theme="テーマ",
+            personas_output=many_personas,
+            hypotheses=sample_hypotheses_list,
+            validation_questions=sample_validation_questions,
+            sample_size=3,
+            max_concurrency=1,
+            verbose=False,
+        )
+
+        tallies = {tally.hypothesis_id: tally for tally in report.tallies}
+        assert report.personas_sampled == 3
+        assert (tallies["P1"].support, tallies["P1"].refute) == (2, 1)
+        assert (tallies["I1"].refute, tallies["I1"].inconclusive) == (1, 1)
+
+    async def test_prompt_contains_persona_and_hypotheses(
+        self, fake_runner, sample_personas_output, sample_hypotheses_list, sample_validation_questions
+    ):
+        """プロンプトにペルソナ情報、仮説ID、検証質問が含まれる."""
+        fake_runner.outputs["ValidationInterviewer"] = make_response("A", [])
+
+        await run_validation_interview_workflow(
+            theme="テーマ",
+            personas_output=sample_personas_output,
+            hypotheses=sample_hypotheses_list,
+            validation_questions=sample_validation_questions,
+            verbose=False,
+        )
+
+        prompt = fake_runner.calls_for("ValidationInterviewer")[0]
+        persona = sample_personas_output.personas[0]
+        assert f"- 名前: {persona.name}" in prompt
+        assert "P1 (課題仮説)" in prompt
+        assert "I1 (インサイト仮説)" in prompt
+        assert sample_validation_questions.questions[0].question in prompt
+
+    async def test_failed_interviews_are_recorded(
+        self, fake_runner, many_personas, sample_hypotheses_list, sample_validation_questions
+    ):
+        """失敗したペルソナは記録され、他のヒアリングは継続する."""
+        def respond(prompt: str):
+            if "ペルソナ2\n" in prompt:
+                raise RuntimeError("rate limited")
+            return make_response("ok", [("P1", "支持")])
+
+        fake_runner.outputs["ValidationInterviewer"] = respond
+
+        report = await run_validation_interview_workflow(
+            theme="テーマ",
+            personas_output=many_personas,
+            hypotheses=sample_hypotheses_list,
+            validation_questions=sample_validation_questions,
+            max_concurrency=8,
+            verbose=False,
+        )
+
+        assert len(report.interviews) == 19
+        assert [f.persona_name for f in report.failed] == ["ペルソナ2"]
+        assert "rate limited" in report.failed[0].reason
+
+
+class TestValidationInterviewer:
+    """検証ヒアリングエージェントと出力のテスト."""
+
+    def test_agent_creation(self):
+        agent = create_validation_interviewer_agent()
+        assert agent.name == "ValidationInterviewer"
+        assert agent.output_type == ValidationInterviewResponse
+
+    def test_support_rate(self):
+        tally = HypothesisTally(
+            hypothesis_id="P1", hypothesis_type="課題仮説", statement="文", support=3, refute=1
+        )
+        assert tally.support_rate == pytest.approx(0.75)
+        assert HypothesisTally(hypothesis_id="P2", hypothesis_type="課題仮説", statement="文").support_rate is None
+
+    def test_format_markdown(self):
+        from models.validation_schemas import ValidationInterviewReport
+
+        report = ValidationInterviewReport(
+            personas_sampled=1,
+            interviews=[make_response("田中", [("P1", "支持")])],
+            tallies=[
+                HypothesisTally(
+                    hypothesis_id="P1", hypothesis_type="課題仮説", statement="仮説文", support=1
+                )
+            ],
+        )
+        result = format_validation_interviews_markdown(report)
+
+        assert "# 検証ヒアリング結果" in result
+        assert "| P1: 仮説文 | 1 | 0 | 0 | 100% |" in result
+        assert "P1: 支持 — 根拠" in result
@@ -1,10 +1,101 @@
-"""ワークフローのパッケージ."""
-from workflows.multi_hearing import (
-    run_multi_persona_hearing_workflow,
-    run_question_evaluation_workflow,
-)
-
-__all__ = [
-    "run_multi_persona_hearing_workflow",
-    "run_question_evaluation_workflow",
-]
+"""
+ワークフローのパッケージ.
+
+公開している名前は最初に参照されたときに読み込む（エージェントSDKを読み込むのは
+ワークフロー本体を使う場合だけにし、Deadline やイベントだけを使う処理を軽くする）。
+"""
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# 公開名 → 定義しているモジュール
+_EXPORTS = {
+    "HearingWorkflowResult": "workflows.multi_hearing",
+    "run_multi_persona_hearing_workflow": "workflows.multi_hearing",
+    "stream_multi_persona_hearing_workflow": "workflows.multi_hearing",
+    "run_validation_interview_workflow": "workflows.multi_hearing",
+    "run_question_evaluation_workflow": "workflows.multi_hearing",
+    "run_theme_brief_workflow": "workflows.multi_hearing",
+    "AgentCaller": "workflows.agent_calls",
+    "CheckpointWriter": "workflows.checkpoint",
+    "ConsoleReporter": "workflows.console",
+    "Deadline": "workflows.deadline",
+    "DeadlineExceeded": "workflows.deadline",
+    "HedgingPolicy": "workflows.hedging",
+    "RunBudget": "workflows.budget",
+    "BudgetExceeded": "workflows.budget",
+    "TokenPrices": "workflows.budget",
+    "ThemeBriefing": "workflows.theme_brief",
+    "ThemeBriefCache": "workflows.theme_brief",
+    "Tracer": "workflows.tracing",
+    "trace_span": "workflows.tracing",
+    "load_trace": "workflows.tracing",
+    "format_trace_timeline": "workflows.tracing",
+    "Cassette": "workflows.cassette",
+    "CassetteMiss": "workflows.cassette",
+    "WorkflowEvent": "workflows.events",
+    "WorkflowStarted": "workflows.events",
+    "WorkflowFinished": "workflows.events",
+    "PhaseStarted": "workflows.events",
+    "PhaseFinished": "workflows.events",
+    "InterviewStarted": "workflows.events",
+    "InterviewCompleted": "workflows.events",
+    "InterviewFailed": "workflows.events",
+    "SaturationReached": "workflows.events",
+    "DeadlineReached": "workflows.events",
+    "CallRetried": "workflows.events",
+    "CallHedged": "workflows.events",
+    "UsageUpdated": "workflows.events",
+    "EventEmitter": "workflows.events",
+    "stream_events": "workflows.events",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from workflows.multi_hearing import (
+        HearingWorkflowResult,
+        run_multi_persona_hearing_workflow,
+        stream_multi_persona_hearing_workflow,
+        run_validation_interview_workflow,
+        run_question_evaluation_workflow,
+        run_theme_brief_workflow,
+    )
+    from workflows.agent_calls import AgentCaller
+    from workflows.checkpoint import CheckpointWriter
+    from workflows.console import ConsoleReporter
+    from workflows.deadline import Deadline, DeadlineExceeded
+    from workflows.hedging import HedgingPolicy
+    from workflows.budget import RunBudget, BudgetExceeded, TokenPrices
+    from workflows.theme_brief import ThemeBriefing, ThemeBriefCache
+    from workflows.tracing import Tracer, trace_span, load_trace, format_trace_timeline
+    from workflows.cassette import Cassette, CassetteMiss
+    from workflows.events import (
+        WorkflowEvent,
+        WorkflowStarted,
+        WorkflowFinished,
+        PhaseStarted,
+        PhaseFinished,
+        InterviewStarted,
+        InterviewCompleted,
+        InterviewFailed,
+        SaturationReached,
+        DeadlineReached,
+        CallRetried,
+        CallHedged,
+        UsageUpdated,
+        EventEmitter,
+        stream_events,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,326 @@
+"""エージェント呼び出しの共通処理（再試行・使用量の集計）."""
+import asyncio
+import dataclasses
+import random
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, List, Optional, Sequence, Type, TypeVar, Union
+
+import openai
+from agents import Agent, ModelSettings, RunConfig, Runner
+
+from workflows.events import CallHedged, CallRetried, EventEmitter, UsageUpdated
+from workflows.budget import RunBudget, estimate_tokens
+from workflows.cassette import Cassette
+from workflows.hedging import HedgingPolicy
+from workflows.tracing import KIND_CLIENT, record_span, trace_span
+
+if TYPE_CHECKING:
+    from backends.batch import BatchSubmitter
+
+
+T = TypeVar("T")
+
+# 再試行すれば成功する見込みのある一時的なエラー
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+
+class AgentCaller:
+    """
+    ワークフロー内のすべてのエージェント呼び出しを仲介する.
+
+    一時的なエラーは指数バックオフで再試行し、再試行と使用量を
+    イベントとして発行する。call_timeout を指定すると、1回の呼び出しが
+    その秒数を超えた時点で打ち切り、一時的なエラーとして再試行する。
+    run_config を指定すると、すべての呼び出しに渡す（モデルプロバイダーの差し替えなど）。
+    hedging を指定すると、遅い呼び出しに重複リクエストを送り、先に完了した方を使う。
+    budget を指定すると、各呼び出しの間は入力の見積もりと出力トークン数の上限を予算から確保し
+    （収まらなければ BudgetExceeded）、その上限を ModelSettings.max_tokens として渡して、
+    完了後に使用量を予算の台帳に記録する。ヘッジで結果を使わなかった重複リクエストの使用量も記録する
+    （途中でキャンセルしたものは入力の見積もりを使用量とみなす）。
+    cassette を指定すると、記録モードでは成功した呼び出しをカセットに追記し、
+    再生モードでは API を呼び出さずにカセットの出力を返す（workflows.cassette）。
+    トレースが有効なら（workflows.tracing）、呼び出しごとにトークン数・再試行の回数を
+    属性にしたスパンを作り、ツールの呼び出しをその子スパンとして記録する。
+    run_batch は互いに独立した呼び出しをまとめてバッチAPIに提出する（backends.batch）。
+    """
+
+    def __init__(
+        self,
+        emitter: EventEmitter,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        call_timeout: Optional[float] = None,
+        run_config: Optional[RunConfig] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        budget: Optional[RunBudget] = None,
+        cassette: Optional[Cassette] = None,
+    ):
+        if call_timeout is not None and call_timeout <= 0:
+            raise ValueError("call_timeout は0より大きい秒数を指定してください")
+        self.emitter = emitter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.call_timeout = call_timeout
+        self.run_config = run_config
+        self.hedging = hedging
+        self.budget = budget
+        self.cassette = cassette
+        self.total_requests = 0
+        self.total_input_tokens = 0
+        self.total_output_tokens = 0
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """attempt 回目の失敗後の待ち時間（ジッター付き指数バックオフ）."""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return delay * (0.5 + random.random() / 2)
+
+    def _record_usage(self, agent_name: str, result) -> None:
+        """実行結果の使用量を累計に加え、UsageUpdated を発行する."""
+        context_wrapper = getattr(result, "context_wrapper", None)
+        self._add_usage(agent_name, getattr(context_wrapper, "usage", None))
+
+    def _add_usage(self, agent_name: str, usage) -> None:
+        """使用量を累計に加え、UsageUpdated を発行する."""
+        if usage is None:
+            return
+        self.total_requests += usage.requests
+        self.total_input_tokens += usage.input_tokens
+        self.total_output_tokens += usage.output_tokens
+        if self.budget is not None:
+            self.budget.record(agent_name, usage.requests, usage.input_tokens, usage.output_tokens)
+        if self.emitter.enabled:
+            self.emitter.emit(
+                UsageUpdated(
+                    agent_name=agent_name,
+                    requests=usage.requests,
+                    input_tokens=usage.input_tokens,
+                    output_tokens=usage.output_tokens,
+                    total_requests=self.total_requests,
+                    total_input_tokens=self.total_input_tokens,
+                    total_output_tokens=self.total_output_tokens,
+                )
+            )
+
+    def _run_once(self, agent: Agent, prompt: str):
+        """Runner.run を1回呼び出すコルーチンを返す（予算があれば呼び出しの間その分を確保する）."""
+        if self.budget is None:
+            return self._runner_call(agent, prompt, None)
+        return self._run_held(agent, prompt)
+
+    async def _run_held(self, agent: Agent, prompt: str):
+        with self.budget.hold(agent.name, _input_estimate(agent, prompt)) as max_tokens:
+            return await self._runner_call(agent, prompt, max_tokens)
+
+    def _runner_call(self, agent: Agent, prompt: str, max_tokens: Optional[int]):
+        run_config = self.run_config
+        if max_tokens is not None:
+            # エージェント自身の上限があれば小さい方を使う
+            agent_limit = getattr(getattr(agent, "model_settings", None), "max_tokens", None)
+            if agent_limit is not None:
+                max_tokens = min(max_tokens, agent_limit)
+            base = run_config or RunConfig()
+            run_config = dataclasses.replace(
+                base,
+                model_settings=(base.model_settings or ModelSettings()).resolve(
+                    ModelSettings(max_tokens=max_tokens)
+                ),
+            )
+        if run_config is None:
+            return Runner.run(agent, prompt)
+        return Runner.run(agent, prompt, run_config=run_config)
+
+    def _call(self, agent: Agent, prompt: str):
+        """1回分の呼び出し（ヘッジが有効なら重複リクエストを含む）のコルーチンを返す."""
+        if self.hedging is None:
+            return self._run_once(agent, prompt)
+
+        def on_hedge(delay: float) -> None:
+            if self.emitter.enabled:
+                self.emitter.emit(CallHedged(agent_name=agent.name, delay=delay))
+
+        def on_discard(task: asyncio.Future) -> None:
+            if task.cancelled():
+                # 途中でキャンセルしたリクエストの使用量はわからないため、入力の見積もりを使用量とみなす
+                self._add_usage(agent.name, SimpleNamespace(
+                    requests=1, input_tokens=_input_estimate(agent, prompt), output_tokens=0,
+                ))
+            elif task.exception() is None:
+                self._record_usage(agent.name, task.result())
+
+        return self.hedging.run(agent.name, lambda: self._run_once(agent, prompt), on_hedge, on_discard)
+
+    async def run(self, agent: Agent, prompt: str, output_type: Type[T]) -> T:
+        """
+        エージェントを実行し、構造化出力を返す.
+
+        Raises:
+            BudgetExceeded: 予算の残りが足りない場合（呼び出しは行わない）
+            CassetteMiss: 再生モードで、カセットに対応する記録がない場合
+            TimeoutError: 再試行しても call_timeout 以内に応答がなかった場合
+            Exception: 再試行回数を超えても成功しなかった場合は最後のエラー
+        """
+        with trace_span(f"agent {agent.name}", {"agent.name": agent.name}, KIND_CLIENT) as span:
+            return await self._run(agent, prompt, output_type, span)
+
+    async def _run(self, agent: Agent, prompt: str, output_type: Type[T], span) -> T:
+        if self.cassette is not None and self.cassette.replaying:
+            # 再生時も予算の判定と使用量の記録は記録時と同じように行う
+            if self.budget is not None:
+                self.budget.check(agent.name, _input_estimate(agent, prompt))
+            output, entry = await self.cassette.replay(agent, prompt, output_type)
+            usage = SimpleNamespace(
+                requests=entry.requests,
+                input_tokens=entry.input_tokens,
+                output_tokens=entry.output_tokens,
+            )
+            self._add_usage(agent.name, usage)
+            span.set("agent.replayed", True)
+            _trace_usage(span, usage)
+            return output
+
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                call = self._call(agent, prompt)
+                if self.call_timeout is None:
+                    result = await call
+                else:
+                    result = await asyncio.wait_for(call, self.call_timeout)
+            except (asyncio.TimeoutError, *RETRYABLE_ERRORS) as e:
+                if attempt > self.max_retries:
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise TimeoutError(
+                            f"{agent.name} が {self.call_timeout:g}秒以内に応答しませんでした"
+                        ) from e
+                    raise
+                delay = self._backoff_delay(attempt)
+                span.set("agent.retries", attempt)
+                if self.emitter.enabled:
+                    self.emitter.emit(
+                        CallRetried(
+                            agent_name=agent.name,
+                            attempt=attempt,
+                            delay=delay,
+                            error=f"{type(e).__name__}: {e}" if str(e) else type(e).__name__,
+                        )
+                    )
+                await asyncio.sleep(delay)
+                continue
+            self._record_usage(agent.name, result)
+            output = result.final_output_as(output_type)
+            usage = getattr(getattr(result, "context_wrapper", None), "usage", None)
+            if self.cassette is not None:
+                self.cassette.record(agent, prompt, output, time.perf_counter() - started, usage)
+            _trace_usage(span, usage)
+            _trace_tool_calls(result)
+            return output
+
+    async def run_batch(
+        self,
+        submitter: "BatchSubmitter",
+        agent: Agent,
+        prompts: Sequence[str],
+        output_type: Type[T],
+    ) -> List[Union[T, Exception]]:
+        """
+        同じエージェントへの呼び出しをまとめてバッチに提出し、完了後に結果を返す.
+
+        予算の判定はすべての呼び出しの入力の見積もりの合計で提出前に1回行い、残りの予算を等分した
+        出力トークン数の上限を各リクエストの max_output_tokens にして、結果を取り込むまで確保しておく。
+        使用量は結果が返った呼び出しごとに記録する。失敗した呼び出しは再試行せず、その例外を結果として返す。
+        実行の設定（run_config）の model_settings は、通常の呼び出しと同じくリクエストに含める。
+
+        Raises:
+            BudgetExceeded: 予算の残りが足りない場合（提出は行わない）
+            ValueError: バッチで表せない model_settings がある場合（提出は行わない）
+            BatchJobFailed: バッチ全体が失敗した場合
+        """
+        with trace_span(
+            f"batch {agent.name}", {"agent.name": agent.name, "batch.requests": len(prompts)}, KIND_CLIENT,
+        ) as span:
+            if self.run_config is not None and self.run_config.model_settings is not None:
+                # 通常の呼び出しと同じく、実行の設定の model_settings をエージェントの設定より優先する
+                agent = agent.clone(model_settings=agent.model_settings.resolve(self.run_config.model_settings))
+            if self.budget is None:
+                return await self._submit_batch(submitter, agent, prompts, output_type, span)
+            input_tokens = sum(_input_estimate(agent, prompt) for prompt in prompts)
+            with self.budget.hold(agent.name, input_tokens, requests=len(prompts)) as max_tokens:
+                # 結果を取り込んで使用量を記録するまで、全リクエストの出力の上限を確保しておく
+                agent_limit = agent.model_settings.max_tokens
+                if agent_limit is not None:
+                    max_tokens = min(max_tokens, agent_limit)
+                agent = agent.clone(model_settings=agent.model_settings.resolve(ModelSettings(max_tokens=max_tokens)))
+                return await self._submit_batch(submitter, agent, prompts, output_type, span)
+
+    async def _submit_batch(
+        self,
+        submitter: "BatchSubmitter",
+        agent: Agent,
+        prompts: Sequence[str],
+        output_type: Type[T],
+        span,
+    ) -> List[Union[T, Exception]]:
+        """バッチを提出し、結果ごとに使用量を記録して出力（失敗は例外）を返す."""
+        batch = await submitter.run(agent, prompts, output_type)
+        span.set("batch.id", batch.batch_id)
+        span.set("batch.status", batch.status)
+        span.set("batch.polls", batch.polls)
+        total = SimpleNamespace(requests=0, input_tokens=0, output_tokens=0)
+        outputs: List[Union[T, Exception]] = []
+        for result in batch.results:
+            self._add_usage(agent.name, result.usage)
+            if result.usage is not None:
+                total.requests += result.usage.requests
+                total.input_tokens += result.usage.input_tokens
+                total.output_tokens += result.usage.output_tokens
+            for call in result.tool_calls:
+                _record_tool_span(call["type"], call["query"], call["status"])
+            outputs.append(result.error if result.error is not None else result.output)
+        span.set("batch.failed", sum(1 for output in outputs if isinstance(output, Exception)))
+        _trace_usage(span, total)
+        return outputs
+
+
+def _input_estimate(agent: Agent, prompt: str) -> int:
+    """呼び出しの入力トークン数の見積もり（指示とプロンプト）."""
+    return estimate_tokens(f"{agent.instructions or ''}{prompt}")
+
+
+def _trace_usage(span, usage) -> None:
+    """呼び出しのスパンに使用量を記録する."""
+    if usage is not None:
+        span.set("agent.requests", usage.requests)
+        span.set("agent.input_tokens", usage.input_tokens)
+        span.set("agent.output_tokens", usage.output_tokens)
+
+
+def _trace_tool_calls(result) -> None:
+    """
+    実行結果に含まれるツールの呼び出しを、呼び出しのスパンの子スパンとして記録する.
+
+    Web検索などのホスト型ツールは API の中で実行され、個別の所要時間はわからないため
+    長さ0のスパンにする。
+    """
+    for item in getattr(result, "new_items", ()):
+        if getattr(item, "type", None) != "tool_call_item":
+            continue
+        raw = item.raw_item
+        _record_tool_span(
+            getattr(raw, "name", None) or getattr(raw, "type", None) or "tool",
+            getattr(getattr(raw, "action", None), "query", None),
+            getattr(raw, "status", None),
+        )
+
+
+def _record_tool_span(tool: str, query: Optional[str], status: Optional[str]) -> None:
+    record_span(f"tool {tool}", {"tool.name": tool, "tool.query": query, "tool.status": status})
@@ -0,0 +1,406 @@
+"""
+実行全体のトークン数・費用の予算.
+
+エージェント呼び出しの使用量（usage）をフェーズごとに集計し、上限を超える呼び出しは
+送る前に BudgetExceeded で止める。後続のフェーズ（仮説生成・検証項目の設計・検証ヒアリング・評価）に
+必要な分は実行の最初に確保しておき、ヒアリング（フェーズ3）は残りの予算に収まるように
+Web検索なし・短い回答・ペルソナ数の削減の順で規模を縮小して計画する。
+
+見積もりは日本語を1文字1トークンとして多めに数える。実際の使用量は呼び出しの完了ごとに
+記録し、ヒアリングの1件あたりの見積もりも実績で置き換えて、以降の開始を判断する。
+呼び出し中は入力の見積もりと出力トークン数の上限（ModelSettings.max_tokens として渡す）を
+確保しておくため、並行する呼び出しの応答を合わせても上限を超えない。
+"""
+import math
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+
+from models.run_report import BudgetLedgerEntry, BudgetReport
+from workflows.events import (
+    PHASE_THEME_BRIEF,
+    PHASE_PERSONAS,
+    PHASE_QUESTIONS,
+    PHASE_INTERVIEWS,
+    PHASE_HYPOTHESES,
+    PHASE_VALIDATION_QUESTIONS,
+    PHASE_VALIDATION_INTERVIEWS,
+    PHASE_EVALUATION,
+    PhaseStarted,
+    WorkflowEvent,
+)
+
+
+# 台帳に表示するフェーズ名
+PHASE_LABELS = {
+    PHASE_THEME_BRIEF: "テーマの要約",
+    PHASE_PERSONAS: "ペルソナ生成",
+    PHASE_QUESTIONS: "初回ヒアリング質問の設計",
+    PHASE_INTERVIEWS: "ヒアリング",
+    PHASE_HYPOTHESES: "仮説生成",
+    PHASE_VALIDATION_QUESTIONS: "検証項目の設計",
+    PHASE_VALIDATION_INTERVIEWS: "検証ヒアリング",
+    PHASE_EVALUATION: "質問セット評価",
+}
+
+# 見積もりに使う1トークンあたりの文字数（日本語は多めに1文字1トークンとする）
+CHARS_PER_TOKEN = 1.0
+
+# ヒアリングの回答1問あたりの出力トークン数（通常 / 短い回答）
+ANSWER_TOKENS = 350
+SHORT_ANSWER_TOKENS = 120
+# ヒアリング1件あたりの洞察・裏付け・構造化出力の出力トークン数
+INTERVIEW_OVERHEAD_TOKENS = 400
+# Web検索の結果としてモデルに渡される入力トークン数（ヒアリング1回あたり）
+WEB_SEARCH_TOKENS = 4000
+# 完了したヒアリングの使用量の平均から次のヒアリングを見積もるときの余裕の倍率
+INTERVIEW_ESTIMATE_MARGIN = 1.2
+
+# 予算があるときに1回の呼び出しで許す出力トークン数の上限（エージェント名ごと）
+OUTPUT_TOKEN_LIMITS: Dict[str, int] = {
+    "QuestionAnswerer": 2000,
+    "InsightExtractor": 2000,
+    "ThemeBriefer": 2000,
+}
+DEFAULT_OUTPUT_TOKEN_LIMIT = 8000
+# 呼び出しを送るには、入力の見積もりに加えてこの出力トークン数が残っている必要がある
+MIN_OUTPUT_TOKENS = 256
+
+# 後続のフェーズのために確保する使用量（入力トークン数, 出力トークン数）
+PHASE_RESERVES: Dict[str, Tuple[int, int]] = {
+    PHASE_HYPOTHESES: (3000, 4000),
+    PHASE_VALIDATION_QUESTIONS: (4000, 4000),
+    PHASE_EVALUATION: (8000, 6000),
+}
+# 仮説生成でヒアリング1件あたりに追加される入力トークン数（ヒアリング結果の要約）
+HYPOTHESIS_TOKENS_PER_INTERVIEW = 400
+# 検証ヒアリング1件あたりの使用量（入力, 出力）
+VALIDATION_INTERVIEW_TOKENS = (3000, 1500)
+# 並列評価モード（評価側面7つ + マッピング + 統合）の使用量（入力, 出力）
+PARALLEL_EVALUATION_TOKENS = (9 * 5000, 9 * 1200)
+
+
+def estimate_tokens(text: str) -> int:
+    """テキストのトークン数を多めに見積もる."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class BudgetExceeded(Exception):
+    """予算の残りが足りないため、エージェント呼び出しを行わなかった."""
+
+
+@dataclass(frozen=True)
+class TokenPrices:
+    """
+    費用の計算に使うトークン単価（USD / 100万トークン）.
+
+    デフォルトは目安の値。使用するモデルの料金に合わせて指定すること。
+    """
+
+    input_per_million: float = 1.25
+    output_per_million: float = 10.0
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        """使用量の費用（USD）."""
+        return (
+            input_tokens * self.input_per_million + output_tokens * self.output_per_million
+        ) / 1_000_000
+
+
+@dataclass(frozen=True)
+class InterviewPlan:
+    """
+    予算に合わせたヒアリングの計画.
+
+    Attributes:
+        personas: ヒアリングするペルソナの数
+        web_search: Web検索で裏付けを取るか
+        short_answers: 回答を短くするか
+        input_tokens: ヒアリング1件あたりの入力トークン数の見積もり
+        output_tokens: ヒアリング1件あたりの出力トークン数の見積もり
+    """
+
+    personas: int
+    web_search: bool
+    short_answers: bool
+    input_tokens: int
+    output_tokens: int
+
+    @property
+    def scaled_down(self) -> bool:
+        """通常の計画から縮小したか."""
+        return not self.web_search or self.short_answers
+
+    def describe(self, requested: int) -> str:
+        """計画の説明（例: 「ペルソナ 8/15名・Web検索なし・短い回答」）."""
+        parts = [f"ペルソナ {self.personas}/{requested}名"]
+        parts.append("Web検索あり" if self.web_search else "Web検索なし")
+        parts.append("短い回答" if self.short_answers else "通常の回答")
+        return "・".join(parts)
+
+
+@dataclass
+class _PhaseUsage:
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class RunBudget:
+    """
+    実行全体のトークン数・費用の上限と、その使用状況の台帳.
+
+    ワークフローのイベントを購読して現在のフェーズを追跡し（`_create_caller` が登録する）、
+    AgentCaller が呼び出しの間 hold() で使用量を確保し、完了後に record() を呼ぶ。
+    予約（reserve）した使用量は、そのフェーズが始まるまで他のフェーズからは使えない。
+
+    Args:
+        max_tokens: 入力・出力を合わせたトークン数の上限
+        max_cost: 費用の上限（USD）
+        prices: 費用の計算に使うトークン単価
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        max_cost: Optional[float] = None,
+        prices: TokenPrices = TokenPrices(),
+    ):
+        if max_tokens is None and max_cost is None:
+            raise ValueError("max_tokens と max_cost の少なくとも一方を指定してください")
+        if max_tokens is not None and max_tokens <= 0:
+            raise ValueError("max_tokens は1以上を指定してください")
+        if max_cost is not None and max_cost <= 0:
+            raise ValueError("max_cost は0より大きい金額を指定してください")
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.prices = prices
+        self.phase: Optional[str] = None
+        self.interview_plan: Optional[InterviewPlan] = None
+        self.personas_requested: Optional[int] = None
+        self._usage: Dict[str, _PhaseUsage] = {}
+        self._reserved: Dict[str, Tuple[int, int]] = {}
+        self._started: set = set()
+        # 実行中の呼び出しのために確保している入力・出力トークン数
+        self._in_flight_input = 0
+        self._in_flight_output = 0
+
+    def __call__(self, event: WorkflowEvent) -> None:
+        if isinstance(event, PhaseStarted):
+            self.phase = event.phase
+            self._started.add(event.phase)
+
+    @property
+    def spent_input_tokens(self) -> int:
+        return sum(usage.input_tokens for usage in self._usage.values())
+
+    @property
+    def spent_output_tokens(self) -> int:
+        return sum(usage.output_tokens for usage in self._usage.values())
+
+    @property
+    def spent_tokens(self) -> int:
+        return self.spent_input_tokens + self.spent_output_tokens
+
+    @property
+    def spent_cost(self) -> float:
+        return self.prices.cost(self.spent_input_tokens, self.spent_output_tokens)
+
+    def phase_usage(self, phase: str) -> Tuple[int, int, int]:
+        """フェーズの使用量（リクエスト数, 入力トークン数, 出力トークン数）."""
+        usage = self._usage.get(phase, _PhaseUsage())
+        return usage.requests, usage.input_tokens, usage.output_tokens
+
+    def reserve(self, phase: str, input_tokens: int, output_tokens: int) -> None:
+        """まだ始まっていないフェーズのために使用量を確保する（同じフェーズへの予約は加算）."""
+        if phase in self._started:
+            return
+        reserved_input, reserved_output = self._reserved.get(phase, (0, 0))
+        self._reserved[phase] = (reserved_input + input_tokens, reserved_output + output_tokens)
+
+    def reserve_hearing_phases(self, num_personas: int) -> None:
+        """ヒアリング後の仮説生成と検証項目の設計のために使用量を確保する."""
+        hypotheses_input, hypotheses_output = PHASE_RESERVES[PHASE_HYPOTHESES]
+        self.reserve(
+            PHASE_HYPOTHESES,
+            hypotheses_input + HYPOTHESIS_TOKENS_PER_INTERVIEW * num_personas,
+            hypotheses_output,
+        )
+        self.reserve(PHASE_VALIDATION_QUESTIONS, *PHASE_RESERVES[PHASE_VALIDATION_QUESTIONS])
+
+    def _held(self) -> Tuple[int, int]:
+        """まだ始まっていないフェーズのために確保している使用量の合計."""
+        pending = [tokens for phase, tokens in self._reserved.items() if phase not in self._started]
+        return sum(i for i, _ in pending), sum(o for _, o in pending)
+
+    def fits(self, input_tokens: int, output_tokens: int) -> bool:
+        """使用済み・確保済みに加えて、この使用量が上限に収まるか."""
+        held_input, held_output = self._held()
+        total_input = self.spent_input_tokens + held_input + input_tokens
+        total_output = self.spent_output_tokens + held_output + output_tokens
+        if self.max_tokens is not None and total_input + total_output > self.max_tokens:
+            return False
+        if self.max_cost is not None and self.prices.cost(total_input, total_output) > self.max_cost:
+            return False
+        return True
+
+    def affordable_count(self, input_tokens: int, output_tokens: int) -> int:
+        """1件あたりこの使用量の処理を、上限内で何件行えるか."""
+        held_input, held_output = self._held()
+        counts = []
+        if self.max_tokens is not None:
+            left = self.max_tokens - self.spent_tokens - held_input - held_output
+            counts.append(left // max(1, input_tokens + output_tokens))
+        if self.max_cost is not None:
+            left = self.max_cost - self.prices.cost(
+                self.spent_input_tokens + held_input, self.spent_output_tokens + held_output
+            )
+            unit = self.prices.cost(input_tokens, output_tokens)
+            if unit > 0:
+                counts.append(math.floor(left / unit))
+        return max(0, min(counts)) if counts else sys.maxsize
+
+    def _remaining_output(self, input_tokens: int) -> int:
+        """使用済み・確保済み・実行中の分とこの入力に加えて、上限内に収まる出力トークン数."""
+        held_input, held_output = self._held()
+        total_input = self.spent_input_tokens + held_input + self._in_flight_input + input_tokens
+        total_output = self.spent_output_tokens + held_output + self._in_flight_output
+        remaining = sys.maxsize
+        if self.max_tokens is not None:
+            remaining = min(remaining, self.max_tokens - total_input - total_output)
+        if self.max_cost is not None and self.prices.output_per_million > 0:
+            left = self.max_cost - self.prices.cost(total_input, total_output)
+            remaining = min(remaining, math.floor(left / self.prices.output_per_million * 1_000_000))
+        return remaining
+
+    def check(
+        self,
+        agent_name: str,
+        input_tokens: int,
+        min_output_tokens: int = MIN_OUTPUT_TOKENS,
+        requests: int = 1,
+    ) -> int:
+        """
+        入力トークン数の見積もりと最低限の出力が残りの予算に収まらなければ呼び出しを止める.
+
+        requests にまとめて送るリクエストの数（バッチ）を指定すると、input_tokens はその合計とし、
+        最低限の出力はリクエストごとに必要とする。
+
+        Returns:
+            1リクエストに許す出力トークン数の上限（残りの予算を等分した量とエージェントごとの上限の小さい方）
+
+        Raises:
+            BudgetExceeded: 予算の残りが足りない場合
+        """
+        remaining = self._remaining_output(input_tokens)
+        if remaining < min_output_tokens * requests:
+            raise BudgetExceeded(
+                f"{agent_name} の呼び出しは予算の上限を超えるため実行しません"
+                f"（使用済み {self.spent_tokens:,}トークン / ${self.spent_cost:.4f}）"
+            )
+        return min(remaining // requests, OUTPUT_TOKEN_LIMITS.get(agent_name, DEFAULT_OUTPUT_TOKEN_LIMIT))
+
+    @contextmanager
+    def hold(self, agent_name: str, input_tokens: int, requests: int = 1) -> Iterator[int]:
+        """
+        呼び出しの間、入力の見積もりと出力トークン数の上限を確保する.
+
+        check() と同じく収まらなければ BudgetExceeded を送出し、収まれば1リクエストあたりの
+        出力トークン数の上限を返す（requests 件分を確保する）。
+        """
+        max_output_tokens = self.check(agent_name, input_tokens, requests=requests)
+        self._in_flight_input += input_tokens
+        self._in_flight_output += max_output_tokens * requests
+        try:
+            yield max_output_tokens
+        finally:
+            self._in_flight_input -= input_tokens
+            self._in_flight_output -= max_output_tokens * requests
+
+    def record(self, agent_name: str, requests: int, input_tokens: int, output_tokens: int) -> None:
+        """完了した呼び出しの使用量を現在のフェーズに記録する."""
+        usage = self._usage.setdefault(self.phase or "other", _PhaseUsage())
+        usage.requests += requests
+        usage.input_tokens += input_tokens
+        usage.output_tokens += output_tokens
+
+    def plan_interviews(
+        self,
+        personas: int,
+        base_input_tokens: int,
+        question_count: int,
+        calls_per_interview: int = 1,
+    ) -> InterviewPlan:
+        """
+        残りの予算（後続のフェーズの確保分を除く）に収まるヒアリングの計画を立てる.
+
+        全ペルソナに通常どおりヒアリングできなければ、Web検索なし、短い回答の順に縮小し、
+        それでも足りなければ最も小さい規模でヒアリングするペルソナの数を減らす。
+
+        Args:
+            personas: ヒアリングする予定のペルソナの数
+            base_input_tokens: ヒアリング1回の入力トークン数（指示とプロンプト）
+            question_count: 質問の数
+            calls_per_interview: ヒアリング1件あたりの呼び出し回数
+        """
+        candidates = []
+        for web_search, short_answers in ((True, False), (False, False), (False, True)):
+            input_tokens = base_input_tokens * calls_per_interview
+            if web_search:
+                input_tokens += WEB_SEARCH_TOKENS * calls_per_interview
+            answer_tokens = SHORT_ANSWER_TOKENS if short_answers else ANSWER_TOKENS
+            output_tokens = answer_tokens * question_count + INTERVIEW_OVERHEAD_TOKENS
+            count = min(personas, self.affordable_count(input_tokens, output_tokens))
+            candidates.append(InterviewPlan(count, web_search, short_answers, input_tokens, output_tokens))
+            if count == personas:
+                break
+        plan = candidates[-1]
+        self.interview_plan = plan
+        self.personas_requested = personas
+        return plan
+
+    def report(self) -> BudgetReport:
+        """予算の台帳（実行レポート用）."""
+        phases = list(self._usage) + [phase for phase in self._reserved if phase not in self._usage]
+        entries = []
+        for phase in phases:
+            requests, input_tokens, output_tokens = self.phase_usage(phase)
+            reserved_input, reserved_output = self._reserved.get(phase, (0, 0))
+            entries.append(BudgetLedgerEntry(
+                phase=phase,
+                label=PHASE_LABELS.get(phase, "その他"),
+                requests=requests,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cost=round(self.prices.cost(input_tokens, output_tokens), 6),
+                reserved_tokens=reserved_input + reserved_output,
+                started=phase in self._started,
+            ))
+        plan = self.interview_plan
+        return BudgetReport(
+            max_tokens=self.max_tokens,
+            max_cost=self.max_cost,
+            input_price_per_million=self.prices.input_per_million,
+            output_price_per_million=self.prices.output_per_million,
+            spent_tokens=self.spent_tokens,
+            spent_cost=round(self.spent_cost, 6),
+            interview_plan=(
+                plan.describe(self.personas_requested) if plan is not None else None
+            ),
+            interview_scaled_down=(
+                plan is not None and (plan.scaled_down or plan.personas < self.personas_requested)
+            ),
+            entries=entries,
+        )
+
+
+def evaluation_reserve(mode: str) -> Tuple[int, int]:
+    """質問セット評価のために確保する使用量（入力, 出力）."""
+    return PARALLEL_EVALUATION_TOKENS if mode == "parallel" else PHASE_RESERVES[PHASE_EVALUATION]
+
+
+def validation_interviews_reserve(sample_size: int) -> Tuple[int, int]:
+    """検証ヒアリングのために確保する使用量（入力, 出力）."""
+    input_tokens, output_tokens = VALIDATION_INTERVIEW_TOKENS
+    return input_tokens * sample_size, output_tokens * sample_size
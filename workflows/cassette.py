@@ -0,0 +1,194 @@
+"""
+エージェント呼び出しの記録と再生（カセット）.
+
+記録モードでは、成功したエージェント呼び出しごとに、エージェント名・入力（指示とプロンプト）の
+ハッシュ・呼び出し順・構造化出力・所要時間・使用量をJSONLファイルに1行ずつ追記する。
+再生モードでは、同じエージェント・同じ入力の呼び出しに記録した出力をそのまま返し、
+API を一切呼び出さずにワークフロー全体を実行する（記録時の所要時間を再現することもできる）。
+失敗した呼び出しは記録しないため、再生時に該当する記録がない呼び出しは CassetteMiss で失敗する。
+"""
+import asyncio
+import hashlib
+import json
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Type, TypeVar, Union
+
+from agents import Agent
+
+
+T = TypeVar("T")
+
+CASSETTE_MODES = ("record", "replay")
+
+
+class CassetteMiss(Exception):
+    """再生モードで、呼び出しに対応する記録がカセットになかった."""
+
+
+def input_hash(agent: Agent, prompt: str) -> str:
+    """エージェントの指示とプロンプトのハッシュ（カセットの照合キー）."""
+    instructions = agent.instructions if isinstance(agent.instructions, str) else ""
+    digest = hashlib.sha256(f"{agent.name}\n{instructions}\n{prompt}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _dump_output(output: Any) -> Any:
+    if hasattr(output, "model_dump"):
+        return output.model_dump(mode="json")
+    return output
+
+
+def _load_output(data: Any, output_type: Type[T]) -> T:
+    if hasattr(output_type, "model_validate"):
+        return output_type.model_validate(data)
+    return data
+
+
+@dataclass(frozen=True)
+class CassetteEntry:
+    """
+    カセットに記録した1回分の呼び出し.
+
+    Attributes:
+        agent_name: エージェント名
+        input_hash: 指示とプロンプトのハッシュ
+        occurrence: 同じエージェント・同じ入力の呼び出しの中での順番（0始まり）
+        sequence: 実行全体での完了順（0始まり）
+        output: 構造化出力（JSON）
+        seconds: 呼び出し元から見た所要時間（再試行・重複リクエストを含む）
+        requests: APIリクエスト数
+        input_tokens: 入力トークン数
+        output_tokens: 出力トークン数
+    """
+
+    agent_name: str
+    input_hash: str
+    occurrence: int
+    sequence: int
+    output: Any
+    seconds: float
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class Cassette:
+    """
+    エージェント呼び出しの記録・再生を行うカセットファイル.
+
+    AgentCaller に渡すと、記録モードでは成功した呼び出しを追記し、
+    再生モードでは呼び出しの代わりに記録した出力を返す。
+    再生時はエージェント名・入力のハッシュ・同じ入力の中での順番で照合する。
+    strict=False の場合、入力が一致する記録がなければ（プロンプトを変更した場合など）
+    同じエージェントの未使用の記録を記録順に使う（fallbacks に数える）。
+
+    Args:
+        path: カセットファイル（JSONL）。記録モードでは既存の内容を消して書き直す
+        mode: "record"（記録）または "replay"（再生）
+        simulate_latency: 再生時に記録した所要時間だけ待ってから出力を返すか
+        strict: 再生時に入力が一致する記録だけを使うか
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        mode: str = "replay",
+        simulate_latency: bool = False,
+        strict: bool = False,
+    ):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"未対応のカセットのモードです: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.simulate_latency = simulate_latency
+        self.strict = strict
+        self.hits = 0
+        self.fallbacks = 0
+        self._occurrences: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._sequence = 0
+        self._entries: Dict[Tuple[str, str, int], CassetteEntry] = {}
+        self._by_agent: Dict[str, Deque[CassetteEntry]] = defaultdict(deque)
+        self._used: Set[int] = set()
+        if mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text("", encoding="utf-8")
+        else:
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise FileNotFoundError(f"カセットファイルが見つかりません: {self.path}")
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = CassetteEntry(**json.loads(line))
+                self._entries[(entry.agent_name, entry.input_hash, entry.occurrence)] = entry
+        for entry in sorted(self._entries.values(), key=lambda e: e.sequence):
+            self._by_agent[entry.agent_name].append(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries) if self.replaying else self._sequence
+
+    def entries(self) -> List[CassetteEntry]:
+        """記録されている呼び出し（完了順。再生モードのみ）."""
+        return sorted(self._entries.values(), key=lambda e: e.sequence)
+
+    def _next_occurrence(self, agent_name: str, key: str) -> int:
+        occurrence = self._occurrences[(agent_name, key)]
+        self._occurrences[(agent_name, key)] += 1
+        return occurrence
+
+    def record(self, agent: Agent, prompt: str, output: Any, seconds: float, usage=None) -> None:
+        """成功した呼び出しを1行追記する（中断した実行でも、それまでの呼び出しは残る）."""
+        key = input_hash(agent, prompt)
+        entry = CassetteEntry(
+            agent_name=agent.name,
+            input_hash=key,
+            occurrence=self._next_occurrence(agent.name, key),
+            sequence=self._sequence,
+            output=_dump_output(output),
+            seconds=round(seconds, 3),
+            requests=getattr(usage, "requests", 0),
+            input_tokens=getattr(usage, "input_tokens", 0),
+            output_tokens=getattr(usage, "output_tokens", 0),
+        )
+        self._sequence += 1
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry.__dict__, ensure_ascii=False) + "\n")
+
+    def _take(self, agent: Agent, prompt: str) -> CassetteEntry:
+        key = input_hash(agent, prompt)
+        entry = self._entries.get((agent.name, key, self._next_occurrence(agent.name, key)))
+        if entry is not None and entry.sequence not in self._used:
+            self.hits += 1
+        elif self.strict:
+            raise CassetteMiss(f"{agent.name} の呼び出しに一致する記録がカセットにありません")
+        else:
+            queue = self._by_agent[agent.name]
+            while queue and queue[0].sequence in self._used:
+                queue.popleft()
+            if not queue:
+                raise CassetteMiss(f"{agent.name} の未使用の記録がカセットに残っていません")
+            entry = queue.popleft()
+            self.fallbacks += 1
+        self._used.add(entry.sequence)
+        return entry
+
+    async def replay(self, agent: Agent, prompt: str, output_type: Type[T]) -> Tuple[T, CassetteEntry]:
+        """
+        記録した出力を返す（simulate_latency なら記録時の所要時間だけ待つ）.
+
+        Raises:
+            CassetteMiss: 対応する記録がない場合
+        """
+        entry = self._take(agent, prompt)
+        if self.simulate_latency and entry.seconds > 0:
+            await asyncio.sleep(entry.seconds)
+        return _load_output(entry.output, output_type), entry
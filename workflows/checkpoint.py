@@ -0,0 +1,77 @@
+"""完了したフェーズの結果を逐次保存するイベント購読者."""
+from pathlib import Path
+from typing import Optional
+
+from storage import RunArtifacts, save_artifact
+from storage.interview_store import InterviewStore
+from storage.artifacts import (
+    artifacts_dir,
+    PERSONAS_FILENAME,
+    QUESTIONS_FILENAME,
+    INTERVIEWS_FILENAME,
+    RUN_REPORT_FILENAME,
+    HYPOTHESES_FILENAME,
+    VALIDATION_QUESTIONS_FILENAME,
+    VALIDATION_INTERVIEWS_FILENAME,
+    EVALUATION_FILENAME,
+)
+from workflows.events import (
+    PHASE_PERSONAS,
+    PHASE_QUESTIONS,
+    PHASE_INTERVIEWS,
+    PHASE_HYPOTHESES,
+    PHASE_VALIDATION_QUESTIONS,
+    PHASE_VALIDATION_INTERVIEWS,
+    PHASE_EVALUATION,
+    WorkflowEvent,
+    PhaseFinished,
+    InterviewCompleted,
+)
+from workflows.tracing import trace_span
+
+
+# フェーズの完了時に保存するアーティファクト（RunArtifacts の属性名, ファイル名）
+_PHASE_ARTIFACTS = {
+    PHASE_PERSONAS: ("personas_output", PERSONAS_FILENAME),
+    PHASE_QUESTIONS: ("questions_output", QUESTIONS_FILENAME),
+    PHASE_INTERVIEWS: ("run_report", RUN_REPORT_FILENAME),
+    PHASE_HYPOTHESES: ("hypotheses", HYPOTHESES_FILENAME),
+    PHASE_VALIDATION_QUESTIONS: ("validation_questions", VALIDATION_QUESTIONS_FILENAME),
+    PHASE_VALIDATION_INTERVIEWS: ("validation_interviews", VALIDATION_INTERVIEWS_FILENAME),
+    PHASE_EVALUATION: ("evaluation_report", EVALUATION_FILENAME),
+}
+
+
+class CheckpointWriter:
+    """
+    ワークフローのイベントを購読し、完了した結果をその都度アーティファクトとして保存する.
+
+    ヒアリング結果は1件完了するごとに artifacts/interviews.jsonl に追記するため、
+    実行が中断されても完了済みのヒアリングは失われず、`state` から部分的な結果を取り出せる。
+    """
+
+    def __init__(self, output_dir: Path, initial: Optional[RunArtifacts] = None):
+        self.output_dir = output_dir
+        self.state = initial if initial is not None else RunArtifacts()
+        path = artifacts_dir(output_dir) / INTERVIEWS_FILENAME
+        interviews = self.state.interviews
+        if not (isinstance(interviews, InterviewStore) and interviews.path.resolve() == path.resolve()):
+            # 保存先のファイルに追記していくストアに移し替える
+            path.unlink(missing_ok=True)
+            store = InterviewStore(path)
+            store.extend(interviews)
+            self.state.interviews = store
+
+    def __call__(self, event: WorkflowEvent) -> None:
+        if isinstance(event, InterviewCompleted):
+            if event.phase == PHASE_INTERVIEWS:
+                with trace_span("write", {"file.name": INTERVIEWS_FILENAME}):
+                    self.state.interviews.append(event.response)
+        elif isinstance(event, PhaseFinished):
+            target = _PHASE_ARTIFACTS.get(event.phase)
+            if target is None or event.result is None:
+                return
+            attribute, filename = target
+            setattr(self.state, attribute, event.result)
+            with trace_span("write", {"file.name": filename}):
+                save_artifact(self.output_dir, filename, event.result)
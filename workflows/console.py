@@ -0,0 +1,173 @@
+"""ワークフローの進捗イベントをコンソールに表示する購読者."""
+from typing import Callable, Dict
+
+from workflows.events import (
+    PHASE_THEME_BRIEF,
+    PHASE_PERSONAS,
+    PHASE_QUESTIONS,
+    PHASE_INTERVIEWS,
+    PHASE_HYPOTHESES,
+    PHASE_VALIDATION_QUESTIONS,
+    PHASE_VALIDATION_INTERVIEWS,
+    PHASE_EVALUATION,
+    WorkflowEvent,
+    WorkflowStarted,
+    WorkflowFinished,
+    PhaseStarted,
+    PhaseFinished,
+    InterviewStarted,
+    InterviewCompleted,
+    InterviewFailed,
+    SaturationReached,
+    DeadlineReached,
+    CallRetried,
+    CallHedged,
+)
+
+
+PHASE_TITLES = {
+    PHASE_THEME_BRIEF: "📝 テーマの要約",
+    PHASE_PERSONAS: "📋 フェーズ1: ペルソナ生成",
+    PHASE_QUESTIONS: "💬 フェーズ2: 初回ヒアリング質問の設計",
+    PHASE_INTERVIEWS: "🎤 フェーズ3: 各ペルソナへのヒアリング実行",
+    PHASE_HYPOTHESES: "💡 フェーズ4: 課題仮説・インサイト仮説の生成",
+    PHASE_VALIDATION_QUESTIONS: "🔍 フェーズ5: 仮説検証用のヒアリング項目洗い出し",
+    PHASE_VALIDATION_INTERVIEWS: "🧪 フェーズ6: 検証ヒアリングの実行",
+    PHASE_EVALUATION: "📋 質問セット評価分析中...",
+}
+
+
+class ConsoleReporter:
+    """
+    進捗イベントを従来の verbose 出力と同じ形式で標準出力に表示する.
+
+    各イベントを1行単位で出力するため、並行実行中のヒアリングの表示が
+    行の途中で混ざることはない。
+    """
+
+    def __init__(self, print_fn: Callable[..., None] = print):
+        self._print = print_fn
+        self._handlers: Dict[type, Callable] = {
+            WorkflowStarted: self._on_workflow_started,
+            WorkflowFinished: self._on_workflow_finished,
+            PhaseStarted: self._on_phase_started,
+            PhaseFinished: self._on_phase_finished,
+            InterviewStarted: self._on_interview_started,
+            InterviewCompleted: self._on_interview_completed,
+            InterviewFailed: self._on_interview_failed,
+            SaturationReached: self._on_saturation_reached,
+            DeadlineReached: self._on_deadline_reached,
+            CallRetried: self._on_call_retried,
+            CallHedged: self._on_call_hedged,
+        }
+
+    def __call__(self, event: WorkflowEvent) -> None:
+        handler = self._handlers.get(type(event))
+        if handler is not None:
+            handler(event)
+
+    def _on_workflow_started(self, event: WorkflowStarted) -> None:
+        if event.workflow == "hearing":
+            self._print("=" * 80)
+            self._print("🎯 複数ペルソナヒアリングワークフローを開始します")
+            self._print("=" * 80)
+            self._print(f"テーマ: {event.theme}")
+            self._print(f"生成ペルソナ数: {event.num_personas}")
+            self._print()
+        elif event.workflow == "evaluation":
+            self._print("=" * 80)
+            self._print("📊 質問セット評価ワークフローを開始します")
+            self._print("=" * 80)
+            self._print()
+
+    def _on_workflow_finished(self, event: WorkflowFinished) -> None:
+        if event.workflow == "hearing":
+            self._print("=" * 80)
+            self._print("🎉 ワークフロー完了")
+            self._print("=" * 80)
+            self._print()
+
+    def _on_phase_started(self, event: PhaseStarted) -> None:
+        self._print("─" * 80)
+        self._print(PHASE_TITLES.get(event.phase, event.phase))
+        self._print("─" * 80)
+        if event.detail:
+            self._print(event.detail)
+
+    def _on_phase_finished(self, event: PhaseFinished) -> None:
+        result = event.result
+        if event.phase == PHASE_THEME_BRIEF:
+            self._print(f"✅ テーマを要約しました: {result.summary}")
+        elif event.phase == PHASE_PERSONAS:
+            self._print(f"✅ {len(result.personas)}体のペルソナを生成しました")
+            for i, persona in enumerate(result.personas, 1):
+                self._print(f"   {i}. {persona.name} ({persona.age}歳, {persona.occupation})")
+        elif event.phase == PHASE_QUESTIONS:
+            self._print(f"✅ {len(result.questions)}個の質問を設計しました")
+        elif event.phase == PHASE_INTERVIEWS:
+            self._print(f"\n✅ {result.interviews_completed}件のヒアリングを完了しました")
+            if result.not_interviewed:
+                self._print(f"   （未実施: {len(result.not_interviewed)}名）")
+            if result.partial:
+                self._print("   ⚠️ 期限により部分的な結果で後続のフェーズに進みます")
+            if result.saturation_threshold is not None:
+                curve = " → ".join(f"{score:.2f}" for score in result.saturation_curve)
+                self._print(f"   飽和曲線: {curve}")
+        elif event.phase == PHASE_HYPOTHESES:
+            self._print(f"✅ 課題仮説 {len(result.problem_hypotheses)}個、"
+                        f"インサイト仮説 {len(result.insight_hypotheses)}個を生成しました")
+        elif event.phase == PHASE_VALIDATION_QUESTIONS:
+            self._print(f"✅ {len(result.questions)}個の検証用質問を設計しました")
+        elif event.phase == PHASE_VALIDATION_INTERVIEWS:
+            self._print(f"\n✅ {len(result.interviews)}件の検証ヒアリングを完了しました")
+            for tally in result.tallies:
+                self._print(f"   {tally.hypothesis_id}: 支持 {tally.support} / 反証 {tally.refute}"
+                            f" / 判断不能 {tally.inconclusive}")
+        elif event.phase == PHASE_EVALUATION:
+            self._print(f"✅ 評価レポートを生成しました")
+            self._print()
+            self._print("主要な評価結果:")
+            self._print(f"  - 初回質問: {result.comparison.question_count_initial}問")
+            self._print(f"  - 検証質問: {result.comparison.question_count_validation}問")
+            self._print(f"  - 質問数の変化率: {result.comparison.count_change_percent:+.1f}%")
+            self._print()
+            self._print("最重要改善ポイント:")
+            for i, improvement in enumerate(result.key_improvements[:3], 1):
+                self._print(f"  {i}. {improvement}")
+        self._print()
+
+    def _on_interview_started(self, event: InterviewStarted) -> None:
+        if event.phase == PHASE_INTERVIEWS:
+            self._print(f"   [{event.index + 1}/{event.total}] {event.persona_name} へのヒアリング中...")
+
+    def _on_interview_completed(self, event: InterviewCompleted) -> None:
+        if event.phase == PHASE_VALIDATION_INTERVIEWS:
+            self._print(f"   ✓ {event.persona_name} の検証ヒアリング完了")
+            return
+        elapsed = f", {event.elapsed:.1f}秒" if event.elapsed is not None else ""
+        self._print(f"      ✓ [{event.index + 1}/{event.total}] {event.persona_name} 完了 "
+                    f"({len(event.response.key_insights)}個の洞察を抽出{elapsed})")
+        if event.novelty is not None:
+            self._print(f"      新規性: {event.novelty:.2f}")
+
+    def _on_interview_failed(self, event: InterviewFailed) -> None:
+        if event.phase == PHASE_VALIDATION_INTERVIEWS:
+            self._print(f"   ⚠️ {event.persona_name} への検証ヒアリングに失敗しました: {event.error}")
+        else:
+            self._print(f"      ⚠️ {event.persona_name} へのヒアリングに失敗しました: {event.error}")
+
+    def _on_saturation_reached(self, event: SaturationReached) -> None:
+        self._print(f"   📉 新規性 {event.threshold:.2f} 未満が"
+                    f"{event.patience}件連続したため、ヒアリングを打ち切ります")
+
+    def _on_deadline_reached(self, event: DeadlineReached) -> None:
+        self._print(f"   ⏰ 期限が近づいたため打ち切ります"
+                    f"（{event.total}名中 {event.completed}名が完了済み）")
+
+    def _on_call_retried(self, event: CallRetried) -> None:
+        self._print(f"   ↻ {event.agent_name} の呼び出しを再試行します"
+                    f"（{event.attempt}回目の失敗, {event.delay:.1f}秒後）: {event.error}")
+
+    def _on_call_hedged(self, event: CallHedged) -> None:
+        self._print(f"   ⏱️ {event.agent_name} の応答が{event.delay:.1f}秒を超えたため、"
+                    f"同じ呼び出しをもう1つ送ります")
@@ -0,0 +1,32 @@
+"""実行全体の期限."""
+import time
+from typing import Callable
+
+
+class DeadlineExceeded(Exception):
+    """実行全体の期限により中断された処理を表す."""
+
+
+class Deadline:
+    """
+    実行全体の期限（開始からの秒数）.
+
+    複数のワークフローで同じインスタンスを共有し、残り時間に応じて
+    新しいヒアリングの開始を打ち切る判断に使う。
+    """
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        if seconds <= 0:
+            raise ValueError("期限は0より大きい秒数を指定してください")
+        self.seconds = seconds
+        self._clock = clock
+        self.expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        """期限までの残り秒数（期限切れなら0）."""
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        """期限を過ぎているか."""
+        return self.remaining() <= 0.0
@@ -0,0 +1,203 @@
+"""ワークフローの進捗イベントとその配信."""
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional
+
+
+# フェーズの識別子
+PHASE_THEME_BRIEF = "theme_brief"
+PHASE_PERSONAS = "personas"
+PHASE_QUESTIONS = "questions"
+PHASE_INTERVIEWS = "interviews"
+PHASE_HYPOTHESES = "hypotheses"
+PHASE_VALIDATION_QUESTIONS = "validation_questions"
+PHASE_VALIDATION_INTERVIEWS = "validation_interviews"
+PHASE_EVALUATION = "evaluation"
+
+
+@dataclass(frozen=True, slots=True)
+class WorkflowEvent:
+    """ワークフローが発行するイベントの基底クラス."""
+
+
+@dataclass(frozen=True, slots=True)
+class WorkflowStarted(WorkflowEvent):
+    """ワークフローの開始."""
+
+    workflow: str
+    theme: str
+    num_personas: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class WorkflowFinished(WorkflowEvent):
+    """ワークフローの完了（result はワークフローの戻り値）."""
+
+    workflow: str
+    result: Any
+
+
+@dataclass(frozen=True, slots=True)
+class PhaseStarted(WorkflowEvent):
+    """フェーズの開始."""
+
+    phase: str
+    detail: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class PhaseFinished(WorkflowEvent):
+    """フェーズの完了（result はそのフェーズの成果物）."""
+
+    phase: str
+    elapsed: float
+    result: Any = None
+
+
+@dataclass(frozen=True, slots=True)
+class InterviewStarted(WorkflowEvent):
+    """1人のペルソナへのヒアリングの開始（index は0始まり）."""
+
+    phase: str
+    index: int
+    total: int
+    persona_name: str
+
+
+@dataclass(frozen=True, slots=True)
+class InterviewCompleted(WorkflowEvent):
+    """1人のペルソナへのヒアリングの完了."""
+
+    phase: str
+    index: int
+    total: int
+    persona_name: str
+    response: Any
+    novelty: Optional[float] = None
+    # ヒアリングの開始から完了までの秒数
+    elapsed: Optional[float] = None
+
+
+@dataclass(frozen=True, slots=True)
+class InterviewFailed(WorkflowEvent):
+    """1人のペルソナへのヒアリングの失敗."""
+
+    phase: str
+    index: int
+    total: int
+    persona_name: str
+    error: str
+
+
+@dataclass(frozen=True, slots=True)
+class SaturationReached(WorkflowEvent):
+    """ヒアリングが飽和に達し、以降の開始を打ち切ったこと."""
+
+    interviews_completed: int
+    threshold: float
+    patience: int
+
+
+@dataclass(frozen=True, slots=True)
+class DeadlineReached(WorkflowEvent):
+    """実行全体の期限が近づき、フェーズを途中で打ち切ったこと."""
+
+    phase: str
+    completed: int
+    total: int
+
+
+@dataclass(frozen=True, slots=True)
+class CallRetried(WorkflowEvent):
+    """エージェント呼び出しの再試行."""
+
+    agent_name: str
+    attempt: int
+    delay: float
+    error: str
+
+
+@dataclass(frozen=True, slots=True)
+class CallHedged(WorkflowEvent):
+    """遅いエージェント呼び出しへの重複リクエストの送信（delay は送信までに待った秒数）."""
+
+    agent_name: str
+    delay: float
+
+
+@dataclass(frozen=True, slots=True)
+class UsageUpdated(WorkflowEvent):
+    """エージェント呼び出し1回分のトークン使用量と、実行全体の累計."""
+
+    agent_name: str
+    requests: int
+    input_tokens: int
+    output_tokens: int
+    total_requests: int
+    total_input_tokens: int
+    total_output_tokens: int
+
+
+EventHandler = Callable[[WorkflowEvent], None]
+
+
+class EventEmitter:
+    """
+    イベントを購読者に同期的に配信する.
+
+    購読者がいなければ emit は何もしないため、イベントの発行は
+    ヒアリングの並行実行のスループットに影響しない。
+    購読者は呼び出し元のイベントループ上で実行されるので、重い処理は避けること。
+    """
+
+    __slots__ = ("_handlers",)
+
+    def __init__(self, *handlers: Optional[EventHandler]):
+        self._handlers: List[EventHandler] = [h for h in handlers if h is not None]
+
+    @property
+    def enabled(self) -> bool:
+        """購読者が1つ以上登録されているか."""
+        return bool(self._handlers)
+
+    def subscribe(self, handler: EventHandler) -> None:
+        """購読者を追加する."""
+        self._handlers.append(handler)
+
+    def emit(self, event: WorkflowEvent) -> None:
+        """イベントをすべての購読者に配信する."""
+        for handler in self._handlers:
+            handler(event)
+
+
+_STREAM_DONE = object()
+
+
+async def stream_events(
+    run: Callable[..., Awaitable[Any]],
+    **kwargs: Any,
+) -> AsyncIterator[WorkflowEvent]:
+    """
+    on_event 引数を受け取るワークフロー関数を非同期イテレータとして実行する.
+
+    ワークフローが発行したイベントを順に返す。最後のイベントは
+    WorkflowFinished で、その result にワークフローの戻り値が入る。
+    ワークフローが例外で終了した場合は、それまでのイベントを返した後に
+    同じ例外を送出する。反復を途中でやめるとワークフローはキャンセルされる。
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    task = asyncio.ensure_future(run(on_event=queue.put_nowait, **kwargs))
+    task.add_done_callback(lambda _: queue.put_nowait(_STREAM_DONE))
+    try:
+        while True:
+            event = await queue.get()
+            if event is _STREAM_DONE:
+                break
+            yield event
+        task.result()
+    finally:
+        if not task.done():
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
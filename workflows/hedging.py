@@ -0,0 +1,177 @@
+"""
+遅いエージェント呼び出しへの重複リクエスト（ヘッジ）.
+
+同じエージェントへの呼び出しの所要時間を記録しておき、実行中の呼び出しが
+その分布のパーセンタイル（例: p95）を超えても終わらない場合に、同じ呼び出しを
+もう1つ送る。先に完了した方の結果を使い、もう一方はキャンセルする。
+重複リクエストは全呼び出しに対する割合の上限内でだけ送る。
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from models.run_report import HedgingReport
+
+
+def _nearest_rank(sorted_values: List[float], q: float) -> float:
+    """最近傍順位法によるパーセンタイル（sorted_values は昇順で空でないこと）."""
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+class HedgingPolicy:
+    """
+    エージェントごとの所要時間から、重複リクエストを送るまでの待ち時間を決める.
+
+    Args:
+        percentile: 重複リクエストを送る所要時間のパーセンタイル（0-1。例: 0.95）
+        max_extra_fraction: 重複リクエストの数の、呼び出し数に対する上限の割合
+        min_samples: このエージェントの所要時間がこの件数集まるまでは重複リクエストを送らない
+        window: パーセンタイルの計算に使う直近の所要時間の件数
+        min_delay: 重複リクエストを送るまでの最短の待ち時間（秒）
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_extra_fraction: float = 0.1,
+        min_samples: int = 5,
+        window: int = 200,
+        min_delay: float = 0.0,
+    ):
+        if not 0 < percentile < 1:
+            raise ValueError("percentile は0より大きく1未満の値を指定してください")
+        if not 0 <= max_extra_fraction <= 1:
+            raise ValueError("max_extra_fraction は0以上1以下の値を指定してください")
+        if min_samples < 1:
+            raise ValueError("min_samples は1以上を指定してください")
+        self.percentile = percentile
+        self.max_extra_fraction = max_extra_fraction
+        self.min_samples = min_samples
+        self.window = window
+        self.min_delay = min_delay
+        self.calls = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self._samples: Dict[str, Deque[float]] = {}
+        # 呼び出し元から見た所要時間と、重複リクエストを送らなかった場合の所要時間（推定を含む）
+        self._effective: List[float] = []
+        self._unhedged: List[float] = []
+
+    def delay_for(self, agent_name: str) -> Optional[float]:
+        """重複リクエストを送るまでの待ち時間（所要時間の記録が足りなければ None）."""
+        samples = self._samples.get(agent_name)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        return max(self.min_delay, _nearest_rank(sorted(samples), self.percentile))
+
+    def observe(self, agent_name: str, seconds: float) -> None:
+        """1件のリクエストの所要時間を記録する."""
+        samples = self._samples.get(agent_name)
+        if samples is None:
+            samples = self._samples[agent_name] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def _estimate_unhedged(self, agent_name: str, at_least: float) -> float:
+        """
+        キャンセルした最初のリクエストが完了するまでの所要時間の推定値.
+
+        このエージェントの記録のうち at_least 秒より長かったものの中央値
+        （該当がなければ下限の at_least）を使う。
+        """
+        longer = sorted(s for s in self._samples.get(agent_name, ()) if s > at_least)
+        return longer[len(longer) // 2] if longer else at_least
+
+    def try_hedge(self) -> bool:
+        """上限の割合内であれば重複リクエストの送信を記録して True を返す."""
+        if self.hedges_fired + 1 > self.max_extra_fraction * self.calls:
+            return False
+        self.hedges_fired += 1
+        return True
+
+    async def run(
+        self,
+        agent_name: str,
+        start: Callable[[], Awaitable[Any]],
+        on_hedge: Optional[Callable[[float], None]] = None,
+        on_discard: Optional[Callable[["asyncio.Future"], None]] = None,
+    ) -> Any:
+        """
+        start() で始めたリクエストを実行し、遅ければ重複リクエストを送って先に終わった方の結果を返す.
+
+        on_hedge は重複リクエストを送ったときに待ち時間（秒）を渡して呼ばれる。
+        一方が失敗した場合はもう一方の完了を待ち、両方失敗した場合は最初のリクエストのエラーを送出する。
+        on_discard は重複リクエストを送った場合に、結果を使わなかったリクエストのタスク
+        （キャンセルしたもの・失敗したもの・後から完了したもの）ごとに終了後に呼ばれる
+        （使われなかったリクエストの使用量を数えるため）。
+        """
+        self.calls += 1
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(start())
+        tasks = [primary]
+        winner = None
+        try:
+            delay = self.delay_for(agent_name)
+            if delay is not None:
+                await asyncio.wait({primary}, timeout=delay)
+            if primary.done() or delay is None or not self.try_hedge():
+                result = await primary
+                elapsed = time.perf_counter() - started
+                self.observe(agent_name, elapsed)
+                self._effective.append(elapsed)
+                self._unhedged.append(elapsed)
+                return result
+
+            if on_hedge is not None:
+                on_hedge(delay)
+            hedge_started = time.perf_counter()
+            hedge = asyncio.ensure_future(start())
+            tasks.append(hedge)
+            pending = set(tasks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+            if winner is None:
+                raise primary.exception()
+
+            elapsed = time.perf_counter() - started
+            if winner is hedge:
+                self.hedges_won += 1
+                self._unhedged.append(self._estimate_unhedged(agent_name, elapsed))
+                self.observe(agent_name, time.perf_counter() - hedge_started)
+            else:
+                self._unhedged.append(elapsed)
+                self.observe(agent_name, elapsed)
+            self._effective.append(elapsed)
+            return winner.result()
+        finally:
+            # 負けた方のリクエストをキャンセルし、終了を待つ
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if on_discard is not None and len(tasks) > 1:
+                for task in tasks:
+                    if task is not winner:
+                        on_discard(task)
+
+    def report(self) -> HedgingReport:
+        """重複リクエストの送信状況と、所要時間の分布の改善（実行レポート用）."""
+        effective = sorted(self._effective)
+        unhedged = sorted(self._unhedged)
+
+        def tail(values: List[float], q: float) -> Optional[float]:
+            return round(_nearest_rank(values, q), 3) if values else None
+
+        return HedgingReport(
+            percentile=self.percentile,
+            max_extra_fraction=self.max_extra_fraction,
+            calls=self.calls,
+            hedges_fired=self.hedges_fired,
+            hedges_won=self.hedges_won,
+            p50_seconds=tail(effective, 0.5),
+            p95_seconds=tail(effective, 0.95),
+            p99_seconds=tail(effective, 0.99),
+            unhedged_p95_seconds=tail(unhedged, 0.95),
+            unhedged_p99_seconds=tail(unhedged, 0.99),
+        )
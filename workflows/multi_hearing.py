@@ -1,39 +1,527 @@
 """複数ペルソナヒアリングのメインワークフロー."""
-from typing import Tuple, List
-from agents import Runner
+import asyncio
+import datetime
+import math
+import time
+from contextlib import suppress
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, List, Literal, NamedTuple, Optional, Sequence, Tuple,
+    TypeVar, Union,
+)
+from agents import RunConfig
 
 from agent_definitions import (
+    create_theme_briefer_agent,
     create_persona_generator_agent,
     create_question_designer_agent,
     create_interviewer_agent,
+    create_question_answerer_agent,
+    create_insight_extractor_agent,
     create_hypothesis_builder_agent,
     create_validation_question_designer_agent,
     create_question_evaluator_agent,
+    create_validation_interviewer_agent,
+    create_dimension_evaluator_agent,
+    create_question_mapper_agent,
+    create_evaluation_synthesizer_agent,
+    cached_agent,
 )
+from agent_definitions.question_evaluator import EVALUATION_DIMENSIONS
 from models.schemas import (
+    ThemeBrief,
     PersonasOutput,
     PersonaOutput,
+    InterviewQuestion,
     InterviewQuestionsOutput,
     InterviewResponse,
+    QuestionGroupAnswers,
+    InterviewInsights,
     HypothesisList,
     ValidationQuestionsOutput,
 )
 from models.evaluation_schemas import (
+    DimensionJudgement,
     EvaluationReport,
+    EvaluationDimension,
+    QuestionMapping,
+    TopicAssessment,
+    TopicAssessmentsOutput,
+    EvaluationJudgement,
+    EvaluationSynthesis,
+)
+from models.run_report import (
+    InterviewLatency,
+    NotInterviewedPersona,
+    RunReport,
+)
+from models.validation_schemas import (
+    ValidationInterviewResponse,
+    HypothesisTally,
+    ValidationInterviewReport,
+)
+from backends.batch import BatchSubmitter
+from analysis.insight_clustering import InsightCluster, cluster_insights
+from analysis.persona_diversity import PersonaDiversityTooLow, analyze_persona_diversity
+from analysis.question_metrics import QuestionSetFacts, compare_question_sets
+from analysis.saturation import SaturationTracker
+from storage import RunArtifacts
+from storage.interview_store import InterviewStore
+from storage.persona_library import PersonaLibrary, PersonaMatch
+from workflows.agent_calls import AgentCaller
+from workflows.budget import (
+    INTERVIEW_ESTIMATE_MARGIN,
+    BudgetExceeded,
+    RunBudget,
+    estimate_tokens,
+)
+from workflows.cassette import Cassette
+from workflows.console import ConsoleReporter
+from workflows.deadline import Deadline, DeadlineExceeded
+from workflows.hedging import HedgingPolicy
+from workflows.theme_brief import BRIEF_MIN_CHARS, ThemeBriefCache, ThemeBriefing
+from workflows.tracing import current_tracer
+from workflows.events import (
+    PHASE_THEME_BRIEF,
+    PHASE_PERSONAS,
+    PHASE_QUESTIONS,
+    PHASE_INTERVIEWS,
+    PHASE_HYPOTHESES,
+    PHASE_VALIDATION_QUESTIONS,
+    PHASE_VALIDATION_INTERVIEWS,
+    PHASE_EVALUATION,
+    EventEmitter,
+    EventHandler,
+    WorkflowEvent,
+    WorkflowStarted,
+    WorkflowFinished,
+    PhaseStarted,
+    PhaseFinished,
+    InterviewStarted,
+    InterviewCompleted,
+    InterviewFailed,
+    SaturationReached,
+    DeadlineReached,
+    stream_events,
 )
 
 
+T = TypeVar("T")
+
+# ヒアリングの実行方法（1回の呼び出しで全質問に回答 / 質問ごとに並行して回答）
+INTERVIEW_MODES = ("single", "per-question")
+
+
+def _format_persona_info(persona: PersonaOutput) -> str:
+    """ヒアリング用プロンプトに埋め込むペルソナ情報を整形する."""
+    return f"""
+ペルソナ情報:
+- 名前: {persona.name}
+- 年齢: {persona.age}歳
+- 職業: {persona.occupation}
+- 背景: {persona.background}
+- ニーズ: {', '.join(persona.needs)}
+- 行動パターン: {', '.join(persona.behaviors)}
+- 痛みポイント: {', '.join(persona.pain_points)}
+"""
+
+
+def _format_questions(questions: List[InterviewQuestion], start: int = 0) -> str:
+    """ヒアリング用プロンプトに埋め込む質問リストを整形する（番号は start+1 から）."""
+    return "\n".join([
+        f"{j+1}. {q.question} (意図: {q.intent})"
+        for j, q in enumerate(questions, start)
+    ])
+
+
+def _question_groups(question_count: int, group_size: int) -> List[range]:
+    """質問を先頭から group_size 問ずつのまとまり（インデックスの範囲）に分ける."""
+    return [
+        range(start, min(start + group_size, question_count))
+        for start in range(0, question_count, group_size)
+    ]
+
+
+def _answer_requirements(web_search: bool = True, short_answers: bool = False) -> str:
+    """ヒアリングの回答の要件（予算に合わせて縮小した計画を反映する）."""
+    lines = [
+        "- ペルソナの背景や属性を踏まえた回答をする",
+        "- 具体的なエピソードや経験を含める",
+        "- Web検索を使って、回答内容の現実性を確認し裏付けを取る" if web_search
+        else "- Web検索は使わず、ペルソナの経験と知識だけで回答する",
+    ]
+    if short_answers:
+        lines.append("- 各回答は2〜3文で簡潔にまとめる")
+    return "\n".join(lines)
+
+
+async def _interview_per_question(
+    persona: PersonaOutput,
+    questions: List[InterviewQuestion],
+    group_size: int,
+    caller: AgentCaller,
+    web_search: bool = True,
+    short_answers: bool = False,
+) -> InterviewResponse:
+    """
+    質問のまとまりごとに並行して回答させ、1件のヒアリング結果にまとめる.
+    
+    1回の呼び出しで全質問に回答させると、所要時間は出力の長さ（質問数）に比例する。
+    ここでは同じペルソナ情報を渡して質問のまとまりごとに同時に回答させ、
+    最後に回答全体から洞察だけを短い呼び出しで抽出する。
+    呼び出し回数は「まとまりの数 + 1」になる。
+    """
+    answerer = cached_agent(create_question_answerer_agent, web_search)
+    insight_extractor = cached_agent(create_insight_extractor_agent)
+    persona_info = _format_persona_info(persona)
+    groups = _question_groups(len(questions), group_size)
+    
+    async def answer_group(group: range) -> QuestionGroupAnswers:
+        answer_prompt = f"""
+あなたは以下のペルソナになりきって、質問に回答してください。
+
+{persona_info}
+
+質問:
+{_format_questions(questions[group.start:group.stop], start=group.start)}
+
+要件:
+{_answer_requirements(web_search, short_answers)}
+- 質問ごとに1件ずつ、{len(group)}件の回答を質問と同じ順序で返す
+"""
+        return await caller.run(answerer, answer_prompt, QuestionGroupAnswers)
+    
+    group_answers = await asyncio.gather(*(answer_group(group) for group in groups))
+    
+    answers: List[str] = []
+    evidence: Dict[str, None] = {}
+    for group, result in zip(groups, group_answers):
+        # 回答数が質問数と合わなくても、質問と回答の対応がずれないように揃える
+        group_answer_list = result.answers[:len(group)]
+        answers.extend(group_answer_list)
+        answers.extend(["（回答なし）"] * (len(group) - len(group_answer_list)))
+        evidence.update(dict.fromkeys(result.supporting_evidence))
+    
+    qa_text = "\n".join(
+        f"Q{j+1}. {question.question}\nA: {answer}"
+        for j, (question, answer) in enumerate(zip(questions, answers))
+    )
+    insight_prompt = f"""
+以下のペルソナへのヒアリングの質問と回答から、重要な洞察を抽出してください。
+
+{persona_info}
+
+質問と回答:
+{qa_text}
+"""
+    insights = await caller.run(insight_extractor, insight_prompt, InterviewInsights)
+    
+    return InterviewResponse(
+        persona_name=persona.name,
+        answers=answers,
+        key_insights=insights.key_insights,
+        supporting_evidence=list(evidence),
+    )
+
+
+async def _run_bounded(
+    count: int,
+    worker: Callable[[int], Awaitable[T]],
+    max_concurrency: int,
+    should_start: Optional[Callable[[], bool]] = None,
+    timeout: Optional[float] = None,
+) -> List[Union[T, Exception, None]]:
+    """
+    worker(0..count-1) を同時実行数を制限して実行する.
+    
+    固定数のワーカーがインデックスを順に取り出して処理するため、件数が
+    数百件あってもタスクやプロンプトが一度に生成されることはない。
+    1件の失敗は他に波及させず、その位置に例外オブジェクトを入れて返す。
+    should_start が False を返した後に未着手だった位置は None のままになる。
+    timeout 秒を過ぎると実行中の worker をキャンセルし、その位置には
+    DeadlineExceeded を入れて、それまでに完了した結果を返す。
+    
+    Returns:
+        List: インデックス順の結果（成功時は戻り値、失敗時は例外、未着手は None）
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency は1以上を指定してください")
+    
+    results: List[Union[T, Exception, None]] = [None] * count
+    in_flight = set()
+    next_index = 0
+    
+    async def run_worker() -> None:
+        nonlocal next_index
+        while next_index < count:
+            if should_start is not None and not should_start():
+                return
+            index = next_index
+            next_index += 1
+            in_flight.add(index)
+            try:
+                results[index] = await worker(index)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                results[index] = e
+            finally:
+                in_flight.discard(index)
+    
+    workers = asyncio.gather(*(run_worker() for _ in range(min(max_concurrency, count))))
+    if timeout is None:
+        await workers
+        return results
+    
+    done, _ = await asyncio.wait({workers}, timeout=max(0.0, timeout))
+    if done:
+        workers.result()
+        return results
+    
+    stragglers = sorted(in_flight)
+    workers.cancel()
+    with suppress(asyncio.CancelledError):
+        await workers
+    for index in stragglers:
+        results[index] = DeadlineExceeded("期限により中断")
+    return results
+
+
+def _create_caller(
+    verbose: bool,
+    on_event: Optional[EventHandler],
+    call_timeout: Optional[float] = None,
+    run_config: Optional[RunConfig] = None,
+    hedging: Optional[HedgingPolicy] = None,
+    budget: Optional[RunBudget] = None,
+    cassette: Optional[Cassette] = None,
+    theme_briefing: Optional[ThemeBriefing] = None,
+) -> Tuple[EventEmitter, AgentCaller]:
+    """イベントの配信先とエージェント呼び出し窓口を用意する."""
+    emitter = EventEmitter(on_event)
+    if verbose:
+        emitter.subscribe(ConsoleReporter())
+    if budget is not None:
+        # 予算は現在のフェーズを追跡して、使用量をフェーズごとに記録する
+        emitter.subscribe(budget)
+    if theme_briefing is not None:
+        # ブリーフを使わなかった場合との比較のため、入力トークン数を数える
+        emitter.subscribe(theme_briefing)
+    tracer = current_tracer()
+    if tracer is not None:
+        # ワークフロー・フェーズ・ヒアリングのスパンはイベントから作る
+        emitter.subscribe(tracer)
+    return emitter, AgentCaller(
+        emitter, call_timeout=call_timeout, run_config=run_config,
+        hedging=hedging, budget=budget, cassette=cassette,
+    )
+
+
+def _resumed(resume_from: Optional[RunArtifacts], attribute: str):
+    """再開元のアーティファクトから完了済みのフェーズの結果を取り出す."""
+    return getattr(resume_from, attribute) if resume_from is not None else None
+
+
+def _resume_detail(value) -> Optional[str]:
+    """再利用したフェーズの開始時に表示する補足."""
+    return "保存済みの結果を再利用します" if value is not None else None
+
+
+def _persona_prompt(theme: str, count: int, existing: Sequence[PersonaOutput]) -> str:
+    """ペルソナ生成のプロンプト（existing はライブラリから再利用するペルソナ）."""
+    prompt = f"""
+以下のテーマについて、{count}体の多様なペルソナを生成してください。
+
+テーマ:
+{theme}
+
+要件:
+- 多様な年齢、職業、背景を持つペルソナを生成する
+- 各ペルソナは独自の視点やニーズを持つ
+- テーマに対して異なる関心や経験を持つペルソナを含める
+- 極端なケース（先進的/保守的など）も含める
+"""
+    if existing:
+        summaries = "\n".join(
+            f"- {persona.name}（{persona.age}歳、{persona.occupation}）" for persona in existing
+        )
+        prompt += f"""- 以下の既存のペルソナとは名前・属性・視点が重ならないようにする
+
+既存のペルソナ:
+{summaries}
+"""
+    return prompt
+
+
+async def _generate_personas(
+    caller: AgentCaller,
+    theme: str,
+    num_personas: int,
+    library_matches: Sequence[PersonaMatch],
+) -> PersonasOutput:
+    """
+    ライブラリから再利用するペルソナに、足りない数だけ生成したペルソナを加える.
+    
+    再利用したペルソナが先頭に、生成したペルソナが後ろに並ぶ。
+    """
+    reused = [match.persona for match in library_matches]
+    if len(reused) >= num_personas:
+        themes = "、".join(dict.fromkeys(match.theme for match in library_matches))
+        return PersonasOutput(
+            personas=reused[:num_personas],
+            generation_rationale=f"類似するテーマ（{themes}）で生成したペルソナをライブラリから再利用",
+        )
+    
+    persona_generator = cached_agent(create_persona_generator_agent)
+    generated = await caller.run(
+        persona_generator,
+        _persona_prompt(theme, num_personas - len(reused), reused),
+        PersonasOutput,
+    )
+    if not reused:
+        return generated
+    
+    # 生成したペルソナの名前が再利用したペルソナと重なった場合は区別できるようにする
+    names = {persona.name for persona in reused}
+    new_personas = []
+    for persona in generated.personas:
+        name = persona.name
+        suffix = 2
+        while name in names:
+            name = f"{persona.name}（{suffix}）"
+            suffix += 1
+        names.add(name)
+        new_personas.append(persona.model_copy(update={"name": name}))
+    return PersonasOutput(
+        personas=reused + new_personas,
+        generation_rationale=(
+            f"{len(reused)}名は類似するテーマで生成したペルソナをライブラリから再利用。"
+            f"{generated.generation_rationale}"
+        ),
+    )
+
+
+# 仮説生成のプロンプトに含める洞察のクラスタの数と、個別のヒアリング結果を含めるヒアリングの数の上限
+HYPOTHESIS_PROMPT_CLUSTERS = 15
+HYPOTHESIS_PROMPT_INTERVIEWS = 20
+
+
+def _format_insight_clusters(clusters: Sequence[InsightCluster], limit: int) -> str:
+    """仮説生成に渡す洞察のクラスタ（共通するペルソナが多い順に最大 limit 個）."""
+    lines = []
+    for cluster in clusters[:limit]:
+        personas = "、".join(cluster.personas[:5])
+        if len(cluster.personas) > 5:
+            personas += f" ほか{len(cluster.personas) - 5}名"
+        lines.append(
+            f"- [{len(cluster.personas)}名・{cluster.size}件] {' / '.join(cluster.representatives)}（{personas}）"
+        )
+    if len(clusters) > limit:
+        lines.append(f"- ほか{len(clusters) - limit}個のクラスタ")
+    return "\n".join(lines)
+
+
+class HearingWorkflowResult(NamedTuple):
+    """複数ペルソナヒアリングワークフローの実行結果."""
+    
+    personas_output: PersonasOutput
+    questions_output: InterviewQuestionsOutput
+    # ペルソナ順のヒアリング結果（InterviewStore を参照するシーケンス）
+    interviews: Sequence[InterviewResponse]
+    hypotheses: HypothesisList
+    validation_questions: ValidationQuestionsOutput
+    run_report: RunReport
+
+
+async def run_theme_brief_workflow(
+    briefing: ThemeBriefing,
+    cache: Optional[ThemeBriefCache] = None,
+    min_chars: int = BRIEF_MIN_CHARS,
+    verbose: bool = True,
+    on_event: Optional[EventHandler] = None,
+    call_timeout: Optional[float] = None,
+    run_config: Optional[RunConfig] = None,
+    budget: Optional[RunBudget] = None,
+    cassette: Optional[Cassette] = None,
+) -> Optional[ThemeBrief]:
+    """
+    長いテーマを構造化ブリーフに要約し、briefing で使うようにする.
+    
+    briefing は後続のワークフローに theme_briefing として渡す。min_chars 文字より短いテーマは
+    要約せず、元のテーマをそのまま使う。cache にテーマのブリーフがあれば、
+    エージェントを呼び出さずにそれを使う。
+    
+    Args:
+        briefing: ヒアリングのテーマと、ブリーフを使わないフェーズを指定した ThemeBriefing
+        cache: テーマのハッシュごとのブリーフのキャッシュ
+        min_chars: 要約するテーマの最小の文字数
+        verbose: 進捗を表示するか
+        on_event: 進捗イベント（workflows.events）を受け取るコールバック
+        call_timeout: エージェント呼び出し1回あたりのタイムアウト（秒）
+        run_config: エージェント実行時の設定（モデルプロバイダーの差し替えなど）
+        budget: 実行全体のトークン数・費用の予算（workflows.budget）
+        cassette: エージェント呼び出しの記録・再生（workflows.cassette）
+    
+    Returns:
+        ThemeBrief: テーマのブリーフ（要約しなかった場合は None）
+    """
+    theme = briefing.theme
+    if briefing.brief is not None or len(theme) < min_chars:
+        return briefing.brief
+    
+    emitter, caller = _create_caller(
+        verbose, on_event, call_timeout, run_config, None, budget, cassette, briefing,
+    )
+    brief = cache.get(theme) if cache is not None else None
+    cached = brief is not None
+    emitter.emit(PhaseStarted(
+        phase=PHASE_THEME_BRIEF,
+        detail="キャッシュしたブリーフを使います" if cached else f"{len(theme)}文字のテーマを要約します",
+    ))
+    phase_started = time.perf_counter()
+    
+    if brief is None:
+        briefer = cached_agent(create_theme_briefer_agent)
+        brief_prompt = f"""
+以下のテーマを、後続の工程で参照する簡潔なブリーフにまとめてください。
+
+テーマ:
+{theme}
+"""
+        brief = await caller.run(briefer, brief_prompt, ThemeBrief)
+        if cache is not None:
+            cache.put(theme, brief)
+    briefing.use(brief, cached=cached)
+    emitter.emit(PhaseFinished(
+        phase=PHASE_THEME_BRIEF,
+        elapsed=time.perf_counter() - phase_started,
+        result=brief,
+    ))
+    return brief
+
+
 async def run_multi_persona_hearing_workflow(
     theme: str,
     num_personas: int = 15,
     verbose: bool = True,
-) -> Tuple[
-    PersonasOutput,
-    InterviewQuestionsOutput,
-    List[InterviewResponse],
-    HypothesisList,
-    ValidationQuestionsOutput,
-]:
+    saturation_threshold: Optional[float] = None,
+    saturation_patience: int = 3,
+    max_concurrency: int = 5,
+    on_event: Optional[EventHandler] = None,
+    deadline: Optional[Deadline] = None,
+    call_timeout: Optional[float] = None,
+    resume_from: Optional[RunArtifacts] = None,
+    run_config: Optional[RunConfig] = None,
+    interview_store: Optional[InterviewStore] = None,
+    interview_mode: Literal["single", "per-question"] = "single",
+    question_group_size: int = 1,
+    hedging: Optional[HedgingPolicy] = None,
+    budget: Optional[RunBudget] = None,
+    cassette: Optional[Cassette] = None,
+    persona_library: Optional[PersonaLibrary] = None,
+    theme_briefing: Optional[ThemeBriefing] = None,
+    min_persona_diversity: Optional[float] = None,
+    batch: Optional[BatchSubmitter] = None,
+) -> HearingWorkflowResult:
     """
     複数ペルソナヒアリングワークフローを実行する.
     
@@ -41,64 +529,117 @@ async def run_multi_persona_hearing_workflow(
         theme: ヒアリングのテーマ
         num_personas: 生成するペルソナの数（デフォルト: 15）
         verbose: 進捗を表示するか
+        saturation_threshold: 飽和判定に使う新規性のしきい値（0-1）。
+            指定すると、新規性がこれを下回るヒアリングが saturation_patience 件
+            連続した時点で残りのペルソナへのヒアリングを打ち切る。
+        saturation_patience: 飽和とみなす低新規性ヒアリングの連続件数
+        max_concurrency: 同時に実行するヒアリングの最大数
+        on_event: 進捗イベント（workflows.events）を受け取るコールバック
+        deadline: 実行全体の期限。期限が近づくと新しいヒアリングの開始を止め、
+            実行中のヒアリングをキャンセルして、完了済みの結果だけで
+            仮説生成・検証項目の洗い出しに進む（run_report.partial が True になる）。
+        call_timeout: エージェント呼び出し1回あたりのタイムアウト（秒）
+        resume_from: 中断した実行のアーティファクト。完了済みのフェーズと
+            ヒアリング結果を再利用し、残りの処理だけを実行する。
+        run_config: エージェント実行時の設定（モデルプロバイダーの差し替えなど）
+        interview_store: 完了したヒアリング結果の保存先（空のストア）。省略すると
+            一時ファイルのストアを使う。結果はメモリに溜めずにファイルへ書き出すため、
+            ペルソナ数が多くてもメモリ使用量は増えない。
+        interview_mode: "single" は1回の呼び出しで全質問に回答させる。
+            "per-question" は質問を question_group_size 問ずつに分けて並行して回答させ、
+            最後に短い呼び出しで洞察を抽出する（1件のヒアリングの所要時間が
+            最も長いまとまりの回答時間で決まるため、ヒアリングごとの待ち時間が短くなる）。
+            同時に実行する呼び出しは最大で max_concurrency ×（まとまりの数）になる。
+        question_group_size: "per-question" モードで1回の呼び出しに含める質問の数
+        hedging: 遅い呼び出しへの重複リクエストの方針（workflows.hedging）。
+            指定すると、呼び出しがそのエージェントの所要時間のパーセンタイルを超えた時点で
+            同じ呼び出しをもう1つ送り、先に完了した方を使う。送信状況は run_report.hedging に記録する。
+        budget: 実行全体のトークン数・費用の予算（workflows.budget）。仮説生成と検証項目の設計の分を
+            確保したうえで、ヒアリングを残りの予算に収まる規模（Web検索なし・短い回答・
+            ペルソナ数の削減）で計画し、予算を超える呼び出しは行わない。台帳は run_report.budget に記録する。
+        cassette: エージェント呼び出しの記録・再生（workflows.cassette）。記録モードでは
+            成功した呼び出しをカセットに追記し、再生モードでは API を呼び出さずに記録した出力を使う。
+        persona_library: 生成したペルソナを蓄積するライブラリ（storage.persona_library）。
+            類似するテーマで生成したペルソナを最大 num_personas 名まで再利用し、
+            足りない数だけを生成する。新しく生成したペルソナはライブラリに追加する。
+        theme_briefing: テーマのブリーフ（run_theme_brief_workflow で作成）。プロンプトに
+            元のテーマの代わりにブリーフを埋め込む（指定したフェーズを除く）。
+        min_persona_diversity: ヒアリングを行うペルソナの多様性スコア（analysis.persona_diversity）の
+            下限（0-1）。下回った場合は質問設計・ヒアリングを行わずに PersonaDiversityTooLow を送出する。
+            多様性は指定しなくても run_report.persona_diversity に記録する。
+        batch: 指定すると、フェーズ3のヒアリングをすべて1つのバッチジョブにまとめて提出し
+            （backends.batch）、結果を受け取ってから仮説生成に進む（interview_mode が "single" の場合のみ）。
+            提出後は打ち切れないため、飽和による打ち切りは行わず、予算がある場合は計画した
+            ペルソナ数だけを提出する。期限に達した場合はバッチをキャンセルする。
     
     Returns:
-        Tuple containing:
+        HearingWorkflowResult containing:
             - PersonasOutput: 生成されたペルソナ
             - InterviewQuestionsOutput: 初回ヒアリング質問
-            - List[InterviewResponse]: 各ペルソナへのヒアリング結果
+            - Sequence[InterviewResponse]: 各ペルソナへのヒアリング結果（ペルソナ順）
             - HypothesisList: 課題・インサイト仮説
             - ValidationQuestionsOutput: 検証用質問
+            - RunReport: ヒアリングの実施状況などのメタ情報
     """
-    if verbose:
-        print("=" * 80)
-        print("🎯 複数ペルソナヒアリングワークフローを開始します")
-        print("=" * 80)
-        print(f"テーマ: {theme}")
-        print(f"生成ペルソナ数: {num_personas}")
-        print()
+    if interview_mode not in INTERVIEW_MODES:
+        raise ValueError(f"未対応のヒアリングモードです: {interview_mode}")
+    if question_group_size < 1:
+        raise ValueError("question_group_size は1以上を指定してください")
+    if min_persona_diversity is not None and not 0 <= min_persona_diversity <= 1:
+        raise ValueError("min_persona_diversity は0以上1以下を指定してください")
+    if batch is not None and interview_mode != "single":
+        raise ValueError("batch は interview_mode が \"single\" の場合のみ指定できます")
     
-    # フェーズ1: ペルソナ生成
-    if verbose:
-        print("─" * 80)
-        print("📋 フェーズ1: ペルソナ生成")
-        print("─" * 80)
+    emitter, caller = _create_caller(
+        verbose, on_event, call_timeout, run_config, hedging, budget, cassette, theme_briefing,
+    )
+    if theme_briefing is None:
+        theme_briefing = ThemeBriefing(theme)
+    if budget is not None:
+        budget.reserve_hearing_phases(num_personas)
+    emitter.emit(WorkflowStarted(workflow="hearing", theme=theme, num_personas=num_personas))
     
-    persona_generator = create_persona_generator_agent()
-    persona_prompt = f"""
-以下のテーマについて、{num_personas}体の多様なペルソナを生成してください。
-
-テーマ:
-{theme}
-
-要件:
-- 多様な年齢、職業、背景を持つペルソナを生成する
-- 各ペルソナは独自の視点やニーズを持つ
-- テーマに対して異なる関心や経験を持つペルソナを含める
-- 極端なケース（先進的/保守的など）も含める
-"""
+    # フェーズ1: ペルソナ生成
+    personas_output = _resumed(resume_from, "personas_output")
+    library_matches: List[PersonaMatch] = []
+    detail = _resume_detail(personas_output)
+    if personas_output is None and persona_library is not None:
+        library_matches = persona_library.search(theme, limit=num_personas)
+        detail = f"ライブラリから{len(library_matches)}名を再利用、{num_personas - len(library_matches)}名を生成"
+    emitter.emit(PhaseStarted(phase=PHASE_PERSONAS, detail=detail))
+    phase_started = time.perf_counter()
     
-    result = await Runner.run(persona_generator, persona_prompt)
-    personas_output = result.final_output_as(PersonasOutput)
+    if personas_output is None:
+        personas_output = await _generate_personas(
+            caller, theme_briefing.text_for(PHASE_PERSONAS), num_personas, library_matches,
+        )
+        if persona_library is not None:
+            # 今回新しく生成したペルソナだけをライブラリに追加する
+            persona_library.add(theme, personas_output.personas[len(library_matches):])
+    personas_elapsed = time.perf_counter() - phase_started
+    emitter.emit(PhaseFinished(
+        phase=PHASE_PERSONAS,
+        elapsed=personas_elapsed,
+        result=personas_output,
+    ))
     
-    if verbose:
-        print(f"✅ {len(personas_output.personas)}体のペルソナを生成しました")
-        for i, persona in enumerate(personas_output.personas, 1):
-            print(f"   {i}. {persona.name} ({persona.age}歳, {persona.occupation})")
-        print()
+    # ペルソナの多様性（下限を下回ればヒアリングに進まない）
+    persona_diversity = analyze_persona_diversity(personas_output.personas, min_score=min_persona_diversity)
+    if min_persona_diversity is not None and persona_diversity.score < min_persona_diversity:
+        raise PersonaDiversityTooLow(persona_diversity)
     
     # フェーズ2: 初回ヒアリング質問の設計
-    if verbose:
-        print("─" * 80)
-        print("💬 フェーズ2: 初回ヒアリング質問の設計")
-        print("─" * 80)
+    questions_output = _resumed(resume_from, "questions_output")
+    emitter.emit(PhaseStarted(phase=PHASE_QUESTIONS, detail=_resume_detail(questions_output)))
+    phase_started = time.perf_counter()
     
-    question_designer = create_question_designer_agent()
-    question_prompt = f"""
+    if questions_output is None:
+        question_designer = cached_agent(create_question_designer_agent)
+        question_prompt = f"""
 以下のテーマについて、効果的なヒアリング質問を設計してください。
 
 テーマ:
-{theme}
+{theme_briefing.text_for(PHASE_QUESTIONS)}
 
 生成されたペルソナの概要:
 {personas_output.generation_rationale}
@@ -110,141 +651,356 @@ async def run_multi_persona_hearing_workflow(
 - 各質問の意図を明確にする
 """
     
-    result = await Runner.run(question_designer, question_prompt)
-    questions_output = result.final_output_as(InterviewQuestionsOutput)
-    
-    if verbose:
-        print(f"✅ {len(questions_output.questions)}個の質問を設計しました")
-        print()
+        questions_output = await caller.run(question_designer, question_prompt, InterviewQuestionsOutput)
+    questions_elapsed = time.perf_counter() - phase_started
+    emitter.emit(PhaseFinished(
+        phase=PHASE_QUESTIONS,
+        elapsed=questions_elapsed,
+        result=questions_output,
+    ))
     
     # フェーズ3: 各ペルソナへのヒアリング実行
-    if verbose:
-        print("─" * 80)
-        print("🎤 フェーズ3: 各ペルソナへのヒアリング実行")
-        print("─" * 80)
-    
-    interviewer = create_interviewer_agent()
-    interviews: List[InterviewResponse] = []
+    # 完了したヒアリング結果はストアに書き出し、以降は位置（インデックス）だけを扱う。
+    # 再開時は保存済みのヒアリング結果を再利用し、未実施のペルソナにだけヒアリングする
+    store = interview_store if interview_store is not None else InterviewStore()
+    resumed_interviews: Dict[str, int] = {}
+    persona_names = {persona.name for persona in personas_output.personas}
+    for interview in (resume_from.interviews if resume_from is not None else []):
+        # どのペルソナとも名前が一致しない結果と、同じペルソナの重複した結果は使わない
+        if interview.persona_name in persona_names and interview.persona_name not in resumed_interviews:
+            resumed_interviews[interview.persona_name] = store.append(interview)
+    pending = [
+        i for i, persona in enumerate(personas_output.personas)
+        if persona.name not in resumed_interviews
+    ]
+    questions_text = _format_questions(questions_output.questions)
+    calls_per_interview = (
+        len(_question_groups(len(questions_output.questions), question_group_size)) + 1
+        if interview_mode == "per-question" else 1
+    )
     
-    for i, persona in enumerate(personas_output.personas, 1):
-        if verbose:
-            print(f"   [{i}/{len(personas_output.personas)}] {persona.name} へのヒアリング中...")
-        
-        # ペルソナ情報と質問を整形
-        persona_info = f"""
-ペルソナ情報:
-- 名前: {persona.name}
-- 年齢: {persona.age}歳
-- 職業: {persona.occupation}
-- 背景: {persona.background}
-- ニーズ: {', '.join(persona.needs)}
-- 行動パターン: {', '.join(persona.behaviors)}
-- 痛みポイント: {', '.join(persona.pain_points)}
-"""
-        
-        questions_text = "\n".join([
-            f"{j+1}. {q.question} (意図: {q.intent})"
-            for j, q in enumerate(questions_output.questions)
-        ])
-        
-        interview_prompt = f"""
+    def build_interview_prompt(
+        persona: PersonaOutput, web_search: bool = True, short_answers: bool = False,
+    ) -> str:
+        return f"""
 あなたは以下のペルソナになりきって、質問に回答してください。
 
-{persona_info}
+{_format_persona_info(persona)}
 
 質問リスト:
 {questions_text}
 
 要件:
-- ペルソナの背景や属性を踏まえた回答をする
-- 具体的なエピソードや経験を含める
-- Web検索を使って、回答内容の現実性を確認し裏付けを取る
+{_answer_requirements(web_search, short_answers)}
 - 回答から得られた重要な洞察を抽出する
 """
+    
+    # 予算がある場合は、後続のフェーズの確保分を除いた残りに収まるようにヒアリングの規模を決める
+    plan = None
+    if budget is not None and pending:
+        planning_agent = (
+            cached_agent(create_question_answerer_agent) if interview_mode == "per-question"
+            else cached_agent(create_interviewer_agent)
+        )
+        base_input_tokens = estimate_tokens(
+            planning_agent.instructions
+            + build_interview_prompt(personas_output.personas[pending[0]])
+        )
+        plan = budget.plan_interviews(
+            len(pending), base_input_tokens, len(questions_output.questions), calls_per_interview,
+        )
+    web_search = plan.web_search if plan is not None else True
+    short_answers = plan is not None and plan.short_answers
+    
+    phase_details = []
+    if resumed_interviews:
+        phase_details.append(f"保存済みのヒアリング結果 {len(resumed_interviews)}件を再利用します")
+    if plan is not None and (plan.scaled_down or plan.personas < len(pending)):
+        phase_details.append(f"予算に合わせて縮小: {plan.describe(len(pending))}")
+    # バッチは提出後に打ち切れないため、予算の計画に収まるペルソナだけを提出する
+    submitted = pending[:plan.personas] if batch is not None and plan is not None else pending
+    if batch is not None and submitted:
+        phase_details.append(f"{len(submitted)}件をバッチで提出します")
+    emitter.emit(PhaseStarted(
+        phase=PHASE_INTERVIEWS,
+        detail="、".join(phase_details) if phase_details else None,
+    ))
+    phase_started = time.perf_counter()
+    
+    interviewer = cached_agent(create_interviewer_agent, web_search)
+    run_report = RunReport(
+        personas_total=len(personas_output.personas),
+        saturation_threshold=saturation_threshold,
+        deadline_seconds=deadline.seconds if deadline is not None else None,
+        interview_mode=interview_mode,
+        personas_reused=len(library_matches),
+        persona_diversity=persona_diversity,
+    )
+    saturation = (
+        SaturationTracker(saturation_threshold, saturation_patience)
+        if saturation_threshold is not None
+        else None
+    )
+    if saturation is not None:
+        for persona in personas_output.personas:
+            if persona.name in resumed_interviews:
+                saturation.observe(store[resumed_interviews[persona.name]])
+    total = len(personas_output.personas)
+    interviews_started = 0
+    interviews_finished = 0
+    budget_stopped = len(submitted) < len(pending)
+    
+    batch_outputs = None
+    if batch is not None and submitted:
+        batch_outputs = asyncio.ensure_future(caller.run_batch(
+            batch,
+            interviewer,
+            [
+                build_interview_prompt(personas_output.personas[index], web_search, short_answers)
+                for index in submitted
+            ],
+            InterviewResponse,
+        ))
+        batch_positions = {index: position for position, index in enumerate(submitted)}
+    
+    async def interview_persona(index: int) -> int:
+        nonlocal interviews_finished
+        persona = personas_output.personas[index]
+        emitter.emit(InterviewStarted(
+            phase=PHASE_INTERVIEWS, index=index, total=total, persona_name=persona.name,
+        ))
+        started = time.perf_counter()
         
-        result = await Runner.run(interviewer, interview_prompt)
-        interview = result.final_output_as(InterviewResponse)
-        interviews.append(interview)
+        try:
+            if interview_mode == "per-question":
+                interview = await _interview_per_question(
+                    persona, questions_output.questions, question_group_size, caller,
+                    web_search=web_search, short_answers=short_answers,
+                )
+            elif batch_outputs is not None:
+                # すべてのヒアリングが同じバッチの完了を待ち、自分の結果を取り出す
+                outcome = (await asyncio.shield(batch_outputs))[batch_positions[index]]
+                if isinstance(outcome, Exception):
+                    raise outcome
+                interview = outcome
+            else:
+                interview = await caller.run(
+                    interviewer,
+                    build_interview_prompt(persona, web_search, short_answers),
+                    InterviewResponse,
+                )
+        except Exception as e:
+            emitter.emit(InterviewFailed(
+                phase=PHASE_INTERVIEWS, index=index, total=total,
+                persona_name=persona.name, error=str(e),
+            ))
+            raise
+        finally:
+            interviews_finished += 1
+        if interview.persona_name != persona.name:
+            # 再開時はペルソナ名で対応付けるため、モデルが書いた名前をペルソナの名前にそろえる
+            interview = interview.model_copy(update={"persona_name": persona.name})
+        elapsed = time.perf_counter() - started
+        run_report.interview_latencies.append(InterviewLatency(
+            persona_name=persona.name, seconds=round(elapsed, 3), calls=calls_per_interview,
+        ))
         
-        if verbose:
-            print(f"      ✓ 完了 ({len(interview.key_insights)}個の洞察を抽出)")
+        novelty = None
+        if saturation is not None:
+            was_saturated = saturation.saturated
+            novelty = saturation.observe(interview)
+        emitter.emit(InterviewCompleted(
+            phase=PHASE_INTERVIEWS, index=index, total=total,
+            persona_name=persona.name, response=interview, novelty=novelty, elapsed=elapsed,
+        ))
+        if saturation is not None and saturation.saturated and not was_saturated:
+            emitter.emit(SaturationReached(
+                interviews_completed=len(saturation.curve),
+                threshold=saturation_threshold,
+                patience=saturation_patience,
+            ))
+        return store.append(interview)
     
-    if verbose:
-        print(f"\n✅ {len(interviews)}件のヒアリングを完了しました")
-        print()
+    def interview_estimate() -> Tuple[int, int]:
+        """ヒアリング1件あたりの使用量の見積もり（完了したヒアリングがあれば実績の平均に余裕を持たせる）."""
+        completed = len(run_report.interview_latencies)
+        _, input_tokens, output_tokens = budget.phase_usage(PHASE_INTERVIEWS)
+        if completed == 0 or input_tokens + output_tokens == 0:
+            return plan.input_tokens, plan.output_tokens
+        return (
+            math.ceil(input_tokens / completed * INTERVIEW_ESTIMATE_MARGIN),
+            math.ceil(output_tokens / completed * INTERVIEW_ESTIMATE_MARGIN),
+        )
+    
+    def should_start() -> bool:
+        nonlocal interviews_started, budget_stopped
+        if saturation is not None and saturation.saturated:
+            return False
+        if plan is not None:
+            # 実行中のヒアリングの分も含めて、次のヒアリングが予算に収まるときだけ開始する
+            input_tokens, output_tokens = interview_estimate()
+            reserved = interviews_started - interviews_finished + 1
+            if interviews_started >= plan.personas or not budget.fits(
+                input_tokens * reserved, output_tokens * reserved,
+            ):
+                budget_stopped = True
+                return False
+        interviews_started += 1
+        return True
+    
+    interview_timeout = None
+    if deadline is not None:
+        # 仮説生成と検証項目の設計（いずれも1回の呼び出し）に必要な時間を
+        # フェーズ1・2の所要時間から見積もり、その分を残してヒアリングを打ち切る
+        interview_timeout = deadline.remaining() - (personas_elapsed + questions_elapsed)
+    
+    pending_outcomes = await _run_bounded(
+        len(submitted),
+        lambda position: interview_persona(submitted[position]),
+        # バッチでは提出したヒアリングがすべて同時に結果を待つ
+        max(len(submitted), 1) if batch_outputs is not None else max_concurrency,
+        should_start=should_start if batch_outputs is None else None,
+        timeout=interview_timeout,
+    )
+    if batch_outputs is not None and not batch_outputs.done():
+        # 期限によりヒアリングを打ち切った場合は、提出したバッチもキャンセルする
+        batch_outputs.cancel()
+        with suppress(asyncio.CancelledError):
+            await batch_outputs
+    outcomes = [resumed_interviews.get(persona.name) for persona in personas_output.personas]
+    for index, outcome in zip(submitted, pending_outcomes):
+        outcomes[index] = outcome
+    
+    positions: List[int] = []
+    for i, (persona, outcome) in enumerate(zip(personas_output.personas, outcomes), 1):
+        if isinstance(outcome, int):
+            positions.append(outcome)
+            continue
+        if isinstance(outcome, DeadlineExceeded):
+            reason = "期限により中断"
+        elif isinstance(outcome, BudgetExceeded):
+            reason = "予算により中断"
+        elif outcome is not None:
+            reason = f"エラー: {outcome}"
+        elif saturation is not None and saturation.saturated and batch_outputs is None:
+            reason = "飽和により打ち切り"
+        elif budget_stopped:
+            reason = "予算により未実施"
+        else:
+            reason = "期限により未実施"
+        run_report.not_interviewed.append(
+            NotInterviewedPersona(persona_index=i, persona_name=persona.name, reason=reason)
+        )
+    
+    interviews = store.view(positions)
+    run_report.interviews_completed = len(interviews)
+    run_report.partial = any(
+        skipped.reason.startswith("期限により") for skipped in run_report.not_interviewed
+    )
+    if run_report.partial:
+        emitter.emit(DeadlineReached(
+            phase=PHASE_INTERVIEWS, completed=len(interviews), total=total,
+        ))
+    if saturation is not None:
+        run_report.saturation_curve = saturation.curve
+        run_report.saturation_reached = saturation.saturated
+    if hedging is not None:
+        run_report.hedging = hedging.report()
+    if budget is not None:
+        run_report.budget = budget.report()
+    run_report.theme_brief = theme_briefing.report()
+    
+    emitter.emit(PhaseFinished(
+        phase=PHASE_INTERVIEWS,
+        elapsed=time.perf_counter() - phase_started,
+        result=run_report,
+    ))
     
     # フェーズ4: 課題仮説・インサイト仮説の生成
-    if verbose:
-        print("─" * 80)
-        print("💡 フェーズ4: 課題仮説・インサイト仮説の生成")
-        print("─" * 80)
+    hypotheses = _resumed(resume_from, "hypotheses")
+    emitter.emit(PhaseStarted(phase=PHASE_HYPOTHESES, detail=_resume_detail(hypotheses)))
+    phase_started = time.perf_counter()
+    
+    if hypotheses is None:
+        hypothesis_builder = cached_agent(create_hypothesis_builder_agent)
     
-    hypothesis_builder = create_hypothesis_builder_agent()
+        # 洞察をローカルでクラスタにまとめ、多くのペルソナに共通するものから渡す
+        clusters = cluster_insights(interviews)
+        clusters_text = _format_insight_clusters(clusters, HYPOTHESIS_PROMPT_CLUSTERS)
     
-    # ヒアリング結果を整形
-    interviews_summary = []
-    for interview in interviews:
-        summary = f"""
+        # ヒアリング結果を整形（多い場合はクラスタだけを渡す）
+        interviews_summary = []
+        for interview in interviews[:HYPOTHESIS_PROMPT_INTERVIEWS]:
+            summary = f"""
 ペルソナ: {interview.persona_name}
 回答: {' / '.join(interview.answers[:3])}...  # 最初の3つの回答
 洞察: {' / '.join(interview.key_insights)}
 裏付け: {' / '.join(interview.supporting_evidence[:2]) if interview.supporting_evidence else 'なし'}
 """
-        interviews_summary.append(summary)
+            interviews_summary.append(summary)
     
-    separator = '─' * 40
-    interviews_text = f"\n{separator}\n".join(interviews_summary)
+        separator = '─' * 40
+        interviews_text = f"\n{separator}\n".join(interviews_summary)
+        if len(interviews) > HYPOTHESIS_PROMPT_INTERVIEWS:
+            interviews_text += (
+                f"\n{separator}\n（ほか{len(interviews) - HYPOTHESIS_PROMPT_INTERVIEWS}件のヒアリング結果は"
+                "洞察のクラスタにまとめています）"
+            )
     
-    hypothesis_prompt = f"""
+        hypothesis_prompt = f"""
 以下のヒアリング結果を分析し、課題仮説とインサイト仮説を生成してください。
 
 テーマ:
-{theme}
+{theme_briefing.text_for(PHASE_HYPOTHESES)}
+
+洞察のクラスタ（全{len(interviews)}件のヒアリングの洞察を類似度でまとめたもの。[ペルソナ数・洞察の数] 代表的な洞察）:
+{clusters_text}
 
 ヒアリング結果:
 {separator}
 {interviews_text}
 
 要件:
-- 複数のペルソナから共通して見られるパターンを抽出する
+- 複数のペルソナから共通して見られるパターンを抽出する（洞察のクラスタのペルソナ数を共通性の根拠にする）
 - 検証可能な仮説を立てる
 - 各仮説に根拠と確信度を示す
 - 課題仮説とインサイト仮説の両方を含める
 - 5-10個程度の仮説に絞り込む
 """
     
-    result = await Runner.run(hypothesis_builder, hypothesis_prompt)
-    hypotheses = result.final_output_as(HypothesisList)
-    
-    if verbose:
-        print(f"✅ 課題仮説 {len(hypotheses.problem_hypotheses)}個、"
-              f"インサイト仮説 {len(hypotheses.insight_hypotheses)}個を生成しました")
-        print()
+        hypotheses = await caller.run(hypothesis_builder, hypothesis_prompt, HypothesisList)
+    emitter.emit(PhaseFinished(
+        phase=PHASE_HYPOTHESES,
+        elapsed=time.perf_counter() - phase_started,
+        result=hypotheses,
+    ))
     
     # フェーズ5: 仮説検証用のヒアリング項目洗い出し
-    if verbose:
-        print("─" * 80)
-        print("🔍 フェーズ5: 仮説検証用のヒアリング項目洗い出し")
-        print("─" * 80)
+    validation_questions = _resumed(resume_from, "validation_questions")
+    emitter.emit(PhaseStarted(
+        phase=PHASE_VALIDATION_QUESTIONS, detail=_resume_detail(validation_questions),
+    ))
+    phase_started = time.perf_counter()
     
-    validation_designer = create_validation_question_designer_agent()
+    if validation_questions is None:
+        validation_designer = cached_agent(create_validation_question_designer_agent)
     
-    # 仮説を整形
-    problem_hyp_text = "\n".join([
-        f"- {h.statement} (確信度: {h.confidence_level}/10)"
-        for h in hypotheses.problem_hypotheses
-    ])
+        # 仮説を整形
+        problem_hyp_text = "\n".join([
+            f"- {h.statement} (確信度: {h.confidence_level}/10)"
+            for h in hypotheses.problem_hypotheses
+        ])
     
-    insight_hyp_text = "\n".join([
-        f"- {h.statement} (確信度: {h.confidence_level}/10)"
-        for h in hypotheses.insight_hypotheses
-    ])
+        insight_hyp_text = "\n".join([
+            f"- {h.statement} (確信度: {h.confidence_level}/10)"
+            for h in hypotheses.insight_hypotheses
+        ])
     
-    validation_prompt = f"""
+        validation_prompt = f"""
 以下の仮説を検証するための効果的なヒアリング項目を設計してください。
 
 テーマ:
-{theme}
+{theme_briefing.text_for(PHASE_VALIDATION_QUESTIONS)}
 
 課題仮説:
 {problem_hyp_text}
@@ -259,66 +1015,271 @@ async def run_multi_persona_hearing_workflow(
 - 10-20問程度に絞り込む
 """
     
-    result = await Runner.run(validation_designer, validation_prompt)
-    validation_questions = result.final_output_as(ValidationQuestionsOutput)
+        validation_questions = await caller.run(
+            validation_designer, validation_prompt, ValidationQuestionsOutput
+        )
+    emitter.emit(PhaseFinished(
+        phase=PHASE_VALIDATION_QUESTIONS,
+        elapsed=time.perf_counter() - phase_started,
+        result=validation_questions,
+    ))
     
-    if verbose:
-        print(f"✅ {len(validation_questions.questions)}個の検証用質問を設計しました")
-        print()
-        print("=" * 80)
-        print("🎉 ワークフロー完了")
-        print("=" * 80)
-        print()
-    
-    return (
-        personas_output,
-        questions_output,
-        interviews,
-        hypotheses,
-        validation_questions,
+    workflow_result = HearingWorkflowResult(
+        personas_output=personas_output,
+        questions_output=questions_output,
+        interviews=interviews,
+        hypotheses=hypotheses,
+        validation_questions=validation_questions,
+        run_report=run_report,
     )
+    emitter.emit(WorkflowFinished(workflow="hearing", result=workflow_result))
+    return workflow_result
 
 
-async def run_question_evaluation_workflow(
+def stream_multi_persona_hearing_workflow(
     theme: str,
-    initial_questions: InterviewQuestionsOutput,
-    validation_questions: ValidationQuestionsOutput,
+    **kwargs: Any,
+) -> AsyncIterator[WorkflowEvent]:
+    """
+    複数ペルソナヒアリングワークフローを実行し、進捗イベントを順に返す.
+    
+    引数は run_multi_persona_hearing_workflow と同じ（verbose の既定値のみ False）。
+    ヒアリング結果は完了したものから InterviewCompleted として届き、
+    最後の WorkflowFinished の result に HearingWorkflowResult が入る。
+    
+    使用例:
+        async for event in stream_multi_persona_hearing_workflow(theme):
+            if isinstance(event, InterviewCompleted):
+                ...
+    """
+    kwargs.setdefault("verbose", False)
+    return stream_events(run_multi_persona_hearing_workflow, theme=theme, **kwargs)
+
+
+def _hypothesis_catalog(hypotheses: HypothesisList) -> List[HypothesisTally]:
+    """仮説にIDを振り、集計用の空の HypothesisTally を作る."""
+    catalog = [
+        HypothesisTally(hypothesis_id=f"P{i}", hypothesis_type="課題仮説", statement=h.statement)
+        for i, h in enumerate(hypotheses.problem_hypotheses, 1)
+    ]
+    catalog.extend(
+        HypothesisTally(hypothesis_id=f"I{i}", hypothesis_type="インサイト仮説", statement=h.statement)
+        for i, h in enumerate(hypotheses.insight_hypotheses, 1)
+    )
+    return catalog
+
+
+def _sample_indices(total: int, sample_size: Optional[int]) -> List[int]:
+    """ペルソナ全体から偏りなく等間隔にインデックスを選ぶ."""
+    if sample_size is None or sample_size >= total:
+        return list(range(total))
+    if sample_size < 1:
+        raise ValueError("sample_size は1以上を指定してください")
+    return [i * total // sample_size for i in range(sample_size)]
+
+
+async def run_validation_interview_workflow(
+    theme: str,
+    personas_output: PersonasOutput,
     hypotheses: HypothesisList,
+    validation_questions: ValidationQuestionsOutput,
+    sample_size: Optional[int] = None,
+    max_concurrency: int = 5,
     verbose: bool = True,
-) -> EvaluationReport:
+    on_event: Optional[EventHandler] = None,
+    deadline: Optional[Deadline] = None,
+    call_timeout: Optional[float] = None,
+    run_config: Optional[RunConfig] = None,
+    hedging: Optional[HedgingPolicy] = None,
+    budget: Optional[RunBudget] = None,
+    cassette: Optional[Cassette] = None,
+    theme_briefing: Optional[ThemeBriefing] = None,
+) -> ValidationInterviewReport:
     """
-    質問セット評価ワークフローを実行する.
+    検証ヒアリングワークフロー（フェーズ6）を実行する.
     
-    初回ヒアリング質問と検証用ヒアリング質問を比較・評価し、
-    質問設計の進化と改善点を分析するレポートを生成する。
+    生成済みのペルソナ（または等間隔に選んだ一部）に検証用質問を並行して
+    投げかけ、各仮説を支持・反証したペルソナの数を集計する。
     
     Args:
         theme: ヒアリングのテーマ
-        initial_questions: 初回ヒアリング質問
-        validation_questions: 検証用ヒアリング質問
-        hypotheses: 立てられた仮説（コンテキスト情報として使用）
+        personas_output: フェーズ1で生成したペルソナ
+        hypotheses: フェーズ4で生成した仮説
+        validation_questions: フェーズ5で設計した検証用質問
+        sample_size: 検証ヒアリングを行うペルソナの数（None なら全員）
+        max_concurrency: 同時に実行するヒアリングの最大数
         verbose: 進捗を表示するか
+        on_event: 進捗イベント（workflows.events）を受け取るコールバック
+        deadline: 実行全体の期限。期限を過ぎると実行中のヒアリングを
+            キャンセルし、完了済みの結果だけで集計する（report.partial が True になる）。
+        call_timeout: エージェント呼び出し1回あたりのタイムアウト（秒）
+        run_config: エージェント実行時の設定（モデルプロバイダーの差し替えなど）
+        hedging: 遅い呼び出しへの重複リクエストの方針（workflows.hedging）
+        budget: 実行全体のトークン数・費用の予算（workflows.budget）。予算を超える
+            呼び出しは行わず、そのペルソナは「予算により中断」として記録する。
+        cassette: エージェント呼び出しの記録・再生（workflows.cassette）。記録モードでは
+            成功した呼び出しをカセットに追記し、再生モードでは API を呼び出さずに記録した出力を使う。
+        theme_briefing: テーマのブリーフ。プロンプトに元のテーマの代わりに埋め込む
     
     Returns:
-        EvaluationReport: 評価レポート
+        ValidationInterviewReport: 検証ヒアリング結果と仮説ごとの集計
     """
-    if verbose:
-        print("=" * 80)
-        print("📊 質問セット評価ワークフローを開始します")
-        print("=" * 80)
-        print()
+    indices = _sample_indices(len(personas_output.personas), sample_size)
     
-    # 質問評価エージェントの作成
-    evaluator = create_question_evaluator_agent()
+    emitter, caller = _create_caller(
+        verbose, on_event, call_timeout, run_config, hedging, budget, cassette, theme_briefing,
+    )
+    if theme_briefing is None:
+        theme_briefing = ThemeBriefing(theme)
+    emitter.emit(PhaseStarted(
+        phase=PHASE_VALIDATION_INTERVIEWS,
+        detail=f"対象ペルソナ: {len(indices)}/{len(personas_output.personas)}名",
+    ))
+    phase_started = time.perf_counter()
     
-    # 評価用プロンプトの作成
-    evaluation_prompt = f"""
-以下の情報に基づいて、初回ヒアリング質問と検証用ヒアリング質問を比較・評価してください。
+    validation_interviewer = cached_agent(create_validation_interviewer_agent)
+    tallies = _hypothesis_catalog(hypotheses)
+    hypotheses_text = "\n".join(
+        f"- {tally.hypothesis_id} ({tally.hypothesis_type}): {tally.statement}"
+        for tally in tallies
+    )
+    questions_text = _format_questions(validation_questions.questions)
+    
+    async def interview_persona(position: int) -> ValidationInterviewResponse:
+        persona = personas_output.personas[indices[position]]
+        validation_prompt = f"""
+あなたは以下のペルソナになりきって、検証用の質問に回答してください。
+
+テーマ:
+{theme_briefing.text_for(PHASE_VALIDATION_INTERVIEWS)}
+{_format_persona_info(persona)}
+
+検証対象の仮説:
+{hypotheses_text}
+
+質問リスト:
+{questions_text}
+
+要件:
+- ペルソナの背景や属性を踏まえ、仮説に迎合せずに回答する
+- すべての仮説について「支持」「反証」「判断不能」のいずれかで判定する
+- 判定の根拠となった回答内容を添える
+"""
+        emitter.emit(InterviewStarted(
+            phase=PHASE_VALIDATION_INTERVIEWS, index=position, total=len(indices),
+            persona_name=persona.name,
+        ))
+        try:
+            response = await caller.run(
+                validation_interviewer, validation_prompt, ValidationInterviewResponse
+            )
+        except Exception as e:
+            emitter.emit(InterviewFailed(
+                phase=PHASE_VALIDATION_INTERVIEWS, index=position, total=len(indices),
+                persona_name=persona.name, error=str(e),
+            ))
+            raise
+        emitter.emit(InterviewCompleted(
+            phase=PHASE_VALIDATION_INTERVIEWS, index=position, total=len(indices),
+            persona_name=persona.name, response=response,
+        ))
+        return response
+    
+    outcomes = await _run_bounded(
+        len(indices),
+        interview_persona,
+        max_concurrency,
+        should_start=lambda: deadline is None or not deadline.expired,
+        timeout=deadline.remaining() if deadline is not None else None,
+    )
+    
+    report = ValidationInterviewReport(personas_sampled=len(indices), tallies=tallies)
+    tally_by_id = {tally.hypothesis_id: tally for tally in tallies}
+    for index, outcome in zip(indices, outcomes):
+        if not isinstance(outcome, ValidationInterviewResponse):
+            persona = personas_output.personas[index]
+            if isinstance(outcome, DeadlineExceeded):
+                reason = "期限により中断"
+            elif isinstance(outcome, BudgetExceeded):
+                reason = "予算により中断"
+            elif outcome is None:
+                reason = "期限により未実施"
+            else:
+                reason = f"エラー: {outcome}"
+            report.failed.append(
+                NotInterviewedPersona(
+                    persona_index=index + 1,
+                    persona_name=persona.name,
+                    reason=reason,
+                )
+            )
+            continue
+        report.interviews.append(outcome)
+        # 1人のペルソナが同じ仮説を重複して判定しても1票として数える
+        seen = set()
+        for verdict in outcome.verdicts:
+            tally = tally_by_id.get(verdict.hypothesis_id.strip().upper())
+            if tally is None or tally.hypothesis_id in seen:
+                continue
+            seen.add(tally.hypothesis_id)
+            if verdict.verdict == "支持":
+                tally.support += 1
+            elif verdict.verdict == "反証":
+                tally.refute += 1
+            else:
+                tally.inconclusive += 1
+    
+    report.partial = any(failed.reason.startswith("期限により") for failed in report.failed)
+    if report.partial:
+        emitter.emit(DeadlineReached(
+            phase=PHASE_VALIDATION_INTERVIEWS,
+            completed=len(report.interviews),
+            total=len(indices),
+        ))
+    emitter.emit(PhaseFinished(
+        phase=PHASE_VALIDATION_INTERVIEWS,
+        elapsed=time.perf_counter() - phase_started,
+        result=report,
+    ))
+    return report
+
 
+def _format_question_facts(facts: QuestionSetFacts) -> str:
+    """ローカルで計算した比較の事実を評価用プロンプト向けに整形する."""
+    comparison = facts.comparison
+    lines = [
+        f"- 質問数: 初回 {comparison.question_count_initial}問 → 検証 {comparison.question_count_validation}問"
+        f"（{comparison.count_change_percent:+.1f}%）",
+    ]
+    for label, metrics in (("初回", facts.initial_metrics), ("検証", facts.validation_metrics)):
+        lines.append(
+            f"- {label}質問: 平均 {metrics.average_length:.1f}文字、"
+            f"具体的な事例・数値を求める質問 {metrics.specific_ratio:.0%}、"
+            f"疑問詞で広く尋ねる質問 {metrics.open_ended_ratio:.0%}"
+        )
+    lines.append("")
+    lines.append("トピック（質問文と意図の類似度で対応付け）:")
+    for number, topic in enumerate(facts.topics, 1):
+        initial = f"初回{topic.initial_questions}" if not topic.is_new else "初回なし（新しいトピック）"
+        lines.append(f"{number}. {initial} ↔ 検証{topic.validation_questions}")
+    if facts.unmatched_initial:
+        lines.append(f"検証質問と対応しない初回質問: {facts.unmatched_initial}")
+    return "\n".join(lines)
+
+
+def _format_evaluation_context(
+    theme: str,
+    initial_questions: InterviewQuestionsOutput,
+    validation_questions: ValidationQuestionsOutput,
+    hypotheses: HypothesisList,
+    facts: QuestionSetFacts,
+) -> str:
+    """評価用プロンプトに共通するテーマ・質問セット・仮説・事前計算した比較の情報を整形する."""
+    context = f"""
 ## テーマ
 {theme}
 
-## 初回ヒアリング質問（15問）
+## 初回ヒアリング質問（{len(initial_questions.questions)}問）
 設計の意図:
 {initial_questions.design_rationale}
 
@@ -327,9 +1288,9 @@ async def run_question_evaluation_workflow(
     
     # 初回質問の詳細を追加
     for i, q in enumerate(initial_questions.questions, 1):
-        evaluation_prompt += f"\n{i}. {q.question}\n   意図: {q.intent}"
+        context += f"\n{i}. {q.question}\n   意図: {q.intent}"
     
-    evaluation_prompt += f"""
+    context += f"""
 
 ## 検証用ヒアリング質問（{len(validation_questions.questions)}問）
 検証戦略:
@@ -340,18 +1301,18 @@ async def run_question_evaluation_workflow(
     
     # 優先順位を追加
     for i, priority_q in enumerate(validation_questions.priority_order[:5], 1):
-        evaluation_prompt += f"\n{i}. {priority_q}"
+        context += f"\n{i}. {priority_q}"
     
-    evaluation_prompt += f"""
+    context += f"""
 
 全質問リスト:
 """
     
     # 検証質問の詳細を追加
     for i, q in enumerate(validation_questions.questions, 1):
-        evaluation_prompt += f"\n{i}. {q.question}\n   意図: {q.intent}"
+        context += f"\n{i}. {q.question}\n   意図: {q.intent}"
     
-    evaluation_prompt += f"""
+    context += f"""
 
 ## 立てられた仮説の概要
 課題仮説: {len(hypotheses.problem_hypotheses)}個
@@ -360,50 +1321,246 @@ async def run_question_evaluation_workflow(
 統合的サマリー:
 {hypotheses.synthesis_summary}
 
+## 事前計算した比較（確定値。再計算しない）
+{_format_question_facts(facts)}
+"""
+    return context
+
+
+def _topic_mappings(facts: QuestionSetFacts, assessments: Sequence[TopicAssessment]) -> List[QuestionMapping]:
+    """
+    事前に対応付けたトピックに、評価エージェントが付けた名前・深化度・分析を組み合わせる.
+    
+    質問番号は事前計算のものを使う。評価されなかったトピックは、検証質問の先頭の質問文を
+    トピック名にして「同等」とする。
+    """
+    by_number = {a.topic_number: a for a in assessments}
+    mappings = []
+    for number, topic in enumerate(facts.topics, 1):
+        assessment = by_number.get(number)
+        mappings.append(QuestionMapping(
+            topic=assessment.topic if assessment else f"検証質問{topic.validation_questions[0]}のトピック",
+            initial_questions=topic.initial_questions,
+            validation_questions=topic.validation_questions,
+            depth_level=assessment.depth_level if assessment else "同等",
+            analysis=assessment.analysis if assessment else "（評価されませんでした）",
+        ))
+    return mappings
+
+
+def _assemble_report(
+    facts: QuestionSetFacts,
+    assessment: Union[EvaluationJudgement, EvaluationSynthesis],
+    dimensions: List[DimensionJudgement],
+    topics: Sequence[TopicAssessment],
+) -> EvaluationReport:
+    """エージェントの評価と、ローカルで計算した事実から評価レポートを組み立てる."""
+    # 改善ポイント数はスコアの差なので、エージェントには計算させずにここで求める
+    dimensions = [
+        EvaluationDimension(
+            **d.model_dump(),
+            improvement_points=round(d.validation_score - d.initial_score, 2),
+        )
+        for d in dimensions
+    ]
+    return EvaluationReport(
+        title=assessment.title,
+        evaluation_date=datetime.date.today().isoformat(),
+        comparison=facts.comparison,
+        overall_assessment=assessment.overall_assessment,
+        evaluation_dimensions=dimensions,
+        summary_scores={d.dimension_name: d.validation_score for d in dimensions},
+        question_mappings=_topic_mappings(facts, topics),
+        key_improvements=assessment.key_improvements,
+        recommendations=assessment.recommendations,
+        strengths_initial=assessment.strengths_initial,
+        strengths_validation=assessment.strengths_validation,
+        future_improvements=assessment.future_improvements,
+        initial_metrics=facts.initial_metrics,
+        validation_metrics=facts.validation_metrics,
+    )
+
+
+async def _evaluate_in_parallel(
+    evaluation_context: str,
+    facts: QuestionSetFacts,
+    caller: AgentCaller,
+) -> EvaluationReport:
+    """
+    評価側面ごと・トピックごとに並行して評価し、統合して評価レポートを作る.
+    
+    7つの評価側面とトピックの評価を同時に小さな呼び出しで評価した後、
+    結果の要約だけを渡す軽量な統合呼び出しで総評をまとめる。
+    """
+    dimension_evaluator = cached_agent(create_dimension_evaluator_agent)
+    question_mapper = cached_agent(create_question_mapper_agent)
+    synthesizer = cached_agent(create_evaluation_synthesizer_agent)
+    
+    async def evaluate_dimension(name: str, description: str) -> DimensionJudgement:
+        dimension_prompt = f"""
+以下の情報に基づいて、評価側面「{name}」についてのみ、初回ヒアリング質問と検証用ヒアリング質問を比較・評価してください。
+{evaluation_context}
+## 評価タスク
+評価側面: **{name}** - {description}
+
+- 初回質問のスコア（0-5）
+- 検証質問のスコア（0-5）
+- 詳細説明と具体例
+- この側面での主な変化点
+"""
+        dimension = await caller.run(dimension_evaluator, dimension_prompt, DimensionJudgement)
+        # 統合時に項目名がぶれないよう、指定した名前に揃える
+        return dimension.model_copy(update={"dimension_name": name})
+    
+    async def assess_topics() -> List[TopicAssessment]:
+        if not facts.topics:
+            return []
+        mapping_prompt = f"""
+以下の情報に基づいて、事前に対応付けた各トピックの名前・深化度・分析を評価してください。
+{evaluation_context}"""
+        output = await caller.run(question_mapper, mapping_prompt, TopicAssessmentsOutput)
+        return output.assessments
+    
+    *dimensions, topics = await asyncio.gather(
+        *(evaluate_dimension(name, description) for name, description in EVALUATION_DIMENSIONS),
+        assess_topics(),
+    )
+    
+    dimensions_text = "\n".join(
+        f"- {d.dimension_name}: 初回 {d.initial_score:.1f} → 検証 {d.validation_score:.1f}"
+        f"（{d.explanation}）主な変化: {' / '.join(d.key_changes)}"
+        for d in dimensions
+    )
+    mappings_text = "\n".join(
+        f"- {m.topic}: 初回{m.initial_questions} → 検証{m.validation_questions}（{m.depth_level}）"
+        for m in _topic_mappings(facts, topics)
+    )
+    synthesis_prompt = f"""
+以下の評価結果を統合し、質問セット評価レポートの総評をまとめてください。
+{evaluation_context}
+## 評価側面ごとの結果
+{dimensions_text}
+
+## テーマ別マッピング
+{mappings_text}
+"""
+    synthesis = await caller.run(synthesizer, synthesis_prompt, EvaluationSynthesis)
+    return _assemble_report(facts, synthesis, dimensions, topics)
+
+
+async def run_question_evaluation_workflow(
+    theme: str,
+    initial_questions: InterviewQuestionsOutput,
+    validation_questions: ValidationQuestionsOutput,
+    hypotheses: HypothesisList,
+    verbose: bool = True,
+    mode: Literal["single", "parallel"] = "single",
+    on_event: Optional[EventHandler] = None,
+    call_timeout: Optional[float] = None,
+    run_config: Optional[RunConfig] = None,
+    hedging: Optional[HedgingPolicy] = None,
+    budget: Optional[RunBudget] = None,
+    cassette: Optional[Cassette] = None,
+    theme_briefing: Optional[ThemeBriefing] = None,
+) -> EvaluationReport:
+    """
+    質問セット評価ワークフローを実行する.
+    
+    初回ヒアリング質問と検証用ヒアリング質問を比較・評価し、
+    質問設計の進化と改善点を分析するレポートを生成する。
+    質問数・変化率・トピックの対応付け・字句的な指標はローカルで計算して評価エージェントに
+    事実として渡し、エージェントの評価と合わせてレポートに組み込む。
+    
+    Args:
+        theme: ヒアリングのテーマ
+        initial_questions: 初回ヒアリング質問
+        validation_questions: 検証用ヒアリング質問
+        hypotheses: 立てられた仮説（コンテキスト情報として使用）
+        verbose: 進捗を表示するか
+        mode: "single" は1回の呼び出しでレポート全体を生成する。
+            "parallel" は評価側面ごと・マッピングを並行して評価し、
+            最後に軽量な統合呼び出しでレポートを組み立てる。
+        on_event: 進捗イベント（workflows.events）を受け取るコールバック
+        call_timeout: エージェント呼び出し1回あたりのタイムアウト（秒）
+        run_config: エージェント実行時の設定（モデルプロバイダーの差し替えなど）
+        hedging: 遅い呼び出しへの重複リクエストの方針（workflows.hedging）
+        budget: 実行全体のトークン数・費用の予算（workflows.budget）。予算を超える
+            呼び出しは行わず BudgetExceeded を送出する。
+        cassette: エージェント呼び出しの記録・再生（workflows.cassette）。記録モードでは
+            成功した呼び出しをカセットに追記し、再生モードでは API を呼び出さずに記録した出力を使う。
+        theme_briefing: テーマのブリーフ。プロンプトに元のテーマの代わりに埋め込む
+    
+    Returns:
+        EvaluationReport: 評価レポート
+    """
+    if mode not in ("single", "parallel"):
+        raise ValueError(f"未対応の評価モードです: {mode}")
+    
+    emitter, caller = _create_caller(
+        verbose, on_event, call_timeout, run_config, hedging, budget, cassette, theme_briefing,
+    )
+    emitter.emit(WorkflowStarted(workflow="evaluation", theme=theme))
+    
+    if theme_briefing is None:
+        theme_briefing = ThemeBriefing(theme)
+    # 質問数・変化率・トピックの対応付けはローカルで計算し、事実として渡す
+    facts = compare_question_sets(theme, initial_questions.questions, validation_questions.questions)
+    # 並列評価では評価側面ごと・マッピング・統合の各プロンプトに同じ情報を渡す
+    prompts = len(EVALUATION_DIMENSIONS) + 2 if mode == "parallel" else 1
+    evaluation_context = _format_evaluation_context(
+        theme_briefing.text_for(PHASE_EVALUATION, prompts),
+        initial_questions, validation_questions, hypotheses, facts,
+    )
+    
+    emitter.emit(PhaseStarted(
+        phase=PHASE_EVALUATION,
+        detail=(
+            f"{len(EVALUATION_DIMENSIONS)}側面 + マッピングを並行評価"
+            if mode == "parallel" else None
+        ),
+    ))
+    phase_started = time.perf_counter()
+    
+    if mode == "parallel":
+        evaluation_report = await _evaluate_in_parallel(evaluation_context, facts, caller)
+    else:
+        # 質問評価エージェントの作成
+        evaluator = cached_agent(create_question_evaluator_agent)
+        
+        # 評価用プロンプトの作成
+        dimensions_text = "\n".join(
+            f"{i}. **{name}** - {description}"
+            for i, (name, description) in enumerate(EVALUATION_DIMENSIONS, 1)
+        )
+        evaluation_prompt = f"""
+以下の情報に基づいて、初回ヒアリング質問と検証用ヒアリング質問を比較・評価してください。
+{evaluation_context}
 ## 評価タスク
 以下の側面から、2つの質問セットを総合的に比較・評価してください：
 
-1. **仮説との紐付けの明確さ** - 検証質問は各質問が仮説と明確に対応しているか
-2. **反証可能性** - 仮説の棄却を可能にする設計になっているか
-3. **中立性への配慮** - 特定ソリューションへの誘導がないか
-4. **質問の具体性** - 具体的なケースや実例を求める表現の度合い
-5. **深さ・掘り下げ** - 単一質問での深掘り度合い
-6. **観点の幅** - 複数のステークホルダー・課題領域をカバーしているか
-7. **実用性** - 実施可能性と時間効率
+{dimensions_text}
 
 各側面について：
 - 初回質問のスコア（0-5）
 - 検証質問のスコア（0-5）
-- 改善ポイント数
 - 詳細説明と具体例
 
 その上で、以下を含む総合レポートを作成してください：
 - 両者の強み
-- テーマ別のマッピング
+- 事前に対応付けた各トピックの名前・深化度・分析（トピックの番号で対応させる）
 - 今後の改善提案
 - ハイブリッド版への提案
 """
+        
+        judgement = await caller.run(evaluator, evaluation_prompt, EvaluationJudgement)
+        evaluation_report = _assemble_report(
+            facts, judgement, judgement.evaluation_dimensions, judgement.topic_assessments,
+        )
     
-    if verbose:
-        print("─" * 80)
-        print("📋 質問セット評価分析中...")
-        print("─" * 80)
-    
-    result = await Runner.run(evaluator, evaluation_prompt)
-    evaluation_report = result.final_output_as(EvaluationReport)
-    
-    if verbose:
-        print(f"✅ 評価レポートを生成しました")
-        print()
-        print("主要な評価結果:")
-        print(f"  - 初回質問: {evaluation_report.comparison.question_count_initial}問")
-        print(f"  - 検証質問: {evaluation_report.comparison.question_count_validation}問")
-        print(f"  - 質問数の変化率: {evaluation_report.comparison.count_change_percent:+.1f}%")
-        print()
-        print("最重要改善ポイント:")
-        for i, improvement in enumerate(evaluation_report.key_improvements[:3], 1):
-            print(f"  {i}. {improvement}")
-        print()
-    
+    emitter.emit(PhaseFinished(
+        phase=PHASE_EVALUATION,
+        elapsed=time.perf_counter() - phase_started,
+        result=evaluation_report,
+    ))
+    emitter.emit(WorkflowFinished(workflow="evaluation", result=evaluation_report))
     return evaluation_report
-
@@ -0,0 +1,176 @@
+"""
+長いテーマの構造化ブリーフ.
+
+テーマはペルソナ生成・質問設計・仮説生成・検証・評価のすべてのプロンプトにそのまま埋め込まれるため、
+長い企画書をテーマにすると入力トークンがフェーズの数だけ増える。ThemeBriefing は
+実行の最初に一度だけ作ったブリーフ（ThemeBrief）を、指定したフェーズ以外のプロンプトで
+元のテーマの代わりに渡す。ブリーフはテーマのハッシュをキーにしてファイルにキャッシュする。
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from models.run_report import ThemeBriefReport
+from models.schemas import ThemeBrief
+from workflows.budget import estimate_tokens
+from workflows.events import (
+    PHASE_PERSONAS,
+    PHASE_QUESTIONS,
+    PHASE_HYPOTHESES,
+    PHASE_VALIDATION_QUESTIONS,
+    PHASE_VALIDATION_INTERVIEWS,
+    PHASE_EVALUATION,
+    UsageUpdated,
+    WorkflowEvent,
+)
+
+
+# プロンプトにテーマを埋め込むフェーズ
+THEME_PHASES = (
+    PHASE_PERSONAS,
+    PHASE_QUESTIONS,
+    PHASE_HYPOTHESES,
+    PHASE_VALIDATION_QUESTIONS,
+    PHASE_VALIDATION_INTERVIEWS,
+    PHASE_EVALUATION,
+)
+
+# これより短いテーマは要約せずにそのまま使う（文字数）
+BRIEF_MIN_CHARS = 1500
+
+# ブリーフの形式・要約の方針を変えたら上げる（古いキャッシュを使わないようにする）
+BRIEF_VERSION = 1
+
+
+def theme_hash(theme: str) -> str:
+    """ブリーフのキャッシュのキー."""
+    return hashlib.sha256(f"{BRIEF_VERSION}\n{theme}".encode("utf-8")).hexdigest()[:16]
+
+
+def format_theme_brief(brief: ThemeBrief) -> str:
+    """プロンプトに埋め込むブリーフのテキスト."""
+    sections = [("対象ユーザー", brief.target_users), ("明らかにしたいこと", brief.goals),
+                ("前提", brief.key_facts), ("制約", brief.constraints)]
+    lines = [brief.summary]
+    for title, items in sections:
+        if items:
+            lines.append(f"{title}:")
+            lines.extend(f"- {item}" for item in items)
+    return "\n".join(lines)
+
+
+class ThemeBriefCache:
+    """
+    テーマのハッシュごとにブリーフを保存するキャッシュ.
+
+    Args:
+        directory: ブリーフのJSONファイルを保存するディレクトリ
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+
+    def _path(self, theme: str) -> Path:
+        return self.directory / f"{theme_hash(theme)}.json"
+
+    def get(self, theme: str) -> Optional[ThemeBrief]:
+        """キャッシュしたブリーフ（なければ None。壊れたファイルは無視する）."""
+        path = self._path(theme)
+        try:
+            return ThemeBrief.model_validate_json(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, theme: str, brief: ThemeBrief) -> None:
+        """ブリーフを保存する（一時ファイル経由で書き込む）."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(brief.model_dump_json(indent=2))
+        os.replace(tmp, self._path(theme))
+
+
+class ThemeBriefing:
+    """
+    ワークフローのプロンプトに埋め込むテーマ.
+
+    ブリーフがあれば full_text_phases 以外のフェーズではブリーフを、なければ元のテーマを返す。
+    ワークフローのイベントを購読して実行全体の入力トークン数を数え、
+    ブリーフを使わなかった場合との比較を report() で返す。
+
+    Args:
+        theme: 元のテーマ
+        brief: テーマのブリーフ（None なら常に元のテーマを使う）
+        full_text_phases: ブリーフを使わずに元のテーマを渡すフェーズ
+        cached: ブリーフをキャッシュから読み込んだか
+    """
+
+    def __init__(
+        self,
+        theme: str,
+        brief: Optional[ThemeBrief] = None,
+        full_text_phases: Iterable[str] = (),
+        cached: bool = False,
+    ):
+        self.full_text_phases = frozenset(full_text_phases)
+        unknown = self.full_text_phases - set(THEME_PHASES)
+        if unknown:
+            raise ValueError(
+                f"テーマを渡さないフェーズです: {', '.join(sorted(unknown))}（{', '.join(THEME_PHASES)}）"
+            )
+        self.theme = theme
+        self.brief: Optional[ThemeBrief] = None
+        self.cached = False
+        self.text: Optional[str] = None
+        self.prompts_with_brief = 0
+        self.input_tokens = 0
+        self.brief_input_tokens = 0
+        if brief is not None:
+            self.use(brief, cached=cached)
+
+    def use(self, brief: ThemeBrief, cached: bool = False) -> None:
+        """以降のプロンプトでブリーフを使う."""
+        self.brief = brief
+        self.cached = cached
+        self.text = format_theme_brief(brief)
+
+    def text_for(self, phase: str, prompts: int = 1) -> str:
+        """
+        phase のプロンプトに埋め込むテーマ.
+
+        Args:
+            phase: プロンプトを作るフェーズ
+            prompts: このテキストを埋め込むプロンプトの数（削減量の集計に使う）
+        """
+        if self.text is None or phase in self.full_text_phases:
+            return self.theme
+        self.prompts_with_brief += prompts
+        return self.text
+
+    def __call__(self, event: WorkflowEvent) -> None:
+        if isinstance(event, UsageUpdated):
+            self.input_tokens += event.input_tokens
+            if event.agent_name == "ThemeBriefer":
+                self.brief_input_tokens += event.input_tokens
+
+    def report(self) -> Optional[ThemeBriefReport]:
+        """入力トークンの削減状況（ブリーフを使わなかった場合は None）."""
+        if self.text is None:
+            return None
+        theme_tokens = estimate_tokens(self.theme)
+        brief_tokens = estimate_tokens(self.text)
+        return ThemeBriefReport(
+            theme_tokens=theme_tokens,
+            brief_tokens=brief_tokens,
+            cached=self.cached,
+            brief_input_tokens=self.brief_input_tokens,
+            prompts_with_brief=self.prompts_with_brief,
+            full_text_phases=sorted(self.full_text_phases),
+            input_tokens=self.input_tokens,
+            input_tokens_without_brief=(
+                self.input_tokens - self.brief_input_tokens
+                + self.prompts_with_brief * (theme_tokens - brief_tokens)
+            ),
+        )
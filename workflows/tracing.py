@@ -0,0 +1,459 @@
+"""
+フェーズ・ヒアリング・エージェント呼び出し・ツール呼び出し・ファイル書き込みのトレース.
+
+Tracer.activate() で有効にすると、以降の処理（asyncio のタスクを含む）で作るスパンを
+親子関係つきで記録し、OpenTelemetry（OTLP/JSON）互換の形式でファイルに書き出す。
+フェーズ・ヒアリングのスパンはワークフローのイベントから作り（Tracer はイベントの購読者）、
+エージェント呼び出しとファイル書き込みは trace_span() で囲む。現在のスパンは contextvars で
+持つため、並行に実行されるヒアリングのスパンもそれぞれの親に正しくぶら下がる。
+
+有効にしていない場合、trace_span() は何もしない共通のオブジェクトを返すだけなので、
+トレースの処理はほとんど時間を使わない。
+"""
+import json
+import os
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Union
+
+if TYPE_CHECKING:
+    from workflows.events import WorkflowEvent
+
+
+SERVICE_NAME = "multi_persona_hearing"
+
+# OTLP のスパンの種類と状態
+KIND_INTERNAL = 1
+KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+AttributeValue = Union[str, int, float, bool]
+
+_active_tracer: ContextVar[Optional["Tracer"]] = ContextVar("active_tracer", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """
+    処理の区間.
+
+    Attributes:
+        name: スパンの名前（例: "phase interviews"、"agent Interviewer"）
+        trace_id, span_id, parent_id: OTLP の16進表記の識別子（親がなければ parent_id は None）
+        kind: スパンの種類（KIND_INTERNAL / KIND_CLIENT）
+        start_ns, end_ns: 開始・終了の時刻（UNIX時刻のナノ秒。終了していなければ end_ns は None）
+        attributes: 属性（ペルソナの番号、トークン数、再試行の回数など。None の値は持たない）
+        status: 状態（STATUS_UNSET / STATUS_OK / STATUS_ERROR）と message
+    """
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "kind", "start_ns", "end_ns",
+        "attributes", "status", "message", "parent",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent: Optional["Span"] = None,
+        attributes: Optional[Dict[str, AttributeValue]] = None,
+        kind: int = KIND_INTERNAL,
+        start_ns: Optional[int] = None,
+        span_id: Optional[str] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id or os.urandom(8).hex()
+        self.parent = parent
+        self.parent_id = parent.span_id if parent is not None else None
+        self.kind = kind
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, AttributeValue] = {
+            key: value for key, value in (attributes or {}).items() if value is not None
+        }
+        self.status = STATUS_UNSET
+        self.message = ""
+
+    def set(self, key: str, value: Optional[AttributeValue]) -> None:
+        """属性を設定する（None は設定しない）."""
+        if value is not None:
+            self.attributes[key] = value
+
+    def fail(self, message: str) -> None:
+        """スパンを失敗として記録する."""
+        self.status = STATUS_ERROR
+        self.message = message
+
+    def end(self, end_ns: Optional[int] = None) -> None:
+        if self.end_ns is None:
+            self.end_ns = end_ns if end_ns is not None else time.time_ns()
+
+    @property
+    def duration(self) -> float:
+        """所要時間（秒。終了していなければ 0）."""
+        return (self.end_ns - self.start_ns) / 1e9 if self.end_ns is not None else 0.0
+
+
+class _SpanScope:
+    """スパンを現在のスパンにして、抜けるときに終了するコンテキストマネージャ."""
+
+    __slots__ = ("_span", "_token")
+
+    def __init__(self, span: Span):
+        self._span = span
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is not None:
+            self._span.fail(f"{exc_type.__name__}: {exc}" if str(exc) else exc_type.__name__)
+        elif self._span.status == STATUS_UNSET:
+            self._span.status = STATUS_OK
+        self._span.end()
+        _current_span.reset(self._token)
+        return False
+
+
+class _NullSpan:
+    """トレースが無効なときの何もしないスパン."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def set(self, key: str, value: Optional[AttributeValue]) -> None:
+        pass
+
+    def fail(self, message: str) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+def current_tracer() -> Optional["Tracer"]:
+    """有効なトレーサー（なければ None）."""
+    return _active_tracer.get()
+
+
+def trace_span(
+    name: str,
+    attributes: Optional[Dict[str, AttributeValue]] = None,
+    kind: int = KIND_INTERNAL,
+):
+    """
+    現在のスパンの子スパンで囲むコンテキストマネージャ.
+
+    with trace_span("write", {"file.name": name}) as span: のように使う。
+    トレースが無効なら何もしない NULL_SPAN を返す。
+    """
+    tracer = _active_tracer.get()
+    if tracer is None:
+        return NULL_SPAN
+    return _SpanScope(tracer.start_span(name, attributes, kind))
+
+
+def record_span(
+    name: str,
+    attributes: Optional[Dict[str, AttributeValue]] = None,
+    start_ns: Optional[int] = None,
+) -> None:
+    """
+    終了済みの区間を現在のスパンの子スパンとして記録する（トレースが無効なら何もしない）.
+
+    start_ns を省略すると、長さ0のスパンになる（時刻のわからないホスト型ツールの呼び出しなど）。
+    """
+    tracer = _active_tracer.get()
+    if tracer is None:
+        return
+    span = tracer.start_span(name, attributes, start_ns=start_ns)
+    span.status = STATUS_OK
+    span.end()
+
+
+class Tracer:
+    """
+    1回の実行のスパンを記録する.
+
+    ワークフローのイベントの購読者として、ワークフロー・フェーズ・ヒアリングのスパンを作る。
+
+    Args:
+        service_name: OTLP の resource の service.name
+    """
+
+    def __init__(self, service_name: str = SERVICE_NAME):
+        self.service_name = service_name
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+        self._root: Optional[Span] = None
+        self._tokens = None
+
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, AttributeValue]] = None,
+        kind: int = KIND_INTERNAL,
+        start_ns: Optional[int] = None,
+    ) -> Span:
+        """現在のスパンの子スパンを開始する（現在のスパンは変えない）."""
+        span = Span(name, self.trace_id, _current_span.get(), attributes, kind, start_ns)
+        self.spans.append(span)
+        return span
+
+    def activate(self, root: Optional[str] = None, attributes: Optional[Dict[str, AttributeValue]] = None) -> None:
+        """
+        現在のコンテキスト（以降に作る asyncio のタスクを含む）でトレースを有効にする.
+
+        root を指定すると、その名前のスパンを開始して以降のスパンの親にする。
+        deactivate() で有効にする前の状態に戻す。
+        """
+        self._root = self.start_span(root, attributes) if root is not None else None
+        self._tokens = (_active_tracer.set(self), _current_span.set(self._root or _current_span.get()))
+
+    def deactivate(self, error: Optional[str] = None) -> None:
+        """トレースを無効にし、activate() で開始したスパンを終了する（error を指定すると失敗とする）."""
+        if self._root is not None and self._root.end_ns is None:
+            if error is not None:
+                self._root.fail(error)
+            else:
+                self._root.status = STATUS_OK
+            self._root.end()
+        active_token, span_token = self._tokens
+        _current_span.reset(span_token)
+        _active_tracer.reset(active_token)
+
+    # --- ワークフローのイベントからのスパン ---
+
+    def _open(self, name: str, attributes: Dict[str, AttributeValue]) -> None:
+        _current_span.set(self.start_span(name, attributes))
+
+    def _close(self, match, error: Optional[str] = None) -> Optional[Span]:
+        """現在のスパンから親をたどり、match に合うスパンを終了して、その親を現在のスパンに戻す."""
+        span = _current_span.get()
+        while span is not None and not match(span):
+            span = span.parent
+        if span is None:
+            return None
+        if error is not None:
+            span.fail(error)
+        elif span.status == STATUS_UNSET:
+            span.status = STATUS_OK
+        span.end()
+        _current_span.set(span.parent)
+        return span
+
+    def __call__(self, event: "WorkflowEvent") -> None:
+        # Markdownの再生成（render）でもファイル書き込みのスパンに使うため、asyncio を読み込む
+        # イベントのモジュールはワークフローのイベントを受け取ったときに読み込む
+        from workflows.events import (
+            InterviewCompleted,
+            InterviewFailed,
+            InterviewStarted,
+            PhaseFinished,
+            PhaseStarted,
+            WorkflowFinished,
+            WorkflowStarted,
+        )
+
+        if isinstance(event, WorkflowStarted):
+            self._open(f"workflow {event.workflow}", {"workflow.name": event.workflow})
+        elif isinstance(event, WorkflowFinished):
+            self._close(lambda span: span.attributes.get("workflow.name") == event.workflow)
+        elif isinstance(event, PhaseStarted):
+            self._open(f"phase {event.phase}", {"phase": event.phase})
+        elif isinstance(event, PhaseFinished):
+            self._close(lambda span: span.name == f"phase {event.phase}")
+        elif isinstance(event, InterviewStarted):
+            # ヒアリングごとのタスクの中で発行されるので、タスクごとに現在のスパンが分かれる
+            self._open("interview", {
+                "phase": event.phase,
+                "persona.index": event.index,
+                "persona.name": event.persona_name,
+            })
+        elif isinstance(event, (InterviewCompleted, InterviewFailed)):
+            def match(span: Span) -> bool:
+                return (
+                    span.name == "interview"
+                    and span.attributes.get("phase") == event.phase
+                    and span.attributes.get("persona.index") == event.index
+                )
+            span = self._close(match, event.error if isinstance(event, InterviewFailed) else None)
+            if span is not None and isinstance(event, InterviewCompleted) and event.novelty is not None:
+                span.set("interview.novelty", round(event.novelty, 4))
+
+    # --- 書き出し ---
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """
+        OTLP/JSON（ExportTraceServiceRequest）形式の辞書.
+
+        終了していないスパン（中断された処理）はこの時点で終了し、unfinished 属性を付ける。
+        """
+        now = time.time_ns()
+        for span in self.spans:
+            if span.end_ns is None:
+                span.set("unfinished", True)
+                span.end(now)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [_otlp_span(span) for span in self.spans],
+                }],
+            }],
+        }
+
+    def export(self, path: Union[str, Path]) -> Path:
+        """OTLP/JSON 形式でファイルに書き出す."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_otlp(), ensure_ascii=False, indent=1), encoding="utf-8")
+        return path
+
+
+def _otlp_value(value: AttributeValue) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON では64ビット整数は文字列で表す
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, AttributeValue]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    data: Dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _otlp_attributes(span.attributes),
+        "status": {"code": span.status},
+    }
+    if span.parent_id is not None:
+        data["parentSpanId"] = span.parent_id
+    if span.message:
+        data["status"]["message"] = span.message
+    return data
+
+
+def _attribute_value(value: Dict[str, Any]) -> AttributeValue:
+    if "boolValue" in value:
+        return bool(value["boolValue"])
+    if "intValue" in value:
+        return int(value["intValue"])
+    if "doubleValue" in value:
+        return float(value["doubleValue"])
+    return str(value.get("stringValue", ""))
+
+
+def load_trace(path: Union[str, Path]) -> List[Span]:
+    """OTLP/JSON 形式のトレースファイルからスパンを読み込む（親子関係も復元する）."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    spans = []
+    for resource in data.get("resourceSpans", []):
+        for scope in resource.get("scopeSpans", []):
+            for raw in scope.get("spans", []):
+                span = Span(
+                    raw["name"], raw["traceId"],
+                    attributes={a["key"]: _attribute_value(a["value"]) for a in raw.get("attributes", [])},
+                    kind=raw.get("kind", KIND_INTERNAL),
+                    start_ns=int(raw["startTimeUnixNano"]),
+                    span_id=raw["spanId"],
+                )
+                span.parent_id = raw.get("parentSpanId") or None
+                span.end(int(raw["endTimeUnixNano"]))
+                status = raw.get("status", {})
+                span.status = status.get("code", STATUS_UNSET)
+                span.message = status.get("message", "")
+                spans.append(span)
+    by_id = {span.span_id: span for span in spans}
+    for span in spans:
+        span.parent = by_id.get(span.parent_id)
+    return spans
+
+
+# タイムラインの行の末尾に表示する属性
+_TIMELINE_ATTRIBUTES = (
+    ("persona.name", "{}"),
+    ("agent.retries", "再試行{}回"),
+    ("agent.input_tokens", "入力{}"),
+    ("agent.output_tokens", "出力{}"),
+    ("tool.query", "「{}」"),
+    ("file.name", "{}"),
+)
+
+
+def _walk(spans: List[Span]) -> Iterator[tuple]:
+    """スパンを親子の順（兄弟は開始時刻順）にたどり、(深さ, スパン) を返す."""
+    children: Dict[Optional[str], List[Span]] = {}
+    ids = {span.span_id for span in spans}
+    for span in spans:
+        parent_id = span.parent_id if span.parent_id in ids else None
+        children.setdefault(parent_id, []).append(span)
+    for siblings in children.values():
+        siblings.sort(key=lambda span: span.start_ns)
+    stack = [(0, span) for span in reversed(children.get(None, []))]
+    while stack:
+        depth, span = stack.pop()
+        yield depth, span
+        stack.extend((depth + 1, child) for child in reversed(children.get(span.span_id, [])))
+
+
+def format_trace_timeline(spans: List[Span], width: int = 40, max_depth: Optional[int] = None) -> str:
+    """
+    スパンをタイムライン（ウォーターフォール）のテキストにする.
+
+    各行に、トレースの開始からの経過秒数・所要秒数・全体に対する区間のバーと、
+    スパンの名前（深さで字下げ）・主な属性を表示する。
+    """
+    if not spans:
+        return "スパンがありません"
+    start = min(span.start_ns for span in spans)
+    end = max(span.end_ns or span.start_ns for span in spans)
+    total = max(end - start, 1)
+    lines = [
+        f"トレース {spans[0].trace_id[:16]}（{total / 1e9:.3f}秒、スパン {len(spans)}件）",
+        # 全角の見出しは2桁ずつ表示されるので、その分だけ幅を詰める
+        f"{'開始':>6} {'所要':>6}  {'':{width + 2}}  名前",
+    ]
+    for depth, span in _walk(spans):
+        if max_depth is not None and depth > max_depth:
+            continue
+        span_end = span.end_ns or span.start_ns
+        left = min(width - 1, (span.start_ns - start) * width // total)
+        right = max(left + 1, min(width, -(-(span_end - start) * width // total)))
+        bar = " " * left + "█" * (right - left) + " " * (width - right)
+        details = [
+            template.format(span.attributes[key])
+            for key, template in _TIMELINE_ATTRIBUTES if key in span.attributes
+        ]
+        if span.status == STATUS_ERROR:
+            details.append(f"❌ {span.message}")
+        if span.attributes.get("unfinished"):
+            details.append("未完了")
+        suffix = f"  ({', '.join(details)})" if details else ""
+        lines.append(
+            f"{(span.start_ns - start) / 1e9:>7.3f}s {(span_end - span.start_ns) / 1e9:>7.3f}s  "
+            f"|{bar}|  {'  ' * depth}{span.name}{suffix}"
+        )
+    return "\n".join(lines)